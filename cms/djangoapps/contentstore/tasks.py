@@ -9,7 +9,7 @@ import os
 import shutil
 import tarfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 from celery.task import task
 from celery.utils.log import get_task_logger
@@ -45,8 +45,9 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
+from xmodule.modulestore.tar_export_fs import TarExportFS
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
-from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
+from xmodule.modulestore.xml_importer import CourseImportManager, LibraryImportManager
 
 LOGGER = get_task_logger(__name__)
 FILE_READ_CHUNK = 1024  # bytes
@@ -272,20 +273,22 @@ def create_export_tarball(course_module, course_key, context, status=None):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        if status:
-            status.set_state(u'Compressing')
-            status.increment_completed_steps()
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+        # Stream the exported OLX straight into the compressed tar file, rather
+        # than writing it to a temporary directory to compress afterwards.
+        with tarfile.open(fileobj=export_file, mode='w|gz') as tar_file:
+            export_fs = TarExportFS(tar_file)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, export_fs, name)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, export_fs, name)
+
+            if status:
+                status.set_state(u'Compressing')
+                status.increment_completed_steps()
+        export_file.seek(0)
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key)
@@ -318,9 +321,6 @@ def create_export_tarball(course_module, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -381,11 +381,11 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
     if is_library:
         root_name = LIBRARY_ROOT
         courselike_module = modulestore().get_library(courselike_key)
-        import_func = import_library_from_xml
+        import_manager_class = LibraryImportManager
     else:
         root_name = COURSE_ROOT
         courselike_module = modulestore().get_course(courselike_key)
-        import_func = import_course_from_xml
+        import_manager_class = CourseImportManager
 
     # Locate the uploaded OLX archive (and download it from S3 if necessary)
     # Do everything in a try-except block to make sure everything is properly cleaned up.
@@ -503,13 +503,22 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             u'courselike_import.time',
             tags=[u"courselike:{}".format(courselike_key)]
         ):
-            courselike_items = import_func(
+            import_manager = import_manager_class(
                 modulestore(), user.id,
                 settings.GITHUB_REPO_ROOT, [dirpath],
                 load_error_modules=False,
                 static_content_store=contentstore(),
-                target_id=courselike_key
+                target_id=courselike_key,
+                static_import_workers=settings.COURSE_IMPORT_STATIC_WORKERS,
+                skip_unchanged_static=settings.COURSE_IMPORT_SKIP_UNCHANGED_STATIC,
             )
+            courselike_items = list(import_manager.run_imports())
+
+        # Report the time spent in each phase of the import with the task status.
+        LOGGER.info(u'Course import %s: Import stats %s', courselike_key, dict(import_manager.stats))
+        UserTaskArtifact.objects.create(
+            status=self.status, name=u'Stats', text=json.dumps(import_manager.stats, sort_keys=True)
+        )
 
         new_location = courselike_items[0].location
         LOGGER.debug(u'new course at %s', new_location)
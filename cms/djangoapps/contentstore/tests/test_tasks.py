@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function
 
 import copy
 import json
+import tarfile
 from uuid import uuid4
 
 import mock
@@ -53,6 +54,20 @@ class ExportCourseTestCase(CourseTestCase):
         output = artifacts[0]
         self.assertEqual(output.name, 'Output')
 
+    def test_output_archive(self):
+        """
+        Verify that the exported OLX is streamed into a valid tar.gz archive
+        """
+        key = str(self.course.location.course_key)
+        result = export_olx.delay(self.user.id, key, u'en')
+        status = UserTaskStatus.objects.get(task_id=result.id)
+        output = UserTaskArtifact.objects.get(status=status, name='Output')
+        with tarfile.open(fileobj=output.file, mode='r:gz') as tar_file:
+            names = tar_file.getnames()
+        course_dir = self.course.url_name
+        self.assertIn(u'{}/course.xml'.format(course_dir), names)
+        self.assertIn(u'{}/policies/assets.json'.format(course_dir), names)
+
     @mock.patch('contentstore.tasks.export_course_to_xml', side_effect=side_effect_exception)
     def test_exception(self, mock_export):  # pylint: disable=unused-argument
         """
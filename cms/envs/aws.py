@@ -162,6 +162,14 @@ if 'loc_cache' not in CACHES:
         'LOCATION': 'edx_location_mem_cache',
     }
 
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES', COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES
+)
+CONTENTSERVER_DISK_CACHE_DIR = ENV_TOKENS.get('CONTENTSERVER_DISK_CACHE_DIR', CONTENTSERVER_DISK_CACHE_DIR)
+CONTENTSERVER_DISK_CACHE_MAX_BYTES = ENV_TOKENS.get(
+    'CONTENTSERVER_DISK_CACHE_MAX_BYTES', CONTENTSERVER_DISK_CACHE_MAX_BYTES
+)
+
 SESSION_COOKIE_DOMAIN = ENV_TOKENS.get('SESSION_COOKIE_DOMAIN')
 SESSION_COOKIE_HTTPONLY = ENV_TOKENS.get('SESSION_COOKIE_HTTPONLY', True)
 SESSION_ENGINE = ENV_TOKENS.get('SESSION_ENGINE', SESSION_ENGINE)
@@ -342,6 +350,11 @@ else:
 
 USER_TASKS_ARTIFACT_STORAGE = COURSE_IMPORT_EXPORT_STORAGE
 
+COURSE_IMPORT_STATIC_WORKERS = ENV_TOKENS.get('COURSE_IMPORT_STATIC_WORKERS', COURSE_IMPORT_STATIC_WORKERS)
+COURSE_IMPORT_SKIP_UNCHANGED_STATIC = ENV_TOKENS.get(
+    'COURSE_IMPORT_SKIP_UNCHANGED_STATIC', COURSE_IMPORT_SKIP_UNCHANGED_STATIC
+)
+
 DATABASES = AUTH_TOKENS['DATABASES']
 
 # The normal database user does not have enough permissions to run migrations.
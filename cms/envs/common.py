@@ -504,6 +504,18 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 ############################ Modulestore Configuration ################################
 MODULESTORE_BRANCH = 'draft-preferred'
 
+# Maximum number of bytes of pickled split modulestore course structures to
+# keep in an in-process cache, in front of the 'course_structure_cache'.
+# Structures are immutable, so this cache never serves stale data. Set to 0
+# to disable the in-process cache.
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = 0
+
+# Directory in which to cache the data of course assets, which are too large to be cached
+# in the 'course_assets' cache, on the local disk of each node, and the maximum number of
+# bytes to cache there. The disk cache is disabled unless both are set.
+CONTENTSERVER_DISK_CACHE_DIR = None
+CONTENTSERVER_DISK_CACHE_MAX_BYTES = 0
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -626,6 +638,14 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# Number of threads reading and saving the static files of an imported course
+# into the contentstore; files are imported one at a time if 1 or less.
+COURSE_IMPORT_STATIC_WORKERS = 0
+
+# Whether static files identical to the assets already in the contentstore, by
+# md5 digest and attributes, are skipped when re-importing a course.
+COURSE_IMPORT_SKIP_UNCHANGED_STATIC = False
+
 ##### EMBARGO #####
 EMBARGO_SITE_REDIRECT_URL = None
 
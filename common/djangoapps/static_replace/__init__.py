@@ -1,5 +1,8 @@
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
@@ -13,6 +16,23 @@ log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
 
+# Compiled regexes of _url_replace_regex, by prefix.
+_COMPILED_URL_REPLACE_REGEXES = {}
+
+# Compiled regexes of _combined_url_replace_regex, by STATIC_URL and data directory.
+_COMPILED_COMBINED_REGEXES = {}
+
+# Maximum number of regexes compiled in either of the above, beyond which
+# they're cleared, as a guard against unbounded growth.
+_MAX_COMPILED_REGEXES = 1000
+
+# Names of the groups of the combined regex matching the prefixes
+# rewritten by each of the separate replacement functions.
+_STATIC_GROUP = 'static'
+_COURSE_GROUP = 'course'
+_JUMP_TO_ID_GROUP = 'jump_to_id'
+
+
 def _url_replace_regex(prefix):
     """
     Match static urls in quotes that don't end in '?raw'.
@@ -29,6 +49,128 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled regex of _url_replace_regex for the given prefix,
+    compiling it only once.
+    """
+    regex = _COMPILED_URL_REPLACE_REGEXES.get(prefix)
+    if regex is None:
+        if len(_COMPILED_URL_REPLACE_REGEXES) >= _MAX_COMPILED_REGEXES:
+            _COMPILED_URL_REPLACE_REGEXES.clear()
+        regex = _COMPILED_URL_REPLACE_REGEXES[prefix] = re.compile(_url_replace_regex(prefix))
+    return regex
+
+
+def _static_prefix_regex(data_dir):
+    """
+    Returns the regex of the prefix of urls of static files, excluding those
+    already in the given data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+def _combined_url_replace_regex(data_dir):
+    """
+    Returns the compiled regex matching the urls rewritten by any of
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls
+    in a single pass, with the prefix of each captured in its own group.
+    """
+    key = (settings.STATIC_URL, data_dir)
+    regex = _COMPILED_COMBINED_REGEXES.get(key)
+    if regex is None:
+        if len(_COMPILED_COMBINED_REGEXES) >= _MAX_COMPILED_REGEXES:
+            _COMPILED_COMBINED_REGEXES.clear()
+        regex = _COMPILED_COMBINED_REGEXES[key] = re.compile(_url_replace_regex(
+            u'(?P<{static}>{static_prefix})|(?P<{course}>/course/)|(?P<{jump_to_id}>/jump_to_id/)'.format(
+                static=_STATIC_GROUP,
+                static_prefix=_static_prefix_regex(data_dir),
+                course=_COURSE_GROUP,
+                jump_to_id=_JUMP_TO_ID_GROUP,
+            )
+        ))
+    return regex
+
+
+class AssetUrlCache(object):
+    """
+    An in-process cache of the urls resolved for static assets, by course,
+    evicting the least recently used courses and urls.
+
+    Resolving the url of a course asset looks it up in the contentstore,
+    which is repeated for every rendering of every block referencing it.
+    Urls are only kept for `timeout` seconds, since they change with the
+    content of the asset.
+    """
+    def __init__(self, timeout, max_courses, max_urls_per_course):
+        self.timeout = timeout
+        self.max_courses = max_courses
+        self.max_urls_per_course = max_urls_per_course
+        self._urls_by_course = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, course_key, key):
+        """
+        Returns the cached url of the given course for the given key, or
+        None if there is none.
+        """
+        with self._lock:
+            urls = self._urls_by_course.pop(course_key, None)
+            if urls is None:
+                return None
+            self._urls_by_course[course_key] = urls
+
+            entry = urls.pop(key, None)
+            if entry is None:
+                return None
+            expires, url = entry
+            if expires < time.time():
+                return None
+            urls[key] = entry
+            return url
+
+    def set(self, course_key, key, url):
+        """
+        Caches the url of the given course for the given key.
+        """
+        with self._lock:
+            urls = self._urls_by_course.pop(course_key, None)
+            if urls is None:
+                urls = OrderedDict()
+                while len(self._urls_by_course) >= self.max_courses:
+                    self._urls_by_course.popitem(last=False)
+            self._urls_by_course[course_key] = urls
+
+            urls.pop(key, None)
+            urls[key] = (time.time() + self.timeout, url)
+            while len(urls) > self.max_urls_per_course:
+                urls.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all cached urls.
+        """
+        with self._lock:
+            self._urls_by_course.clear()
+
+
+# The AssetUrlCache of resolved static asset urls, or None if it's disabled.
+ASSET_URL_CACHE = None
+
+
+def configure_asset_url_cache(timeout, max_courses=100, max_urls_per_course=1000):
+    """
+    Configures the in-process cache of resolved static asset urls, whose
+    entries are kept for the given number of seconds.  A timeout of 0
+    disables the cache.
+    """
+    global ASSET_URL_CACHE  # pylint: disable=global-statement
+    ASSET_URL_CACHE = AssetUrlCache(timeout, max_courses, max_urls_per_course) if timeout else None
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
@@ -70,7 +212,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -90,7 +232,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -108,26 +250,26 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        if _is_xblock_resource_url(prefix, rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(_static_prefix_regex(data_dir)).sub(wrap_part_extraction, text)
+
+
+def _is_xblock_resource_url(prefix, rest):
+    """
+    Returns whether the matched static url is a link to an XBlock resource.
+    """
+    # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
+    # works for actual static assets and for magical course asset URLs....
+    full_url = prefix + rest
+
+    starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
 
 
 def make_static_urls_absolute(request, html):
@@ -164,54 +306,144 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         """
         Replace a single matched url.
         """
-        # Don't mess with things that end in '?raw'
-        if rest.endswith('?raw'):
+        url = _static_url(prefix, rest, data_directory, course_id, static_asset_path)
+        if url is None:
             return original
+        return "".join([quote, url, quote])
+
+    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+
+
+def replace_urls(text, data_directory=None, course_id=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Does the substitutions of replace_static_urls, then, if course_id is
+    given, those of replace_course_urls, then, if jump_to_id_base_url is
+    given, those of replace_jump_to_id_urls, in a single pass over the text.
+
+    The arguments are those of the separate functions.
+    """
+    static_data_dir = static_asset_path or data_directory
+    regex = _combined_url_replace_regex(static_data_dir)
+
+    # The single pass can't tell how the separate passes would rewrite
+    # urls within the quotes of other urls, or urls sharing a quote with
+    # the url before them, so it leaves such text to the separate passes.
+    needs_separate_passes = []
 
-        # In debug mode, if we can find the url as is,
-        if settings.DEBUG and finders.find(rest, True):
+    def replace_url(match):
+        """
+        Replace a single matched url.
+        """
+        original = match.group(0)
+        prefix = match.group('prefix')
+        quote = match.group('quote')
+        rest = match.group('rest')
+
+        if '"' in rest or "'" in rest or any(
+                regex.match(match.string, position) for position in (match.end() - len(quote), match.end() - 1)
+        ):
+            needs_separate_passes.append(True)
             return original
-        # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
-            # first look in the static file pipeline and see if we are trying to reference
-            # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
-
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-
-            if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
-
-        # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+
+        if match.group(_STATIC_GROUP) is not None:
+            if _is_xblock_resource_url(prefix, rest):
+                return original
+            url = _static_url(prefix, rest, data_directory, course_id, static_asset_path)
+            if url is None:
+                return original
+            return "".join([quote, url, quote])
+        elif match.group(_COURSE_GROUP) is not None:
+            if course_id is None:
+                return original
+            return "".join([quote, '/courses/' + course_id.to_deprecated_string() + '/', rest, quote])
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
-
-            try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
-                else:
-                    url = staticfiles_storage.url(course_path)
-            # And if that fails, assume that it's course content, and add manually data directory
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
-                url = "".join([prefix, course_path])
+            if jump_to_id_base_url is None:
+                return original
+            return "".join([quote, jump_to_id_base_url + rest, quote])
 
-        return "".join([quote, url, quote])
+    replaced_text = regex.sub(replace_url, text)
+    if not needs_separate_passes:
+        return replaced_text
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    text = replace_static_urls(text, data_directory, course_id, static_asset_path)
+    if course_id is not None:
+        text = replace_course_urls(text, course_id)
+    if jump_to_id_base_url is not None:
+        text = replace_jump_to_id_urls(text, course_id, jump_to_id_base_url)
+    return text
+
+
+def _static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Returns the url replacing the matched static url with the given prefix
+    and rest, or None if it must not be replaced.
+
+    The urls are cached by the AssetUrlCache, if it's enabled.
+    """
+    cache = ASSET_URL_CACHE
+    if cache is None:
+        return _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+
+    key = (prefix, rest, data_directory, static_asset_path)
+    url = cache.get(course_id, key)
+    if url is None:
+        url = _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path)
+        # Urls that must not be replaced are cached as False.
+        cache.set(course_id, key, url if url is not None else False)
+    return url or None
+
+
+def _resolve_static_url(prefix, rest, data_directory, course_id, static_asset_path):
+    """
+    Returns the url replacing the matched static url with the given prefix
+    and rest, or None if it must not be replaced.  See replace_static_urls.
+    """
+    # Don't mess with things that end in '?raw'
+    if rest.endswith('?raw'):
+        return None
+
+    # In debug mode, if we can find the url as is,
+    if settings.DEBUG and finders.find(rest, True):
+        return None
+    # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
+    elif (not static_asset_path) and course_id:
+        # first look in the static file pipeline and see if we are trying to reference
+        # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
+
+        exists_in_staticfiles_storage = False
+        try:
+            exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+
+        if exists_in_staticfiles_storage:
+            url = staticfiles_storage.url(rest)
+        else:
+            # if not, then assume it's courseware specific content and then look in the
+            # Mongo-backed database
+            # Import is placed here to avoid model import at project startup.
+            from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            base_url = AssetBaseUrlConfig.get_base_url()
+            excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
+            url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+
+            if AssetLocator.CANONICAL_NAMESPACE in url:
+                url = url.replace('block@', 'block/', 1)
+
+    # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
+    else:
+        course_path = "/".join((static_asset_path or data_directory, rest))
+
+        try:
+            if staticfiles_storage.exists(rest):
+                url = staticfiles_storage.url(rest)
+            else:
+                url = staticfiles_storage.url(course_path)
+        # And if that fails, assume that it's course content, and add manually data directory
+        except Exception as err:
+            log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                rest, str(err)))
+            url = "".join([prefix, course_path])
+
+    return url
@@ -7,7 +7,7 @@ from urlparse import parse_qsl, urlparse, urlunparse
 
 import ddt
 import pytest
-from django.test import override_settings
+from django.test import TestCase, override_settings
 from django.utils.http import urlencode, urlquote
 from mock import Mock, patch
 from nose.tools import assert_equals, assert_false, assert_true  # pylint: disable=no-name-in-module
@@ -15,11 +15,15 @@ from opaque_keys.edx.keys import CourseKey
 from PIL import Image
 
 from static_replace import (
+    AssetUrlCache,
     _url_replace_regex,
+    configure_asset_url_cache,
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -231,6 +235,122 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+JUMP_TO_ID_BASE_URL = '/courses/org/course/run/jump_to_id/'
+
+
+@ddt.ddt
+class ReplaceUrlsTest(TestCase):
+    """
+    Tests for replace_urls, which does the substitutions of the separate
+    replacement functions in a single pass.
+    """
+    def setUp(self):
+        super(ReplaceUrlsTest, self).setUp()
+        patcher = patch('static_replace.staticfiles_storage', autospec=True)
+        self.mock_storage = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_storage.exists.return_value = True
+        self.mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    def replace_separately(self, text, course_id, jump_to_id_base_url):
+        """
+        Returns the given text with the substitutions of the separate
+        replacement functions.
+        """
+        text = replace_static_urls(text, DATA_DIRECTORY, course_id)
+        if course_id is not None:
+            text = replace_course_urls(text, course_id)
+        if jump_to_id_base_url is not None:
+            text = replace_jump_to_id_urls(text, course_id, jump_to_id_base_url)
+        return text
+
+    @ddt.data(
+        '<img src="/static/file.png"/><a href="/course/info">info</a><a href=\'/jump_to_id/abc\'>abc</a>',
+        '"/static/data_dir/file.png" "/static/file.png?raw" "/static/xblock/resources/file.png"',
+        '<a href="/course/x\'/static/y\'">nested</a>',
+        '"/static/a.png"/course/b" \\"/jump_to_id/c\\"',
+        '"/static/it\'s.png" \'/course/"quoted"\'',
+        'no urls at all',
+    )
+    def test_same_as_separate_replacements(self, text):
+        for course_id, jump_to_id_base_url in (
+                (COURSE_KEY, JUMP_TO_ID_BASE_URL),
+                (COURSE_KEY, None),
+                (None, None),
+        ):
+            self.assertEqual(
+                replace_urls(text, DATA_DIRECTORY, course_id, jump_to_id_base_url=jump_to_id_base_url),
+                self.replace_separately(text, course_id, jump_to_id_base_url),
+            )
+
+    def test_replacements(self):
+        self.assertEqual(
+            replace_urls(
+                '"/static/file.png" "/course/info" "/jump_to_id/abc"',
+                DATA_DIRECTORY,
+                COURSE_KEY,
+                jump_to_id_base_url=JUMP_TO_ID_BASE_URL,
+            ),
+            '"/static/hashed/file.png" "/courses/org/course/run/info" "/courses/org/course/run/jump_to_id/abc"',
+        )
+
+    def test_asset_url_cache(self):
+        configure_asset_url_cache(60)
+        self.addCleanup(configure_asset_url_cache, 0)
+
+        for _ in range(3):
+            self.assertEqual(replace_urls(STATIC_SOURCE, DATA_DIRECTORY), '"/static/hashed/file.png"')
+            self.assertEqual(replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY), '"/static/hashed/file.png"')
+        self.mock_storage.exists.assert_called_once_with('file.png')
+
+        # Other courses and data directories have their own urls.
+        replace_urls(STATIC_SOURCE, 'other_data_dir')
+        self.assertEqual(self.mock_storage.exists.call_count, 2)
+
+
+class AssetUrlCacheTest(TestCase):
+    """
+    Tests for AssetUrlCache.
+    """
+    def test_get_set(self):
+        cache = AssetUrlCache(60, max_courses=2, max_urls_per_course=2)
+        self.assertIsNone(cache.get(COURSE_KEY, 'a'))
+        cache.set(COURSE_KEY, 'a', '/url/a')
+        self.assertEqual(cache.get(COURSE_KEY, 'a'), '/url/a')
+        self.assertIsNone(cache.get(None, 'a'))
+
+    def test_evict_urls(self):
+        cache = AssetUrlCache(60, max_courses=2, max_urls_per_course=2)
+        cache.set(COURSE_KEY, 'a', '/url/a')
+        cache.set(COURSE_KEY, 'b', '/url/b')
+        cache.get(COURSE_KEY, 'a')
+        cache.set(COURSE_KEY, 'c', '/url/c')
+        self.assertEqual(cache.get(COURSE_KEY, 'a'), '/url/a')
+        self.assertIsNone(cache.get(COURSE_KEY, 'b'))
+        self.assertEqual(cache.get(COURSE_KEY, 'c'), '/url/c')
+
+    def test_evict_courses(self):
+        cache = AssetUrlCache(60, max_courses=2, max_urls_per_course=2)
+        other_course_keys = [CourseKey.from_string('org/other/run'), CourseKey.from_string('org/another/run')]
+        cache.set(COURSE_KEY, 'a', '/url/a')
+        cache.set(other_course_keys[0], 'a', '/other/a')
+        cache.get(COURSE_KEY, 'a')
+        cache.set(other_course_keys[1], 'a', '/another/a')
+        self.assertEqual(cache.get(COURSE_KEY, 'a'), '/url/a')
+        self.assertIsNone(cache.get(other_course_keys[0], 'a'))
+        self.assertEqual(cache.get(other_course_keys[1], 'a'), '/another/a')
+
+    @patch('static_replace.time.time')
+    def test_timeout(self, mock_time):
+        cache = AssetUrlCache(60, max_courses=2, max_urls_per_course=2)
+        mock_time.return_value = 1000
+        cache.set(COURSE_KEY, 'a', '/url/a')
+        mock_time.return_value = 1060
+        self.assertEqual(cache.get(COURSE_KEY, 'a'), '/url/a')
+        mock_time.return_value = 1061
+        self.assertIsNone(cache.get(COURSE_KEY, 'a'))
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -0,0 +1,114 @@
+"""
+Performance test comparing the separate static_replace substitutions with
+the single pass of replace_urls, on large HTML blocks.
+"""
+import unittest
+from timeit import default_timer
+
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from static_replace import (
+    configure_asset_url_cache,
+    replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
+)
+
+COURSE_KEY = CourseKey.from_string('org/course/run')
+DATA_DIRECTORY = 'data_dir'
+JUMP_TO_ID_BASE_URL = '/courses/org/course/run/jump_to_id/'
+
+# Numbers of each kind of url in the generated HTML blocks.
+NUM_URLS = (10, 100, 1000)
+
+# Number of distinct static assets referenced by each HTML block.
+NUM_ASSETS = 20
+
+# Number of times each substitution is timed.
+NUM_RUNS = 5
+
+
+def generate_html(num_urls):
+    """
+    Returns an HTML block with the given number of each kind of url
+    rewritten by static_replace, among paragraphs of text.
+    """
+    paragraph = u'<p>{}</p>'.format(u'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 10)
+    return u''.join(
+        u'{paragraph}<img src="/static/images/image{asset}.png"/>'
+        u'<a href="/course/info/{index}">info</a><a href="/jump_to_id/block{index}">block</a>'.format(
+            paragraph=paragraph, asset=index % NUM_ASSETS, index=index,
+        )
+        for index in range(num_urls)
+    )
+
+
+def replace_separately(text):
+    """
+    Returns the given text with the substitutions of the separate
+    replacement functions.
+    """
+    text = replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY)
+    text = replace_course_urls(text, COURSE_KEY)
+    return replace_jump_to_id_urls(text, COURSE_KEY, JUMP_TO_ID_BASE_URL)
+
+
+def replace_combined(text):
+    """
+    Returns the given text with the substitutions of replace_urls.
+    """
+    return replace_urls(text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url=JUMP_TO_ID_BASE_URL)
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class ReplaceUrlsPerf(TestCase):
+    """
+    Compares the wall time of the separate substitutions, the single pass
+    and the single pass with the asset url cache.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ReplaceUrlsPerf, self).setUp()
+        # Stand in for the configuration and contentstore lookups of course assets.
+        for patcher in (
+                patch('static_replace.models.AssetBaseUrlConfig.get_base_url', return_value=''),
+                patch('static_replace.models.AssetExcludedExtensionsConfig.get_excluded_extensions', return_value=[]),
+                patch(
+                    'static_replace.StaticContent.get_canonicalized_asset_path',
+                    side_effect=lambda course_key, path, base_url, excluded_exts: (
+                        u'/asset-v1:org+course+run+type@asset+block@' + path
+                    ),
+                ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(configure_asset_url_cache, 0)
+
+    def test_replace(self):
+        print
+        print '{:>8} {:>10} {:>12}'.format('urls', 'mode', 'time (ms)')
+        for num_urls in NUM_URLS:
+            html = generate_html(num_urls)
+            expected = replace_separately(html)
+            for mode, replace, cache_timeout in (
+                    ('separate', replace_separately, 0),
+                    ('combined', replace_combined, 0),
+                    ('cached', replace_combined, 60),
+            ):
+                configure_asset_url_cache(cache_timeout)
+                timings = []
+                for _ in range(NUM_RUNS):
+                    start = default_timer()
+                    result = replace(html)
+                    timings.append(default_timer() - start)
+                self.assertEqual(result, expected)
+
+                print '{:>8} {:>10} {:>12.2f}'.format(num_urls, mode, min(timings) * 1000)
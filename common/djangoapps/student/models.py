@@ -1485,8 +1485,8 @@ class CourseEnrollment(models.Model):
         We try to preload all CourseOverviews, which are usually lazily loaded
         as the .course_overview property. This is to avoid making an extra
         query for every enrollment when displaying something like the student
-        dashboard. If some of the CourseOverviews are not found, we make no
-        attempt to initialize them -- we just fall back to existing lazy-load
+        dashboard. CourseOverviews that are missing are generated along the
+        way; if some of them can't be, we just fall back to existing lazy-load
         behavior. The goal is to optimize the most common case as simply as
         possible, without changing any of the existing contracts.
 
@@ -1494,7 +1494,7 @@ class CourseEnrollment(models.Model):
         number of alternatives, so pylint can stuff it (disable=invalid-name)
         """
         enrollments = list(cls.enrollments_for_user(user))
-        overviews = CourseOverview.get_from_ids_if_exists(
+        overviews = CourseOverview.get_from_ids(
             enrollment.course_id for enrollment in enrollments
         )
         for enrollment in enrollments:
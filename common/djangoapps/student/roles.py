@@ -68,16 +68,17 @@ class RoleCache(object):
                 CourseAccessRole.objects.filter(user=user).all()
             )
 
+        # Index the roles, since a request may check them thousands of times.
+        self._role_tuples = {
+            (access_role.role, access_role.course_id, access_role.org)
+            for access_role in self._roles
+        }
+
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._role_tuples
 
 
 class AccessRole(object):
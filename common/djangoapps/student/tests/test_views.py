@@ -10,7 +10,9 @@ import ddt
 import pytz
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from edx_oauth2_provider.constants import AUTHORIZED_CLIENTS_SESSION_KEY
 from edx_oauth2_provider.tests.factories import ClientFactory, TrustedClientFactory
 from milestones.tests.utils import MilestonesTestCaseMixin
@@ -52,7 +54,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = 'processing'
         self.client.login(username=self.user.username, password=PASSWORD)
 
-    def mock_cert(self, _user, _course_overview, _course_mode):
+    def mock_cert(self, _user, _course_overview, _course_mode, cert_status=None):  # pylint: disable=unused-argument
         """ Return a preset certificate status. """
         return {
             'status': self.cert_status,
@@ -312,6 +314,30 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual('Share on Twitter' in response.content, set_marketing or set_social_sharing)
         self.assertEqual('Share on Facebook' in response.content, set_marketing or set_social_sharing)
 
+    def _num_dashboard_queries(self):
+        """
+        Returns the number of queries made to render the dashboard.
+        """
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def test_num_queries_independent_of_enrollments(self):
+        """
+        Verify that the number of queries made to render the dashboard
+        doesn't grow with the number of courses the user is enrolled in.
+        """
+        for _ in range(2):
+            CourseEnrollmentFactory(course_id=CourseFactory.create(emit_signals=True).id, user=self.user)
+        # The first visit may create records, such as the user's preferences.
+        self.client.get(self.path)
+        num_queries = self._num_dashboard_queries()
+
+        for _ in range(5):
+            CourseEnrollmentFactory(course_id=CourseFactory.create(emit_signals=True).id, user=self.user)
+        self.assertEqual(self._num_dashboard_queries(), num_queries)
+
     @patch.dict("django.conf.settings.FEATURES", {'ENABLE_PREREQUISITE_COURSES': True})
     def test_pre_requisites_appear_on_dashboard(self):
         """
@@ -57,7 +57,8 @@ from bulk_email.models import BulkEmailFlag, Optout  # pylint: disable=import-er
 from certificates.api import get_certificate_url, has_html_certificates_enabled  # pylint: disable=import-error
 from certificates.models import (  # pylint: disable=import-error
     CertificateStatuses,
-    certificate_status_for_student
+    certificate_status_for_student,
+    certificate_statuses_for_student
 )
 from course_modes.models import CourseMode
 from courseware.access import has_access
@@ -85,7 +86,7 @@ from openedx.core.djangoapps.site_configuration import helpers as configuration_
 from openedx.core.djangoapps.theming import helpers as theming_helpers
 from openedx.core.djangoapps.user_api.preferences import api as preferences_api
 from openedx.core.djangolib.markup import HTML
-from openedx.features.course_experience import course_home_url_name
+from openedx.features.course_experience import COURSE_PRE_START_ACCESS_FLAG, course_home_url_name
 from openedx.features.enterprise_support.api import get_dashboard_consent_notification
 from shoppingcart.api import order_history
 from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
@@ -227,7 +228,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -236,6 +237,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The user's certificate status in the course, as
+            returned by certificate_status, if it has already been loaded.
 
     Returns:
         dict: A dictionary with keys:
@@ -247,12 +250,9 @@ def cert_info(user, course_overview, course_mode):
             'grade': if status is not 'processing'
             'can_unenroll': if status allows for unenrollment
     """
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -645,6 +645,111 @@ def compose_and_send_activation_email(user, profile, user_registration=None):
     send_activation_email.delay(subject, message_for_activation, from_address, dest_addr)
 
 
+def get_dashboard_course_data(request, course_enrollments, course_modes_by_course):
+    """
+    Gather the per-course information needed to render the dashboard.
+
+    Everything is loaded in bulk for all the enrollments, so the number of
+    queries doesn't grow with the number of courses the user is enrolled in.
+
+    Arguments:
+        request: The request object.
+        course_enrollments (list[CourseEnrollment]): The enrollments to be
+            displayed, with their course overviews loaded.
+        course_modes_by_course (dict): Mapping of course ids to dictionaries
+            of unexpired course modes, keyed by slug.
+
+    Returns:
+        dict: The dashboard template context entries for the courses.
+
+    """
+    user = request.user
+    course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+    # Checking whether each course can be loaded checks whether the start
+    # date is overridden for the course.
+    COURSE_PRE_START_ACCESS_FLAG.prefetch_course_overrides(course_ids)
+    show_courseware_links_for = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if has_access(user, 'load', enrollment.course_overview)
+    )
+
+    # Construct a dictionary of course mode information
+    # used to render the course list.  We re-use the course modes dict
+    # we loaded earlier to avoid hitting the database.
+    course_mode_info = {
+        enrollment.course_id: complete_course_mode_info(
+            enrollment.course_id, enrollment,
+            modes=course_modes_by_course[enrollment.course_id]
+        )
+        for enrollment in course_enrollments
+    }
+
+    # Determine the per-course verification status
+    # This is a dictionary in which the keys are course locators
+    # and the values are one of:
+    #
+    # VERIFY_STATUS_NEED_TO_VERIFY
+    # VERIFY_STATUS_SUBMITTED
+    # VERIFY_STATUS_APPROVED
+    # VERIFY_STATUS_MISSED_DEADLINE
+    #
+    # Each of which correspond to a particular message to display
+    # next to the course on the dashboard.
+    #
+    # If a course is not included in this dictionary,
+    # there is no verification messaging to display.
+    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+
+    cert_statuses_by_course = certificate_statuses_for_student(user, course_ids)
+    cert_statuses = {
+        enrollment.course_id: cert_info(
+            user, enrollment.course_overview, enrollment.mode,
+            cert_status=cert_statuses_by_course[enrollment.course_id]
+        )
+        for enrollment in course_enrollments
+    }
+
+    # only show email settings for Mongo course and when bulk email is turned on
+    show_email_settings_for = frozenset(BulkEmailFlag.feature_enabled_for_courses(course_ids))
+
+    redeemed_registration_codes = defaultdict(list)
+    for registration_code in CourseRegistrationCode.objects.filter(
+            course_id__in=course_ids,
+            registrationcoderedemption__redeemed_by=user
+    ).select_related('invoice_item__invoice'):
+        redeemed_registration_codes[registration_code.course_id].append(registration_code)
+
+    block_courses = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if is_course_blocked(request, redeemed_registration_codes[enrollment.course_id], enrollment.course_id)
+    )
+
+    # A course is paid if the enrollment is in a professional mode, or if the
+    # course is white label; credit modes aren't considered for the latter.
+    enrolled_courses_either_paid = frozenset(
+        enrollment.course_id for enrollment in course_enrollments
+        if CourseMode.is_professional_slug(enrollment.mode) or CourseMode.is_white_label(
+            enrollment.course_id,
+            modes_dict={
+                slug: mode for slug, mode in course_modes_by_course[enrollment.course_id].iteritems()
+                if slug not in CourseMode.CREDIT_MODES
+            }
+        )
+    )
+
+    return {
+        'show_courseware_links_for': show_courseware_links_for,
+        'all_course_modes': course_mode_info,
+        'cert_statuses': cert_statuses,
+        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'show_email_settings_for': show_email_settings_for,
+        'verification_status_by_course': verify_status_by_course,
+        'block_courses': block_courses,
+        'enrolled_courses_either_paid': enrolled_courses_either_paid,
+    }
+
+
 @login_required
 @ensure_csrf_cookie
 def dashboard(request):
@@ -751,54 +856,13 @@ def dashboard(request):
         staff_access = True
         errored_courses = modulestore().get_errored_courses()
 
-    show_courseware_links_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if has_access(request.user, 'load', enrollment.course_overview)
-    )
-
     # Find programs associated with course runs being displayed. This information
     # is passed in the template context to allow rendering of program-related
     # information on the dashboard.
     meter = ProgramProgressMeter(request.site, user, enrollments=course_enrollments)
     inverted_programs = meter.invert_programs()
 
-    # Construct a dictionary of course mode information
-    # used to render the course list.  We re-use the course modes dict
-    # we loaded earlier to avoid hitting the database.
-    course_mode_info = {
-        enrollment.course_id: complete_course_mode_info(
-            enrollment.course_id, enrollment,
-            modes=course_modes_by_course[enrollment.course_id]
-        )
-        for enrollment in course_enrollments
-    }
-
-    # Determine the per-course verification status
-    # This is a dictionary in which the keys are course locators
-    # and the values are one of:
-    #
-    # VERIFY_STATUS_NEED_TO_VERIFY
-    # VERIFY_STATUS_SUBMITTED
-    # VERIFY_STATUS_APPROVED
-    # VERIFY_STATUS_MISSED_DEADLINE
-    #
-    # Each of which correspond to a particular message to display
-    # next to the course on the dashboard.
-    #
-    # If a course is not included in this dictionary,
-    # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
-        for enrollment in course_enrollments
-    }
-
-    # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            BulkEmailFlag.feature_enabled(enrollment.course_id)
-        )
-    )
+    course_data = get_dashboard_course_data(request, course_enrollments, course_modes_by_course)
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -809,23 +873,6 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
-        )
-    )
-
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
-
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
     denied_banner = any(item.display for item in reverifications["denied"])
@@ -867,22 +914,14 @@ def dashboard(request):
         'sidebar_account_activation_message': sidebar_account_activation_message,
         'staff_access': staff_access,
         'errored_courses': errored_courses,
-        'show_courseware_links_for': show_courseware_links_for,
-        'all_course_modes': course_mode_info,
-        'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
-        'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
-        'verification_status_by_course': verify_status_by_course,
         'verification_errors': verification_errors,
-        'block_courses': block_courses,
         'denied_banner': denied_banner,
         'billing_email': settings.PAYMENT_SUPPORT_EMAIL,
         'user': user,
         'logout_url': reverse('logout'),
         'platform_name': platform_name,
-        'enrolled_courses_either_paid': enrolled_courses_either_paid,
         'provider_states': [],
         'order_history_list': order_history_list,
         'courses_requirements_not_met': courses_requirements_not_met,
@@ -895,6 +934,8 @@ def dashboard(request):
         'display_sidebar_on_dashboard': display_sidebar_on_dashboard,
     }
 
+    context.update(course_data)
+
     ecommerce_service = EcommerceService()
     if ecommerce_service.is_enabled(request.user):
         context.update({
@@ -0,0 +1,167 @@
+"""
+Event tracker backend that hands events to another backend from a
+background thread, in batches.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Empty, Full, Queue
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# What to do with an event when the queue is full.
+OVERFLOW_DROP = 'drop'
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK)
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events for another backend.
+
+    Events are put on a bounded in-process queue, which is drained by a
+    background thread that sends them to the wrapped backend in batches,
+    so that a slow backend doesn't add latency to the request emitting
+    the event.
+
+    """
+
+    def __init__(
+            self, backend, name='buffered', max_queue_size=10000, batch_size=100,
+            flush_interval=1.0, overflow=OVERFLOW_DROP, **kwargs
+    ):
+        """
+        Buffer the events sent to a backend.
+
+        :Parameters:
+
+          - `backend`: the backend to send the queued events to
+          - `name`: name of the backend, used to tag metrics
+          - `max_queue_size`: maximum number of events waiting to be sent
+          - `batch_size`: maximum number of events sent to `backend` at once
+          - `flush_interval`: maximum number of seconds an event waits for
+            its batch to fill before it is sent
+          - `overflow`: what to do with an event when the queue is full;
+            'drop' discards it and 'block' waits for room in the queue
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid event track backend overflow policy %s' % overflow)
+
+        self.backend = backend
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._worker_pid = None
+
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event to be sent to the wrapped backend."""
+        queue = self._ensure_worker()
+        try:
+            queue.put(event, block=(self.overflow == OVERFLOW_BLOCK))
+        except Full:
+            dog_stats_api.increment('track.send.dropped', tags=[u'backend:{}'.format(self.name)])
+
+    def flush(self):
+        """Send all queued events, blocking until they have been sent."""
+        queue = self._queue
+        if queue is None or self._worker_pid != os.getpid():
+            return
+
+        events = []
+        while True:
+            try:
+                events.append(queue.get_nowait())
+            except Empty:
+                break
+
+        # Sending the events here, rather than waiting for the worker
+        # thread, lets this be called when the process exits.
+        for start in xrange(0, len(events), self.batch_size):
+            self._send_batch(events[start:start + self.batch_size])
+        for _ in events:
+            queue.task_done()
+
+        # Wait for any batch the worker thread is sending.
+        queue.join()
+
+    def _ensure_worker(self):
+        """
+        Returns the queue of events, starting the worker thread draining
+        it if needed.
+
+        The queue and thread are created lazily, and again after a fork,
+        since threads don't survive in the child process.
+
+        """
+        pid = os.getpid()
+        if self._worker_pid != pid:
+            with self._lock:
+                if self._worker_pid != pid:
+                    self._queue = Queue(self.max_queue_size)
+                    self._worker = threading.Thread(
+                        target=self._run, args=(self._queue,), name='track-{}'.format(self.name),
+                    )
+                    self._worker.daemon = True
+                    self._worker.start()
+                    self._worker_pid = pid
+        return self._queue
+
+    def _run(self, queue):
+        """Send the events on the queue, in batches, forever."""
+        while True:
+            events = self._next_batch(queue)
+            try:
+                self._send_batch(events)
+            finally:
+                for _ in events:
+                    queue.task_done()
+
+    def _next_batch(self, queue):
+        """
+        Returns the next batch of events on the queue, waiting for the
+        first one, then for up to `flush_interval` seconds to fill it.
+        """
+        events = [queue.get()]
+        deadline = time.time() + self.flush_interval
+        while len(events) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                events.append(queue.get(timeout=remaining))
+            except Empty:
+                break
+        return events
+
+    def _send_batch(self, events):
+        """Send the events to the wrapped backend, logging any error."""
+        tags = [u'backend:{}'.format(self.name)]
+        dog_stats_api.histogram('track.send.batch_size', len(events), tags=tags)
+        try:
+            with dog_stats_api.timer('track.send.batch', tags=tags):
+                self.backend.send_batch(events)
+        except Exception:  # pylint: disable=broad-except
+            # The events are lost, but the worker thread keeps running.
+            log.exception('Error sending batch of %d events to event tracker backend %s', len(events), self.name)
+            dog_stats_api.increment('track.send.dropped', value=len(events), tags=tags)
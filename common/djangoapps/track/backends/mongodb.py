@@ -96,3 +96,13 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection with a single request"""
+        try:
+            # Events are inserted without manipulation, as for single events,
+            # so that no _id is added to event dicts shared with other backends.
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting batch to MongoDB event tracker backend'
+            log.exception(msg)
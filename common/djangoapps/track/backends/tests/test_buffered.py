@@ -0,0 +1,80 @@
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend that records the batches of events it's sent."""
+
+    def __init__(self, **options):
+        super(RecordingBackend, self).__init__(**options)
+        self.batches = []
+        self.sending = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.sending.set()
+        self.release.wait()
+        self.batches.append(list(events))
+
+
+class TestBufferedBackend(TestCase):
+    def setUp(self):
+        super(TestBufferedBackend, self).setUp()
+        self.recorder = RecordingBackend()
+
+    def test_events_sent_in_batches(self):
+        backend = BufferedBackend(self.recorder, batch_size=3, flush_interval=0.01)
+        events = [{'test': index} for index in range(10)]
+        for event in events:
+            backend.send(event)
+        backend.flush()
+
+        self.assertTrue(all(len(batch) <= 3 for batch in self.recorder.batches))
+        self.assertEqual(sorted(sum(self.recorder.batches, []), key=lambda event: event['test']), events)
+
+    def test_flush_without_events(self):
+        backend = BufferedBackend(self.recorder)
+        backend.flush()
+        self.assertEqual(self.recorder.batches, [])
+
+    def test_overflow_drop(self):
+        backend = BufferedBackend(self.recorder, name='slow', max_queue_size=1, batch_size=1)
+
+        # Hold the worker thread while it sends the first event, so that
+        # the second fills the queue and the third is dropped.
+        self.recorder.release.clear()
+        backend.send({'test': 1})
+        self.recorder.sending.wait()
+        with patch('track.backends.buffered.dog_stats_api.increment') as mock_increment:
+            backend.send({'test': 2})
+            backend.send({'test': 3})
+        mock_increment.assert_called_once_with('track.send.dropped', tags=[u'backend:slow'])
+
+        self.recorder.release.set()
+        backend.flush()
+        self.assertItemsEqual(self.recorder.batches, [[{'test': 1}], [{'test': 2}]])
+
+    def test_backend_errors(self):
+        backend = BufferedBackend(self.recorder, batch_size=1)
+        with patch.object(self.recorder, 'send_batch', side_effect=[Exception, None]) as mock_send_batch:
+            backend.send({'test': 1})
+            backend.flush()
+            # The worker thread survives the error.
+            backend.send({'test': 2})
+            backend.flush()
+        self.assertEqual(mock_send_batch.call_count, 2)
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedBackend(self.recorder, overflow='ignore')
@@ -4,6 +4,7 @@ from django.test.utils import override_settings
 
 import track.tracker as tracker
 from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
 
 SIMPLE_SETTINGS = {
     'default': {
@@ -14,6 +15,15 @@ SIMPLE_SETTINGS = {
     }
 }
 
+BUFFERED_SETTINGS = {
+    'default': {
+        'ENGINE': 'track.tests.test_tracker.DummyBackend',
+        'BUFFER': {
+            'batch_size': 10,
+        }
+    }
+}
+
 MULTI_SETTINGS = {
     'first': {
         'ENGINE': 'track.tests.test_tracker.DummyBackend',
@@ -97,6 +107,23 @@ class TestTrackerDjangoInstantiation(TestCase):
 
         self.assertEqual(len(backends), 1)
 
+    @override_settings(TRACKING_BACKENDS=BUFFERED_SETTINGS.copy())
+    def test_django_buffered_settings(self):
+        """Test configuration of a buffered backend"""
+
+        backends = self._reload_backends()
+
+        backend = backends['default']
+        self.assertIsInstance(backend, BufferedBackend)
+        self.assertIsInstance(backend.backend, DummyBackend)
+        self.assertEqual(backend.batch_size, 10)
+
+        for _ in xrange(5):
+            tracker.send({})
+        backend.flush()
+
+        self.assertEqual(backend.backend.count, 5)
+
     def _reload_backends(self):
         # pylint: disable=protected-access
 
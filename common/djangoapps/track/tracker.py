@@ -16,6 +16,23 @@ below::
       }
   }
 
+A backend's events can be sent from a background thread, in batches,
+rather than in the request emitting them, by adding a 'BUFFER' entry
+with the options of `track.backends.buffered.BufferedBackend`::
+
+  TRACKING_BACKENDS = {
+      'tracker_name': {
+          'ENGINE': 'class.name.for.backend',
+          'OPTIONS': { ... },
+          'BUFFER': {
+              'max_queue_size': 10000,
+              'batch_size': 100,
+              'flush_interval': 1.0,
+              'overflow': 'drop',
+          }
+      }
+  }
+
 """
 
 import inspect
@@ -25,6 +42,7 @@ from django.conf import settings
 from dogapi import dog_stats_api
 
 from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
 
 __all__ = ['send']
 
@@ -47,7 +65,10 @@ def _initialize_backends_from_django_settings():
         if values:
             engine = values['ENGINE']
             options = values.get('OPTIONS', {})
-            backends[name] = _instantiate_backend_from_name(engine, options)
+            backend = _instantiate_backend_from_name(engine, options)
+            if 'BUFFER' in values:
+                backend = BufferedBackend(backend, name=name, **values['BUFFER'])
+            backends[name] = backend
 
 
 def _instantiate_backend_from_name(name, options):
@@ -7,6 +7,8 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import numbers
 import operator
+import threading
+from collections import OrderedDict
 
 import numpy
 import scipy.constants
@@ -87,6 +89,13 @@ SUFFIXES = {
 }
 
 
+# Maximum number of compiled expressions kept by `compile_expression`.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
+_COMPILED_EXPRESSION_CACHE = OrderedDict()
+_COMPILED_EXPRESSION_CACHE_LOCK = threading.Lock()
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -230,6 +239,88 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
+# The following few functions are the evaluation actions used when evaluating
+# an expression for arrays of sample points at once. Unlike the actions above,
+# they tell numbers from operators without requiring numbers to be scalars.
+
+def _operands(parse_result):
+    """
+    Return the inputs that are not operators or parentheses.
+    """
+    return [k for k in parse_result if not isinstance(k, basestring)]
+
+
+def eval_atom_array(parse_result):
+    """
+    Return the value wrapped by the atom, like `eval_atom`.
+    """
+    return _operands(parse_result)[0]
+
+
+def eval_power_array(parse_result):
+    """
+    Exponentiate the inputs right to left, like `eval_power`.
+    """
+    return reduce(lambda a, b: b ** a, reversed(_operands(parse_result)))
+
+
+def eval_parallel_array(parse_result):
+    """
+    Compute the parallel resistors operator, like `eval_parallel`.
+
+    Zero inputs are divisions by zero here, rather than NaN.
+    """
+    operands = _operands(parse_result)
+    if len(operands) == 1:
+        return operands[0]
+    return 1. / sum(1. / e for e in operands)
+
+
+def eval_sum_array(parse_result):
+    """
+    Add the inputs, keeping in mind their sign, like `eval_sum`.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def eval_product_array(parse_result):
+    """
+    Multiply the inputs, like `eval_product`.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
+
+
+SCALAR_ACTIONS = {
+    'atom': eval_atom,
+    'power': eval_power,
+    'parallel': eval_parallel,
+    'product': eval_product,
+    'sum': eval_sum
+}
+
+ARRAY_ACTIONS = {
+    'atom': eval_atom_array,
+    'power': eval_power_array,
+    'parallel': eval_parallel_array,
+    'product': eval_product_array,
+    'sum': eval_sum_array
+}
+
+
 def evaluator(variables, functions, math_expr, case_sensitive=False):
     """
     Evaluate an expression; that is, take a string of math and return a float.
@@ -242,34 +333,119 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     if math_expr.strip() == "":
         return float('nan')
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    compiled_expr = compile_expression(math_expr, variables, functions, case_sensitive)
+    return compiled_expr.evaluate(variables, functions)
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+def batch_evaluator(variables, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression at many sample points; return a numpy array.
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+    -Variables are passed as a dictionary from string to a sequence of the
+     variable's values at each sample point. All of the sequences must have
+     the same length. With no variables, there is a single sample point.
+    -Unary functions are passed as a dictionary from string to function.
 
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
+    The result at each sample point is the same as `evaluator` would give
+    for it, but the expression is only parsed once.
+    """
+    num_samples = len(next(variables.itervalues())) if variables else 1
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    # No need to go further.
+    if math_expr.strip() == "":
+        return numpy.repeat(float('nan'), num_samples)
+
+    compiled_expr = compile_expression(math_expr, variables, functions, case_sensitive)
+    return compiled_expr.evaluate_batch(variables, functions, num_samples)
+
+
+def compile_expression(math_expr, variable_names=(), function_names=(), case_sensitive=False):
+    """
+    Return a `CompiledExpression` for the expression.
+
+    Confirm that the expression only uses the given variable and function
+    names, along with the default ones; otherwise raise UndefinedVariable.
+
+    The compiled expressions of the most recently used expressions and names
+    are cached, so they are neither parsed nor checked again.
+    """
+    cache_key = (math_expr, case_sensitive, frozenset(variable_names), frozenset(function_names))
+    with _COMPILED_EXPRESSION_CACHE_LOCK:
+        compiled_expr = _COMPILED_EXPRESSION_CACHE.pop(cache_key, None)
+        if compiled_expr is not None:
+            _COMPILED_EXPRESSION_CACHE[cache_key] = compiled_expr
+            return compiled_expr
+
+    compiled_expr = CompiledExpression(math_expr, case_sensitive)
+    compiled_expr.check_variables(dict.fromkeys(variable_names), dict.fromkeys(function_names))
+
+    with _COMPILED_EXPRESSION_CACHE_LOCK:
+        _COMPILED_EXPRESSION_CACHE[cache_key] = compiled_expr
+        while len(_COMPILED_EXPRESSION_CACHE) > COMPILED_EXPRESSION_CACHE_SIZE:
+            _COMPILED_EXPRESSION_CACHE.popitem(last=False)
+    return compiled_expr
+
+
+class CompiledExpression(object):
+    """
+    A math expression, parsed and compiled into nested functions which can be
+    evaluated any number of times without parsing the expression again.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse and compile the given math expression string.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self.math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+        self.math_interpreter.parse_algebra()
+        self._evaluate_scalar = self.math_interpreter.compile_tree(SCALAR_ACTIONS)
+        self._evaluate_array = self.math_interpreter.compile_tree(ARRAY_ACTIONS)
+
+    def check_variables(self, variables, functions):
+        """
+        Confirm that the expression only uses the given variables and
+        functions, along with the default ones.
+
+        Otherwise, raise an UndefinedVariable containing all bad variables.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self.math_interpreter.check_variables(all_variables, all_functions)
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression with the given variables and functions, which
+        are given as for `evaluator`.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        return self._evaluate_scalar(all_variables, all_functions)
+
+    def evaluate_batch(self, variables, functions, num_samples):
+        """
+        Evaluate the expression at `num_samples` sample points at once;
+        variables and functions are given as for `batch_evaluator`.
+
+        The sample points are evaluated as numpy arrays. If that raises an
+        error, such as for a function that does not accept arrays or for a
+        floating point error, each sample point is evaluated separately
+        instead, so the result or error is the same as for `evaluate`.
+        """
+        array_variables = {name: numpy.asarray(values) for name, values in variables.iteritems()}
+        all_variables, all_functions = add_defaults(array_variables, functions, self.case_sensitive)
+        try:
+            with numpy.errstate(divide='raise', over='raise', invalid='raise'):
+                results = numpy.asarray(self._evaluate_array(all_variables, all_functions))
+            if results.shape == ():
+                results = numpy.repeat(results, num_samples)
+            if results.shape == (num_samples,):
+                return results
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+        return numpy.array([
+            self.evaluate({name: values[index] for name, values in variables.iteritems()}, functions)
+            for index in xrange(num_samples)
+        ])
 
 
 class ParseAugmenter(object):
@@ -411,6 +587,49 @@ class ParseAugmenter(object):
         # Find the value of the entire tree.
         return handle_node(self.tree)
 
+    def compile_tree(self, handle_actions):
+        """
+        Compile `self.tree` into a function of (variables, functions).
+
+        The function evaluates the tree like `reduce_tree` would, using the
+        given `handle_actions` for the 'atom', 'power', 'parallel', 'product'
+        and 'sum' nodes. Numbers are converted once, when compiling, and
+        variables and functions are looked up in the dictionaries passed to
+        the function, which are expected to have casified keys.
+        """
+        if self.case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        def compile_node(node):
+            """
+            Return a function of (variables, functions) evaluating the node.
+            """
+            if not isinstance(node, ParseResults):
+                # Then treat it as a terminal node.
+                return lambda variables, functions: node
+
+            node_name = node.getName()
+            if node_name == 'number':
+                value = eval_number(node)
+                return lambda variables, functions: value
+            elif node_name == 'variable':
+                variable_name = casify(node[0])
+                return lambda variables, functions: variables[variable_name]
+            elif node_name == 'function':
+                function_name = casify(node[0])
+                compiled_arg = compile_node(node[1])
+                return lambda variables, functions: functions[function_name](compiled_arg(variables, functions))
+            elif node_name not in handle_actions:  # pragma: no cover
+                raise Exception(u"Unknown branch name '{}'".format(node_name))
+
+            action = handle_actions[node_name]
+            compiled_kids = [compile_node(k) for k in node]
+            return lambda variables, functions: action([kid(variables, functions) for kid in compiled_kids])
+
+        return compile_node(self.tree)
+
     def check_variables(self, valid_variables, valid_functions):
         """
         Confirm that all the variables used in the tree are valid/defined.
@@ -5,6 +5,7 @@ Unit tests for calc.py
 import unittest
 import numpy
 import calc
+from mock import patch
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -559,3 +560,86 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for the compiled expression cache and calc.batch_evaluator
+    """
+
+    def setUp(self):
+        super(CompiledExpressionTest, self).setUp()
+        calc.calc._COMPILED_EXPRESSION_CACHE.clear()
+
+    def test_parsed_once(self):
+        """
+        Repeated evaluations of an expression should only parse it once
+        """
+        with patch.object(calc.ParseAugmenter, 'parse_algebra', autospec=True,
+                          side_effect=calc.ParseAugmenter.parse_algebra) as mock_parse:
+            for x in range(5):
+                self.assertEqual(calc.evaluator({'x': x}, {}, '2*x+1'), 2 * x + 1)
+            self.assertEqual(mock_parse.call_count, 1)
+
+            # Different variable names are checked again.
+            calc.evaluator({'x': 1, 'y': 2}, {}, '2*x+1')
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_cached_undefined_vars(self):
+        """
+        Expressions with undefined variables should not be cached as valid
+        """
+        for _ in range(2):
+            with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+                calc.evaluator({'x': 1}, {}, 'x+y')
+
+    def test_cache_size(self):
+        """
+        The least recently used compiled expressions should be evicted
+        """
+        with patch.object(calc.calc, 'COMPILED_EXPRESSION_CACHE_SIZE', 2):
+            calc.evaluator({}, {}, '1+1')
+            calc.evaluator({}, {}, '2+2')
+            calc.evaluator({}, {}, '1+1')
+            calc.evaluator({}, {}, '3+3')
+        self.assertEqual(
+            [key[0] for key in calc.calc._COMPILED_EXPRESSION_CACHE],
+            ['1+1', '3+3']
+        )
+
+    def test_batch_matches_evaluator(self):
+        """
+        Batch evaluation should give the same result as evaluating each sample
+        """
+        samples = {'x': [0.5, 1.0, 2.5, -3.0], 'y': [1.0, 2.0, 3.0, 4.0]}
+        for expression in ['x^2+3*y', 'sin(x)/y', 'x||y', '-x*j+2', 'y^x^2', '5', '1k*x+5%']:
+            results = calc.batch_evaluator(samples, {}, expression)
+            self.assertEqual(len(results), 4)
+            for index, result in enumerate(results):
+                expected = calc.evaluator({'x': samples['x'][index], 'y': samples['y'][index]}, {}, expression)
+                self.assertAlmostEqual(result, expected, msg=expression)
+
+    def test_batch_fallback(self):
+        """
+        Samples which cannot be evaluated as arrays should give the same
+        results and errors as evaluating each sample
+        """
+        results = calc.batch_evaluator({'x': [1.0, 3.0]}, {}, 'fact(x)+arccot(-x)')
+        self.assertAlmostEqual(results[0], calc.evaluator({'x': 1.0}, {}, 'fact(x)+arccot(-x)'))
+        self.assertAlmostEqual(results[1], calc.evaluator({'x': 3.0}, {}, 'fact(x)+arccot(-x)'))
+
+        self.assertTrue(numpy.isnan(calc.batch_evaluator({'x': [1.0, 0.0]}, {}, 'x||1')[1]))
+        with self.assertRaises(ZeroDivisionError):
+            calc.batch_evaluator({'x': [1.0, 0.0]}, {}, '1/x')
+        with self.assertRaises(ValueError):
+            calc.batch_evaluator({'x': [1.0, -1.0]}, {}, 'fact(x)')
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'y'):
+            calc.batch_evaluator({'x': [1.0]}, {}, 'x+y')
+
+    def test_batch_empty_expression(self):
+        """
+        An empty expression should give NaN for each sample
+        """
+        results = calc.batch_evaluator({'x': [1.0, 2.0]}, {}, ' ')
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(numpy.isnan(results)))
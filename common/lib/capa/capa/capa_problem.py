@@ -13,9 +13,11 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+import hashlib
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -28,6 +30,7 @@ import capa.customrender as customrender
 import capa.inputtypes as inputtypes
 import capa.responsetypes as responsetypes
 import capa.xqueue_interface as xqueue_interface
+import dogstats_wrapper as dog_stats_api
 from capa.correctmap import CorrectMap
 from capa.safe_exec import safe_exec
 from capa.util import contextualize_text, convert_files_to_filenames
@@ -71,6 +74,103 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+TEMPLATE_CACHE_METRIC_NAME = 'capa.problem_template_cache'
+
+
+class ProblemTemplateCache(object):
+    """
+    A bounded, in-process, least-recently-used cache of parsed problem templates.
+
+    A problem's template is its XML tree as it is before any learner-specific
+    processing: parsed and made compatible.  That work is the same for every
+    learner, whatever their seed, so it is only done once per problem text, and
+    every LoncapaProblem gets its own copy of the cached tree, which is much
+    cheaper than parsing it again.
+
+    Templates are evicted when the total length of the problem texts they were
+    parsed from exceeds `max_bytes`.  Their trees take a few times more memory.
+
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(problem_text):
+        """
+        Return the key of the template parsed from `problem_text`.
+        """
+        if isinstance(problem_text, unicode):
+            problem_text = problem_text.encode('utf-8')
+        return hashlib.sha1(problem_text).hexdigest()
+
+    def get(self, problem_text):
+        """
+        Return a copy of the template parsed from `problem_text`, or None.
+        """
+        key = self._key(problem_text)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is None:
+            return None
+        return deepcopy(entry[0])
+
+    def set(self, problem_text, tree):
+        """
+        Cache a copy of `tree`, the template parsed from `problem_text`,
+        evicting the least recently used templates if the cache is full.
+        Returns the number of templates evicted.
+        """
+        size = len(problem_text)
+        if size > self.max_bytes:
+            return 0
+
+        key = self._key(problem_text)
+        entry = (deepcopy(tree), size)
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = entry
+            self.size += size
+            while self.size > self.max_bytes:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                evicted += 1
+        return evicted
+
+    def clear(self):
+        """
+        Remove all templates from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The process-wide ProblemTemplateCache, or None if it isn't enabled.
+PROBLEM_TEMPLATE_CACHE = None
+
+
+def configure_template_cache(max_bytes):
+    """
+    Enable the in-process cache of problem templates, holding templates
+    parsed from up to `max_bytes` of problem text.
+
+    A `max_bytes` of 0 disables it.
+
+    """
+    global PROBLEM_TEMPLATE_CACHE  # pylint: disable=global-statement
+    PROBLEM_TEMPLATE_CACHE = ProblemTemplateCache(max_bytes) if max_bytes else None
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -176,10 +276,9 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        # parse problem XML file into an element tree, or copy the tree
+        # parsed for an earlier instance of this problem
+        self.tree = self._load_template(problem_text)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -214,6 +313,31 @@ class LoncapaProblem(object):
 
             self.extracted_tree = self._extract_html(self.tree)
 
+    def _load_template(self, problem_text):
+        """
+        Return the problem's XML tree, parsed from `problem_text` and made
+        compatible, from the template cache if it is enabled.
+
+        Problems with <include> tags aren't cached, since the included files
+        can change without the problem text changing.
+        """
+        template_cache = PROBLEM_TEMPLATE_CACHE
+        if template_cache is not None:
+            tree = template_cache.get(problem_text)
+            if tree is not None:
+                dog_stats_api.increment(TEMPLATE_CACHE_METRIC_NAME, tags=[u'result:hit'])
+                return tree
+            dog_stats_api.increment(TEMPLATE_CACHE_METRIC_NAME, tags=[u'result:miss'])
+
+        tree = etree.XML(problem_text)
+        self.make_xml_compatible(tree)
+
+        if template_cache is not None and tree.find('.//include') is None:
+            evicted = template_cache.set(problem_text, tree)
+            if evicted:
+                dog_stats_api.increment(TEMPLATE_CACHE_METRIC_NAME + '.evictions', value=evicted)
+        return tree
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -881,18 +1005,17 @@ class LoncapaProblem(object):
         response_id = 1
         problem_data = {}
         self.responders = {}
-        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+        input_tags = inputtypes.registry.registered_tags()
+        # Find the responses and their inputs in document order, in a single
+        # pass over the tree or the response, rather than one per tag.
+        for response in list(tree.iter(*responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
             response.set('id', responsetype_id)
             response_id += 1
 
             answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
-                id=responsetype_id
-            )
+            inputfields = list(response.iter(*input_tags))
 
             # assign one answer_id for each input type
             for entry in inputfields:
@@ -39,7 +39,7 @@ import capa.safe_exec as safe_exec
 import capa.xqueue_interface as xqueue_interface
 import dogstats_wrapper as dog_stats_api
 # specific library imports
-from calc import UndefinedVariable, evaluator
+from calc import UndefinedVariable, batch_evaluator, evaluator
 from cmath import isnan
 from openedx.core.djangolib.markup import HTML, Text
 
@@ -685,7 +685,7 @@ class ChoiceResponse(LoncapaResponse):
 
     def get_choices(self):
         """Returns this response's XML choice elements."""
-        return self.xml.xpath('//*[@id=$id]//choice', id=self.xml.get('id'))
+        return self.xml.xpath('.//choice')
 
     def assign_choice_names(self):
         """
@@ -871,7 +871,7 @@ class ChoiceResponse(LoncapaResponse):
             return
 
         # Look at all the choices - each can generate some hint text
-        choices = self.xml.xpath('//checkboxgroup[@id=$id]/choice', id=self.answer_id)
+        choices = self.xml.xpath('.//checkboxgroup[@id=$id]/choice', id=self.answer_id)
         hint_log = []
         label = None
         label_count = 0
@@ -929,14 +929,14 @@ class ChoiceResponse(LoncapaResponse):
             student_set = set()
             names = []
             for student_answer in student_answers[self.answer_id]:
-                choice_list = self.xml.xpath('//checkboxgroup[@id=$id]/choice[@name=$name]',
+                choice_list = self.xml.xpath('.//checkboxgroup[@id=$id]/choice[@name=$name]',
                                              id=self.answer_id, name=student_answer)
                 if choice_list:
                     choice = choice_list[0]
                     student_set.add(choice.get('id').upper())
                     names.append(student_answer)
 
-            for compound_hint in self.xml.xpath('//checkboxgroup[@id=$id]/compoundhint', id=self.answer_id):
+            for compound_hint in self.xml.xpath('.//checkboxgroup[@id=$id]/compoundhint', id=self.answer_id):
                 # Selector words are space separated and not case-sensitive
                 selectors = compound_hint.get('value').upper().split()
                 selector_set = set(selectors)
@@ -945,7 +945,7 @@ class ChoiceResponse(LoncapaResponse):
                     # This is the atypical case where the hint text is in an inner div with its own style.
                     hint_text = compound_hint.text.strip()
                     # Compute the choice names just for logging
-                    choices = self.xml.xpath('//checkboxgroup[@id=$id]/choice', id=self.answer_id)
+                    choices = self.xml.xpath('.//checkboxgroup[@id=$id]/choice', id=self.answer_id)
                     choice_all = [choice.get('name') for choice in choices]
                     hint_log = [{'text': hint_text, 'trigger': [{'choice': name, 'selected': True} for name in names]}]
                     new_cmap[self.answer_id]['msg'] += self.make_hint_div(
@@ -1005,7 +1005,7 @@ class MultipleChoiceResponse(LoncapaResponse):
 
         # define correct choices (after calling secondary setup)
         xml = self.xml
-        cxml = xml.xpath('//*[@id=$id]//choice', id=xml.get('id'))
+        cxml = xml.xpath('.//choice')
 
         # contextualize correct attribute and then select ones for which
         # correct = "true"
@@ -1472,7 +1472,7 @@ class OptionResponse(LoncapaResponse):
         if answer_id in student_answers:
             student_answer = student_answers[answer_id]
             # If we run into an old-style optioninput, there is no <option> tag, so this safely does nothing
-            options = self.xml.xpath('//optioninput[@id=$id]/option', id=answer_id)
+            options = self.xml.xpath('.//optioninput[@id=$id]/option', id=answer_id)
             # Extra pass here to ignore whitespace around the answer in the matching
             options = [option for option in options if option.text.strip() == student_answer]
             if options:
@@ -1540,10 +1540,7 @@ class NumericalResponse(LoncapaResponse):
             self.correct_answer = contextualize_text(answer, context)
 
             # Find the tolerance
-            tolerance_xml = xml.xpath(
-                '//*[@id=$id]//responseparam[@type="tolerance"]/@default',
-                id=xml.get('id')
-            )
+            tolerance_xml = xml.xpath('.//responseparam[@type="tolerance"]/@default')
             if tolerance_xml:  # If it isn't an empty list...
                 self.tolerance = contextualize_text(tolerance_xml[0], context)
 
@@ -1793,8 +1790,7 @@ class NumericalResponse(LoncapaResponse):
             hint_type (str): Hint type, either `correcthint` or `additional_answer`
             hint_index (int): Index of the hint node
         """
-        # Note: using self.id here, not the more typical self.answer_id
-        hint_nodes = self.xml.xpath('//numericalresponse[@id=$id]/' + hint_type, id=self.id)
+        hint_nodes = self.xml.xpath('self::numericalresponse/' + hint_type)
         if hint_nodes:
             hint_node = hint_nodes[hint_index]
             if hint_type == 'additional_answer':
@@ -1921,8 +1917,7 @@ class StringResponse(LoncapaResponse):
         """
         if self.answer_id in student_answers:
             student_answer = student_answers[self.answer_id]
-            # Note the atypical case of using self.id instead of self.answer_id
-            responses = self.xml.xpath('//stringresponse[@id=$id]', id=self.id)
+            responses = self.xml.xpath('self::stringresponse')
             if responses:
                 response = responses[0]
 
@@ -2106,7 +2101,7 @@ class CustomResponse(LoncapaResponse):
         self.code = None
         answer = None
         try:
-            answer = xml.xpath('//*[@id=$id]//answer', id=xml.get('id'))[0]
+            answer = xml.xpath('.//answer')[0]
         except IndexError:
             # print "xml = ",etree.tostring(xml,pretty_print=True)
 
@@ -3051,10 +3046,7 @@ class FormulaResponse(LoncapaResponse):
         self.samples = contextualize_text(xml.get('samples'), context)
 
         # Find the tolerance
-        tolerance_xml = xml.xpath(
-            '//*[@id=$id]//responseparam[@type="tolerance"]/@default',
-            id=xml.get('id')
-        )
+        tolerance_xml = xml.xpath('.//responseparam[@type="tolerance"]/@default')
         if tolerance_xml:  # If it isn't an empty list...
             self.tolerance = contextualize_text(tolerance_xml[0], context)
 
@@ -3090,56 +3082,58 @@ class FormulaResponse(LoncapaResponse):
         """
         _ = self.capa_system.i18n.ugettext
 
-        out = []
-        for var_dict in var_dict_list:
-            try:
-                out.append(evaluator(
-                    var_dict,
-                    dict(),
-                    answer,
-                    case_sensitive=self.case_sensitive,
-                ))
-            except UndefinedVariable as err:
+        if not var_dict_list:
+            return []
+
+        # Evaluate all the test cases at once, so the answer is only parsed once.
+        samples = {var: [var_dict[var] for var_dict in var_dict_list] for var in var_dict_list[0]}
+        try:
+            return batch_evaluator(
+                samples,
+                dict(),
+                answer,
+                case_sensitive=self.case_sensitive,
+            ).tolist()
+        except UndefinedVariable as err:
+            log.debug(
+                'formularesponse: undefined variable in formula=%s',
+                cgi.escape(answer)
+            )
+            raise StudentInputError(
+                _("Invalid input: {bad_input} not permitted in answer.").format(bad_input=err.message)
+            )
+        except ValueError as err:
+            if 'factorial' in err.message:
+                # This is thrown when fact() or factorial() is used in a formularesponse answer
+                #   that tests on negative and/or non-integer inputs
+                # err.message will be: `factorial() only accepts integral values` or
+                # `factorial() not defined for negative values`
                 log.debug(
-                    'formularesponse: undefined variable in formula=%s',
+                    ('formularesponse: factorial function used in response '
+                     'that tests negative and/or non-integer inputs. '
+                     'Provided answer was: %s'),
                     cgi.escape(answer)
                 )
                 raise StudentInputError(
-                    _("Invalid input: {bad_input} not permitted in answer.").format(bad_input=err.message)
+                    _("Factorial function not permitted in answer "
+                      "for this problem. Provided answer was: "
+                      "{bad_input}").format(bad_input=cgi.escape(answer))
                 )
-            except ValueError as err:
-                if 'factorial' in err.message:
-                    # This is thrown when fact() or factorial() is used in a formularesponse answer
-                    #   that tests on negative and/or non-integer inputs
-                    # err.message will be: `factorial() only accepts integral values` or
-                    # `factorial() not defined for negative values`
-                    log.debug(
-                        ('formularesponse: factorial function used in response '
-                         'that tests negative and/or non-integer inputs. '
-                         'Provided answer was: %s'),
-                        cgi.escape(answer)
-                    )
-                    raise StudentInputError(
-                        _("Factorial function not permitted in answer "
-                          "for this problem. Provided answer was: "
-                          "{bad_input}").format(bad_input=cgi.escape(answer))
-                    )
-                # If non-factorial related ValueError thrown, handle it the same as any other Exception
-                log.debug('formularesponse: error %s in formula', err)
-                raise StudentInputError(
-                    _("Invalid input: Could not parse '{bad_input}' as a formula.").format(
-                        bad_input=cgi.escape(answer)
-                    )
+            # If non-factorial related ValueError thrown, handle it the same as any other Exception
+            log.debug('formularesponse: error %s in formula', err)
+            raise StudentInputError(
+                _("Invalid input: Could not parse '{bad_input}' as a formula.").format(
+                    bad_input=cgi.escape(answer)
                 )
-            except Exception as err:
-                # traceback.print_exc()
-                log.debug('formularesponse: error %s in formula', err)
-                raise StudentInputError(
-                    _("Invalid input: Could not parse '{bad_input}' as a formula").format(
-                        bad_input=cgi.escape(answer)
-                    )
+            )
+        except Exception as err:
+            # traceback.print_exc()
+            log.debug('formularesponse: error %s in formula', err)
+            raise StudentInputError(
+                _("Invalid input: Could not parse '{bad_input}' as a formula").format(
+                    bad_input=cgi.escape(answer)
                 )
-        return out
+            )
 
     def randomize_variables(self, samples):
         """
@@ -3253,7 +3247,7 @@ class SchematicResponse(LoncapaResponse):
 
     def setup_response(self):
         xml = self.xml
-        answer = xml.xpath('//*[@id=$id]//answer', id=xml.get('id'))[0]
+        answer = xml.xpath('.//answer')[0]
         answer_src = answer.get('src')
         if answer_src is not None:
             # Untested; never used
@@ -3600,8 +3594,7 @@ class ChoiceTextResponse(LoncapaResponse):
         context = self.context
         self.answer_values = {self.answer_id: []}
         self.assign_choice_names()
-        correct_xml = self.xml.xpath('//*[@id=$id]//choice[@correct="true"]',
-                                     id=self.xml.get('id'))
+        correct_xml = self.xml.xpath('.//choice[@correct="true"]')
 
         for node in correct_xml:
             # For each correct choice, set the `parent_name` to the
@@ -3679,7 +3672,7 @@ class ChoiceTextResponse(LoncapaResponse):
         </radiotextgroup>
         """
 
-        choices = self.xml.xpath('//*[@id=$id]//choice', id=self.xml.get('id'))
+        choices = self.xml.xpath('.//choice')
         for index, choice in enumerate(choices):
             # Set the name attribute for <choices>
             # "bc" is appended at the end to indicate that this is a
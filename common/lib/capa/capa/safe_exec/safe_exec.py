@@ -6,7 +6,10 @@ from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
+import cPickle as pickle
 import hashlib
+import threading
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -49,6 +52,75 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+CACHE_METRIC_NAME = 'capa.safe_exec.cache'
+
+
+class LocalResultCache(object):
+    """
+    A bounded, in-process, least-recently-used cache of execution results.
+
+    This sits in front of the `cache` given to `safe_exec`, so that code
+    re-run for every render of a problem doesn't need a round trip to the
+    shared cache either.  It has the same .get(key) and .set(key, value)
+    interface as the shared cache.  Values are stored pickled, so callers can't
+    change a cached result by mutating the globals it was restored into.
+
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the value cached for `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._entries[key] = value
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        """
+        Cache `value` for `key`, evicting the least recently used entries
+        if the cache is full.  Returns the number of entries evicted.
+        """
+        evicted = 0
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The process-wide LocalResultCache, or None if it isn't enabled.
+LOCAL_RESULT_CACHE = None
+
+
+def configure_local_cache(max_entries):
+    """
+    Enable the in-process result cache, holding up to `max_entries` results.
+
+    A `max_entries` of 0 disables it.
+
+    """
+    global LOCAL_RESULT_CACHE  # pylint: disable=global-statement
+    LOCAL_RESULT_CACHE = LocalResultCache(max_entries) if max_entries else None
+
 
 def update_hash(hasher, obj):
     """
@@ -73,6 +145,55 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+def result_cache_key(code, globals_dict, random_seed, python_path, extra_files):
+    """
+    Return the key to cache the result of executing `code` under.
+
+    Everything that can change the result is part of the key: the code, the
+    globals, the random seed, the Python path and the contents of the extra
+    files (a course's python_lib.zip can change without the code changing).
+
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code))
+    update_hash(md5er, json_safe(globals_dict))
+    update_hash(md5er, list(python_path or ()))
+    for filename, contents in extra_files or ():
+        md5er.update(repr(filename))
+        md5er.update(hashlib.md5(contents).hexdigest())
+    return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+
+def _get_cached_result(cache, local_cache, key):
+    """
+    Return the cached result for `key`, trying `local_cache` before `cache`.
+    """
+    if local_cache is not None:
+        cached = local_cache.get(key)
+        if cached is not None:
+            dog_stats_api.increment(CACHE_METRIC_NAME, tags=[u'result:local_hit'])
+            return cached
+
+    cached = cache.get(key)
+    if cached is None:
+        dog_stats_api.increment(CACHE_METRIC_NAME, tags=[u'result:miss'])
+        return None
+
+    dog_stats_api.increment(CACHE_METRIC_NAME, tags=[u'result:hit'])
+    if local_cache is not None:
+        _set_local_result(local_cache, key, cached)
+    return cached
+
+
+def _set_local_result(local_cache, key, result):
+    """
+    Store `result` in `local_cache`, recording any evictions.
+    """
+    evicted = local_cache.set(key, result)
+    if evicted:
+        dog_stats_api.increment(CACHE_METRIC_NAME + '.evictions', value=evicted)
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -102,7 +223,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed, the Python path and the extra files.  If the in-process result
+    cache is enabled (see `configure_local_cache`), it is checked first.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -110,14 +232,12 @@ def safe_exec(
     If `unsafely` is true, then the code will actually be executed without sandboxing.
 
     """
+    local_cache = LOCAL_RESULT_CACHE
+
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        key = result_cache_key(code, globals_dict, random_seed, python_path, extra_files)
+        cached = _get_cached_result(cache, local_cache, key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -152,6 +272,8 @@ def safe_exec(
     if cache:
         cleaned_results = json_safe(globals_dict)
         cache.set(key, (emsg, cleaned_results))
+        if local_cache is not None:
+            _set_local_result(local_cache, key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
@@ -7,9 +7,11 @@ import random
 import textwrap
 import unittest
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import configure_local_cache, safe_exec, update_hash
+from capa.safe_exec.safe_exec import LocalResultCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -176,6 +178,96 @@ class TestSafeExecCaching(unittest.TestCase):
             except UnicodeEncodeError:
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
+    def test_cache_key_includes_python_path(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        cache = {}
+        safe_exec("a = 17", {}, cache=DictCache(cache))
+        safe_exec("a = 17", {}, python_path=[pylib], cache=DictCache(cache))
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_key_includes_extra_files(self):
+        # A changed python_lib.zip can change the result of unchanged code.
+        cache = {}
+        for contents in ("THE_CONST = 1\n", "THE_CONST = 2\n"):
+            g = {}
+            safe_exec(
+                "import extra; a = extra.THE_CONST", g,
+                extra_files=[("extra.py", contents)], cache=DictCache(cache), unsafely=True,
+            )
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(g['a'], 2)
+
+
+class TestSafeExecLocalCaching(unittest.TestCase):
+    """Test the in-process result cache in front of the shared cache."""
+
+    def setUp(self):
+        super(TestSafeExecLocalCaching, self).setUp()
+        configure_local_cache(10)
+        self.addCleanup(configure_local_cache, 0)
+
+    def test_local_cache_hit(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+
+        # The shared cache isn't consulted when the result is cached locally.
+        cache[cache.keys()[0]] = (None, {'a': 17})
+        g = {}
+        with patch.object(DictCache, 'get') as mock_get:
+            safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+        self.assertFalse(mock_get.called)
+        self.assertEqual(g['a'], 3)
+
+    def test_local_cache_filled_from_shared_cache(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache))
+        configure_local_cache(10)
+
+        cache[cache.keys()[0]] = (None, {'a': 17})
+        for _ in range(2):
+            g = {}
+            safe_exec("a = int(math.pi)", g, cache=DictCache(cache))
+            self.assertEqual(g['a'], 17)
+
+    def test_local_cache_exceptions(self):
+        cache = {}
+        for _ in range(2):
+            with self.assertRaises(SafeExecException) as cm:
+                safe_exec("1/0", {}, cache=DictCache(cache))
+            self.assertIn("ZeroDivisionError", cm.exception.message)
+
+    def test_mutating_globals_does_not_change_cached_result(self):
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        g['a'].append(3)
+
+        g = {}
+        safe_exec("a = [1, 2]", g, cache=DictCache({}))
+        self.assertEqual(g['a'], [1, 2])
+
+
+class TestLocalResultCache(unittest.TestCase):
+    """Test the LRU behavior of LocalResultCache."""
+
+    def test_eviction(self):
+        cache = LocalResultCache(2)
+        self.assertEqual(cache.set('a', 1), 0)
+        self.assertEqual(cache.set('b', 2), 0)
+        # Using 'a' makes 'b' the least recently used entry.
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.set('c', 3), 1)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear(self):
+        cache = LocalResultCache(2)
+        cache.set('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get('a'))
+
 
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
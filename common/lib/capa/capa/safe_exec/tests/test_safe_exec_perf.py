@@ -0,0 +1,79 @@
+"""
+Performance test of safe_exec with and without its result caches.
+
+The code is executed unsafely, in-process, so that the measurement doesn't
+depend on CodeJail being configured; a sandboxed execution adds the cost of
+starting the sandbox to every miss.
+"""
+import cPickle as pickle
+import unittest
+from timeit import default_timer
+
+from capa.safe_exec import configure_local_cache, safe_exec
+
+from .test_safe_exec import DictCache
+
+# Number of renders of the same problem to time.
+NUM_RENDERS = 1000
+
+# Number of distinct random seeds the renders are spread over.
+NUM_SEEDS = (1, 20, 100)
+
+
+class PicklingDictCache(DictCache):
+    """
+    A stand-in for a shared cache, which serializes values as memcached does.
+
+    The network round trip to a real shared cache is not included.
+    """
+
+    def get(self, key):
+        value = super(PicklingDictCache, self).get(key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        super(PicklingDictCache, self).set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+CODE = """
+a = random.randint(1, 100)
+b = random.randint(1, 100)
+answers = [math.sqrt(a * a + b * b + i) for i in range(500)]
+"""
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class SafeExecCachePerf(unittest.TestCase):
+    """
+    Compares the wall time of repeatedly executing a randomized problem's
+    code with no cache, the shared cache, and both result caches.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def tearDown(self):
+        configure_local_cache(0)
+        super(SafeExecCachePerf, self).tearDown()
+
+    def _time_renders(self, num_seeds, cache):
+        """
+        Returns the time, in seconds, to execute CODE NUM_RENDERS times
+        with `num_seeds` distinct seeds.
+        """
+        start = default_timer()
+        for render in xrange(NUM_RENDERS):
+            safe_exec(CODE, {}, random_seed=render % num_seeds, cache=cache, unsafely=True)
+        return default_timer() - start
+
+    def test_cached_renders(self):
+        print
+        print '{:>8} {:>12} {:>12}'.format('seeds', 'cache', 'time (ms)')
+        for num_seeds in NUM_SEEDS:
+            for cache_name, local_entries in (('none', None), ('shared', 0), ('local', NUM_RENDERS)):
+                configure_local_cache(local_entries or 0)
+                cache = PicklingDictCache({}) if local_entries is not None else None
+                elapsed = self._time_renders(num_seeds, cache)
+                print '{:>8} {:>12} {:>12.1f}'.format(num_seeds, cache_name, elapsed * 1000)
@@ -4,8 +4,11 @@ Test capa problem.
 import ddt
 import textwrap
 from lxml import etree
+from mock import patch
 import unittest
 
+from capa import capa_problem
+from capa.capa_problem import ProblemTemplateCache, configure_template_cache
 from capa.tests.helpers import new_loncapa_problem
 
 
@@ -590,3 +593,85 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+class ProblemTemplateCacheTest(unittest.TestCase):
+    """Tests for the in-process cache of parsed problem templates"""
+
+    xml = textwrap.dedent("""
+        <problem>
+            <optionresponse>
+                <optioninput label="Which color?">
+                    <option correct="False">yellow</option>
+                    <option correct="True">blue</option>
+                </optioninput>
+            </optionresponse>
+            <stringresponse answer="Paris">
+                <textline label="Capital of France?"/>
+            </stringresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ProblemTemplateCacheTest, self).setUp()
+        configure_template_cache(10 ** 6)
+        self.addCleanup(configure_template_cache, 0)
+
+    def patch_parse(self):
+        """Patch the translation done for every problem that is parsed, to count them"""
+        return patch.object(
+            capa_problem.LoncapaProblem, 'make_xml_compatible',
+            autospec=True, side_effect=capa_problem.LoncapaProblem.make_xml_compatible,
+        )
+
+    def test_template_is_reused(self):
+        with self.patch_parse() as mock_parse:
+            first_problem = new_loncapa_problem(self.xml, seed=1)
+            second_problem = new_loncapa_problem(self.xml, seed=2)
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(len(capa_problem.PROBLEM_TEMPLATE_CACHE), 1)
+
+        # The compatibility translation is part of the template.
+        self.assertEqual(second_problem.tree.find('.//optioninput').get('correct'), 'blue')
+        self.assertEqual(first_problem.get_html(), second_problem.get_html())
+        self.assertEqual(
+            second_problem.grade_answers({'1_2_1': 'blue', '1_3_1': 'Paris'}).get_dict(),
+            first_problem.grade_answers({'1_2_1': 'blue', '1_3_1': 'Paris'}).get_dict(),
+        )
+
+    def test_problems_get_their_own_tree(self):
+        first_problem = new_loncapa_problem(self.xml, problem_id='first')
+        second_problem = new_loncapa_problem(self.xml, problem_id='second')
+        self.assertIsNot(first_problem.tree, second_problem.tree)
+        self.assertEqual(first_problem.tree.find('.//textline').get('id'), 'first_3_1')
+        self.assertEqual(second_problem.tree.find('.//textline').get('id'), 'second_3_1')
+
+    def test_problems_with_includes_are_not_cached(self):
+        xml = """
+            <problem>
+                <include file="snuggletex_correct.html"/>
+            </problem>
+        """
+        new_loncapa_problem(xml)
+        self.assertEqual(len(capa_problem.PROBLEM_TEMPLATE_CACHE), 0)
+
+    def test_disabled(self):
+        configure_template_cache(0)
+        self.assertIsNone(capa_problem.PROBLEM_TEMPLATE_CACHE)
+        with self.patch_parse() as mock_parse:
+            new_loncapa_problem(self.xml)
+            new_loncapa_problem(self.xml)
+        self.assertEqual(mock_parse.call_count, 2)
+
+    def test_eviction(self):
+        cache = ProblemTemplateCache(25)
+        self.assertEqual(cache.set('<a>' + 'a' * 10 + '</a>', etree.XML('<a/>')), 0)
+        self.assertEqual(cache.set('<b>' + 'b' * 10 + '</b>', etree.XML('<b/>')), 1)
+        self.assertIsNone(cache.get('<a>' + 'a' * 10 + '</a>'))
+        self.assertEqual(cache.get('<b>' + 'b' * 10 + '</b>').tag, 'b')
+        self.assertEqual(cache.size, 17)
+
+    def test_too_large(self):
+        cache = ProblemTemplateCache(10)
+        self.assertEqual(cache.set('<a>' + 'a' * 10 + '</a>', etree.XML('<a/>')), 0)
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,98 @@
+"""
+Performance test of constructing, rendering and checking large problems with
+many responses, with and without the cache of parsed problem templates.
+"""
+import unittest
+from timeit import default_timer
+
+from capa.capa_problem import configure_template_cache
+from capa.tests.helpers import new_loncapa_problem
+
+# Numbers of responses in the generated problems.
+NUM_RESPONSES = (10, 100, 500)
+
+# Number of learners, each with their own seed, loading each problem.
+NUM_LEARNERS = 10
+
+# Responses of the generated problems, in rotation, and their correct answers.
+RESPONSES = (
+    (
+        u'<stringresponse answer="Paris"><label>Capital of France?</label><textline/></stringresponse>',
+        u'Paris',
+    ),
+    (
+        u'<numericalresponse answer="42"><label>The answer?</label><formulaequationinput/></numericalresponse>',
+        u'42',
+    ),
+    (
+        u'<optionresponse><optioninput label="Which color?">'
+        u'<option correct="False">yellow</option><option correct="True">blue</option>'
+        u'</optioninput></optionresponse>',
+        u'blue',
+    ),
+    (
+        u'<multiplechoiceresponse><choicegroup type="MultipleChoice" label="Which one?">'
+        u'<choice correct="false">one</choice><choice correct="true">two</choice>'
+        u'</choicegroup></multiplechoiceresponse>',
+        u'choice_1',
+    ),
+)
+
+
+def generate_problem(num_responses):
+    """
+    Returns the XML of a problem with the given number of responses, and the
+    correct answers to it, by input id.
+    """
+    responses = [RESPONSES[index % len(RESPONSES)] for index in range(num_responses)]
+    xml = u'<problem>{}</problem>'.format(u''.join(
+        u'<p>Question {}</p>{}'.format(index, response) for index, (response, __) in enumerate(responses)
+    ))
+    answers = {
+        '1_{}_1'.format(index + 2): answer for index, (__, answer) in enumerate(responses)
+    }
+    return xml, answers
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class ProblemTemplateCachePerf(unittest.TestCase):
+    """
+    Compares the wall time of loading a problem for several learners then
+    rendering or checking it, with and without the problem template cache.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ProblemTemplateCachePerf, self).setUp()
+        self.addCleanup(configure_template_cache, 0)
+
+    def _time(self, xml, action):
+        """
+        Returns the mean wall time of loading the problem and performing
+        `action` on it, for each learner.
+        """
+        start = default_timer()
+        for seed in range(NUM_LEARNERS):
+            action(new_loncapa_problem(xml, seed=seed))
+        return (default_timer() - start) / NUM_LEARNERS
+
+    def test_load(self):
+        print
+        print '{:>10} {:>8} {:>12} {:>12}'.format('responses', 'cache', 'render (ms)', 'check (ms)')
+        for num_responses in NUM_RESPONSES:
+            xml, answers = generate_problem(num_responses)
+            for cache, max_bytes in (('off', 0), ('on', 10 ** 7)):
+                configure_template_cache(max_bytes)
+                # Load the problem once first, as for an earlier learner.
+                problem = new_loncapa_problem(xml)
+                self.assertEqual(problem.grade_answers(answers).get_correctness('1_2_1'), 'correct')
+
+                render_time = self._time(xml, lambda problem: problem.get_html())
+                check_time = self._time(xml, lambda problem: problem.grade_answers(answers))
+                print '{:>10} {:>8} {:>12.2f} {:>12.2f}'.format(
+                    num_responses, cache, render_time * 1000, check_time * 1000,
+                )
@@ -153,22 +153,32 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
+        self.export_to_fs(location, OSFS(output_directory, create=True))
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+    def export_to_fs(self, location, static_fs):
+        """
+        Export the asset at the given location into the filesystem `static_fs`, under the directory of
+        its import path. The asset data is streamed from GridFS rather than read into memory.
 
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+        Raises NotFoundError if no such item exists
+        """
+        content_id, __ = self.asset_db_key(location)
+        try:
+            fp = self.fs.get(content_id)
+        except NoFile:
+            raise NotFoundError(content_id)
 
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+        with fp:
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=fp.displayname, invalid_char_list=['/', '\\'])
 
-        disk_fs = OSFS(output_directory)
+            import_path = getattr(fp, 'import_path', None)
+            if import_path is not None and os.path.dirname(import_path):
+                export_dir = os.path.dirname(import_path)
+                static_fs.makedir(export_dir, recursive=True, allow_recreate=True)
+                export_name = export_dir + '/' + export_name
 
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
+            static_fs.setcontents(export_name, fp)
 
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
@@ -181,6 +191,20 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
+        policy = self.export_all_for_course_to_fs(course_key, OSFS(output_directory, create=True))
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(policy, f, sort_keys=True, indent=4)
+
+    def export_all_for_course_to_fs(self, course_key, static_fs):
+        """
+        Export all of this course's assets into the filesystem `static_fs`, and return the policy
+        of the assets: their attributes by asset name.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            static_fs: the filesystem, such as an OSFS or a TarExportFS, in which to put all the asset files
+        """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
@@ -193,13 +217,12 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            self.export_to_fs(asset['asset_key'], static_fs)
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].name, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
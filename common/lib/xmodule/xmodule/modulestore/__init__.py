@@ -1256,6 +1256,20 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
         """
         return True
 
+    def prefetch_definitions(self, blocks, depth=0):
+        """
+        Load the definitions of ``blocks``, and of their descendants out to
+        ``depth``, in bulk, for stores which otherwise load the definitions
+        of blocks one at a time when their content is first accessed.
+
+        Arguments:
+            blocks (list of XBlock): Blocks loaded from this store.
+            depth (int or None): How many levels of descendants to include
+                (0 => the blocks only, 1 => also their children, etc...). A depth
+                of None includes all descendants.
+        """
+        pass
+
     def heartbeat(self):
         """
         Is this modulestore ready?
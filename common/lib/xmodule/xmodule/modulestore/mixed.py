@@ -6,6 +6,7 @@ In this way, courses can be served up via either SplitMongoModuleStore or MongoM
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -20,6 +21,7 @@ from . import ModuleStoreWriteBase, ModuleStoreEnum, XMODULE_FIELDS_WITH_USAGE_K
 from .exceptions import ItemNotFoundError, DuplicateCourseError
 from .draft_and_published import ModuleStoreDraftAndPublished
 from .split_migrator import SplitMigrator
+from .split_mongo import StructureDiff
 
 new_contract('CourseKey', CourseKey)
 new_contract('AssetKey', AssetKey)
@@ -606,6 +608,38 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    @strip_key
+    def get_changed_usage_keys(self, course_key, old_version, new_version, **kwargs):
+        """
+        Returns the usage keys of the blocks that were added, removed or
+        changed between the two given structure versions of the course,
+        or None if the course's modulestore doesn't version its structures.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_changed_usage_keys')
+            return store.get_changed_usage_keys(course_key, old_version, new_version)
+        except NotImplementedError:
+            return None
+
+    @strip_key
+    def diff_structures(self, course_key, old_version, new_version, **kwargs):
+        """
+        Returns the usage keys of the blocks that were added, removed, moved
+        or changed between the two given structure versions of the course,
+        or None if the course's modulestore doesn't version its structures.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'diff_structures')
+            diff = store.diff_structures(course_key, old_version, new_version)
+        except NotImplementedError:
+            return None
+
+        if diff is None:
+            return None
+        # The decorator only strips keys in lists and dicts.
+        field_decorator = kwargs.get('field_decorator', lambda usage_keys: usage_keys)
+        return StructureDiff(*[frozenset(field_decorator(list(usage_keys))) for usage_keys in diff])
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
@@ -899,6 +933,18 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_id)
         return store.has_published_version(xblock)
 
+    def prefetch_definitions(self, blocks, depth=0):
+        """
+        See :meth:`xmodule.modulestore.ModuleStoreReadBase.prefetch_definitions`
+        """
+        blocks_by_course = defaultdict(list)
+        for block in blocks:
+            blocks_by_course[block.scope_ids.usage_id.course_key].append(block)
+
+        for course_key, course_blocks in blocks_by_course.iteritems():
+            store = self._get_modulestore_for_courselike(course_key)
+            store.prefetch_definitions(course_blocks, depth)
+
     @strip_key
     def publish(self, location, user_id, **kwargs):
         """
@@ -21,3 +21,7 @@ class BlockKey(namedtuple('BlockKey', 'type id')):
 
 
 CourseEnvelope = namedtuple('CourseEnvelope', 'course_key structure')
+
+# The usage keys (or block keys) of the blocks that differ between two
+# structures, as returned by SplitMongoModuleStore.diff_structures.
+StructureDiff = namedtuple('StructureDiff', 'added removed moved changed')
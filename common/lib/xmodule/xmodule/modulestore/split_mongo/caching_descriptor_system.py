@@ -82,6 +82,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        # definition id -> definition, for definitions loaded by prefetch_definitions
+        self.prefetched_definitions = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
     @lazy
@@ -159,6 +161,39 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return json_data
 
+    @contract(block_keys="list(BlockKey)", depth="int | None")
+    def prefetch_definitions(self, block_keys, depth=0):
+        """
+        Load the definitions of the given blocks, and of their descendants out
+        to ``depth``, with a single query, so that they aren't fetched one at a
+        time when the content fields of those blocks are first accessed.
+
+        This also applies to blocks which have already been loaded lazily.
+
+        Arguments:
+            block_keys (list of BlockKey): The blocks whose definitions to load.
+            depth (int or None): How many levels of descendants to include
+                (0 => the blocks only, 1 => also their children, etc...). A depth
+                of None includes all descendants.
+        """
+        block_map = {}
+        for block_key in block_keys:
+            block_map = self.modulestore.descendants(
+                self.course_entry.structure['blocks'], block_key, depth, block_map
+            )
+
+        definition_ids = {
+            block_data.definition
+            for block_data in block_map.itervalues()
+            if block_data.definition is not None and not block_data.definition_loaded
+        }
+        definition_ids.difference_update(self.prefetched_definitions)
+        if not definition_ids:
+            return
+
+        for definition in self.modulestore.get_definitions(self.course_entry.course_key, definition_ids):
+            self.prefetched_definitions[definition['_id']] = definition
+
     # xblock's runtime does not always pass enough contextual information to figure out
     # which named container (course x branch) or which parent is requesting an item. Because split allows
     # a many:1 mapping from named containers to structures and because item's identities encode
@@ -198,6 +233,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 block_key.type,
                 definition_id,
                 convert_fields,
+                definitions=self.prefetched_definitions,
             )
         else:
             definition_loader = None
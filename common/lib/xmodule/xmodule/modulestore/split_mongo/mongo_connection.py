@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -44,6 +47,28 @@ def get_cache(alias):
     return caches[alias]
 
 
+_LOCAL_STRUCTURE_CACHE = None
+_LOCAL_STRUCTURE_CACHE_LOCK = threading.Lock()
+
+
+def get_local_cache():
+    """
+    Return the in-process tier of the course structure cache, or None if
+    it is disabled, i.e. if COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES isn't set.
+
+    Note: The primary purpose of this is to mock the cache in test_split_modulestore.py
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if _LOCAL_STRUCTURE_CACHE is None:
+        max_bytes = getattr(settings, 'COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES', 0)
+        if not max_bytes:
+            return None
+        with _LOCAL_STRUCTURE_CACHE_LOCK:
+            if _LOCAL_STRUCTURE_CACHE is None:
+                _LOCAL_STRUCTURE_CACHE = LocalStructureCache(max_bytes)
+    return _LOCAL_STRUCTURE_CACHE
+
+
 def round_power_2(value):
     """
     Return value rounded up to the nearest power of 2.
@@ -225,6 +250,59 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache(object):
+    """
+    A thread-safe, in-process LRU cache of pickled course structures, keyed
+    by structure id, holding at most ``max_bytes`` of pickled data.
+
+    Structures are immutable, so entries never need to be invalidated; they
+    are only evicted, least recently used first. Pickled data is cached
+    rather than the structures themselves so that callers can't modify the
+    cached copy, and so that the size of the cache can be measured.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the pickled structure cached for ``key``, or None."""
+        with self._lock:
+            pickled_data = self._entries.pop(key, None)
+            if pickled_data is not None:
+                self._entries[key] = pickled_data
+            return pickled_data
+
+    def set(self, key, pickled_data):
+        """
+        Cache ``pickled_data`` for ``key``, evicting the least recently used
+        entries as needed to stay within ``max_bytes``.
+
+        Returns the number of evicted entries.
+        """
+        if len(pickled_data) > self.max_bytes:
+            return 0
+
+        evictions = 0
+        with self._lock:
+            previous_data = self._entries.pop(key, None)
+            if previous_data is not None:
+                self.size -= len(previous_data)
+
+            self._entries[key] = pickled_data
+            self.size += len(pickled_data)
+
+            while self.size > self.max_bytes:
+                _, evicted_data = self._entries.popitem(last=False)
+                self.size -= len(evicted_data)
+                evictions += 1
+        return evictions
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
@@ -232,14 +310,20 @@ class CourseStructureCache(object):
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
+
+    If a :class:`LocalStructureCache` is configured, it is consulted before
+    the django cache, and holds the pickled, but uncompressed, structures.
     """
     def __init__(self):
         self.cache = None
+        self.local_cache = None
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            else:
+                self.local_cache = get_local_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
@@ -247,17 +331,27 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
-            compressed_pickled_data = self.cache.get(key)
-            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+            pickled_data = None
+            if self.local_cache is not None:
+                pickled_data = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(pickled_data is not None).lower())
 
-            if compressed_pickled_data is None:
-                # Always log cache misses, because they are unexpected
-                tagger.sample_rate = 1
-                return None
+            if pickled_data is None:
+                compressed_pickled_data = self.cache.get(key)
+                tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
-            tagger.measure('compressed_size', len(compressed_pickled_data))
+                if compressed_pickled_data is None:
+                    # Always log cache misses, because they are unexpected
+                    tagger.sample_rate = 1
+                    return None
+
+                tagger.measure('compressed_size', len(compressed_pickled_data))
+
+                pickled_data = zlib.decompress(compressed_pickled_data)
+                self._set_local(key, pickled_data, tagger)
+            else:
+                tagger.tag(from_cache='true')
 
-            pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
             return pickle.loads(pickled_data)
@@ -270,6 +364,7 @@ class CourseStructureCache(object):
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_local(key, pickled_data, tagger)
 
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
@@ -278,6 +373,51 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+    def _set_local(self, key, pickled_data, tagger):
+        """Write the pickled struct data to the local cache, if there is one."""
+        if self.local_cache is None:
+            return
+
+        evictions = self.local_cache.set(key, pickled_data)
+        if evictions:
+            tagger.measure('local_evictions', evictions)
+
+
+class StructureDiffCache(object):
+    """
+    Wrapper around the django cache of course structures, to cache the
+    differences between pairs of structures.
+
+    Saved structures never change, so neither do the differences between
+    them, and they are cached without a timeout. If the 'course_structure_cache'
+    doesn't exist, then don't do anything for set and get.
+    """
+    KEY_PREFIX = 'structure_diff'
+
+    def __init__(self):
+        self.cache = None
+        if DJANGO_AVAILABLE:
+            try:
+                self.cache = get_cache('course_structure_cache')
+            except InvalidCacheBackendError:
+                pass
+
+    def _key(self, old_version, new_version):
+        """Return the cache key of the difference between two structure versions."""
+        return u'{}.{}.{}'.format(self.KEY_PREFIX, old_version, new_version)
+
+    def get(self, old_version, new_version):
+        """Return the cached difference between two structure versions, or None."""
+        if self.cache is None:
+            return None
+        return self.cache.get(self._key(old_version, new_version))
+
+    def set(self, old_version, new_version, diff):
+        """Cache the difference between two structure versions."""
+        if self.cache is None:
+            return
+        self.cache.set(self._key(old_version, new_version), diff, None)
+
 
 class MongoConnection(object):
     """
@@ -86,8 +86,8 @@ from xmodule.modulestore import (
 from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.partitions.partitions_service import PartitionService
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
-from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError, StructureDiffCache
+from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope, StructureDiff
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
@@ -124,6 +124,21 @@ new_contract('BlockKey', BlockKey)
 new_contract('XBlock', XBlock)
 
 
+def _block_content_changed(old_block, new_block):
+    """
+    Returns whether the content of a block differs between two structures,
+    comparing the definition id first, as it changes with every edit of
+    the block's content.
+    """
+    return (
+        old_block.definition != new_block.definition or
+        old_block.block_type != new_block.block_type or
+        old_block.fields != new_block.fields or
+        old_block.defaults != new_block.defaults or
+        old_block.get_asides() != new_block.get_asides()
+    )
+
+
 class SplitBulkWriteRecord(BulkOpsRecord):
     def __init__(self):
         super(SplitBulkWriteRecord, self).__init__()
@@ -806,6 +821,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             system.module_data.update(new_module_data)
             return system.module_data
 
+    def prefetch_definitions(self, blocks, depth=0):
+        """
+        See :meth:`xmodule.modulestore.ModuleStoreReadBase.prefetch_definitions`
+
+        The definitions are loaded with one query per runtime that loaded
+        ``blocks``, and are used by the lazy loaders of those runtimes.
+        """
+        # Blocks bound to a user have a combined runtime, which delegates
+        # prefetch_definitions to the CachingDescriptorSystem that loaded them,
+        # so blocks are grouped by that (bound) method.
+        block_keys = defaultdict(list)
+        for block in blocks:
+            prefetch = getattr(block.runtime, 'prefetch_definitions', None)
+            if prefetch is not None:
+                block_keys[prefetch].append(BlockKey.from_usage_key(block.location))
+
+        for prefetch, runtime_block_keys in block_keys.iteritems():
+            prefetch(runtime_block_keys, depth)
+
     @contract(course_entry=CourseEnvelope, block_keys="list(BlockKey)", depth="int | None")
     def _load_items(self, course_entry, block_keys, depth=0, **kwargs):
         """
@@ -1486,6 +1520,87 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             'edited_on': course['edited_on']
         }
 
+    def get_changed_usage_keys(self, course_key, old_version, new_version):
+        """
+        Returns the usage keys of the blocks that were added, removed or
+        changed between the two given structure versions of the course.
+
+        :param course_key: the course whose structure versions are compared
+        :param old_version: the version guid of the older structure
+        :param new_version: the version guid of the newer structure
+        :return: a list of usage keys, or None if either structure can't be found
+        """
+        diff = self.diff_structures(course_key, old_version, new_version)
+        if diff is None:
+            return None
+        return list(diff.added | diff.removed | diff.changed)
+
+    def diff_structures(self, course_key, old_version, new_version):
+        """
+        Returns the differences between the two given structure versions of
+        the course, as a StructureDiff of the sets of usage keys of the blocks
+        that were added, removed, moved to other parents or changed.
+
+        A block is changed if its definition id, fields, defaults or asides
+        differ, so definitions don't need to be loaded. Its edit_info is
+        ignored, since publishing versions every block it copies, whether or
+        not the block changed.
+
+        Differences are cached by version pair, except during a bulk
+        operation on the course, whose structures can still change.
+
+        :param course_key: the course whose structure versions are compared
+        :param old_version: the version guid of the older structure
+        :param new_version: the version guid of the newer structure
+        :return: a StructureDiff, or None if either structure can't be found
+        """
+        if not isinstance(course_key, CourseLocator) or course_key.deprecated:
+            # The supplied CourseKey is of the wrong type, so it can't possibly be stored in this modulestore.
+            raise ItemNotFoundError(course_key)
+
+        diff_cache = None
+        if not self._get_bulk_ops_record(course_key).active:
+            diff_cache = StructureDiffCache()
+
+        block_key_diff = diff_cache.get(old_version, new_version) if diff_cache is not None else None
+        if block_key_diff is None:
+            old_structure = self.get_structure(course_key, old_version)
+            new_structure = self.get_structure(course_key, new_version)
+            if old_structure is None or new_structure is None:
+                return None
+
+            block_key_diff = self._diff_structure_blocks(old_structure, new_structure)
+            if diff_cache is not None:
+                diff_cache.set(old_version, new_version, block_key_diff)
+
+        return StructureDiff(*[
+            frozenset(course_key.make_usage_key(block_key.type, block_key.id) for block_key in block_keys)
+            for block_keys in block_key_diff
+        ])
+
+    def _diff_structure_blocks(self, old_structure, new_structure):
+        """
+        Returns the StructureDiff of the block keys of two structures.
+        """
+        old_blocks = old_structure['blocks']
+        new_blocks = new_structure['blocks']
+        common_block_keys = old_blocks.viewkeys() & new_blocks.viewkeys()
+
+        old_parents = self.build_block_key_to_parents_mapping(old_structure)
+        new_parents = self.build_block_key_to_parents_mapping(new_structure)
+        return StructureDiff(
+            added=frozenset(new_blocks.viewkeys() - old_blocks.viewkeys()),
+            removed=frozenset(old_blocks.viewkeys() - new_blocks.viewkeys()),
+            moved=frozenset(
+                block_key for block_key in common_block_keys
+                if set(old_parents.get(block_key, [])) != set(new_parents.get(block_key, []))
+            ),
+            changed=frozenset(
+                block_key for block_key in common_block_keys
+                if _block_content_changed(old_blocks[block_key], new_blocks[block_key])
+            ),
+        )
+
     def get_definition_history_info(self, definition_locator, course_context=None):
         """
         Because xblocks doesn't give a means to separate the definition's meta information from
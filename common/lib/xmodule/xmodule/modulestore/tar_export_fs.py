@@ -0,0 +1,168 @@
+"""
+A write-only filesystem writing the files of a course export straight into a
+tar stream, so that exports can be compressed and sent on as they are written,
+instead of being staged in a temporary directory.
+"""
+import os
+import posixpath
+import tarfile
+import time
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+from fs.errors import UnsupportedError
+
+# Number of bytes of a file opened for writing that are held in memory; larger
+# files are spooled to a temporary file until they are closed.
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class TarExportFS(object):
+    """
+    Filesystem adding the directories and files written to it to a tar file,
+    usually opened in a streaming mode such as 'w|gz', under the directory `root`.
+
+    Only the part of the pyfilesystem API used by exports is implemented, and
+    files can only be written: a tar member is preceded by its size, so files
+    opened with `open` are held until closed (in memory up to SPOOL_MAX_SIZE
+    bytes), while `setcontents` copies file-like objects into the tar file
+    directly.
+    """
+    def __init__(self, tar_file, root=u'', directories=None):
+        self.tar_file = tar_file
+        self.root = root.strip(u'/')
+        # Paths of the directories already added to the tar file, shared with
+        # the filesystems opened on subdirectories.
+        self.directories = directories if directories is not None else set()
+
+    def _tar_path(self, path):
+        """
+        Returns the path in the tar file of the given path of this filesystem.
+        """
+        return posixpath.normpath(posixpath.join(self.root, path.strip(u'/')))
+
+    def _add_directory(self, tar_path):
+        """
+        Adds the directory at the given path in the tar file, and its missing parents.
+        """
+        if tar_path in (u'', u'.') or tar_path in self.directories:
+            return
+        self._add_directory(posixpath.dirname(tar_path))
+
+        info = tarfile.TarInfo(tar_path)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0755
+        info.mtime = time.time()
+        self.tar_file.addfile(info)
+        self.directories.add(tar_path)
+
+    def add_file(self, tar_path, file_obj, size):
+        """
+        Adds the `size` bytes read from `file_obj` as a file at the given path in the tar file.
+        """
+        self._add_directory(posixpath.dirname(tar_path))
+
+        info = tarfile.TarInfo(tar_path)
+        info.size = size
+        info.mode = 0644
+        info.mtime = time.time()
+        self.tar_file.addfile(info, file_obj)
+
+    def makedir(self, path, recursive=False, allow_recreate=False):  # pylint: disable=unused-argument
+        """
+        Adds the directory at `path`, and any missing parent, to the tar file.
+        """
+        self._add_directory(self._tar_path(path))
+
+    def opendir(self, path):
+        """
+        Returns a filesystem writing under the directory at `path`.
+        """
+        return TarExportFS(self.tar_file, self._tar_path(path), self.directories)
+
+    def makeopendir(self, path, recursive=False):
+        """
+        Adds the directory at `path` to the tar file, and returns a filesystem writing under it.
+        """
+        self.makedir(path, recursive=recursive, allow_recreate=True)
+        return self.opendir(path)
+
+    def open(self, path, mode='r', **kwargs):  # pylint: disable=unused-argument
+        """
+        Returns a file which is added at `path` to the tar file when closed.
+        """
+        if 'w' not in mode and 'a' not in mode:
+            raise UnsupportedError('read files of a tar stream', path=path)
+        return TarMemberFile(self, self._tar_path(path))
+
+    def setcontents(
+            self, path, data=b'', encoding=None, errors=None, chunk_size=None
+    ):  # pylint: disable=unused-argument
+        """
+        Adds a file with the given contents at `path` to the tar file.
+
+        `data` may be a string, or a seekable file-like object which is read
+        from its current position to its end.
+        """
+        if isinstance(data, unicode):
+            data = data.encode(encoding or 'utf-8', errors or 'strict')
+        if isinstance(data, bytes):
+            data = BytesIO(data)
+
+        position = data.tell()
+        data.seek(0, os.SEEK_END)
+        size = data.tell() - position
+        data.seek(position)
+        self.add_file(self._tar_path(path), data, size)
+
+
+class TarMemberFile(object):
+    """
+    File opened for writing on a TarExportFS, which is added to its tar file when closed.
+    """
+    def __init__(self, tar_fs, tar_path):
+        self.tar_fs = tar_fs
+        self.tar_path = tar_path
+        self.closed = False
+        self._file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    def write(self, data):
+        """
+        Writes `data` to the file.
+        """
+        self._file.write(data)
+
+    def writelines(self, lines):
+        """
+        Writes each of the given lines to the file.
+        """
+        self._file.writelines(lines)
+
+    def flush(self):
+        """
+        Files are only written to the tar file when closed.
+        """
+        pass
+
+    def close(self):
+        """
+        Adds the data written to the file to the tar file.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        size = self._file.tell()
+        self._file.seek(0)
+        self.tar_fs.add_file(self.tar_path, self._file, size)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave partially written files out of the tar file.
+            self.closed = True
+            self._file.close()
@@ -2,6 +2,8 @@
  Test contentstore.mongo functionality
 """
 import logging
+import tarfile
+from io import BytesIO
 from uuid import uuid4
 import unittest
 import mimetypes
@@ -15,6 +17,7 @@ from xmodule.tests import DATA_DIR
 from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
+from xmodule.modulestore.tar_export_fs import TarExportFS
 import ddt
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 
@@ -145,6 +148,24 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tar_stream(self, deprecated):
+        """
+        Test export into a tar stream
+        """
+        self.set_up_assets(deprecated)
+        tar_stream = BytesIO()
+        with tarfile.open(fileobj=tar_stream, mode='w|gz') as tar_file:
+            policy = self.contentstore.export_all_for_course_to_fs(
+                self.course1_key, TarExportFS(tar_file, u'static')
+            )
+        self.assertItemsEqual(policy.keys(), self.course1_files)
+
+        tar_stream.seek(0)
+        with tarfile.open(fileobj=tar_stream, mode='r:gz') as tar_file:
+            exported_files = {member.name for member in tar_file if member.isfile()}
+        self.assertItemsEqual(exported_files, [u'static/' + filename for filename in self.course1_files])
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -29,6 +29,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import LocalStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -935,6 +936,43 @@ class SplitModuleCourseTests(SplitModuleTest):
         self.assertEqual(root_block_key.name, "course")
 
 
+class TestLocalStructureCache(unittest.TestCase):
+    """Tests for the LocalStructureCache"""
+
+    def test_get_and_set(self):
+        cache = LocalStructureCache(100)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.set('a', 'x' * 10), 0)
+        self.assertEqual(cache.get('a'), 'x' * 10)
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalStructureCache(30)
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'x' * 10)
+        cache.set('c', 'x' * 10)
+        cache.get('a')
+
+        self.assertEqual(cache.set('d', 'x' * 15), 2)
+        self.assertEqual(cache.size, 25)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('c'))
+
+    def test_replace(self):
+        cache = LocalStructureCache(30)
+        cache.set('a', 'x' * 10)
+        cache.set('a', 'x' * 20)
+        self.assertEqual(cache.size, 20)
+        self.assertEqual(len(cache), 1)
+
+    def test_too_large(self):
+        cache = LocalStructureCache(30)
+        cache.set('a', 'x' * 10)
+        self.assertEqual(cache.set('b', 'x' * 31), 0)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+
+
 class TestCourseStructureCache(SplitModuleTest):
     """Tests for the CourseStructureCache"""
 
@@ -987,6 +1025,51 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_local_cache')
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_local_course_structure_cache(self, mock_get_cache, mock_get_local_cache):
+        mock_get_cache.return_value = self.cache
+        local_cache = LocalStructureCache(10 ** 7)
+        mock_get_local_cache.return_value = local_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+        self.assertEqual(len(local_cache), 1)
+
+        # the structure is still served from the local cache once it has been
+        # dropped from the shared cache
+        self.cache.clear()
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        self.assertEqual(cached_structure, not_cached_structure)
+
+        # callers can't modify the locally cached structure
+        cached_structure['blocks'].clear()
+        with check_mongo_calls(0):
+            self.assertEqual(self._get_structure(self.new_course), not_cached_structure)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_structure_diff_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        course_key = self.new_course.id
+        old_version = self.new_course.location.version_guid
+        modulestore().create_child(self.user, self.new_course.location, 'chapter')
+        new_version = modulestore().get_course(course_key).location.version_guid
+
+        with patch.object(
+            SplitMongoModuleStore, '_diff_structure_blocks', wraps=modulestore()._diff_structure_blocks
+        ) as mock_diff:
+            diff = modulestore().diff_structures(course_key, old_version, new_version)
+            self.assertEqual(modulestore().diff_structures(course_key, old_version, new_version), diff)
+            self.assertEqual(mock_diff.call_count, 1)
+
+            # differences can't be cached while the structures can still change
+            with modulestore().bulk_operations(course_key):
+                modulestore().diff_structures(course_key, new_version, old_version)
+                modulestore().diff_structures(course_key, new_version, old_version)
+            self.assertEqual(mock_diff.call_count, 3)
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
@@ -1261,6 +1344,50 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         self.assertEqual(len(expected_ids), 0)
 
+    def test_prefetch_definitions(self):
+        """
+        Test that prefetch_definitions loads the definitions of lazily loaded blocks at once
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        problems = modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+        self.assertGreater(len(problems), 1)
+
+        with check_mongo_calls(1):
+            modulestore().prefetch_definitions(problems)
+
+        with check_mongo_calls(0):
+            for problem in problems:
+                self.assertIsNotNone(problem.data)
+
+        # the definitions are only loaded once
+        with check_mongo_calls(0):
+            modulestore().prefetch_definitions(problems)
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_prefetch_descendant_definitions(self, _from_json):
+        """
+        Test that prefetch_definitions loads the definitions of descendants out to depth
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'course', 'head12345'
+        )
+        course = modulestore().get_item(locator)
+        problems = []
+        blocks = [course]
+        while blocks:
+            block = blocks.pop()
+            if block.category == 'problem':
+                problems.append(block)
+            blocks.extend(block.get_children())
+        self.assertGreater(len(problems), 1)
+
+        with check_mongo_calls(1):
+            modulestore().prefetch_definitions([course], depth=None)
+
+        with check_mongo_calls(0):
+            for problem in problems:
+                self.assertIsNotNone(problem.data)
+
 
 def version_agnostic(children):
     """
@@ -1330,6 +1457,64 @@ class TestItemCrud(SplitModuleTest):
         with self.assertRaises(ItemNotFoundError):
             modulestore().get_item(locator)
 
+    def test_get_changed_usage_keys(self):
+        """
+        get_changed_usage_keys(course_key, old_version, new_version): [usage_key]
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        parent_locator = BlockUsageLocator(course_key, 'chapter', block_id='chapter2')
+        premod_version = modulestore().get_course(course_key).location.version_guid
+        new_module = modulestore().create_child(
+            'user123', parent_locator, 'sequential',
+            fields={'display_name': 'new sequential'}
+        )
+        current_version = modulestore().get_course(course_key).location.version_guid
+
+        changed_usage_keys = modulestore().get_changed_usage_keys(course_key, premod_version, current_version)
+        self.assertEqual(
+            set(changed_usage_keys),
+            {
+                course_key.make_usage_key('chapter', 'chapter2'),
+                course_key.make_usage_key('sequential', new_module.location.block_id),
+            },
+        )
+        self.assertEqual(modulestore().get_changed_usage_keys(course_key, current_version, current_version), [])
+
+    def test_diff_structures(self):
+        """
+        diff_structures(course_key, old_version, new_version): StructureDiff
+        """
+        course_key = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        premod_version = modulestore().get_course(course_key).location.version_guid
+        new_module = modulestore().create_child(
+            'user123', BlockUsageLocator(course_key, 'chapter', block_id='chapter2'), 'sequential',
+            fields={'display_name': 'new sequential'}
+        )
+        chapter3 = modulestore().get_item(BlockUsageLocator(course_key, 'chapter', block_id='chapter3'))
+        moved_key = chapter3.children[0]
+        chapter3.children.remove(moved_key)
+        modulestore().update_item(chapter3, 'user123')
+        chapter1 = modulestore().get_item(BlockUsageLocator(course_key, 'chapter', block_id='chapter1'))
+        chapter1.children.append(moved_key)
+        modulestore().update_item(chapter1, 'user123')
+        current_version = modulestore().get_course(course_key).location.version_guid
+
+        diff = modulestore().diff_structures(course_key, premod_version, current_version)
+        new_key = course_key.make_usage_key('sequential', new_module.location.block_id)
+        moved_key = course_key.make_usage_key(moved_key.block_type, moved_key.block_id)
+        self.assertEqual(diff.added, {new_key})
+        self.assertEqual(diff.removed, set())
+        self.assertEqual(diff.moved, {moved_key})
+        self.assertEqual(
+            diff.changed,
+            {course_key.make_usage_key('chapter', chapter_id) for chapter_id in ('chapter1', 'chapter2', 'chapter3')},
+        )
+
+        reverse_diff = modulestore().diff_structures(course_key, current_version, premod_version)
+        self.assertEqual(reverse_diff.added, set())
+        self.assertEqual(reverse_diff.removed, {new_key})
+        self.assertEqual(reverse_diff.moved, {moved_key})
+
     def test_create_parented_item(self):
         """
         Test create_item w/ specifying the parent of the new item
@@ -2088,6 +2273,36 @@ class TestPublish(SplitModuleTest):
         pub_module = modulestore().get_item(new_module.location.map_into_course(dest_course))
         self._check_course(source_course, dest_course, expected, unexpected)
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_publish_changed_usage_keys(self, _from_json):
+        """
+        Test that republishing blocks whose content didn't change doesn't report them as changed
+        """
+        source_course = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        dest_course = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_PUBLISHED)
+        head = source_course.make_usage_key('course', "head12345")
+        chapter1 = source_course.make_usage_key('chapter', 'chapter1')
+        chapter2 = source_course.make_usage_key('chapter', 'chapter2')
+        chapter3 = source_course.make_usage_key('chapter', 'chapter3')
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [chapter2, chapter3])
+        old_version = modulestore().get_course(dest_course).location.version_guid
+        new_module = modulestore().create_child(
+            self.user_id, chapter1, "sequential",
+            fields={'display_name': 'new sequential'},
+        )
+        # republishing the whole course gives every published block new edit_info
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [chapter2, chapter3])
+        new_version = modulestore().get_course(dest_course).location.version_guid
+
+        changed_usage_keys = modulestore().get_changed_usage_keys(dest_course, old_version, new_version)
+        self.assertEqual(
+            set(changed_usage_keys),
+            {
+                dest_course.make_usage_key('chapter', 'chapter1'),
+                dest_course.make_usage_key('sequential', new_module.location.block_id),
+            },
+        )
+
     def test_exceptions(self):
         """
         Test the exceptions which preclude successful publication
@@ -0,0 +1,81 @@
+"""
+Tests for the TarExportFS filesystem, which writes exports into tar streams.
+"""
+import tarfile
+import unittest
+from io import BytesIO
+
+from fs.errors import UnsupportedError
+
+from xmodule.modulestore.tar_export_fs import TarExportFS
+
+
+class TarExportFSTestCase(unittest.TestCase):
+    """
+    Tests of writing files and directories into a tar stream with TarExportFS.
+    """
+    def setUp(self):
+        super(TarExportFSTestCase, self).setUp()
+        self.tar_stream = BytesIO()
+        self.tar_file = tarfile.open(fileobj=self.tar_stream, mode='w|gz')
+        self.export_fs = TarExportFS(self.tar_file, u'course')
+
+    def _read_members(self):
+        """
+        Closes the tar stream, and returns the contents of its files, or None
+        for directories, by path.
+        """
+        self.tar_file.close()
+        self.tar_stream.seek(0)
+        members = {}
+        with tarfile.open(fileobj=self.tar_stream, mode='r:gz') as tar_file:
+            for member in tar_file:
+                members[member.name] = tar_file.extractfile(member).read() if member.isfile() else None
+        return members
+
+    def test_open(self):
+        with self.export_fs.open(u'course.xml', 'w') as course_xml:
+            course_xml.write(b'<course/>')
+        policies_dir = self.export_fs.makeopendir(u'policies')
+        with policies_dir.open(u'run/policy.json', 'w') as policy:
+            # Files opened while another is being written are added when closed.
+            with policies_dir.open(u'run/grading_policy.json', 'w') as grading_policy:
+                grading_policy.write(b'{}')
+            policy.write(b'{"course/run": {}}')
+
+        self.assertEqual(self._read_members(), {
+            u'course': None,
+            u'course/course.xml': b'<course/>',
+            u'course/policies': None,
+            u'course/policies/run': None,
+            u'course/policies/run/grading_policy.json': b'{}',
+            u'course/policies/run/policy.json': b'{"course/run": {}}',
+        })
+
+    def test_setcontents(self):
+        self.export_fs.makedir(u'static/images', recursive=True, allow_recreate=True)
+        static_dir = self.export_fs.opendir(u'static')
+        static_dir.setcontents(u'images/image.png', BytesIO(b'image data'))
+        static_dir.setcontents(u'text.txt', u'text \u2026')
+        static_dir.setcontents(u'empty.txt')
+
+        self.assertEqual(self._read_members(), {
+            u'course': None,
+            u'course/static': None,
+            u'course/static/images': None,
+            u'course/static/images/image.png': b'image data',
+            u'course/static/text.txt': u'text \u2026'.encode('utf-8'),
+            u'course/static/empty.txt': b'',
+        })
+
+    def test_failed_write(self):
+        with self.assertRaises(ValueError):
+            with self.export_fs.open(u'course.xml', 'w') as course_xml:
+                course_xml.write(b'<cour')
+                raise ValueError
+
+        self.assertEqual(self._read_members(), {})
+
+    def test_read(self):
+        with self.assertRaises(UnsupportedError):
+            self.export_fs.open(u'course.xml')
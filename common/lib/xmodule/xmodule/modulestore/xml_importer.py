@@ -20,8 +20,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
 import logging
 from abc import abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing.pool import ThreadPool
+from timeit import default_timer
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -55,10 +61,114 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+def _get_existing_assets(static_content_store, target_id):
+    """
+    Returns the attributes of the assets already in the contentstore for
+    the given course, by asset key, to detect unchanged files on re-import.
+    """
+    assets, __ = static_content_store.get_all_content_for_course(target_id)
+    return {asset['asset_key']: asset for asset in assets}
+
+
+def _import_static_file(static_content_store, target_id, policy, mimetypes_list, existing_assets, static_file):
+    """
+    Reads a single static file and saves it, with its thumbnail, into the
+    contentstore, unless `existing_assets` holds an identical asset.
+
+    Returns a Counter of the seconds spent reading, hashing, generating the
+    thumbnail of and saving the file, and of whether it was imported or skipped.
+    """
+    content_path, filename, fullname_with_subpath = static_file
+    stats = Counter()
+
+    start = default_timer()
+    try:
+        with open(content_path, 'rb') as f:
+            data = f.read()
+    except IOError:
+        if filename.startswith('._'):
+            # OS X "companion files". See
+            # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+            return stats
+        # Not a 'hidden file', then re-raise exception
+        raise
+    stats['static_read'] += default_timer() - start
+
+    asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+    policy_ele = policy.get(asset_key.path, {})
+
+    # During export display name is used to create files, strip away slashes from name
+    displayname = escape_invalid_characters(
+        name=policy_ele.get('displayname', filename),
+        invalid_char_list=['/', '\\']
+    )
+    locked = policy_ele.get('locked', False)
+    mime_type = policy_ele.get('contentType')
+
+    # Check extracted contentType in list of all valid mimetypes
+    if not mime_type or mime_type not in mimetypes_list:
+        mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+
+    existing_asset = existing_assets.get(asset_key) if existing_assets else None
+    if existing_asset is not None:
+        start = default_timer()
+        # The contentstore keeps the md5 digest of each asset, as GridFS computes it.
+        content_digest = hashlib.md5(data).hexdigest()
+        stats['static_hash'] += default_timer() - start
+        if (
+                existing_asset.get('md5') == content_digest and
+                existing_asset.get('displayname') == displayname and
+                existing_asset.get('contentType') == mime_type and
+                existing_asset.get('locked', False) == locked and
+                existing_asset.get('import_path') == fullname_with_subpath
+        ):
+            stats['static_skipped'] += 1
+            return stats
+
+    content = StaticContent(
+        asset_key, displayname, mime_type, data,
+        import_path=fullname_with_subpath, locked=locked
+    )
+
+    # first let's save a thumbnail so we can get back a thumbnail location
+    start = default_timer()
+    thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+    stats['static_thumbnail'] += default_timer() - start
+
+    if thumbnail_content is not None:
+        content.thumbnail_location = thumbnail_location
+
+    # then commit the content
+    start = default_timer()
+    try:
+        static_content_store.save(content)
+    except Exception as err:
+        log.exception(u'Error importing {0}, error={1}'.format(
+            fullname_with_subpath, err
+        ))
+    stats['static_save'] += default_timer() - start
+
+    stats['static_imported'] += 1
+    return stats
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
-
+        target_id, subpath='static', verbose=False,
+        max_workers=0, skip_unchanged=False, stats=None):
+    """
+    Imports the static files under `subpath` of the course directory into
+    the contentstore, and returns the asset keys of the files by their
+    path relative to `subpath`.
+
+    Files are read and saved by a pool of `max_workers` threads when it is
+    greater than 1, and one at a time otherwise. If `skip_unchanged` is True,
+    files identical to the assets already in the contentstore, by md5 digest
+    and attributes, are not saved again. If given, the Counter `stats` is
+    updated with the seconds spent in each phase of the import, summed over
+    the workers, and with the numbers of imported and skipped files.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -77,6 +187,7 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    static_files = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -90,58 +201,42 @@ def import_static_content(
             if verbose:
                 log.debug('importing static content %s...', content_path)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
-
             # strip away leading path from the name
             fullname_with_subpath = content_path.replace(static_dir, '')
             if fullname_with_subpath.startswith('/'):
                 fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
 
-            policy_ele = policy.get(asset_key.path, {})
+            static_files.append((content_path, filename, fullname_with_subpath))
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
-
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+    existing_assets = None
+    if skip_unchanged and static_files:
+        start = default_timer()
+        existing_assets = _get_existing_assets(static_content_store, target_id)
+        if stats is not None:
+            stats['static_lookup'] += default_timer() - start
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+    import_file = partial(
+        _import_static_file, static_content_store, target_id, policy, mimetypes_list, existing_assets
+    )
+    if max_workers > 1 and len(static_files) > 1:
+        pool = ThreadPool(min(max_workers, len(static_files)))
+        try:
+            file_stats = pool.map(import_file, static_files)
+        finally:
+            pool.terminate()
+    else:
+        file_stats = [import_file(static_file) for static_file in static_files]
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+    for (__, __, fullname_with_subpath), import_stats in zip(static_files, file_stats):
+        if not import_stats:
+            # unreadable OS X "companion file"
+            continue
+        if stats is not None:
+            stats.update(import_stats)
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+        # store the remapping information which will be needed
+        # to subsitute in the module data
+        remap_dict[fullname_with_subpath] = StaticContent.compute_location(target_id, fullname_with_subpath)
 
     return remap_dict
 
@@ -178,6 +273,15 @@ class ImportManager(object):
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+        static_import_workers: the number of threads reading and saving static files into
+            static_content_store. Static files are imported one at a time if it is 1 or less.
+
+        skip_unchanged_static: If True, static files identical to the assets already in
+            static_content_store are not saved again, as when re-importing a course.
+
+    After the import, `stats` holds the seconds spent in each phase of the import, and the
+    numbers of static files imported and skipped.
     """
     store_class = XMLModuleStore
 
@@ -187,7 +291,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_import_workers=0, skip_unchanged_static=False
     ):
         self.store = store
         self.user_id = user_id
@@ -200,6 +304,9 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_workers = static_import_workers
+        self.skip_unchanged_static = skip_unchanged_static
+        self.stats = Counter()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -211,6 +318,17 @@ class ImportManager(object):
         )
         self.logger, self.errors = make_error_tracker()
 
+    @contextmanager
+    def timed(self, phase):
+        """
+        Adds the seconds spent in the wrapped block to the stats of the given phase.
+        """
+        start = default_timer()
+        try:
+            yield
+        finally:
+            self.stats[phase] += default_timer() - start
+
     def preflight(self):
         """
         Perform any pre-import sanity checks.
@@ -228,7 +346,10 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                max_workers=self.static_import_workers,
+                skip_unchanged=self.skip_unchanged_static,
+                stats=self.stats,
             )
 
         elif self.verbose and not self.do_import_static:
@@ -251,7 +372,10 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                max_workers=self.static_import_workers,
+                skip_unchanged=self.skip_unchanged_static,
+                stats=self.stats,
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -440,13 +564,16 @@ class ImportManager(object):
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with self.timed('static'):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed('asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed('children'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -455,7 +582,8 @@ class ImportManager(object):
             # and then publishing it.
             with self.store.bulk_operations(dest_id):
                 # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                with self.timed('drafts'):
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
 
             yield courselike
 
@@ -3,14 +3,17 @@ Tests of XML export
 """
 
 import ddt
+import itertools
 import lxml.etree
 import mock
 import pytz
 import shutil
+import tarfile
 import unittest
 
 from datetime import datetime, timedelta, tzinfo
 from fs.osfs import OSFS
+from io import BytesIO
 from path import Path as path
 from tempfile import mkdtemp
 from textwrap import dedent
@@ -21,6 +24,7 @@ from xblock.test.tools import blocks_are_equivalent
 
 from opaque_keys.edx.locations import Location
 from xmodule.modulestore import EdxJSONEncoder
+from xmodule.modulestore.tar_export_fs import TarExportFS
 from xmodule.modulestore.xml import XMLModuleStore
 from xmodule.tests import DATA_DIR
 from xmodule.x_module import XModuleMixin
@@ -70,18 +74,22 @@ class RoundTripTestCase(unittest.TestCase):
 
     @mock.patch('xmodule.video_module.video_module.edxval_api', None)
     @mock.patch('xmodule.course_module.requests.get')
-    @ddt.data(
-        "toy",
-        "simple",
-        "conditional_and_poll",
-        "conditional",
-        "self_assessment",
-        "test_exam_registration",
-        "word_cloud",
-        "pure_xblock",
-    )
+    @ddt.data(*itertools.product(
+        (
+            "toy",
+            "simple",
+            "conditional_and_poll",
+            "conditional",
+            "self_assessment",
+            "test_exam_registration",
+            "word_cloud",
+            "pure_xblock",
+        ),
+        (False, True),
+    ))
+    @ddt.unpack
     @XBlock.register_temp_plugin(PureXBlock, 'pure')
-    def test_export_roundtrip(self, course_dir, mock_get):
+    def test_export_roundtrip(self, course_dir, to_tar_stream, mock_get):
 
         # Patch network calls to retrieve the textbook TOC
         mock_get.return_value.text = dedent("""
@@ -106,7 +114,13 @@ class RoundTripTestCase(unittest.TestCase):
         # export to the same directory--that way things like the custom_tags/ folder
         # will still be there.
         print "Starting export"
-        file_system = OSFS(root_dir)
+        if to_tar_stream:
+            # stream the export into a tar file, then extract it over the course.
+            tar_stream = BytesIO()
+            tar_file = tarfile.open(fileobj=tar_stream, mode='w|gz')
+            file_system = TarExportFS(tar_file)
+        else:
+            file_system = OSFS(root_dir)
         initial_course.runtime.export_fs = file_system.makeopendir(course_dir)
         root = lxml.etree.Element('root')
 
@@ -114,6 +128,12 @@ class RoundTripTestCase(unittest.TestCase):
         with initial_course.runtime.export_fs.open('course.xml', 'w') as course_xml:
             lxml.etree.ElementTree(root).write(course_xml)
 
+        if to_tar_stream:
+            tar_file.close()
+            tar_stream.seek(0)
+            with tarfile.open(fileobj=tar_stream, mode='r:gz') as tar_file:
+                tar_file.extractall(root_dir)
+
         print "Starting second import"
         second_import = XMLModuleStore(root_dir, source_dirs=[course_dir], xblock_mixins=(XModuleMixin,))
 
@@ -1,8 +1,16 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
+from collections import Counter
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import ddt
 from mock import Mock
+from path import Path as path
+from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locator import CourseLocator
 from xmodule.tests import DATA_DIR
@@ -39,3 +47,77 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+@ddt.ddt
+class ImportStaticContentTestCase(unittest.TestCase):
+    """
+    Tests of the parallel import of static files and of the skipping of
+    unchanged ones
+    """
+    def setUp(self):
+        super(ImportStaticContentTestCase, self).setUp()
+        self.course_dir = path(mkdtemp())
+        self.addCleanup(rmtree, self.course_dir)
+        self.course_id = CourseLocator("edX", "static", "2014_Fall")
+        self.files = {'file{}.txt'.format(index): 'content {}'.format(index) for index in range(10)}
+        (self.course_dir / 'static').mkdir()
+        for filename, data in self.files.iteritems():
+            (self.course_dir / 'static' / filename).write_bytes(data)
+        self.content_store = Mock()
+        self.content_store.generate_thumbnail.return_value = (None, None)
+
+    def _saved_static_content(self):
+        """
+        Returns the data of the static content saved in the contentstore, by name.
+        """
+        return {call[0][0].name: call[0][0].data for call in self.content_store.save.call_args_list}
+
+    def _existing_asset(self, filename, data):
+        """
+        Returns the attributes of the asset with the given name and data, as
+        returned by the contentstore.
+        """
+        return {
+            'asset_key': StaticContent.compute_location(self.course_id, filename),
+            'displayname': filename,
+            'contentType': 'text/plain',
+            'md5': hashlib.md5(data).hexdigest(),
+            'locked': False,
+            'import_path': filename,
+        }
+
+    @ddt.data(0, 4)
+    def test_import(self, max_workers):
+        stats = Counter()
+        remap_dict = import_static_content(
+            self.course_dir, self.content_store, self.course_id, max_workers=max_workers, stats=stats
+        )
+        self.assertEqual(self._saved_static_content(), self.files)
+        self.assertEqual(
+            remap_dict,
+            {filename: StaticContent.compute_location(self.course_id, filename) for filename in self.files}
+        )
+        self.assertEqual(stats['static_imported'], len(self.files))
+        self.assertFalse(self.content_store.get_all_content_for_course.called)
+
+    @ddt.data(0, 4)
+    def test_skip_unchanged(self, max_workers):
+        self.content_store.get_all_content_for_course.return_value = ([
+            self._existing_asset('file0.txt', 'content 0'),
+            self._existing_asset('file1.txt', 'changed content'),
+            dict(self._existing_asset('file2.txt', 'content 2'), locked=True),
+        ], 3)
+        stats = Counter()
+        remap_dict = import_static_content(
+            self.course_dir, self.content_store, self.course_id,
+            max_workers=max_workers, skip_unchanged=True, stats=stats,
+        )
+        saved_static_content = self._saved_static_content()
+        self.assertNotIn('file0.txt', saved_static_content)
+        self.assertEqual(saved_static_content['file1.txt'], 'content 1')
+        self.assertEqual(saved_static_content['file2.txt'], 'content 2')
+        self.assertEqual(len(saved_static_content), len(self.files) - 1)
+        self.assertEqual(set(remap_dict), set(self.files))
+        self.assertEqual(stats['static_skipped'], 1)
+        self.assertEqual(stats['static_imported'], len(self.files) - 1)
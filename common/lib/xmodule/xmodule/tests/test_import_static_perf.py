@@ -0,0 +1,106 @@
+"""
+Performance test of importing the static files of a course into a stand-in
+contentstore, one at a time, with a pool of workers, and when re-importing
+unchanged files.
+"""
+import hashlib
+import os
+import time
+import unittest
+from collections import Counter
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from opaque_keys.edx.locator import CourseLocator
+from path import Path as path
+
+from xmodule.modulestore.xml_importer import import_static_content
+
+COURSE_ID = CourseLocator('org', 'perf', 'run')
+
+# Number of static files in the imported course.
+NUM_FILES = 200
+
+# Size in bytes of each static file.
+FILE_SIZE = 256 * 1024
+
+# Number of seconds the stand-in contentstore takes to save each asset.
+SAVE_LATENCY = 0.005
+
+
+class LatentContentStore(object):
+    """
+    Contentstore keeping the attributes of the assets saved in it, after
+    taking `SAVE_LATENCY` seconds to save each of them.
+    """
+
+    def __init__(self):
+        self.assets = {}
+
+    def generate_thumbnail(self, content):  # pylint: disable=unused-argument
+        """Static files of this test are not images, and get no thumbnail."""
+        return None, None
+
+    def save(self, content):
+        """Records the attributes of the given content."""
+        time.sleep(SAVE_LATENCY)
+        self.assets[content.location] = {
+            'asset_key': content.location,
+            'displayname': content.name,
+            'contentType': content.content_type,
+            'md5': hashlib.md5(content.data).hexdigest(),
+            'locked': content.locked,
+            'import_path': content.import_path,
+        }
+
+    def get_all_content_for_course(self, course_key):  # pylint: disable=unused-argument
+        """Returns the attributes of all saved assets."""
+        return self.assets.values(), len(self.assets)
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class ImportStaticContentPerf(unittest.TestCase):
+    """
+    Compares the wall time of importing static files one at a time, with
+    pools of workers, and of re-importing them when unchanged.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ImportStaticContentPerf, self).setUp()
+        self.course_dir = path(mkdtemp())
+        self.addCleanup(rmtree, self.course_dir)
+        (self.course_dir / 'static').mkdir()
+        for index in range(NUM_FILES):
+            (self.course_dir / 'static' / 'file{}.bin'.format(index)).write_bytes(os.urandom(FILE_SIZE))
+
+    def test_import(self):
+        print
+        print '{:>10} {:>8} {:>12} {:>10} {:>10}'.format('mode', 'workers', 'time (ms)', 'imported', 'skipped')
+        for mode, max_workers, skip_unchanged in (
+                ('import', 0, False),
+                ('import', 4, False),
+                ('import', 16, False),
+                ('reimport', 0, True),
+                ('reimport', 4, True),
+        ):
+            content_store = LatentContentStore()
+            if skip_unchanged:
+                import_static_content(self.course_dir, content_store, COURSE_ID)
+            stats = Counter()
+            start = default_timer()
+            import_static_content(
+                self.course_dir, content_store, COURSE_ID,
+                max_workers=max_workers, skip_unchanged=skip_unchanged, stats=stats,
+            )
+            duration = default_timer() - start
+
+            self.assertEqual(stats['static_imported'] + stats['static_skipped'], NUM_FILES)
+            print '{:>10} {:>8} {:>12.1f} {:>10} {:>10}'.format(
+                mode, max_workers, duration * 1000, stats['static_imported'], stats['static_skipped'],
+            )
@@ -9,7 +9,7 @@ import random
 import re
 from collections import Counter
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPServerDisconnected
-from time import sleep
+from time import sleep, time
 
 from boto.exception import AWSConnectionError
 from boto.ses.exceptions import (
@@ -28,6 +28,7 @@ from celery.exceptions import RetryTaskError  # pylint: disable=no-name-in-modul
 from celery.states import FAILURE, RETRY, SUCCESS  # pylint: disable=no-name-in-module, import-error
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.core.mail.message import forbid_multi_line_headers
 from django.core.urlresolvers import reverse
@@ -48,6 +49,7 @@ from lms.djangoapps.instructor_task.subtasks import (
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.lib.courses import course_image_url
 from util.date_utils import get_default_time_display
+from util.query import use_read_replica_if_available
 
 log = logging.getLogger('edx.celery.task')
 
@@ -92,6 +94,14 @@ BULK_EMAIL_FAILURE_ERRORS = (
     SMTPException,
 )
 
+# Cache key of the moving average of the number of seconds it takes to send
+# a single email, which is used to size subtasks.
+SEND_LATENCY_CACHE_KEY = 'bulk_email.send_latency'
+SEND_LATENCY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Weight of the latency measured by the latest subtask in the moving average.
+SEND_LATENCY_SMOOTHING = 0.2
+
 
 def _get_course_email_context(course):
     """
@@ -120,11 +130,61 @@ def _get_course_email_context(course):
     return email_context
 
 
+def _get_optout_user_ids(course_id):
+    """
+    Returns the set of ids of the users who have opted out of email from the course.
+    """
+    return set(use_read_replica_if_available(
+        Optout.objects.filter(course_id=course_id)
+    ).values_list('user_id', flat=True))
+
+
+def _record_send_latency(num_emails, duration):
+    """
+    Updates the moving average of the time it takes to send an email
+    with the `duration` in seconds it took a subtask to send `num_emails` emails.
+    """
+    if num_emails == 0:
+        return
+    latency = duration / num_emails
+    average_latency = cache.get(SEND_LATENCY_CACHE_KEY)
+    if average_latency is not None:
+        latency = average_latency + SEND_LATENCY_SMOOTHING * (latency - average_latency)
+    cache.set(SEND_LATENCY_CACHE_KEY, latency, SEND_LATENCY_CACHE_TIMEOUT)
+
+
+def _get_emails_per_task():
+    """
+    Returns the number of emails each subtask should send.
+
+    If settings.BULK_EMAIL_SECONDS_PER_TASK is set, this is the number of emails
+    that can be sent in that many seconds at the recently measured rate, but no
+    fewer than settings.BULK_EMAIL_MIN_EMAILS_PER_TASK and no more than
+    settings.BULK_EMAIL_MAX_EMAILS_PER_TASK.  Otherwise, or until the rate has
+    been measured, this is settings.BULK_EMAIL_EMAILS_PER_TASK.
+    """
+    seconds_per_task = settings.BULK_EMAIL_SECONDS_PER_TASK
+    if not seconds_per_task:
+        return settings.BULK_EMAIL_EMAILS_PER_TASK
+
+    latency = cache.get(SEND_LATENCY_CACHE_KEY)
+    if not latency:
+        return settings.BULK_EMAIL_EMAILS_PER_TASK
+
+    return max(
+        settings.BULK_EMAIL_MIN_EMAILS_PER_TASK,
+        min(int(seconds_per_task / latency), settings.BULK_EMAIL_MAX_EMAILS_PER_TASK),
+    )
+
+
 def perform_delegate_email_batches(entry_id, course_id, task_input, action_name):
     """
     Delegates emails by querying for the list of recipients who should
-    get the mail, chopping up into batches of no more than settings.BULK_EMAIL_EMAILS_PER_TASK
-    in size, and queueing up worker jobs.
+    get the mail, chopping up into batches of no more than the number returned
+    by _get_emails_per_task in size, and queueing up worker jobs.
+
+    Recipients who have opted out of email from the course are left out of the
+    batches, and counted as skipped by the worker job they would have been in.
     """
     entry = InstructorTask.objects.get(pk=entry_id)
     # Get inputs to use in this task from the entry.
@@ -212,19 +272,27 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
                 global_email_context,
                 initial_subtask_status.to_dict(),
             ),
+            {'optouts_filtered': True},
             task_id=subtask_id,
             routing_key=routing_key,
         )
         return new_subtask
 
+    emails_per_task = _get_emails_per_task()
+    log.info(u"Task %s: Sending email %s to %d recipients, %d per subtask",
+             task_id, email_id, total_recipients, emails_per_task)
+
+    # The recipients of each target are read separately, rather than with
+    # combined_set, so that each query can page through users by id.
     progress = queue_subtasks_for_query(
         entry,
         action_name,
         _create_send_email_subtask,
-        [combined_set],
+        recipient_qsets,
         recipient_fields,
-        settings.BULK_EMAIL_EMAILS_PER_TASK,
+        emails_per_task,
         total_recipients,
+        excluded_item_ids=_get_optout_user_ids(course_id),
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -236,7 +304,7 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
 
 
 @task(default_retry_delay=settings.BULK_EMAIL_DEFAULT_RETRY_DELAY, max_retries=settings.BULK_EMAIL_MAX_RETRIES)
-def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict):
+def send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status_dict, optouts_filtered=False):
     """
     Sends an email to a list of recipients.
 
@@ -265,6 +333,8 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
 
         Most values will be zero on initial call, but may be different when the task is
         invoked as part of a retry.
+      * `optouts_filtered`: whether recipients in the Optout table have already been removed
+        from `to_list` and counted as skipped.
 
     Sends to all addresses contained in to_list that are not also in the Optout table.
     Emails are sent multi-part, in both plain text and html.  Updates InstructorTask object
@@ -299,6 +369,7 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
                 to_list,
                 global_email_context,
                 subtask_status,
+                optouts_filtered,
             )
     except Exception:
         # Unexpected exception. Try to write out the failure to the entry before failing.
@@ -426,7 +497,7 @@ def _get_source_address(course_id, course_title, course_language, truncate=True)
     return from_addr
 
 
-def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
+def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status, optouts_filtered=False):
     """
     Performs the email sending task.
 
@@ -443,6 +514,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
       * `subtask_status` : object of class SubtaskStatus representing current status.
+      * `optouts_filtered`: whether recipients in the Optout table have already been removed
+        from `to_list` and counted as skipped.
 
     Sends to all addresses contained in to_list that are not also in the Optout table.
     Emails are sent multi-part, in both plain text and html.
@@ -482,13 +555,13 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         )
         raise
 
-    # Exclude optouts (if not a retry):
+    # Exclude optouts (if not a retry, and not already done when queueing the subtask):
     # Note that we don't have to do the optout logic at all if this is a retry,
     # because we have presumably already performed the optout logic on the first
     # attempt.  Anyone on the to_list on a retry has already passed the filter
     # that existed at that time, and we don't need to keep checking for changes
     # in the Optout list.
-    if subtask_status.get_retry_count() == 0:
+    if not optouts_filtered and subtask_status.get_retry_count() == 0:
         to_list, num_optout = _filter_optouts_from_recipients(to_list, course_email.course_id)
         subtask_status.increment(skipped=num_optout)
 
@@ -509,6 +582,11 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
 
+        # Time the sends, to size the subtasks of later emails.  Throttled sends are not
+        # representative, so are not timed.
+        num_to_time = len(to_list) if subtask_status.retried_nomax == 0 else 0
+        start_time = time()
+
         while to_list:
             # Update context with user-specific values from the user at the end of the list.
             # At the end of processing this user, they will be popped off of the to_list.
@@ -706,6 +784,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         )
 
     else:
+        _record_send_latency(num_to_time, time() - start_time)
         # All went well.  Update counters with progress to date,
         # and set the state to SUCCESS:
         subtask_status.increment(state=SUCCESS)
@@ -26,17 +26,19 @@ from boto.ses.exceptions import (
 from celery.states import FAILURE, SUCCESS  # pylint: disable=no-name-in-module, import-error
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locator import CourseLocator
 
 from bulk_email.models import SEND_TO_LEARNERS, SEND_TO_MYSELF, SEND_TO_STAFF, CourseEmail, Optout
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import _get_course_email_context, _get_emails_per_task, _record_send_latency
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, update_subtask_status
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskCourseTestCase
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 
@@ -444,3 +446,43 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertIn('account_settings_url', result)
         self.assertIn('email_settings_url', result)
         self.assertIn('platform_name', result)
+
+
+@attr(shard=3)
+@override_settings(
+    BULK_EMAIL_EMAILS_PER_TASK=100,
+    BULK_EMAIL_SECONDS_PER_TASK=60,
+    BULK_EMAIL_MIN_EMAILS_PER_TASK=20,
+    BULK_EMAIL_MAX_EMAILS_PER_TASK=1000,
+)
+class TestEmailsPerTask(CacheIsolationTestCase):
+    """Tests sizing bulk email subtasks by the measured time to send an email."""
+    ENABLED_CACHES = ['default']
+
+    def test_unmeasured(self):
+        self.assertEqual(_get_emails_per_task(), 100)
+
+    @override_settings(BULK_EMAIL_SECONDS_PER_TASK=0)
+    def test_disabled(self):
+        _record_send_latency(10, 1.0)
+        self.assertEqual(_get_emails_per_task(), 100)
+
+    def test_measured(self):
+        _record_send_latency(100, 25.0)
+        self.assertEqual(_get_emails_per_task(), 240)
+
+    def test_moving_average(self):
+        _record_send_latency(100, 25.0)
+        _record_send_latency(0, 1.0)
+        self.assertEqual(_get_emails_per_task(), 240)
+        # The average moves a fifth of the way to the latest measurement:
+        _record_send_latency(100, 75.0)
+        self.assertEqual(_get_emails_per_task(), 171)
+
+    def test_min_emails(self):
+        _record_send_latency(10, 60.0)
+        self.assertEqual(_get_emails_per_task(), 20)
+
+    def test_max_emails(self):
+        _record_send_latency(10000, 1.0)
+        self.assertEqual(_get_emails_per_task(), 1000)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Performance test of sending bulk email through a local SMTP server standing in
+for the real one, with fixed and with adaptive subtask sizes.
+"""
+import asyncore
+import json
+import smtpd
+import threading
+import time
+import unittest
+from timeit import default_timer
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from bulk_email.models import SEND_TO_LEARNERS, CourseEmail
+from bulk_email.tasks import SEND_LATENCY_CACHE_KEY, _get_emails_per_task
+from lms.djangoapps.instructor_task.models import InstructorTask
+from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
+from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskCourseTestCase
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+
+# Number of learners enrolled in the course.
+NUM_LEARNERS = 500
+
+# Number of seconds the stand-in SMTP server takes to accept each message.
+SMTP_LATENCY = 0.002
+
+
+class SlowSMTPServer(smtpd.SMTPServer):
+    """
+    SMTP server that discards messages, after taking `latency` seconds to
+    accept each of them.
+    """
+
+    def __init__(self, latency):
+        smtpd.SMTPServer.__init__(self, ('localhost', 0), None)
+        self.latency = latency
+        self.num_messages = 0
+        self.port = self.socket.getsockname()[1]
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+
+    def process_message(self, peer, mailfrom, rcpttos, data):
+        time.sleep(self.latency)
+        self.num_messages += 1
+
+    def _serve(self):
+        """Handles connections until the server is stopped."""
+        while not self._stopped.is_set():
+            asyncore.loop(timeout=0.05, count=1)
+
+    def start(self):
+        """Starts handling connections in a background thread."""
+        self._thread.start()
+
+    def stop(self):
+        """Stops handling connections and closes the server."""
+        self._stopped.set()
+        self._thread.join()
+        self.close()
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class BulkEmailSendPerf(InstructorTaskCourseTestCase):
+    """
+    Compares the wall time of queueing subtasks for and sending an email to
+    all learners of a course, with fixed subtask sizes and with subtasks sized
+    by the send latency measured by earlier emails.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(BulkEmailSendPerf, self).setUp()
+        self.initialize_course()
+        self.instructor = self.create_instructor('instructor')
+        call_command("loaddata", "course_email_template.json")
+        for _ in range(NUM_LEARNERS):
+            CourseEnrollmentFactory.create(user=UserFactory.create(), course_id=self.course.id)
+
+        self.smtp_server = SlowSMTPServer(SMTP_LATENCY)
+        self.smtp_server.start()
+        self.addCleanup(self.smtp_server.stop)
+        cache.delete(SEND_LATENCY_CACHE_KEY)
+
+    def _send_email(self):
+        """
+        Sends an email to all learners of the course, and returns the
+        InstructorTask that sent it.
+        """
+        course_email = CourseEmail.create(
+            self.course.id, self.instructor, [SEND_TO_LEARNERS], "Test Subject", "<p>This is a test message</p>"
+        )
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            requester=self.instructor,
+            task_input=json.dumps({'email_id': course_email.id}),
+            task_key='dummy value',
+            task_id=str(uuid4()),
+        )
+        send_bulk_course_email.apply([entry.id, {}], task_id=entry.task_id).get()
+        return InstructorTask.objects.get(id=entry.id)
+
+    def test_send(self):
+        print
+        print '{:>10} {:>16} {:>10} {:>12}'.format('mode', 'emails per task', 'subtasks', 'time (ms)')
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='localhost',
+            EMAIL_PORT=self.smtp_server.port,
+            EMAIL_USE_TLS=False,
+            BULK_EMAIL_EMAILS_PER_TASK=100,
+            BULK_EMAIL_MIN_EMAILS_PER_TASK=20,
+            BULK_EMAIL_MAX_EMAILS_PER_TASK=1000,
+        ):
+            # Each email measures the send latency used to size the subtasks of the next.
+            for mode, seconds_per_task in (('fixed', 0), ('adaptive', 0.1), ('adaptive', 0.5)):
+                with override_settings(BULK_EMAIL_SECONDS_PER_TASK=seconds_per_task):
+                    emails_per_task = _get_emails_per_task()
+                    start = default_timer()
+                    entry = self._send_email()
+                    duration = default_timer() - start
+
+                self.assertEqual(json.loads(entry.task_output)['succeeded'], NUM_LEARNERS)
+                print '{:>10} {:>16} {:>10} {:>12.1f}'.format(
+                    mode, emails_per_task, json.loads(entry.subtasks)['total'], duration * 1000,
+                )
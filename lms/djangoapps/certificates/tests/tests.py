@@ -12,7 +12,8 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_info_for_user,
-    certificate_status_for_student
+    certificate_status_for_student,
+    certificate_statuses_for_student
 )
 from certificates.tests.factories import GeneratedCertificateFactory
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
@@ -36,6 +37,22 @@ class CertificatesModelTest(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        courses = [CourseFactory.create(org='edx', number='cert{}'.format(index)) for index in range(2)]
+        GeneratedCertificateFactory.create(
+            user=student,
+            course_id=courses[0].id,
+            status=CertificateStatuses.downloadable,
+            mode=GeneratedCertificate.MODES.verified,
+        )
+
+        with self.assertNumQueries(1):
+            certificate_statuses = certificate_statuses_for_student(student, [course.id for course in courses])
+        self.assertEqual(certificate_statuses[courses[0].id]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(certificate_statuses[courses[0].id]['mode'], GeneratedCertificate.MODES.verified)
+        self.assertEqual(certificate_statuses[courses[1].id]['status'], CertificateStatuses.unavailable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
@@ -2,12 +2,33 @@
 Serializers for Course Blocks related return objects.
 """
 from django.conf import settings
+from django.utils.encoding import iri_to_uri
 from rest_framework import serializers
 from rest_framework.reverse import reverse
+from rest_framework.utils.encoders import JSONEncoder
 
 from .transformers import SUPPORTED_FIELDS
 
 
+def get_block_field(block_structure, block_key, transformer, field_name, default):
+    """
+    Get the field value requested.  The field may be an XBlock field, a
+    transformer block field, or an entire tranformer block data dict.
+    """
+    value = None
+    if transformer is None:
+        value = block_structure.get_xblock_field(block_key, field_name)
+    elif field_name is None:
+        try:
+            value = block_structure.get_transformer_block_data(block_key, transformer).fields
+        except KeyError:
+            pass
+    else:
+        value = block_structure.get_transformer_block_field(block_key, transformer, field_name)
+
+    return value if (value is not None) else default
+
+
 class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     """
     Serializer for single course block
@@ -17,18 +38,7 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
         Get the field value requested.  The field may be an XBlock field, a
         transformer block field, or an entire tranformer block data dict.
         """
-        value = None
-        if transformer is None:
-            value = self.context['block_structure'].get_xblock_field(block_key, field_name)
-        elif field_name is None:
-            try:
-                value = self.context['block_structure'].get_transformer_block_data(block_key, transformer).fields
-            except KeyError:
-                pass
-        else:
-            value = self.context['block_structure'].get_transformer_block_field(block_key, transformer, field_name)
-
-        return value if (value is not None) else default
+        return get_block_field(self.context['block_structure'], block_key, transformer, field_name, default)
 
     def to_representation(self, block_key):
         """
@@ -94,3 +104,125 @@ class BlockDictSerializer(serializers.Serializer):  # pylint: disable=abstract-m
             unicode(block_key): BlockSerializer(block_key, context=self.context).data
             for block_key in structure
         }
+
+
+class BlockStreamSerializer(object):
+    """
+    Serializer that encodes the blocks of a BlockStructure to JSON one
+    block at a time, for a streaming response.
+
+    The output is the JSON encoding of what BlockDictSerializer or
+    BlockSerializer(many=True) would return, rendered as DRF's
+    JSONRenderer would, but without building the whole response in
+    memory or going through DRF's field machinery for each block.
+    """
+    def __init__(self, block_structure, context):
+        self.block_structure = block_structure
+        self.request = context['request']
+        requested_fields = context['requested_fields']
+
+        self.supported_fields = [
+            supported_field for supported_field in SUPPORTED_FIELDS
+            if supported_field.requested_field_name in requested_fields
+        ]
+        self.include_children = 'children' in requested_fields
+        self.include_lti_url = settings.FEATURES.get("ENABLE_LTI_PROVIDER") and 'lti_url' in requested_fields
+
+        # Same separators and handling of non-ASCII characters as DRF's
+        # JSONRenderer with its default settings.
+        self.encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+        self._url_templates = {}
+
+    def iter_dict(self):
+        """
+        Yields the UTF-8 encoded chunks of the JSON encoding of the blocks,
+        formatted as BlockDictSerializer formats them.
+        """
+        yield u'{{"root":{},"blocks":{{'.format(
+            self.encoder.encode(unicode(self.block_structure.root_block_usage_key))
+        ).encode('utf-8')
+        separator = u''
+        for block_key in self.block_structure:
+            yield u'{}{}:{}'.format(
+                separator, self.encoder.encode(unicode(block_key)), self.encode_block(block_key)
+            ).encode('utf-8')
+            separator = u','
+        yield '}}'
+
+    def iter_list(self):
+        """
+        Yields the UTF-8 encoded chunks of the JSON encoding of the blocks,
+        formatted as a list, as BlockSerializer(many=True) formats them.
+        """
+        yield '['
+        separator = u''
+        for block_key in self.block_structure:
+            yield u'{}{}'.format(separator, self.encode_block(block_key)).encode('utf-8')
+            separator = u','
+        yield ']'
+
+    def encode_block(self, block_key):
+        """
+        Returns the JSON encoding of the given block, as a unicode string.
+        """
+        block_key_string = unicode(block_key)
+        course_id = unicode(block_key.course_key)
+        data = {
+            'id': block_key_string,
+            'block_id': unicode(block_key.block_id),
+            'lms_web_url': self._block_url(
+                'jump_to', block_key_string, course_id=course_id, location=block_key_string,
+            ),
+            'student_view_url': self._block_url(
+                'courseware.views.views.render_xblock', block_key_string, usage_key_string=block_key_string,
+            ),
+        }
+
+        if self.include_lti_url:
+            data['lti_url'] = self._block_url(
+                'lti_provider_launch', block_key_string, course_id=course_id, usage_id=block_key_string,
+            )
+
+        for supported_field in self.supported_fields:
+            field_value = get_block_field(
+                self.block_structure,
+                block_key,
+                supported_field.transformer,
+                supported_field.block_field_name,
+                supported_field.default_value,
+            )
+            if field_value is not None:
+                # only return fields that have data
+                data[supported_field.serializer_field_name] = field_value
+
+        if self.include_children:
+            children = self.block_structure.get_children(block_key)
+            if children:
+                data['children'] = [unicode(child) for child in children]
+
+        return self.encoder.encode(data)
+
+    def _block_url(self, url_name, block_key_string, **kwargs):
+        """
+        Returns the absolute URL with the given name and kwargs for the
+        block with the given usage key.
+
+        Reversing a URL for every block is relatively expensive, so the
+        first URL reversed with each name and the same kwargs other than
+        the usage key is split around the usage key into a template for
+        the URLs of the other blocks.
+        """
+        template_key = (url_name, frozenset(
+            (name, value) for name, value in kwargs.iteritems() if value != block_key_string
+        ))
+        template = self._url_templates.get(template_key)
+        if template is not None and iri_to_uri(block_key_string) == block_key_string:
+            return template.format(block_key_string)
+
+        url = reverse(url_name, kwargs=kwargs, request=self.request)
+        if template is None and url.count(block_key_string) == 1:
+            self._url_templates[template_key] = url.replace('{', '{{').replace('}', '}}').replace(
+                block_key_string, '{}'
+            )
+        return url
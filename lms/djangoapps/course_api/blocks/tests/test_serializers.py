@@ -1,7 +1,11 @@
 """
 Tests for Course Blocks serializers
 """
+import json
+
+from django.test.client import RequestFactory
 from mock import MagicMock
+from rest_framework.renderers import JSONRenderer
 
 from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
@@ -11,7 +15,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
-from ..serializers import BlockDictSerializer, BlockSerializer
+from ..serializers import BlockDictSerializer, BlockSerializer, BlockStreamSerializer
 from ..transformers.blocks_api import BlocksAPITransformer
 from .helpers import deserialize_usage_key
 
@@ -231,3 +235,42 @@ class TestBlockDictSerializer(TestBlockSerializerBase):
             self.assert_extended_block(serialized_block)
             self.assert_staff_fields(serialized_block)
         self.assertEquals(len(serializer.data['blocks']), 29)
+
+
+class TestBlockStreamSerializer(TestBlockSerializerBase):
+    """
+    Tests the BlockStreamSerializer class, which encodes the blocks to JSON
+    one at a time.
+    """
+    def setUp(self):
+        super(TestBlockStreamSerializer, self).setUp()
+        # URLs are built from the request, so it can't be a mock.
+        self.serializer_context['request'] = RequestFactory().get('/')
+
+    def assert_same_json(self, context):
+        """
+        Verifies the streamed JSON decodes to the data rendered from
+        BlockDictSerializer and BlockSerializer.
+        """
+        serializer = BlockStreamSerializer(context['block_structure'], context)
+        for streamed, serializer_data in (
+                (serializer.iter_dict(), BlockDictSerializer(context['block_structure'], context=context).data),
+                (serializer.iter_list(), BlockSerializer(context['block_structure'], many=True, context=context).data),
+        ):
+            self.assertEquals(
+                json.loads(''.join(streamed)),
+                json.loads(JSONRenderer().render(serializer_data)),
+            )
+
+    def test_basic(self):
+        self.assert_same_json(self.serializer_context)
+
+    def test_additional_requested_fields(self):
+        self.add_additional_requested_fields()
+        self.assert_same_json(self.serializer_context)
+
+    def test_staff_fields(self):
+        context = self.create_staff_context()
+        context['request'] = self.serializer_context['request']
+        self.add_additional_requested_fields(context)
+        self.assert_same_json(context)
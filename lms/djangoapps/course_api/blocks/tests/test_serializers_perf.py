@@ -0,0 +1,117 @@
+"""
+Performance test comparing the DRF serializers of the Course Blocks API
+with the streaming BlockStreamSerializer.
+"""
+# pylint: disable=protected-access
+import unittest
+from timeit import default_timer
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+from rest_framework.renderers import JSONRenderer
+
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+
+from ..serializers import BlockDictSerializer, BlockStreamSerializer
+from ..transformers.block_counts import BlockCountsTransformer
+from ..transformers.block_depth import BlockDepthTransformer
+from ..transformers.student_view import StudentViewTransformer
+
+# Number of blocks in each generated course.
+COURSE_SIZES = (1000, 10000)
+
+# Number of children of each non-leaf block in a generated course.
+BRANCHING_FACTOR = 8
+
+# Number of times each serialization is timed.
+NUM_RUNS = 3
+
+# Fields requested from the API, as by the mobile apps.
+REQUESTED_FIELDS = [
+    'children', 'display_name', 'type', 'graded', 'format', 'due', 'block_counts',
+    'student_view_multi_device', 'student_view_url', 'lms_web_url',
+]
+
+
+def generate_block_structure(num_blocks):
+    """
+    Returns a transformed block structure for a generated course with
+    the given number of blocks, with the data the Blocks API transformers
+    set on real courses.
+    """
+    course_key = CourseLocator('org', 'perf', 'run{}'.format(num_blocks))
+
+    def block_key(index):
+        """
+        Returns the usage key of the block at the given index.
+        """
+        return BlockUsageLocator(course_key, 'course' if index == 0 else 'vertical', 'block{}'.format(index))
+
+    block_structure = BlockStructureBlockData(block_key(0))
+    for index in range(num_blocks):
+        key = block_key(index)
+        if index:
+            block_structure._add_relation(block_key((index - 1) // BRANCHING_FACTOR), key)
+        block_data = block_structure._get_or_create_block(key)
+        block_data.display_name = u'Block number {}'.format(index)
+        block_data.category = key.block_type
+        block_data.graded = bool(index % 3)
+        block_data.format = u'Homework' if index % 5 else None
+        block_structure.set_transformer_block_field(key, BlockCountsTransformer, 'video', index % 7)
+        block_structure.set_transformer_block_field(key, BlockDepthTransformer, 'block_depth', index % 4)
+        block_structure.set_transformer_block_field(
+            key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_MULTI_DEVICE, bool(index % 2),
+        )
+    return block_structure
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class BlockSerializerPerf(TestCase):
+    """
+    Compares the wall time and size of the largest chunk held in memory
+    of serializing all blocks of large courses to JSON with
+    BlockDictSerializer and with BlockStreamSerializer.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def _serialize_with_drf(self, context):
+        """
+        Returns the chunks of the JSON encoding of the blocks rendered
+        through BlockDictSerializer.
+        """
+        return [JSONRenderer().render(BlockDictSerializer(context['block_structure'], context=context).data)]
+
+    def _serialize_with_stream(self, context):
+        """
+        Returns the chunks of the JSON encoding of the blocks streamed by
+        BlockStreamSerializer.
+        """
+        return list(BlockStreamSerializer(context['block_structure'], context).iter_dict())
+
+    def test_serialize(self):
+        print
+        print '{:>8} {:>10} {:>12} {:>16}'.format('blocks', 'mode', 'time (ms)', 'max chunk (KB)')
+        for num_blocks in COURSE_SIZES:
+            context = {
+                'request': RequestFactory().get('/'),
+                'block_structure': generate_block_structure(num_blocks),
+                'requested_fields': REQUESTED_FIELDS,
+            }
+            for mode, serialize in (('drf', self._serialize_with_drf), ('stream', self._serialize_with_stream)):
+                timings = []
+                for _ in range(NUM_RUNS):
+                    start = default_timer()
+                    chunks = serialize(context)
+                    timings.append(default_timer() - start)
+
+                print '{:>8} {:>10} {:>12.1f} {:>16.1f}'.format(
+                    num_blocks,
+                    mode,
+                    min(timings) * 1000,
+                    max(len(chunk) for chunk in chunks) / 1024.0,
+                )
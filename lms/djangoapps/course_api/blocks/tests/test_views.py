@@ -1,12 +1,14 @@
 """
 Tests for Blocks Views
 """
+import json
 from datetime import datetime
 from string import join
 from urllib import urlencode
 from urlparse import urlunparse
 
 from django.core.urlresolvers import reverse
+from mock import patch
 from opaque_keys.edx.locator import CourseLocator
 
 from student.models import CourseEnrollment
@@ -233,6 +235,21 @@ class TestBlocksView(SharedModuleStoreTestCase):
         )
         self.verify_response_with_requested_fields(response)
 
+    def test_streaming(self):
+        self.query_params.update({'requested_fields': self.requested_fields, 'block_counts': ['video']})
+        for return_type in ('dict', 'list'):
+            self.query_params['return_type'] = return_type
+            response = self.verify_response()
+            with patch.dict('django.conf.settings.FEATURES', {'ENABLE_BLOCKS_API_STREAMING': True}):
+                streaming_response = self.verify_response()
+
+            self.assertTrue(streaming_response.streaming)
+            self.assertEquals(streaming_response['Content-Type'], 'application/json')
+            self.assertEquals(
+                json.loads(''.join(streaming_response.streaming_content)),
+                json.loads(response.content),
+            )
+
     def test_with_list_field_url(self):
         query = urlencode(self.query_params.items() + [
             ('requested_fields', self.requested_fields[0]),
@@ -1,15 +1,16 @@
 """
 Block Counts Transformer
 """
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import BlockVisitor, VisitingTransformerMixin
 
 
-class BlockCountsTransformer(BlockStructureTransformer):
+class BlockCountsTransformer(VisitingTransformerMixin):
     """
     Keep a count of descendant blocks of the requested types
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     BLOCK_COUNTS = 'block_counts'
 
     def __init__(self, block_types_to_count):
@@ -28,14 +29,19 @@ class BlockCountsTransformer(BlockStructureTransformer):
         # collect basic xblock fields
         block_structure.request_xblock_fields('category')
 
-    def transform(self, usage_info, block_structure):
+    def transform_block_visitors(self, usage_info, block_structure):
         """
-        Mutates block_structure based on the given usage_info.
+        Returns a visitor that counts the descendants of each block, after
+        those of its children.
         """
         if not self.block_types_to_count:
-            return
+            return []
 
-        for block_key in block_structure.post_order_traversal():
+        def count_descendants(block_key):
+            """
+            Sets the number of descendants of each requested type of the
+            given block, including itself.
+            """
             for block_type in self.block_types_to_count:
                 descendants_type_count = sum([
                     block_structure.get_transformer_block_field(child_key, self, block_type, 0)
@@ -50,3 +56,5 @@ class BlockCountsTransformer(BlockStructureTransformer):
                         (1 if (block_structure.get_xblock_field(block_key, 'category') == block_type) else 0)
                     )
                 )
+
+        return [BlockVisitor(count_descendants, order=BlockVisitor.POST_ORDER)]
@@ -1,16 +1,17 @@
 """
 Block Depth Transformer
 """
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import BlockVisitor, VisitingTransformerMixin
 
 
-class BlockDepthTransformer(BlockStructureTransformer):
+class BlockDepthTransformer(VisitingTransformerMixin):
     """
     Keep track of the depth of each block within the block structure.  In case
     of multiple paths to a given node (in a DAG), use the shallowest depth.
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     BLOCK_DEPTH = 'block_depth'
 
     def __init__(self, requested_depth=None):
@@ -38,11 +39,16 @@ class BlockDepthTransformer(BlockStructureTransformer):
             cls.BLOCK_DEPTH,
         )
 
-    def transform(self, usage_info, block_structure):
+    def transform_block_visitors(self, usage_info, block_structure):
         """
-        Mutates block_structure based on the given usage_info.
+        Returns a visitor that sets the depth of each block, after those
+        of its parents, then removes the blocks deeper than the requested
+        depth, if any.
         """
-        for block_key in block_structure.topological_traversal():
+        def set_block_depth(block_key):
+            """
+            Sets the depth of the given block.
+            """
             parents = block_structure.get_parents(block_key)
             if parents:
                 block_depth = min(
@@ -58,7 +64,16 @@ class BlockDepthTransformer(BlockStructureTransformer):
                 block_depth
             )
 
-        if self.requested_depth is not None:
+        def remove_deeper_blocks():
+            """
+            Removes the blocks deeper than the requested depth.
+            """
             block_structure.remove_block_traversal(
                 lambda block_key: self.get_block_depth(block_structure, block_key) > self.requested_depth
             )
+
+        return [BlockVisitor(
+            set_block_depth,
+            order=BlockVisitor.TOPOLOGICAL,
+            finish=remove_deeper_blocks if self.requested_depth is not None else None,
+        )]
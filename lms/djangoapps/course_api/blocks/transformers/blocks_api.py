@@ -1,7 +1,7 @@
 """
 Blocks API Transformer
 """
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import VisitingTransformerMixin
 
 from .block_counts import BlockCountsTransformer
 from .block_depth import BlockDepthTransformer
@@ -9,7 +9,7 @@ from .navigation import BlockNavigationTransformer
 from .student_view import StudentViewTransformer
 
 
-class BlocksAPITransformer(BlockStructureTransformer):
+class BlocksAPITransformer(VisitingTransformerMixin):
     """
     Umbrella transformer that contains all the transformers needed by the
     Course Blocks API.
@@ -21,10 +21,14 @@ class BlocksAPITransformer(BlockStructureTransformer):
         BlockNavigationTransformer
 
     Note: BlockDepthTransformer must be executed before BlockNavigationTransformer.
+
+    The block visitors of the contained transformers share traversals of
+    the block structure where their orders allow.
     """
 
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -55,11 +59,16 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
         # TODO support olx_data by calling export_to_xml(?)
 
-    def transform(self, usage_info, block_structure):
+    def transform_block_visitors(self, usage_info, block_structure):
         """
-        Mutates block_structure based on the given usage_info.
+        Returns the block visitors of the contained transformers, in order.
         """
-        StudentViewTransformer(self.requested_student_view_data).transform(usage_info, block_structure)
-        BlockCountsTransformer(self.block_types_to_count).transform(usage_info, block_structure)
-        BlockDepthTransformer(self.depth).transform(usage_info, block_structure)
-        BlockNavigationTransformer(self.nav_depth).transform(usage_info, block_structure)
+        visitors = []
+        for transformer in (
+                StudentViewTransformer(self.requested_student_view_data),
+                BlockCountsTransformer(self.block_types_to_count),
+                BlockDepthTransformer(self.depth),
+                BlockNavigationTransformer(self.nav_depth),
+        ):
+            visitors.extend(transformer.transform_block_visitors(usage_info, block_structure))
+        return visitors
@@ -1,7 +1,7 @@
 """
 TODO
 """
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import BlockVisitor, VisitingTransformerMixin
 
 from .block_depth import BlockDepthTransformer
 
@@ -14,7 +14,7 @@ class DescendantList(object):
         self.items = []
 
 
-class BlockNavigationTransformer(BlockStructureTransformer):
+class BlockNavigationTransformer(VisitingTransformerMixin):
     """
     Creates a table of contents for the course.
 
@@ -23,6 +23,7 @@ class BlockNavigationTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     BLOCK_NAVIGATION = 'block_nav'
     BLOCK_NAVIGATION_FOR_CHILDREN = 'children_block_nav'
 
@@ -42,15 +43,19 @@ class BlockNavigationTransformer(BlockStructureTransformer):
         # collect basic xblock fields
         block_structure.request_xblock_fields('hide_from_toc')
 
-    def transform(self, usage_info, block_structure):
+    def transform_block_visitors(self, usage_info, block_structure):
         """
-        Mutates block_structure based on the given usage_info.
+        Returns a visitor that sets the navigation of each block, after
+        those of its parents.
         """
         if self.nav_depth is None:
-            return
-
-        for block_key in block_structure.topological_traversal():
+            return []
 
+        def set_block_navigation(block_key):
+            """
+            Adds the given block to the navigation of its ancestors, and
+            sets its own navigation if it's within the navigation depth.
+            """
             parents = block_structure.get_parents(block_key)
             parents_descendants_list = set()
             for parent_key in parents:
@@ -92,3 +97,5 @@ class BlockNavigationTransformer(BlockStructureTransformer):
                 self.BLOCK_NAVIGATION_FOR_CHILDREN,
                 children_descendants_list
             )
+
+        return [BlockVisitor(set_block_navigation, order=BlockVisitor.TOPOLOGICAL)]
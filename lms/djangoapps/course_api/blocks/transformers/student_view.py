@@ -1,15 +1,16 @@
 """
 Student View Transformer
 """
-from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from openedx.core.djangoapps.content.block_structure.transformer import BlockVisitor, VisitingTransformerMixin
 
 
-class StudentViewTransformer(BlockStructureTransformer):
+class StudentViewTransformer(VisitingTransformerMixin):
     """
     Only show information that is appropriate for a learner
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -68,10 +69,17 @@ class StudentViewTransformer(BlockStructureTransformer):
                     student_view_data,
                 )
 
-    def transform(self, usage_info, block_structure):
+    def transform_block_visitors(self, usage_info, block_structure):
         """
-        Mutates block_structure based on the given usage_info.
+        Returns a visitor that removes the student_view_data of each
+        block of a category it wasn't requested for.
         """
-        for block_key in block_structure.post_order_traversal():
+        def remove_student_view_data(block_key):
+            """
+            Removes the student_view_data of the given block, unless it
+            was requested for its category.
+            """
             if block_structure.get_xblock_field(block_key, 'category') not in self.requested_student_view_data:
                 block_structure.remove_transformer_block_field(block_key, self, self.STUDENT_VIEW_DATA)
+
+        return [BlockVisitor(remove_student_view_data)]
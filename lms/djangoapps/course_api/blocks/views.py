@@ -1,11 +1,13 @@
 """
 CourseBlocks API views
 """
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from rest_framework.generics import ListAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 from openedx.core.lib.api.view_utils import DeveloperErrorViewMixin, view_auth_classes
@@ -194,24 +196,33 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
         if not params.is_valid():
             raise ValidationError(params.errors)
 
+        # Stream JSON responses, bypassing the renderer, when enabled.
+        stream = (
+            settings.FEATURES.get('ENABLE_BLOCKS_API_STREAMING', False) and
+            isinstance(request.accepted_renderer, JSONRenderer)
+        )
+
         try:
-            return Response(
-                get_blocks(
-                    request,
-                    params.cleaned_data['usage_key'],
-                    params.cleaned_data['user'],
-                    params.cleaned_data['depth'],
-                    params.cleaned_data.get('nav_depth'),
-                    params.cleaned_data['requested_fields'],
-                    params.cleaned_data.get('block_counts', []),
-                    params.cleaned_data.get('student_view_data', []),
-                    params.cleaned_data['return_type'],
-                    params.cleaned_data.get('block_types_filter', None),
-                )
+            blocks = get_blocks(
+                request,
+                params.cleaned_data['usage_key'],
+                params.cleaned_data['user'],
+                params.cleaned_data['depth'],
+                params.cleaned_data.get('nav_depth'),
+                params.cleaned_data['requested_fields'],
+                params.cleaned_data.get('block_counts', []),
+                params.cleaned_data.get('student_view_data', []),
+                params.cleaned_data['return_type'],
+                params.cleaned_data.get('block_types_filter', None),
+                stream=stream,
             )
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(exception.message))
 
+        if stream:
+            return StreamingHttpResponse(blocks, content_type='application/json')
+        return Response(blocks)
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
@@ -26,6 +26,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -64,6 +65,10 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
         ):
             xblock = block_structure.get_xblock(block_key)
             for child_key in xblock.children:
+                if child_key not in block_structure:
+                    # The child is not part of a partially collected
+                    # structure, so its collected data is unchanged.
+                    continue
                 summary = summarize_block(child_key)
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
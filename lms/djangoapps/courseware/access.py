@@ -37,8 +37,10 @@ from courseware.masquerade import get_masquerade_role, is_masquerading_as_studen
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from mobile_api.models import IgnoreMobileAvailableFlagConfig
+from openedx.core.djangoapps import monitoring_utils
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.external_auth.models import ExternalAuthMap
+from request_cache import get_cache
 from student import auth
 from student.models import CourseEnrollmentAllowed
 from student.roles import (
@@ -49,6 +51,7 @@ from student.roles import (
     GlobalStaff,
     OrgInstructorRole,
     OrgStaffRole,
+    RoleCache,
     SupportStaffRole
 )
 from util import milestones_helpers as milestones_helpers
@@ -64,6 +67,9 @@ from xmodule.x_module import XModule
 
 log = logging.getLogger(__name__)
 
+# Namespace of the request cache of access decisions.
+ACCESS_CACHE_NAMESPACE = u'courseware.access.has_access'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -123,11 +129,70 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    When FEATURES['ENABLE_ACCESS_DECISION_CACHE'] is set, decisions are
+    cached for the rest of the request, so changes to the user's roles or
+    to the object during the request aren't taken into account.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    cache_key = _access_cache_key(user, action, obj, course_key)
+    if cache_key is None:
+        return _has_access(user, action, obj, course_key)
+
+    cache = get_cache(ACCESS_CACHE_NAMESPACE)
+    try:
+        response = cache[cache_key]
+    except KeyError:
+        monitoring_utils.increment(u'courseware.access.cache.{}.misses'.format(action))
+        if not hasattr(user, '_roles') and user.is_authenticated():
+            # Load all the roles of the user at once, rather than on
+            # the first role check of the decision.
+            user._roles = RoleCache(user)  # pylint: disable=protected-access
+        response = cache[cache_key] = _has_access(user, action, obj, course_key)
+    else:
+        monitoring_utils.increment(u'courseware.access.cache.{}.hits'.format(action))
+    return response
+
+
+def _access_cache_key(user, action, obj, course_key):
+    """
+    Returns the key of the access decision of the given user for the given
+    action on the given object in the request cache, or None if it must
+    not be cached.
+    """
+    if not settings.FEATURES.get('ENABLE_ACCESS_DECISION_CACHE', False):
+        return None
+
+    # Masquerading changes decisions during the request.
+    if getattr(user, 'masquerade_settings', None):
+        return None
+
+    # Unsaved users can't be told apart.
+    if user.id is None and user.is_authenticated():
+        return None
+
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
+        obj_key = obj.id
+    elif isinstance(obj, (XBlock, XModule)):
+        obj_key = obj.location
+    elif isinstance(obj, (CourseKey, UsageKey, basestring)):
+        obj_key = obj
+    else:
+        return None
+
+    # Different types of objects with the same key, like a descriptor and
+    # its module, may not have the same access rules.
+    return (user.id, action, type(obj), obj_key, course_key)
+
+
+def _has_access(user, action, obj, course_key=None):
+    """
+    Returns whether the given user has the access to do the given action
+    on the given object, without caching.  See has_access.
+    """
     # Preview mode is only accessible by staff.
     if in_preview_mode() and course_key:
         if not has_staff_access_to_preview_mode(user, course_key):
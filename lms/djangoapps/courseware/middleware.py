@@ -4,6 +4,7 @@ Middleware for the courseware app
 
 from django.shortcuts import redirect
 
+from courseware.model_data import UserStateWriteBuffer
 from lms.djangoapps.courseware.exceptions import Redirect
 
 
@@ -17,3 +18,26 @@ class RedirectMiddleware(object):
         """
         if isinstance(exception, Redirect):
             return redirect(exception.url)
+
+
+class UserStateWriteBehindMiddleware(object):
+    """
+    Save the XBlock user state writes buffered while handling a request, when
+    the ``ENABLE_USER_STATE_WRITE_BEHIND`` feature is enabled.
+
+    This must come after RequestCache in MIDDLEWARE_CLASSES, so that the
+    writes are saved before the request cache holding them is cleared.
+    """
+    def process_response(self, _request, response):
+        """
+        Save the buffered writes once the response is ready.
+        """
+        UserStateWriteBuffer.flush()
+        return response
+
+    def process_exception(self, _request, _exception):
+        """
+        Save the buffered writes of a failed request, as they would have been
+        saved without buffering.
+        """
+        UserStateWriteBuffer.flush()
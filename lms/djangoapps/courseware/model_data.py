@@ -21,13 +21,22 @@ UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 """
 
+import hashlib
 import json
 import logging
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+from uuid import uuid4
 
+from celery.signals import task_postrun
 from contracts import contract, new_contract
-from django.db import DatabaseError
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import CourseKey
@@ -36,7 +45,9 @@ from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
+import request_cache
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.djangoapps import monitoring_utils
 from xmodule.modulestore.django import modulestore
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
@@ -341,15 +352,273 @@ class DjangoOrmFieldCache(object):
         raise NotImplementedError()
 
 
+def _hashed(key):
+    """
+    Return a fixed-length digest of ``key``, safe for use in a cache key.
+    """
+    return hashlib.sha1(unicode(key).encode('utf-8')).hexdigest()
+
+
+class SharedUserStateCache(object):
+    """
+    Cross-request cache of Scope.user_state field data for a single user,
+    stored in the default Django cache.
+
+    Entries are namespaced by a version kept per user and course. Any save
+    or delete of one of the user's StudentModules in a course replaces that
+    version, which invalidates all of the user's entries for the course at
+    once; stale entries are never read again and simply expire.
+
+    A write made in a transaction is visible to other requests only once the
+    transaction commits, so the version is replaced again once the request or
+    celery task making the write ends. See :meth:`invalidate_on_commit`.
+    """
+    KEY_PREFIX = 'courseware.user_state'
+
+    # Number of seconds an entry is kept in the cache.
+    TIMEOUT = 60 * 60
+
+    # Holds the (user id, course key) pairs of the state written by the current
+    # thread in transactions which may not have been committed yet.
+    _uncommitted = threading.local()
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+
+    @classmethod
+    def _version_key(cls, user_id, course_key):
+        """
+        Return the cache key of the version of ``user_id``'s state in ``course_key``.
+        """
+        return u'{}.version.{}.{}'.format(cls.KEY_PREFIX, user_id, _hashed(course_key))
+
+    def _entry_key(self, version, usage_key):
+        """
+        Return the cache key of the state of ``usage_key`` as of ``version``.
+        """
+        return u'{}.{}.{}.{}'.format(self.KEY_PREFIX, version, self.user_id, _hashed(usage_key))
+
+    def versions(self, course_keys):
+        """
+        Return a dict mapping each of ``course_keys`` to the current version
+        of this user's state in that course, creating versions as needed.
+
+        Versions must be read before the state they are used to store is
+        loaded from the database, so that a committed write which lands in
+        between invalidates what is stored rather than being hidden by it.
+        """
+        version_keys = {self._version_key(self.user_id, course_key): course_key for course_key in course_keys}
+        cached_versions = cache.get_many(version_keys.keys())
+
+        versions = {}
+        for version_key, course_key in version_keys.iteritems():
+            version = cached_versions.get(version_key)
+            if version is None:
+                version = uuid4().hex
+                if not cache.add(version_key, version, None):
+                    version = cache.get(version_key, version)
+            versions[course_key] = version
+        return versions
+
+    def get_many(self, versions, usage_keys):
+        """
+        Return a dict mapping those of ``usage_keys`` that are in the cache to
+        their stored state. Blocks that are known to have no state map to ``{}``.
+
+        Arguments:
+            versions (dict): Versions, as returned by :meth:`versions`.
+            usage_keys (iterable of :class:`UsageKey`): The blocks to look up.
+        """
+        entry_keys = {
+            self._entry_key(versions[usage_key.course_key], usage_key): usage_key
+            for usage_key in usage_keys
+        }
+        return {
+            entry_keys[entry_key]: state
+            for entry_key, state in cache.get_many(entry_keys.keys()).iteritems()
+        }
+
+    def set_many(self, versions, block_states):
+        """
+        Store ``block_states``, a dict mapping :class:`UsageKey` to state
+        dicts, as of ``versions``.
+        """
+        cache.set_many(
+            {
+                self._entry_key(versions[usage_key.course_key], usage_key): state
+                for usage_key, state in block_states.iteritems()
+            },
+            self.TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate(cls, user_id, course_key):
+        """
+        Invalidate all cached state of ``user_id`` in ``course_key``.
+        """
+        cache.set(cls._version_key(user_id, course_key), uuid4().hex, None)
+
+    @classmethod
+    def invalidate_on_commit(cls, user_id, course_key, using=None):
+        """
+        Invalidate all cached state of ``user_id`` in ``course_key`` now and,
+        if the write being invalidated for is in a transaction, once again
+        when the current request or celery task ends.
+
+        Until the transaction commits, a concurrent request may read the new
+        version, load the state as it was before the write, and store it
+        under that version. Django 1.8 has no commit hooks, but by the end of
+        the request or task its transactions have been committed.
+        """
+        cls.invalidate(user_id, course_key)
+        if transaction.get_connection(using).in_atomic_block:
+            cls._uncommitted_writes().add((user_id, course_key))
+
+    @classmethod
+    def _uncommitted_writes(cls):
+        """
+        Return the set of (user id, course key) pairs written by this thread
+        in transactions which may not have been committed yet.
+        """
+        if not hasattr(cls._uncommitted, 'writes'):
+            cls._uncommitted.writes = set()
+        return cls._uncommitted.writes
+
+    @classmethod
+    def invalidate_committed(cls):
+        """
+        Invalidate the state written in transactions by this thread, which
+        have since been committed.
+        """
+        writes = cls._uncommitted_writes()
+        while writes:
+            cls.invalidate(*writes.pop())
+
+
+@receiver(post_save, sender=StudentModule)
+@receiver(post_delete, sender=StudentModule)
+def invalidate_shared_user_state(sender, instance, using=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the shared user state cache whenever a StudentModule changes.
+
+    This covers writes made through :class:`UserStateCache` as well as those
+    made elsewhere, e.g. by rescoring or resetting attempts. Note that
+    QuerySet.update bypasses this signal.
+    """
+    SharedUserStateCache.invalidate_on_commit(instance.student_id, instance.course_id, using)
+
+
+@task_postrun.connect
+@receiver(request_finished)
+def invalidate_committed_user_state(**kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the shared user state cache again for the writes made in
+    transactions by the request or celery task that just ended.
+    """
+    SharedUserStateCache.invalidate_committed()
+
+
+class UserStateWriteBuffer(object):
+    """
+    Request-scoped buffer of Scope.user_state writes, used by
+    :class:`UserStateCache` when the ``ENABLE_USER_STATE_WRITE_BEHIND``
+    feature is enabled.
+
+    Writes made while handling a request are merged per block here rather
+    than being saved one block at a time, and are saved together, with one
+    bulk write per user, by :meth:`flush` when the response is returned.
+    Writes made outside of a request are saved immediately.
+    """
+    REQUEST_CACHE_NAME = 'courseware.model_data.user_state_writes'
+
+    @classmethod
+    def is_enabled(cls, user):
+        """
+        Return whether writes of ``user``'s state are buffered.
+        """
+        return (
+            settings.FEATURES.get('ENABLE_USER_STATE_WRITE_BEHIND', False) and
+            user.is_authenticated() and
+            request_cache.get_request() is not None
+        )
+
+    @classmethod
+    def _pending_writes(cls):
+        """
+        Return a dict mapping user ids to a (user, block states) tuple of
+        the writes waiting to be saved.
+        """
+        return request_cache.get_cache(cls.REQUEST_CACHE_NAME)
+
+    @classmethod
+    def add(cls, user, block_states):
+        """
+        Buffer the writes of ``block_states``, a dict mapping :class:`UsageKey`
+        to the fields to set on that block, for ``user``.
+        """
+        __, pending_states = cls._pending_writes().setdefault(user.id, (user, {}))
+        for usage_key, state in block_states.iteritems():
+            pending_states.setdefault(usage_key, {}).update(state)
+
+    @classmethod
+    def get_many(cls, user, usage_keys):
+        """
+        Return a dict mapping those of ``usage_keys`` that have buffered
+        writes for ``user`` to the fields they set.
+        """
+        __, pending_states = cls._pending_writes().get(user.id, (user, {}))
+        return {
+            usage_key: state
+            for usage_key, state in pending_states.iteritems()
+            if usage_key in usage_keys
+        }
+
+    @classmethod
+    def flush(cls, user=None):
+        """
+        Save the buffered writes for ``user``, or for all users if None.
+        """
+        pending_writes = cls._pending_writes()
+        user_ids = pending_writes.keys() if user is None else [user.id]
+        for user_id in user_ids:
+            if user_id not in pending_writes:
+                continue
+
+            user, block_states = pending_writes.pop(user_id)
+            try:
+                DjangoXBlockUserStateClient(user).bulk_set_many(user.username, block_states)
+            except DatabaseError:
+                log.exception("Saving buffered user state failed for %s", user.username)
+                raise
+            finally:
+                # Bulk writes don't send the post_save signal.
+                for course_key in {usage_key.course_key for usage_key in block_states}:
+                    SharedUserStateCache.invalidate_on_commit(user.id, course_key)
+            monitoring_utils.accumulate('xb_user_state.write_behind.blocks', len(block_states))
+
+
 class UserStateCache(object):
     """
     Cache for Scope.user_state xblock field data.
+
+    When the ``ENABLE_SHARED_USER_STATE_CACHE`` feature is enabled, state
+    is also read through a :class:`SharedUserStateCache`, so that it can be
+    reused across requests.
+
+    When the ``ENABLE_USER_STATE_WRITE_BEHIND`` feature is enabled, writes
+    made while handling a request are saved through a :class:`UserStateWriteBuffer`
+    at the end of the request. Writes still waiting to be saved are read back
+    by any cache for the same user, so they are visible for the rest of the request.
     """
     def __init__(self, user, course_id):
         self._cache = defaultdict(dict)
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        if self.user.is_authenticated() and settings.FEATURES.get('ENABLE_SHARED_USER_STATE_CACHE', False):
+            self._shared_cache = SharedUserStateCache(self.user.id)
+        else:
+            self._shared_cache = None
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -361,12 +630,50 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        block_field_state = self._client.get_many(
-            self.user.username,
-            _all_usage_keys(xblocks, aside_types),
-        )
-        for user_state in block_field_state:
-            self._cache[user_state.block_key] = user_state.state
+        usage_keys = _all_usage_keys(xblocks, aside_types)
+        if self._shared_cache is None:
+            self._load_block_states(usage_keys)
+        else:
+            self._load_shared_block_states(usage_keys)
+
+        # Writes waiting to be saved are newer than anything that was loaded.
+        for block_key, pending_state in UserStateWriteBuffer.get_many(self.user, usage_keys).iteritems():
+            state = dict(self._cache.get(block_key, {}))
+            state.update(pending_state)
+            self._cache[block_key] = state
+
+    def _load_shared_block_states(self, usage_keys):
+        """
+        Load the state of ``usage_keys`` into this cache from the shared
+        cache, and from the database for the blocks missing from it.
+        """
+        versions = self._shared_cache.versions({usage_key.course_key for usage_key in usage_keys})
+        cached_states = self._shared_cache.get_many(versions, usage_keys)
+        for block_key, state in cached_states.iteritems():
+            if state:
+                self._cache[block_key] = state
+
+        missing_keys = usage_keys.difference(cached_states)
+        monitoring_utils.accumulate('xb_user_state.shared_cache.hits', len(cached_states))
+        monitoring_utils.accumulate('xb_user_state.shared_cache.misses', len(missing_keys))
+        if not missing_keys:
+            return
+
+        # Blocks without any state are cached too, so that they aren't
+        # queried for again on the next request.
+        loaded_states = dict.fromkeys(missing_keys, {})
+        loaded_states.update(self._load_block_states(missing_keys))
+        self._shared_cache.set_many(versions, loaded_states)
+
+    def _load_block_states(self, usage_keys):
+        """
+        Load the state of ``usage_keys`` from the database into this cache,
+        and return a dict mapping the keys of blocks with state to that state.
+        """
+        block_states = {}
+        for user_state in self._client.get_many(self.user.username, usage_keys):
+            self._cache[user_state.block_key] = block_states[user_state.block_key] = user_state.state
+        return block_states
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
@@ -389,6 +696,7 @@ class UserStateCache(object):
 
         Returns: datetime if there was a modified date, or None otherwise
         """
+        UserStateWriteBuffer.flush(self.user)
         try:
             return self._client.get(
                 self.user.username,
@@ -413,6 +721,11 @@ class UserStateCache(object):
 
             pending_updates[cache_key][kvs_key.field_name] = value
 
+        if UserStateWriteBuffer.is_enabled(self.user):
+            UserStateWriteBuffer.add(self.user, pending_updates)
+            self._cache.update(pending_updates)
+            return
+
         try:
             self._client.set_many(
                 self.user.username,
@@ -460,6 +773,8 @@ class UserStateCache(object):
         if kvs_key.field_name not in field_state:
             raise KeyError(kvs_key.field_name)
 
+        # Save any buffered writes first, so that they can't restore the field.
+        UserStateWriteBuffer.flush(self.user)
         self._client.delete(self.user.username, cache_key, fields=[kvs_key.field_name])
         del field_state[kvs_key.field_name]
 
@@ -988,6 +1303,33 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def bulk_create_for_locations(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients with pre-fetched data for the given locations
+        for each of the given users, using a single query.
+
+        Returns a dict mapping each user id to its ScoresClient.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        for client in clients.itervalues():
+            client._has_fetched = True
+        if not (clients and scorable_locations):
+            return clients
+
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        # See fetch_scores for why the course key is mapped back in.
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created',
+        ):
+            scores = clients[user_id]._locations_to_scores
+            scores[location.map_into_course(course_id)] = cls.Score(correct, total, created)
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -32,6 +32,7 @@ from courseware.tests.helpers import LoginEnrollmentTestCase, masquerade_as_grou
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES
+from request_cache.middleware import RequestCache
 from student.models import CourseEnrollment
 from student.roles import CourseCcxCoachRole, CourseStaffRole
 from student.tests.factories import (
@@ -732,6 +733,57 @@ class UserRoleTestCase(TestCase):
         )
 
 
+@attr(shard=1)
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ACCESS_DECISION_CACHE': True})
+class AccessDecisionCacheTestCase(TestCase):
+    """
+    Tests for the request cache of has_access decisions.
+    """
+
+    def setUp(self):
+        super(AccessDecisionCacheTestCase, self).setUp()
+        self.course_key = CourseLocator('edX', 'toy', '2012_Fall')
+        self.course_staff = StaffFactory(course_key=self.course_key)
+        self.student = UserFactory()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_repeated_decisions(self):
+        with patch('courseware.access._has_access', wraps=access._has_access) as mock_has_access:
+            with patch('openedx.core.djangoapps.monitoring_utils.increment') as mock_increment:
+                for _ in range(3):
+                    self.assertTrue(access.has_access(self.course_staff, 'staff', self.course_key))
+                    self.assertFalse(access.has_access(self.student, 'staff', self.course_key))
+
+        self.assertEqual(mock_has_access.call_count, 2)
+        self.assertEqual(
+            [call[0][0] for call in mock_increment.call_args_list],
+            ['courseware.access.cache.staff.misses'] * 2 + ['courseware.access.cache.staff.hits'] * 4,
+        )
+
+    def test_roles_preloaded(self):
+        user = User.objects.get(id=self.course_staff.id)
+        with self.assertNumQueries(1):
+            self.assertTrue(access.has_access(user, 'staff', self.course_key))
+        with self.assertNumQueries(0):
+            self.assertFalse(access.has_access(user, 'instructor', self.course_key))
+            self.assertTrue(access.has_access(user, 'staff', self.course_key))
+
+    def test_masquerade_not_cached(self):
+        self.assertTrue(access.has_access(self.course_staff, 'staff', self.course_key))
+        self.course_staff.masquerade_settings = {
+            self.course_key: CourseMasquerade(self.course_key, role='student')
+        }
+        self.assertFalse(access.has_access(self.course_staff, 'staff', self.course_key))
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_ACCESS_DECISION_CACHE': False})
+    def test_disabled(self):
+        with patch('courseware.access._has_access', wraps=access._has_access) as mock_has_access:
+            for _ in range(3):
+                access.has_access(self.course_staff, 'staff', self.course_key)
+        self.assertEqual(mock_has_access.call_count, 3)
+
+
 @attr(shard=3)
 @ddt.ddt
 class CourseOverviewAccessTestCase(ModuleStoreTestCase):
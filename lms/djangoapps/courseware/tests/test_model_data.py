@@ -4,16 +4,24 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 import json
 from functools import partial
 
+import crum
+from celery.signals import task_postrun
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.db import DatabaseError
-from django.test import TestCase
-from mock import Mock, patch
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+from mock import Mock, call, patch
 from nose.plugins.attrib import attr
 from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.middleware import UserStateWriteBehindMiddleware
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError, SharedUserStateCache
 from courseware.models import (
+    BaseStudentModuleHistory,
     StudentModule,
     XModuleStudentInfoField,
     XModuleStudentPrefsField,
@@ -27,6 +35,7 @@ from courseware.tests.factories import (
     course_id,
     location
 )
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 
 
@@ -291,6 +300,211 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+@attr(shard=1)
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestSharedUserStateCache(TestCase):
+    """Tests for caching user_state across requests"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestSharedUserStateCache, self).setUp()
+        cache.clear()
+        features_patcher = patch.dict(settings.FEATURES, {'ENABLE_SHARED_USER_STATE_CACHE': True})
+        features_patcher.start()
+        self.addCleanup(features_patcher.stop)
+
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value'}))
+        self.user = student_module.student
+
+    def load_kvs(self):
+        """Return a DjangoKeyValueStore for a new FieldDataCache, as a new request would"""
+        return DjangoKeyValueStore(
+            FieldDataCache([mock_descriptor([mock_field(Scope.user_state, 'a_field')])], course_id, self.user)
+        )
+
+    def test_reused_across_requests(self):
+        with self.assertNumQueries(1):
+            self.assertEquals('a_value', self.load_kvs().get(user_state_key('a_field')))
+        with self.assertNumQueries(0):
+            self.assertEquals('a_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def test_missing_state_is_cached(self):
+        StudentModule.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertFalse(self.load_kvs().has(user_state_key('a_field')))
+        with self.assertNumQueries(0):
+            self.assertFalse(self.load_kvs().has(user_state_key('a_field')))
+
+    def test_set_many_invalidates(self):
+        self.load_kvs().set_many({user_state_key('a_field'): 'new_value'})
+        with self.assertNumQueries(1):
+            self.assertEquals('new_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def test_delete_invalidates(self):
+        self.load_kvs().delete(user_state_key('a_field'))
+        with self.assertNumQueries(1):
+            self.assertFalse(self.load_kvs().has(user_state_key('a_field')))
+
+    def test_outside_write_invalidates(self):
+        self.load_kvs()
+        student_module = StudentModule.objects.get()
+        student_module.state = json.dumps({'a_field': 'other_value'})
+        student_module.save()
+        with self.assertNumQueries(1):
+            self.assertEquals('other_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def cache_state_read_before_commit(self):
+        """
+        Write the state in a transaction, which a concurrent request reads
+        before the transaction commits: it gets the new version, but loads
+        and stores the state from before the write.
+        """
+        student_module = StudentModule.objects.get()
+        student_module.state = json.dumps({'a_field': 'other_value'})
+        student_module.save()
+
+        shared_cache = SharedUserStateCache(self.user.id)
+        shared_cache.set_many(shared_cache.versions([course_id]), {location('usage_id'): {'a_field': 'a_value'}})
+        self.assertEquals('a_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def test_request_write_invalidates_on_commit(self):
+        self.cache_state_read_before_commit()
+        request_finished.send(sender=None)
+        with self.assertNumQueries(1):
+            self.assertEquals('other_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def test_task_write_invalidates_on_commit(self):
+        self.cache_state_read_before_commit()
+        task_postrun.send(sender=None)
+        with self.assertNumQueries(1):
+            self.assertEquals('other_value', self.load_kvs().get(user_state_key('a_field')))
+
+    def test_disabled(self):
+        with patch.dict(settings.FEATURES, {'ENABLE_SHARED_USER_STATE_CACHE': False}):
+            self.load_kvs()
+            with self.assertNumQueries(1):
+                self.load_kvs()
+
+    @patch('courseware.model_data.monitoring_utils.accumulate')
+    def test_metrics(self, mock_accumulate):
+        self.load_kvs()
+        self.load_kvs()
+        self.assertEquals(
+            [
+                metric for metric in mock_accumulate.call_args_list
+                if metric[0][0].startswith('xb_user_state.shared_cache')
+            ],
+            [
+                call('xb_user_state.shared_cache.hits', 0),
+                call('xb_user_state.shared_cache.misses', 1),
+                call('xb_user_state.shared_cache.hits', 1),
+                call('xb_user_state.shared_cache.misses', 0),
+            ]
+        )
+
+
+@attr(shard=1)
+class TestUserStateWriteBehind(TestCase):
+    """Tests for saving user_state writes at the end of the request"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestUserStateWriteBehind, self).setUp()
+        features_patcher = patch.dict(settings.FEATURES, {'ENABLE_USER_STATE_WRITE_BEHIND': True})
+        features_patcher.start()
+        self.addCleanup(features_patcher.stop)
+
+        crum.set_current_request(RequestFactory().get('/'))
+        self.addCleanup(crum.set_current_request, None)
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value', 'b_field': 'b_value'}))
+        self.user = student_module.student
+
+    def load_kvs(self):
+        """Return a DjangoKeyValueStore for a new FieldDataCache"""
+        return DjangoKeyValueStore(
+            FieldDataCache(
+                [mock_descriptor([mock_field(Scope.user_state, 'a_field'), mock_field(Scope.user_state, 'b_field')])],
+                course_id,
+                self.user,
+            )
+        )
+
+    def stored_state(self):
+        """Return the state stored in the database"""
+        return json.loads(StudentModule.objects.get(module_state_key=location('usage_id')).state)
+
+    def end_request(self):
+        """Run the middleware saving the buffered writes, as at the end of a request"""
+        response = Mock()
+        self.assertEquals(response, UserStateWriteBehindMiddleware().process_response(None, response))
+
+    def test_set_many_is_buffered(self):
+        kvs = self.load_kvs()
+        with self.assertNumQueries(0):
+            kvs.set_many({user_state_key('a_field'): 'new_value', user_state_key('c_field'): 'c_value'})
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'b_value'}, self.stored_state())
+
+        self.end_request()
+        self.assertEquals(
+            {'a_field': 'new_value', 'b_field': 'b_value', 'c_field': 'c_value'},
+            self.stored_state()
+        )
+
+    def test_read_your_writes(self):
+        self.load_kvs().set(user_state_key('a_field'), 'new_value')
+        kvs = self.load_kvs()
+        self.assertEquals('new_value', kvs.get(user_state_key('a_field')))
+        self.assertEquals('b_value', kvs.get(user_state_key('b_field')))
+
+    def test_writes_are_coalesced(self):
+        kvs = self.load_kvs()
+        kvs.set(user_state_key('a_field'), 'first_value')
+        kvs.set(user_state_key('a_field'), 'second_value')
+        kvs.set(user_state_key('b_field'), 'new_value')
+
+        self.end_request()
+        self.assertEquals({'a_field': 'second_value', 'b_field': 'new_value'}, self.stored_state())
+        latest_entry = BaseStudentModuleHistory.get_history(StudentModule.objects.all())[0]
+        self.assertEquals({'a_field': 'second_value', 'b_field': 'new_value'}, json.loads(latest_entry.state))
+
+    def test_new_student_module(self):
+        StudentModule.objects.all().delete()
+        self.load_kvs().set(user_state_key('a_field'), 'new_value')
+        self.assertFalse(StudentModule.objects.exists())
+
+        self.end_request()
+        self.assertEquals({'a_field': 'new_value'}, self.stored_state())
+        self.assertEquals(1, len(BaseStudentModuleHistory.get_history(StudentModule.objects.all())))
+
+    def test_delete_saves_buffered_writes(self):
+        kvs = self.load_kvs()
+        kvs.set(user_state_key('a_field'), 'new_value')
+        kvs.delete(user_state_key('a_field'))
+        self.assertEquals({'b_field': 'b_value'}, self.stored_state())
+
+        self.end_request()
+        self.assertEquals({'b_field': 'b_value'}, self.stored_state())
+
+    def test_failed_request(self):
+        self.load_kvs().set(user_state_key('a_field'), 'new_value')
+        self.assertIsNone(UserStateWriteBehindMiddleware().process_exception(None, Exception()))
+        self.assertEquals('new_value', self.stored_state()['a_field'])
+
+    def test_outside_of_request(self):
+        crum.set_current_request(None)
+        self.load_kvs().set(user_state_key('a_field'), 'new_value')
+        self.assertEquals('new_value', self.stored_state()['a_field'])
+
+    def test_disabled(self):
+        with patch.dict(settings.FEATURES, {'ENABLE_USER_STATE_WRITE_BEHIND': False}):
+            self.load_kvs().set(user_state_key('a_field'), 'new_value')
+            self.assertEquals('new_value', self.stored_state()['a_field'])
+
+
 @attr(shard=1)
 class StorageTestBase(object):
     """
@@ -8,14 +8,17 @@ import logging
 from operator import attrgetter
 from time import time
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
 import dogstats_wrapper as dog_stats_api
-from courseware.models import BaseStudentModuleHistory, StudentModule
+from courseware.models import BaseStudentModuleHistory, StudentModule, StudentModuleHistory, chunks
 from openedx.core.djangoapps import monitoring_utils
 
 try:
@@ -50,6 +53,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # Maximum number of rows updated by each UPDATE of :meth:`bulk_set_many`.
+    BULK_UPDATE_SIZE = 500
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -337,6 +343,158 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def bulk_set_many(self, username, block_keys_to_state, scope=Scope.user_state):
+        """
+        Set fields for many XBlocks at once, like :meth:`set_many`, but with
+        a fixed number of queries rather than a few per block.
+
+        The existing rows are read with one query, new rows are inserted with
+        one bulk insert and existing rows are updated with one UPDATE per
+        ``BULK_UPDATE_SIZE`` rows. The history of the blocks in
+        ``HISTORY_SAVING_TYPES`` is recorded with one more bulk insert.
+
+        Bulk writes don't send the post_save signal, so callers are responsible
+        for any other work done by its receivers.
+
+        Arguments:
+            username: The name of the user whose state should be set
+            block_keys_to_state (dict): A dict mapping UsageKeys to state dicts,
+                which are overlaid over the stored state as by :meth:`set_many`.
+            scope (Scope): The scope to store data to
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported")
+
+        self._nr_stat_increment('bulk_set_many', 'calls')
+
+        if self.user is not None and self.user.username == username:
+            user = self.user
+        else:
+            user = User.objects.get(username=username)
+
+        if user.is_anonymous() or not block_keys_to_state:
+            return
+
+        evt_time = time()
+
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(username, block_keys_to_state.keys())
+        }
+
+        new_modules = []
+        updated_modules = []
+        for usage_key, state in block_keys_to_state.iteritems():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                new_modules.append(StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                ))
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                updated_modules.append(student_module)
+
+        history_modules = self._bulk_create_modules(username, new_modules)
+        history_modules.extend(self._bulk_update_modules(updated_modules))
+        self._bulk_create_history(history_modules)
+
+        self._ddog_histogram(evt_time, 'bulk_set_many.blks_created', len(new_modules))
+        self._ddog_histogram(evt_time, 'bulk_set_many.blks_updated', len(updated_modules))
+        duration = (time() - evt_time) * 1000  # milliseconds
+        self._ddog_histogram(evt_time, 'bulk_set_many.response_time', duration)
+        self._nr_stat_accumulate('bulk_set_many', 'duration', duration)
+
+    def _bulk_create_modules(self, username, student_modules):
+        """
+        Insert the new ``student_modules``, and return those of them whose
+        history is saved, as read back from the database.
+
+        If another request created any of the rows first, they are all saved
+        with :meth:`set_many` instead, which records their history itself.
+        """
+        if not student_modules:
+            return []
+
+        try:
+            with transaction.atomic():
+                StudentModule.objects.bulk_create(student_modules)
+        except IntegrityError:
+            log.warning("bulk_set_many: IntegrityError for student %s, saving %d new blocks one by one",
+                        username, len(student_modules))
+            self.set_many(username, {
+                student_module.module_state_key: json.loads(student_module.state)
+                for student_module in student_modules
+            })
+            return []
+
+        # Bulk inserts don't set the primary keys of the inserted rows on
+        # every database, and history rows need them.
+        history_keys = [
+            student_module.module_state_key for student_module in student_modules
+            if student_module.module_type in BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+        ]
+        if not history_keys:
+            return []
+        return [student_module for student_module, __ in self._get_student_modules(username, history_keys)]
+
+    def _bulk_update_modules(self, student_modules):
+        """
+        Save the state of the existing ``student_modules``, and return those
+        of them whose history is saved.
+        """
+        modified = timezone.now()
+        with transaction.atomic():
+            for batch in chunks(student_modules, self.BULK_UPDATE_SIZE):
+                StudentModule.objects.filter(
+                    pk__in=[student_module.pk for student_module in batch]
+                ).update(
+                    state=Case(
+                        *[When(pk=student_module.pk, then=Value(student_module.state)) for student_module in batch],
+                        output_field=TextField()
+                    ),
+                    modified=modified,
+                )
+
+        history_modules = []
+        for student_module in student_modules:
+            student_module.modified = modified
+            if student_module.module_type in BaseStudentModuleHistory.HISTORY_SAVING_TYPES:
+                history_modules.append(student_module)
+        return history_modules
+
+    def _bulk_create_history(self, student_modules):
+        """
+        Insert the history rows that saving ``student_modules`` records through
+        the post_save signal.
+        """
+        if not student_modules:
+            return
+
+        # Mirrors the post_save receivers, which write to the extended history
+        # table instead of the original one once it is enabled.
+        if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+            from coursewarehistoryextended.models import StudentModuleHistoryExtended as history_model
+        else:
+            history_model = StudentModuleHistory
+
+        history_model.objects.bulk_create([
+            history_model(
+                student_module=student_module,
+                version=None,
+                created=student_module.modified,
+                state=student_module.state,
+                grade=student_module.grade,
+                max_grade=student_module.max_grade,
+            )
+            for student_module in student_modules
+        ])
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -1429,6 +1429,9 @@ def render_xblock(request, usage_key_string, check_if_enrolled=True):
         block, _ = get_module_by_usage_id(
             request, unicode(course_key), unicode(usage_key), disable_staff_debug_info=True, course=course
         )
+        # load the definitions of the whole subtree at once, rather than one
+        # block at a time while rendering.
+        modulestore().prefetch_definitions([block], depth=None)
 
         student_view_context = request.GET.dict()
         student_view_context['show_bookmark_button'] = False
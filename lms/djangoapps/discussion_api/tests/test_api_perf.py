@@ -0,0 +1,130 @@
+"""
+Performance test of the comments service requests made to retrieve a thread,
+against a local stub of the comments service, with new or pooled connections
+and with sequential or concurrent requests.
+"""
+import json
+import re
+import threading
+import time
+import unittest
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from functools import partial
+from SocketServer import ThreadingMixIn
+from timeit import default_timer
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from django_comment_client.tests.utils import ForumsEnableMixin
+from lms.lib.comment_client.thread import Thread
+from lms.lib.comment_client.user import User
+from lms.lib.comment_client.utils import perform_concurrently
+
+# Number of seconds the stub comments service takes to handle each request.
+SERVICE_LATENCY = 0.01
+
+# Number of threads retrieved in each mode.
+NUM_THREADS = 50
+
+
+class StubCommentsServiceHandler(BaseHTTPRequestHandler):
+    """
+    Handler of the stub comments service, which returns minimal threads
+    and users after `SERVICE_LATENCY` seconds, and keeps connections alive.
+    """
+    protocol_version = 'HTTP/1.1'
+    # The response is written in several small packets, which would otherwise
+    # wait for the client to acknowledge the first on kept alive connections.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        time.sleep(SERVICE_LATENCY)
+        match = re.match(r'/api/v1/(?P<kind>threads|users)/(?P<id>\w+)', self.path)
+        if match.group('kind') == 'threads':
+            content = {'id': match.group('id'), 'title': 'Thread', 'body': 'Body'}
+        else:
+            content = {'id': match.group('id'), 'username': 'learner', 'upvoted_ids': [], 'downvoted_ids': []}
+        content = json.dumps(content)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(content))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class StubCommentsService(ThreadingMixIn, HTTPServer, object):
+    """
+    Stub comments service, handling each connection in its own thread.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubCommentsServiceHandler)
+        self.port = self.server_address[1]
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        """Stops handling connections and closes the server."""
+        self.shutdown()
+        self.server_close()
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class ThreadRetrievalPerf(ForumsEnableMixin, TestCase):
+    """
+    Compares the wall time of the requests _get_thread_and_context makes to
+    retrieve threads and their requester, with new connections for each
+    request, with pooled connections, and with pooled connections and
+    concurrent requests.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(ThreadRetrievalPerf, self).setUp()
+        self.service = StubCommentsService()
+        self.addCleanup(self.service.stop)
+
+        prefix = 'http://127.0.0.1:{}/api/v1'.format(self.service.port)
+        for model, path in ((Thread, 'threads'), (User, 'users')):
+            patcher = patch.object(model, 'base_url', '{}/{}'.format(prefix, path))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _retrieve_threads(self):
+        """
+        Retrieves each thread and its requester, as _get_thread_and_context
+        does.
+        """
+        for index in range(NUM_THREADS):
+            cc_thread, __ = perform_concurrently(
+                partial(Thread(id='thread{}'.format(index)).retrieve, with_responses=False, mark_as_read=False),
+                User(id='1', external_id='1', username='learner').retrieve,
+            )
+            self.assertEqual(cc_thread['title'], 'Thread')
+
+    def test_retrieve(self):
+        print
+        print '{:>12} {:>12} {:>12} {:>14}'.format('pool size', 'concurrency', 'time (ms)', 'per thread (ms)')
+        for pool_size, max_concurrent_requests in ((0, 0), (10, 0), (10, 4)):
+            with override_settings(COMMENTS_SERVICE_CONNECTIONS={
+                'POOL_SIZE': pool_size,
+                'MAX_CONCURRENT_REQUESTS': max_concurrent_requests,
+            }):
+                start = default_timer()
+                self._retrieve_threads()
+                duration = default_timer() - start
+
+            print '{:>12} {:>12} {:>12.1f} {:>14.2f}'.format(
+                pool_size, max_concurrent_requests, duration * 1000, duration * 1000 / NUM_THREADS,
+            )
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import threading
 
 import ddt
 import mock
@@ -8,6 +9,8 @@ import pytest
 
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.utils.translation import get_language, override
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from pytz import UTC
@@ -32,7 +35,12 @@ from django_comment_common.utils import (
     set_course_discussion_settings
 )
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    get_session,
+    perform_concurrently,
+    perform_request
+)
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
@@ -1843,6 +1851,91 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class ClientConnectionPoolTestCase(TestCase):
+    """Tests of the pooled connections to the comment service."""
+
+    def setUp(self):
+        super(ClientConnectionPoolTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+    def test_disabled(self):
+        self.assertIsNone(get_session())
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'POOL_SIZE': 4, 'MAX_RETRIES': 2})
+    def test_session(self):
+        session = get_session()
+        self.assertIs(get_session(), session)
+        adapter = session.get_adapter('http://localhost:4567')
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+        self.assertEqual(adapter.max_retries.total, 2)
+
+        with override_settings(COMMENTS_SERVICE_CONNECTIONS={'POOL_SIZE': 8}):
+            self.assertIsNot(get_session(), session)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'POOL_SIZE': 4})
+    @patch('requests.request')
+    @patch('requests.Session.request')
+    def test_pooled_request(self, mock_session_request, mock_request):
+        response = Mock(status_code=200, json=lambda: {})
+        mock_session_request.return_value = response
+
+        self.assertEqual(perform_request('GET', 'http://www.google.com'), {})
+        self.assertTrue(mock_session_request.called)
+        self.assertFalse(mock_request.called)
+
+
+class PerformConcurrentlyTestCase(TestCase):
+    """Tests of perform_concurrently."""
+
+    def test_disabled(self):
+        results = perform_concurrently(lambda: 1, threading.current_thread)
+        self.assertEqual(results, [1, threading.current_thread()])
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'MAX_CONCURRENT_REQUESTS': 4})
+    def test_concurrent(self):
+        # Each call waits for the other, which only returns if they are
+        # made at the same time.
+        first_started, second_started = threading.Event(), threading.Event()
+
+        def call(started, other_started):
+            started.set()
+            return other_started.wait(5)
+
+        results = perform_concurrently(
+            lambda: call(first_started, second_started),
+            lambda: call(second_started, first_started),
+        )
+        self.assertEqual(results, [True, True])
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'MAX_CONCURRENT_REQUESTS': 4})
+    def test_exception(self):
+        def fail(message):
+            raise CommentClientMaintenanceError(message)
+
+        with self.assertRaises(CommentClientMaintenanceError) as context:
+            perform_concurrently(lambda: 1, lambda: fail('first'), lambda: fail('second'))
+        self.assertEqual(context.exception.message, 'first')
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'MAX_CONCURRENT_REQUESTS': 4})
+    def test_language(self):
+        with override('fr'):
+            self.assertEqual(perform_concurrently(get_language, get_language), ['fr', 'fr'])
+
+    @override_settings(COMMENTS_SERVICE_CONNECTIONS={'MAX_CONCURRENT_REQUESTS': 2})
+    def test_nested(self):
+        # Calls made from the pool's threads are made one after the other, as
+        # waiting on the pool from them could deadlock it.
+        def call():
+            return perform_concurrently(threading.current_thread, threading.current_thread)
+
+        results = perform_concurrently(call, call)
+        for threads in results:
+            self.assertEqual(threads[0], threads[1])
+            self.assertNotEqual(threads[0], threading.current_thread())
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
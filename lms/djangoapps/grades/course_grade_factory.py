@@ -1,4 +1,5 @@
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
@@ -8,7 +9,9 @@ from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED, COURSE
 from .config import assume_zero_if_absent, should_persist_grades
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade, prefetch
+from .models import PersistentCourseGrade, bulk_prefetch, clear_bulk_prefetched, prefetch
+from .scores import possibly_scored
+from .subsection_grade_factory import SubsectionGradeFactory
 
 log = getLogger(__name__)
 
@@ -75,6 +78,7 @@ class CourseGradeFactory(object):
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            batch_size=None,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -84,6 +88,11 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If batch_size is given, the students are graded in batches of that
+        size.  The scores, overrides and persisted grades of all students
+        in a batch are loaded with a handful of set-based queries, instead
+        of separate queries for each student.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -94,9 +103,61 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
-                yield self._iter_grade_result(user, course_data, force_update)
+        if batch_size:
+            user_batches = self._batch_users(users, batch_size)
+        else:
+            user_batches = [users]
+
+        for user_batch in user_batches:
+            if batch_size:
+                self._prefetch_batch(user_batch, course_data, force_update)
+            try:
+                for user in user_batch:
+                    with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
+                        yield self._iter_grade_result(user, course_data, force_update)
+            finally:
+                if batch_size:
+                    self._clear_prefetched_batch(course_data)
+
+    @staticmethod
+    def _batch_users(users, batch_size):
+        """
+        Yields lists of at most batch_size users from the given
+        iterable of users, without loading all of them at once.
+        """
+        users = iter(users)
+        user_batch = list(islice(users, batch_size))
+        while user_batch:
+            yield user_batch
+            user_batch = list(islice(users, batch_size))
+
+    @staticmethod
+    def _prefetch_batch(users, course_data, force_update):
+        """
+        Loads the data needed to grade the given batch of users in the
+        course, using a few queries for the whole batch.
+        """
+        course_key = course_data.course_key
+        if should_persist_grades(course_key):
+            bulk_prefetch(users, course_key, include_overrides=force_update)
+
+        # Scores are only read for blocks that have them, so the scores
+        # of the other possibly scored blocks are not loaded.
+        collected_structure = course_data.collected_structure
+        scored_locations = [
+            block_key for block_key in collected_structure
+            if possibly_scored(block_key) and collected_structure.get_xblock_field(block_key, 'has_score', False)
+        ]
+        SubsectionGradeFactory.prefetch_scores(course_key, users, scored_locations)
+
+    @staticmethod
+    def _clear_prefetched_batch(course_data):
+        """
+        Clears the data loaded by _prefetch_batch, so it is not used
+        once its batch of users has been graded.
+        """
+        clear_bulk_prefetched(course_data.course_key)
+        SubsectionGradeFactory.clear_prefetched_scores(course_data.course_key)
 
     def _iter_grade_result(self, user, course_data, force_update):
         try:
@@ -11,7 +11,7 @@ persisted, course grades are also immune to changes in course content.
 import json
 import logging
 from base64 import b64encode
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from hashlib import sha1
 
 from django.db import models
@@ -296,6 +296,8 @@ class PersistentSubsectionGrade(TimeStampedModel):
     # track which blocks were visible at the time of grade calculation
     visible_blocks = models.ForeignKey(VisibleBlocks, db_column='visible_blocks_hash', to_field='hashed')
 
+    _CACHE_NAMESPACE = u"grades.models.PersistentSubsectionGrade"
+
     @property
     def full_usage_key(self):
         """
@@ -342,15 +344,41 @@ class PersistentSubsectionGrade(TimeStampedModel):
             usage_key=usage_key,
         )
 
+    @classmethod
+    def prefetch(cls, course_key, users):
+        """
+        Prefetches grades for the given users in the given course,
+        replacing any grades previously prefetched for the course.
+        """
+        prefetched = {user.id: [] for user in users}
+        for record in cls.objects.select_related('visible_blocks', 'override').filter(
+                user_id__in=prefetched.keys(),
+                course_id=course_key,
+        ):
+            prefetched[record.user_id].append(record)
+        get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(course_key)] = prefetched
+
+    @classmethod
+    def clear_prefetched(cls, course_key):
+        """
+        Clears the grades prefetched for the given course.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(course_key), None)
+
     @classmethod
     def bulk_read_grades(cls, user_id, course_key):
         """
-        Reads all grades for the given user and course.
+        Reads all grades for the given user and course, from the
+        prefetched grades if they include the user.
 
         Arguments:
             user_id: The user associated with the desired grades
             course_key: The course identifier for the desired grades
         """
+        prefetched = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_key))
+        if prefetched is not None and user_id in prefetched:
+            return prefetched[user_id]
+
         return cls.objects.select_related('visible_blocks', 'override').filter(
             user_id=user_id,
             course_id=course_key,
@@ -381,6 +409,7 @@ class PersistentSubsectionGrade(TimeStampedModel):
             grade.save()
 
         cls._emit_grade_calculated_event(grade)
+        cls._update_cache(user_id, usage_key.course_key, [grade])
         return grade
 
     @classmethod
@@ -402,6 +431,7 @@ class PersistentSubsectionGrade(TimeStampedModel):
         grades = cls.objects.bulk_create(grades)
         for grade in grades:
             cls._emit_grade_calculated_event(grade)
+        cls._update_cache(user_id, course_key, grades)
         return grades
 
     @classmethod
@@ -440,6 +470,22 @@ class PersistentSubsectionGrade(TimeStampedModel):
             if override.possible_graded_override is not None:
                 params['possible_graded'] = override.possible_graded_override
 
+    @classmethod
+    def _update_cache(cls, user_id, course_key, grades):
+        """
+        Updates the prefetched grades of the given user with the given
+        saved grades, iff the user's grades were prefetched.
+        """
+        course_cache = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_key))
+        if course_cache is not None and user_id in course_cache:
+            user_grades = OrderedDict((grade.usage_key, grade) for grade in course_cache[user_id])
+            user_grades.update((grade.usage_key, grade) for grade in grades)
+            course_cache[user_id] = user_grades.values()
+
+    @classmethod
+    def _cache_key(cls, course_key):
+        return u"subsection_grades_cache.{}".format(course_key)
+
     @staticmethod
     def _emit_grade_calculated_event(grade):
         events.subsection_grade_calculated(grade)
@@ -510,6 +556,13 @@ class PersistentCourseGrade(TimeStampedModel):
             cls.objects.filter(user_id__in=[user.id for user in users], course_id=course_id)
         }
 
+    @classmethod
+    def clear_prefetched(cls, course_id):
+        """
+        Clears the grades prefetched for the given course.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(course_id), None)
+
     @classmethod
     def read(cls, user_id, course_id):
         """
@@ -596,12 +649,47 @@ class PersistentSubsectionGradeOverride(models.Model):
 
     @classmethod
     def prefetch(cls, user_id, course_key):
+        if user_id in get_cache(cls._CACHE_NAMESPACE).get(cls._bulk_cache_key(course_key), ()):
+            # Already prefetched along with the other users of the batch.
+            return
+
         get_cache(cls._CACHE_NAMESPACE)[(user_id, str(course_key))] = {
             override.grade.usage_key: override
             for override in
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches overrides for the given batch of users in the given
+        course with a single query, replacing the overrides of any
+        previously prefetched batch.
+        """
+        cls.clear_bulk_prefetched(course_key)
+
+        prefetched = {user.id: {} for user in users}
+        for override in cls.objects.select_related('grade').filter(
+                grade__user_id__in=prefetched.keys(),
+                grade__course_id=course_key,
+        ):
+            prefetched[override.grade.user_id][override.grade.usage_key] = override
+
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user_id, overrides in prefetched.iteritems():
+            cache[(user_id, str(course_key))] = overrides
+        cache[cls._bulk_cache_key(course_key)] = set(prefetched)
+
+    @classmethod
+    def clear_bulk_prefetched(cls, course_key):
+        """
+        Clears the overrides of the batch of users prefetched for the
+        given course.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user_id in cache.pop(cls._bulk_cache_key(course_key), ()):
+            cache.pop((user_id, str(course_key)), None)
+
     @classmethod
     def get_override(cls, user_id, usage_key):
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
@@ -616,7 +704,34 @@ class PersistentSubsectionGradeOverride(models.Model):
         except PersistentSubsectionGradeOverride.DoesNotExist:
             pass
 
+    @classmethod
+    def _bulk_cache_key(cls, course_key):
+        return u"bulk_prefetched_users.{}".format(course_key)
+
 
 def prefetch(user, course_key):
     PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
     VisibleBlocks.bulk_read(course_key)
+
+
+def bulk_prefetch(users, course_key, include_overrides=False):
+    """
+    Prefetches the persisted course and subsection grades, and
+    optionally the subsection grade overrides, of the given batch of
+    users in the given course.
+    """
+    PersistentCourseGrade.prefetch(course_key, users)
+    PersistentSubsectionGrade.prefetch(course_key, users)
+    if include_overrides:
+        PersistentSubsectionGradeOverride.bulk_prefetch(course_key, users)
+        VisibleBlocks.bulk_read(course_key)
+
+
+def clear_bulk_prefetched(course_key):
+    """
+    Clears the grades and overrides prefetched by bulk_prefetch for the
+    given course, so they are not used beyond their batch of users.
+    """
+    PersistentCourseGrade.clear_prefetched(course_key)
+    PersistentSubsectionGrade.clear_prefetched(course_key)
+    PersistentSubsectionGradeOverride.clear_bulk_prefetched(course_key)
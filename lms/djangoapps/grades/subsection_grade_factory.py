@@ -8,8 +8,11 @@ from lms.djangoapps.grades.config import assume_zero_if_absent, should_persist_g
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
+from request_cache import get_cache
 from student.models import anonymous_id_for_user
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
 from .course_data import CourseData
 from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSubsectionGrade
@@ -21,6 +24,8 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
+    _SCORES_CACHE_NAMESPACE = u"grades.subsection_grade_factory.SubsectionGradeFactory.scores"
+
     def __init__(self, student, course=None, course_structure=None, course_data=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
@@ -94,12 +99,44 @@ class SubsectionGradeFactory(object):
 
         return calculated_grade
 
+    @classmethod
+    def prefetch_scores(cls, course_key, users, scorable_locations):
+        """
+        Prefetches the scores of the given batch of users in the given
+        course, stored in the user state (in CSM) for the given scorable
+        locations and by the Submissions API, with a single query each.
+        Replaces the scores of any previously prefetched batch.
+
+        No queries are made if there are no scorable locations.
+        """
+        csm_scores = ScoresClient.bulk_create_for_locations(
+            course_key, [user.id for user in users], scorable_locations,
+        )
+        if scorable_locations:
+            submissions_scores = _bulk_get_submissions_scores(course_key, users)
+        else:
+            submissions_scores = {user.id: {} for user in users}
+        get_cache(cls._SCORES_CACHE_NAMESPACE)[unicode(course_key)] = {
+            user.id: (submissions_scores[user.id], csm_scores[user.id])
+            for user in users
+        }
+
+    @classmethod
+    def clear_prefetched_scores(cls, course_key):
+        """
+        Clears the scores prefetched for the given course.
+        """
+        get_cache(cls._SCORES_CACHE_NAMESPACE).pop(unicode(course_key), None)
+
     @lazy
     def _csm_scores(self):
         """
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        if self._prefetched_scores:
+            return self._prefetched_scores[1]
+
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -109,9 +146,21 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        if self._prefetched_scores:
+            return self._prefetched_scores[0]
+
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
+    @lazy
+    def _prefetched_scores(self):
+        """
+        Returns the (submissions scores, CSM scores) prefetched for the
+        student, or None if the student's scores were not prefetched.
+        """
+        prefetched = get_cache(self._SCORES_CACHE_NAMESPACE).get(unicode(self.course_data.course_key), {})
+        return prefetched.get(self.student.id)
+
     def _get_bulk_cached_grade(self, subsection):
         """
         Returns the student's SubsectionGrade for the subsection,
@@ -157,3 +206,25 @@ class SubsectionGradeFactory(object):
             getattr(subsection, 'subtree_edited_on', None),
             self.student.id,
         ))
+
+
+def _bulk_get_submissions_scores(course_key, users):
+    """
+    Returns the scores stored by the Submissions API for the given users
+    in the given course, keyed by user id, in the same format as
+    submissions_api.get_scores, using a single query.
+
+    The anonymous user ids are computed without being saved, since
+    users with submissions already have them saved.
+    """
+    anonymous_user_ids = {anonymous_id_for_user(user, course_key, save=False): user.id for user in users}
+    scores = {user.id: {} for user in users}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=str(course_key),
+        student_item__student_id__in=anonymous_user_ids.keys(),
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            user_id = anonymous_user_ids[summary.student_item.student_id]
+            scores[user_id][summary.student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    return scores
@@ -3,10 +3,14 @@ from nose.plugins.attrib import attr
 
 import ddt
 from courseware.access import has_access
+from courseware.tests.factories import StudentModuleFactory
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from mock import patch
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -338,3 +342,61 @@ class TestGradeIteration(SharedModuleStoreTestCase):
                 students_to_errors[student] = error
 
         return students_to_course_grades, students_to_errors
+
+
+@attr(shard=1)
+class TestBatchedGradeIteration(GradeTestBase):
+    """
+    Test iteration through student course grades in batches.
+    """
+    def setUp(self):
+        super(TestBatchedGradeIteration, self).setUp()
+        self.students = [UserFactory.create() for _ in range(4)]
+        for index, student in enumerate(self.students):
+            CourseEnrollment.enroll(student, self.course.id)
+            StudentModuleFactory.create(
+                student=student,
+                course_id=self.course.id,
+                module_state_key=self.problem.location,
+                grade=index % 2,
+                max_grade=1,
+            )
+
+    def _percents_for(self, students, **kwargs):
+        """
+        Returns a dict of each student's id to the percent of the
+        course grade returned by CourseGradeFactory.iter.
+        """
+        return {
+            student.id: course_grade.percent
+            for student, course_grade, _ in CourseGradeFactory().iter(students, self.course, **kwargs)
+        }
+
+    def _num_queries_for(self, students, **kwargs):
+        """
+        Returns the number of queries made while iterating through
+        the course grades of the given students.
+        """
+        with CaptureQueriesContext(connection) as captured:
+            self._percents_for(students, **kwargs)
+        return len(captured)
+
+    def test_batched_grades_match(self):
+        with persistent_grades_feature_flags(global_flag=True, enabled_for_all_courses=True):
+            unbatched_percents = self._percents_for(self.students, force_update=True)
+            self.assertEqual(self._percents_for(self.students, force_update=True, batch_size=3), unbatched_percents)
+            self.assertEqual(self._percents_for(self.students, batch_size=3), unbatched_percents)
+        self.assertEqual(self._percents_for(self.students, batch_size=3), unbatched_percents)
+        self.assertNotEqual(len(set(unbatched_percents.values())), 1)
+
+    def test_batched_read_queries(self):
+        with persistent_grades_feature_flags(global_flag=True, enabled_for_all_courses=True):
+            self._percents_for(self.students, force_update=True)
+            self.assertEqual(
+                self._num_queries_for(self.students[:2], batch_size=len(self.students)),
+                self._num_queries_for(self.students, batch_size=len(self.students)),
+            )
+            self.assertLess(
+                self._num_queries_for(self.students, batch_size=len(self.students)),
+                self._num_queries_for(self.students),
+            )
@@ -0,0 +1,78 @@
+"""
+Performance test comparing batched and unbatched iteration through
+course grades with CourseGradeFactory.iter.
+"""
+import unittest
+from timeit import default_timer
+
+from courseware.tests.factories import StudentModuleFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+
+from ..course_grade_factory import CourseGradeFactory
+from .base import GradeTestBase
+
+# Numbers of enrolled users to grade.
+NUM_USERS = (10, 50, 100)
+
+# Number of users in each batch of the batched iteration.
+BATCH_SIZE = 100
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class CourseGradeIterationPerf(GradeTestBase):
+    """
+    Compares the number of queries per user and the wall time of
+    grading all users of a course with and without batching.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def _create_students(self, num_users):
+        """
+        Returns the given number of users, enrolled in the course and
+        with a score for each of its problems.
+        """
+        students = [UserFactory.create() for _ in range(num_users)]
+        for index, student in enumerate(students):
+            CourseEnrollment.enroll(student, self.course.id)
+            for problem in (self.problem, self.problem2):
+                StudentModuleFactory.create(
+                    student=student,
+                    course_id=self.course.id,
+                    module_state_key=problem.location,
+                    grade=index % 2,
+                    max_grade=1,
+                )
+        return students
+
+    def test_iter(self):
+        print
+        print '{:>8} {:>10} {:>10} {:>14} {:>12}'.format('users', 'mode', 'batched', 'queries/user', 'time (ms)')
+        with persistent_grades_feature_flags(global_flag=True, enabled_for_all_courses=True):
+            for num_users in NUM_USERS:
+                students = self._create_students(num_users)
+                for mode, force_update in (('update', True), ('read', False)):
+                    for batch_size in (None, BATCH_SIZE):
+                        with CaptureQueriesContext(connection) as captured:
+                            start = default_timer()
+                            for _, course_grade, error in CourseGradeFactory().iter(
+                                    students, self.course, force_update=force_update, batch_size=batch_size,
+                            ):
+                                self.assertIsNone(error)
+                                self.assertIsNotNone(course_grade)
+                            elapsed = default_timer() - start
+
+                        print '{:>8} {:>10} {:>10} {:>14.2f} {:>12.1f}'.format(
+                            num_users,
+                            mode,
+                            'yes' if batch_size else 'no',
+                            len(captured) / float(num_users),
+                            elapsed * 1000,
+                        )
@@ -8,10 +8,17 @@ from copy import deepcopy
 
 import ddt
 import pytz
+from mock import patch
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.course_blocks.transformers.tests.helpers import CourseStructureTestCase
-from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
+from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache, update_course_in_cache
+from openedx.core.djangoapps.content.block_structure.config import (
+    INCREMENTAL_COLLECT,
+    STORAGE_BACKING_FOR_CACHE,
+    waffle,
+)
+from openedx.core.djangoapps.content.block_structure.manager import BlockStructureManager
 from student.tests.factories import UserFactory
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
@@ -391,6 +398,77 @@ class GradesTransformerTestCase(CourseStructureTestCase):
             original_grading_policy_hash
         )
 
+    def test_incremental_collect(self):
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            blocks = self.build_course([
+                {
+                    u'org': u'GradesTestOrg',
+                    u'course': u'GB102',
+                    u'run': u'cannonball',
+                    u'#type': u'course',
+                    u'#ref': u'course',
+                    u'#children': [
+                        {
+                            u'#type': u'chapter',
+                            u'#ref': u'chapter',
+                            u'#children': [
+                                {
+                                    u'#type': u'sequential',
+                                    u'#ref': u'sequential',
+                                    u'#children': [
+                                        {
+                                            u'metadata': {u'graded': True},
+                                            u'#type': u'vertical',
+                                            u'#ref': u'vertical',
+                                            u'#children': [
+                                                {
+                                                    u'#type': u'problem',
+                                                    u'#ref': u'problem',
+                                                    u'data': u'<problem></problem>',
+                                                },
+                                            ],
+                                        },
+                                    ],
+                                },
+                            ],
+                        },
+                    ],
+                },
+            ])
+        course_key = blocks[u'course'].location.course_key
+
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(INCREMENTAL_COLLECT, active=True):
+                update_course_in_cache(course_key)
+
+                problem = self.store.get_item(blocks[u'problem'].location)
+                problem.data = u'''
+                    <problem>
+                        <numericalresponse answer="27">
+                            <textline label="3^3" />
+                        </numericalresponse>
+                        <numericalresponse answer="13.5">
+                            <textline label="and then half of that?" />
+                        </numericalresponse>
+                    </problem>
+                '''
+                self.store.update_item(problem, self.user.id)
+                with patch.object(BlockStructureManager, '_update_collected') as mock_full_collect:
+                    self.store.publish(problem.location, self.user.id)
+                    update_course_in_cache(course_key)
+                mock_full_collect.assert_not_called()
+
+                block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
+
+        self.assert_collected_transformer_block_fields(
+            block_structure,
+            blocks[u'problem'].location,
+            self.TRANSFORMER_CLASS_TO_TEST,
+            max_score=2,
+            explicit_graded=True,
+            subsections={blocks[u'sequential'].location},
+        )
+
 
 @ddt.ddt
 class MultiProblemModulestoreAccessTestCase(CourseStructureTestCase, SharedModuleStoreTestCase):
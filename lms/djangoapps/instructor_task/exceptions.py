@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass
+
+
+class ShardFailedError(Exception):
+    """Exception indicating that shards of a sharded task failed, so its results can't be combined."""
+    pass
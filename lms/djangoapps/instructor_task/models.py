@@ -17,12 +17,14 @@ import hashlib
 import json
 import logging
 import os.path
+import shutil
+import tempfile
 from uuid import uuid4
 
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
@@ -267,12 +269,53 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        The rows are written to a temporary file as they are iterated, so
+        `rows` can be a generator whose rows are not all held in memory.
+        """
+        with tempfile.TemporaryFile() as output_file:
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file, name=filename))
+
+    def store_merged(self, course_id, filename, header_rows, part_filenames):
+        """
+        Given a course_id, filename, header rows, and the filenames of
+        previously stored csv files, write the header rows followed by the
+        contents of each of the files, in order, to the storage backend.
+
+        The files are copied in chunks without being parsed, so the merged
+        file is never held in memory.
+        """
+        with tempfile.TemporaryFile() as output_file:
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(header_rows))
+            for part_filename in part_filenames:
+                with self.storage.open(self.path_to(course_id, part_filename)) as part_file:
+                    shutil.copyfileobj(part_file, output_file)
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file, name=filename))
+
+    def filenames_in(self, course_id, dirname):
+        """
+        For a given `course_id`, return the sorted names of the files
+        stored in the given directory, relative to the course's directory.
+        """
+        path = self.path_to(course_id, dirname)
+        try:
+            _, filenames = self.storage.listdir(path)
+        except OSError:
+            # Django's FileSystemStorage fails with an OSError if the
+            # dir does not exist; other storage types return an empty list.
+            return []
+        return sorted(os.path.join(dirname, filename) for filename in filenames)
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file with the given filename for the given course.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -1,6 +1,7 @@
 """
 This module contains celery task functions for handling the management of subtasks.
 """
+import heapq
 import json
 import logging
 from contextlib import contextmanager
@@ -25,6 +26,8 @@ SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
+# Number of items read from the database at a time when generating subtasks.
+ITEMS_PER_QUERY = 1000
 
 
 def _get_number_of_subtasks(total_num_items, items_per_task):
@@ -66,6 +69,42 @@ def track_memory_usage(metric, course_id):
         )
 
 
+def _iterate_queryset_by_pk(queryset, item_fields, items_per_query):
+    """
+    Yields (pk, item) tuples for the items of the queryset, in order of primary key,
+    where each item is a dict of the values of `item_fields`, which includes 'pk'.
+
+    The queryset is read in chunks of `items_per_query` items, each chunk starting
+    after the largest primary key of the previous one.  Unlike an offset, this lets
+    each query use the primary key index, and only a chunk is held in memory at a time.
+    """
+    queryset = queryset.values(*item_fields).order_by('pk')
+    last_pk = None
+    while True:
+        chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        items = list(chunk_queryset[:items_per_query])
+        for item in items:
+            yield item['pk'], item
+        if len(items) < items_per_query:
+            return
+        last_pk = items[-1]['pk']
+
+
+def _iterate_items_by_pk(item_querysets, item_fields, items_per_query):
+    """
+    Yields (pk, item) tuples for the items of all of the querysets, in order of
+    primary key, and without duplicates of items in more than one queryset.
+    """
+    last_pk = None
+    for pk, item in heapq.merge(*[
+        _iterate_queryset_by_pk(queryset, item_fields, items_per_query)
+        for queryset in item_querysets
+    ]):
+        if pk != last_pk:
+            last_pk = pk
+            yield pk, item
+
+
 def _generate_items_for_subtask(
     item_querysets,  # pylint: disable=bad-continuation
     item_fields,
@@ -73,20 +112,26 @@ def _generate_items_for_subtask(
     items_per_task,
     total_num_subtasks,
     course_id,
+    excluded_item_ids=frozenset(),
+    items_per_query=ITEMS_PER_QUERY,
 ):
     """
     Generates a chunk of "items" that should be passed into a subtask.
 
     Arguments:
         `item_querysets` : a list of query sets, each of which defines the "items" that should be passed to subtasks.
+            Items in more than one query set are only passed to a subtask once.
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
-        `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
+        `total_num_items` : the number of distinct items in the querysets in `item_querysets`.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `excluded_item_ids` : set of primary keys of items that should be skipped rather than passed to
+            a subtask.  Skipped items still count toward the size of the chunk they would have been in.
+        `items_per_query` : size of chunks to break the query operation into.
 
-    Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
+    Returns:  yields a tuple of a list of dicts, where each dict contains the fields in `item_fields`,
+        plus the 'pk' field, and the number of items skipped from that list.
 
     Warning:  if the algorithm here changes, the _get_number_of_subtasks() method should similarly be changed.
     """
@@ -96,21 +141,28 @@ def _generate_items_for_subtask(
     num_subtasks = 0
 
     items_for_task = []
+    num_items_for_task = 0
+    num_skipped_for_task = 0
 
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
-        for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
-                if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
-                    yield items_for_task
-                    num_items_queued += items_per_task
-                    items_for_task = []
-                    num_subtasks += 1
+        for pk, item in _iterate_items_by_pk(item_querysets, all_item_fields, items_per_query):
+            if num_items_for_task == items_per_task and num_subtasks < total_num_subtasks - 1:
+                yield items_for_task, num_skipped_for_task
+                num_items_queued += items_per_task
+                items_for_task = []
+                num_items_for_task = 0
+                num_skipped_for_task = 0
+                num_subtasks += 1
+            num_items_for_task += 1
+            if pk in excluded_item_ids:
+                num_skipped_for_task += 1
+            else:
                 items_for_task.append(item)
 
         # yield remainder items for task, if any
-        if items_for_task:
-            yield items_for_task
-            num_items_queued += len(items_for_task)
+        if num_items_for_task:
+            yield items_for_task, num_skipped_for_task
+            num_items_queued += num_items_for_task
 
     # Note, depending on what kind of DB is used, it's possible for the queryset
     # we iterate over to change in the course of the query. Therefore it's
@@ -281,6 +333,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    excluded_item_ids=frozenset(),
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -292,10 +345,13 @@ def queue_subtasks_for_query(
             Arguments are the list of items to be processed by this subtask, and a SubtaskStatus
             object reflecting initial status (and containing the subtask's id).
         `item_querysets` : a list of query sets that define the "items" that should be passed to subtasks.
+            Items in more than one query set are only passed to a subtask once.
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
-        `total_num_items` : total amount of items that will be put into subtasks
+        `total_num_items` : total amount of distinct items that will be put into subtasks
+        `excluded_item_ids` : set of primary keys of items that should not be passed to subtasks.
+            These are counted as skipped in the initial status of the subtask they would have been passed to.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -327,6 +383,7 @@ def queue_subtasks_for_query(
         items_per_task,
         total_num_subtasks,
         entry.course_id,
+        excluded_item_ids,
     )
 
     # Now create the subtasks, and start them running.
@@ -337,10 +394,10 @@ def queue_subtasks_for_query(
         total_num_items,
     )
     num_subtasks = 0
-    for item_list in item_list_generator:
+    for item_list, num_skipped in item_list_generator:
         subtask_id = subtask_id_list[num_subtasks]
         num_subtasks += 1
-        subtask_status = SubtaskStatus.create(subtask_id)
+        subtask_status = SubtaskStatus.create(subtask_id, skipped=num_skipped)
         new_subtask = create_subtask_fcn(item_list, subtask_status)
         new_subtask.apply_async()
 
@@ -459,7 +516,7 @@ def check_subtask_is_valid(entry_id, current_task_id, new_subtask_status):
         raise DuplicateTaskException(msg)
 
 
-def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0):
+def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count=0, complete_task=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -470,9 +527,15 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
     The subtask lock acquired in the call to check_subtask_is_valid() is released here, only when
     the attempting of retries has concluded.
+
+    Returns True if this update completed the last of the subtasks of the InstructorTask.
+    Since updates are made while the InstructorTask is locked, this is only true for one
+    of the subtasks, which can then perform any work that needs all subtasks to be done.
+    If `complete_task` is False, the InstructorTask is not marked SUCCESS once its subtasks
+    are done, and that subtask must set its final state once that work is done.
     """
     try:
-        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+        return _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_task)
     except DatabaseError:
         # If we fail, try again recursively.
         retry_count += 1
@@ -480,7 +543,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
             TASK_LOG.info("Retrying to update status for subtask %s of instructor task %d with status %s:  retry %d",
                           current_task_id, entry_id, new_subtask_status, retry_count)
             dog_stats_api.increment('instructor_task.subtask.retry_after_failed_update')
-            update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count)
+            return update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_count, complete_task)
         else:
             TASK_LOG.info("Failed to update status after %d retries for subtask %s of instructor task %d with status %s",
                           retry_count, current_task_id, entry_id, new_subtask_status)
@@ -494,7 +557,7 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
 
 
 @transaction.atomic
-def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
+def _update_subtask_status(entry_id, current_task_id, new_subtask_status, complete_task=True):
     """
     Update the status of the subtask in the parent InstructorTask object tracking its progress.
 
@@ -514,12 +577,14 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     subtasks.  'Total' is expected to have been set at the time the subtasks were created.
     The other three counters are incremented depending on the value of `status`.  Once the counters
     for 'succeeded' and 'failed' match the 'total', the subtasks are done and the InstructorTask's
-    "status" is changed to SUCCESS.
+    "status" is changed to SUCCESS, unless `complete_task` is False.
 
     The "subtasks" field also contains a 'status' key, that contains a dict that stores status
     information for each subtask.  At the moment, the value for each subtask (keyed by its task_id)
     is the value of the SubtaskStatus.to_dict(), but could be expanded in future to store information
     about failure messages, progress made, etc.
+
+    Returns True if this update completed the last of the subtasks.
     """
     TASK_LOG.info("Preparing to update status for subtask %s for instructor task %d with status %s",
                   current_task_id, entry_id, new_subtask_status)
@@ -570,7 +635,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         # At present, we mark the task as having succeeded.  In future, we should see
         # if there was a catastrophic failure that occurred, and figure out how to
         # report that here.
-        if num_remaining <= 0:
+        if num_remaining <= 0 and complete_task:
             entry.task_state = SUCCESS
         entry.subtasks = json.dumps(subtask_dict)
         entry.task_output = InstructorTask.create_output_for_success(task_progress)
@@ -579,6 +644,7 @@ def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
         entry.save()
         TASK_LOG.info("Task output updated to %s for subtask %s of instructor task %d",
                       entry.task_output, current_task_id, entry_id)
+        return num_remaining <= 0 and new_state in READY_STATES
     except Exception:
         TASK_LOG.exception("Unexpected error while updating InstructorTask.")
         dog_stats_api.increment('instructor_task.subtask.update_exception')
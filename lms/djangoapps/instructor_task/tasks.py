@@ -187,6 +187,24 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, xmodule_instance_args, user_id_range, subtask_status_dict):
+    """
+    Grade the enrolled users whose ids are in the given (first, last) range,
+    as a subtask of a sharded grade report, and store their part of the report.
+    The status of the subtask is recorded in the InstructorTask entry.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('graded')
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, Task type: %s, Preparing to grade users %s",
+        subtask_status_dict.get('task_id'), entry_id, action_name, user_id_range
+    )
+    return CourseGradeReport.generate_shard(
+        xmodule_instance_args, entry_id, user_id_range, subtask_status_dict, action_name,
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
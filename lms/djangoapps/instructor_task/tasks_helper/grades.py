@@ -1,13 +1,16 @@
 """
 Functionality for generating grade reports.
 """
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict
 from datetime import datetime
 from itertools import chain, izip, izip_longest
 from time import time
 
+from celery.states import FAILURE, SUCCESS
 from lazy import lazy
 from pytz import UTC
 
@@ -16,7 +19,6 @@ from courseware.courses import get_course_by_id
 from instructor_analytics.basic import list_problem_responses
 from instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
-from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
@@ -29,8 +31,12 @@ from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
+from ..config.models import GradeReportSetting
+from ..exceptions import ShardFailedError
+from ..models import InstructorTask, ReportStore
+from ..subtasks import SubtaskStatus, check_subtask_is_valid, queue_subtasks_for_query, update_subtask_status
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import upload_csv_to_report_store, upload_merged_csv_to_report_store
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -74,6 +80,7 @@ class _CourseGradeReportContext(object):
             task_input=_task_input,
         )
         self.action_name = action_name
+        self.entry_id = _entry_id
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
 
@@ -181,7 +188,6 @@ class _CourseGradeBulkContext(object):
         self.enrollments = _EnrollmentBulkContext(context, users)
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
-        PersistentCourseGrade.prefetch(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
@@ -196,11 +202,59 @@ class CourseGradeReport(object):
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
         Public method to generate a grade report.
+
+        If enabled by GradeReportSetting, the users are split into shards
+        which are graded by separate subtasks, in parallel.
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            if _entry_id is not None:
+                grade_report_setting = GradeReportSetting.current()
+                if grade_report_setting.enabled:
+                    return CourseGradeReport()._generate_sharded(
+                        context, _xmodule_instance_args, grade_report_setting.batch_size,
+                    )
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, user_id_range, subtask_status_dict, action_name):
+        """
+        Public method to generate the part of a sharded grade report for
+        the enrolled users whose ids are in the given (first, last) range.
+
+        The last shard to complete merges the parts of all the shards
+        into the final report, unless any of them failed, then sets the
+        final state of the task.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(_entry_id, current_task_id, subtask_status)
+
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(
+                _xmodule_instance_args, _entry_id, course_id, json.loads(entry.task_input), action_name,
+            )
+            report = CourseGradeReport()
+            try:
+                report._generate_shard(context, user_id_range)
+            except Exception:
+                TASK_LOG.exception(u'%s, Grade report shard %s failed', context.task_info_string, user_id_range)
+                subtask_status.increment(state=FAILURE)
+                if update_subtask_status(_entry_id, current_task_id, subtask_status, complete_task=False):
+                    report._complete_shards(context)
+                raise
+
+            subtask_status.increment(
+                succeeded=context.task_progress.succeeded,
+                failed=context.task_progress.failed,
+                state=SUCCESS,
+            )
+            if update_subtask_status(_entry_id, current_task_id, subtask_status, complete_task=False):
+                report._complete_shards(context)
+        return subtask_status.to_dict()
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -218,6 +272,148 @@ class CourseGradeReport(object):
 
         return context.update_status(u'Completed grades')
 
+    def _generate_sharded(self, context, xmodule_instance_args, shard_size):
+        """
+        Internal method for queueing the subtasks that generate a grade
+        report for the given context in shards of at most shard_size users.
+        """
+        # Imported here to avoid a circular import with the tasks module.
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+        entry = InstructorTask.objects.get(pk=context.entry_id)
+
+        # The task may have been requeued after its subtasks were queued,
+        # in which case they should not be queued again.
+        if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+            TASK_LOG.warning(u'%s, Grade report shards have already been queued', context.task_info_string)
+            return json.loads(entry.task_output)
+
+        users = self._enrolled_users(context).order_by('id')
+        total_num_users = users.count()
+        if total_num_users == 0:
+            return self._generate(context)
+
+        def _create_shard_subtask(user_list, initial_subtask_status):
+            """
+            Creates a subtask to grade the range of users in the given
+            list, which is ordered by user id.
+            """
+            return calculate_grades_csv_shard.subtask(
+                (
+                    context.entry_id,
+                    xmodule_instance_args,
+                    (user_list[0]['pk'], user_list[-1]['pk']),
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+            )
+
+        context.update_status(u'Queueing grade report shards')
+        return queue_subtasks_for_query(
+            entry,
+            context.action_name,
+            _create_shard_subtask,
+            [users],
+            [],
+            shard_size,
+            total_num_users,
+        )
+
+    def _generate_shard(self, context, user_id_range):
+        """
+        Internal method for grading the enrolled users whose ids are in the
+        given range, and storing their rows as parts of the grade report.
+
+        Successful rows are written to the report store as they are
+        compiled, so only a batch of rows is held in memory at a time.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        part_filename = self._shard_part_filename(context, user_id_range)
+        users = self._enrolled_users(context).filter(id__range=user_id_range).order_by('id')
+
+        all_error_rows = []
+
+        def _success_rows():
+            """
+            Yields the successful rows of the shard, batch by batch, while
+            counting them and collecting the error rows.
+            """
+            for success_rows, error_rows in self._batched_rows(context, users):
+                context.task_progress.succeeded += len(success_rows)
+                context.task_progress.failed += len(error_rows)
+                all_error_rows.extend(error_rows)
+                for row in success_rows:
+                    yield row
+
+        report_store.store_rows(context.course_id, part_filename + '.csv', _success_rows())
+        if all_error_rows:
+            report_store.store_rows(context.course_id, part_filename + '_err.csv', all_error_rows)
+        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
+
+    def _complete_shards(self, context):
+        """
+        Internal method, run once all the shards of the grade report are
+        done, for merging their parts into the final report and marking
+        the task SUCCESS.
+
+        If any shard failed, or the merge fails, no report is stored, and
+        the task is marked FAILURE instead. The parts are deleted either way.
+        """
+        entry = InstructorTask.objects.get(pk=context.entry_id)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        part_filenames = report_store.filenames_in(context.course_id, self._shard_parts_dir(context))
+        try:
+            num_failed = json.loads(entry.subtasks)['failed']
+            if num_failed > 0:
+                raise ShardFailedError(u'{} of the grade report shards failed'.format(num_failed))
+            self._merge_shards(context, part_filenames)
+        except Exception as exception:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'%s, Grade report shards could not be merged', context.task_info_string)
+            entry.task_state = FAILURE
+            entry.task_output = InstructorTask.create_output_for_failure(exception, traceback.format_exc())
+        else:
+            entry.task_state = SUCCESS
+        finally:
+            for filename in part_filenames:
+                report_store.delete(context.course_id, filename)
+        entry.save_now()
+
+    def _merge_shards(self, context, part_filenames):
+        """
+        Internal method for merging the given stored parts of all the shards
+        of the grade report into the final report.
+        """
+        success_part_filenames = [filename for filename in part_filenames if not filename.endswith('_err.csv')]
+        error_part_filenames = [filename for filename in part_filenames if filename.endswith('_err.csv')]
+
+        date = datetime.now(UTC)
+        upload_merged_csv_to_report_store(
+            [self._success_headers(context)], success_part_filenames, 'grade_report', context.course_id, date,
+        )
+        if error_part_filenames:
+            upload_merged_csv_to_report_store(
+                [self._error_headers()], error_part_filenames, 'grade_report_err', context.course_id, date,
+            )
+
+        TASK_LOG.info(
+            u'%s, Merged %d grade report shard parts', context.task_info_string, len(part_filenames),
+        )
+
+    def _shard_parts_dir(self, context):
+        """
+        Returns the report store directory of the parts of the shards of
+        the grade report, which is not listed with the course's reports.
+        """
+        return u'grade_report_shards_{}'.format(context.entry_id)
+
+    def _shard_part_filename(self, context, user_id_range):
+        """
+        Returns the report store filename, without extension, of the part
+        for the given user id range.  Zero-padding the id keeps the parts
+        in the order of their users when sorted by filename.
+        """
+        return u'{}/{:012d}'.format(self._shard_parts_dir(context), user_id_range[0])
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -239,11 +435,11 @@ class CourseGradeReport(object):
         """
         return ["Student ID", "Username", "Error"]
 
-    def _batched_rows(self, context):
+    def _batched_rows(self, context, users=None):
         """
         A generator of batches of (success_rows, error_rows) for this report.
         """
-        for users in self._batch_users(context):
+        for users in self._batch_users(context, users):
             users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
@@ -286,18 +482,26 @@ class CourseGradeReport(object):
             grades_header.append(assignment_info['average_header'])
         return grades_header
 
-    def _batch_users(self, context):
+    def _batch_users(self, context, users=None):
         """
-        Returns a generator of batches of users.
+        Returns a generator of batches of the given users, or of all the
+        enrolled users if none are given.
         """
         def grouper(iterable, chunk_size=self.USER_BATCH_SIZE, fillvalue=None):
             args = [iter(iterable)] * chunk_size
             return izip_longest(*args, fillvalue=fillvalue)
 
-        users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
-        users = users.select_related('profile')
+        if users is None:
+            users = self._enrolled_users(context)
         return grouper(users)
 
+    def _enrolled_users(self, context):
+        """
+        Returns a queryset of all the users enrolled in the course.
+        """
+        users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
+        return users.select_related('profile')
+
     def _user_grades(self, course_grade, context):
         """
         Returns a list of grade results for the given course_grade corresponding
@@ -432,6 +636,7 @@ class CourseGradeReport(object):
                 course=context.course,
                 collected_block_structure=context.course_structure,
                 course_key=context.course_id,
+                batch_size=self.USER_BATCH_SIZE,
             ):
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
@@ -480,7 +685,9 @@ class ProblemGradeReport(object):
         # whether each user is currently enrolled in the course.
         CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
 
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
+        for student, course_grade, error in CourseGradeFactory().iter(
+                enrolled_students, course, batch_size=CourseGradeReport.USER_BATCH_SIZE,
+        ):
             student_fields = [getattr(student, field_name) for field_name in header_row]
             task_progress.attempted += 1
 
@@ -28,18 +28,42 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
-    report_store.store_rows(
-        course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
-        rows
+    report_store.store_rows(course_id, _report_filename(csv_name, course_id, timestamp), rows)
+    tracker_emit(csv_name)
+
+
+def upload_merged_csv_to_report_store(header_rows, part_filenames, csv_name, course_id, timestamp,
+                                      config_name='GRADES_DOWNLOAD'):
+    """
+    Upload, using ReportStore, a CSV made of the given header rows followed
+    by the contents of the given CSV files, previously stored in the same
+    ReportStore.
+
+    Arguments:
+        header_rows: CSV data in the same format as for
+            upload_csv_to_report_store
+        part_filenames: Names of the stored CSV files to merge, in order
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_store.store_merged(
+        course_id, _report_filename(csv_name, course_id, timestamp), header_rows, part_filenames,
     )
     tracker_emit(csv_name)
 
 
+def _report_filename(csv_name, course_id, timestamp):
+    """
+    Returns the name of the CSV file to store for the given report.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
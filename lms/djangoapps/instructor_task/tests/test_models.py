@@ -49,6 +49,24 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_merged(self):
+        """
+        Test that ReportStore.store_merged() stores the given header rows
+        followed by the contents of the given files, in order.
+        """
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'parts/b.csv', [['3', '4']])
+        report_store.store_rows(self.course_id, 'parts/a.csv', [['1', '2']])
+        part_filenames = report_store.filenames_in(self.course_id, 'parts')
+        self.assertEqual(part_filenames, ['parts/a.csv', 'parts/b.csv'])
+
+        report_store.store_merged(self.course_id, 'merged_file', [['x', 'y']], part_filenames)
+        with report_store.storage.open(report_store.path_to(self.course_id, 'merged_file')) as merged_file:
+            self.assertEqual(merged_file.read(), 'x,y\r\n1,2\r\n3,4\r\n')
+
+        # Files in the directory are not listed as reports of the course.
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['merged_file'])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -25,7 +25,10 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
+    def _queue_subtasks(
+            self, create_subtask_fcn, items_per_task, initial_count, extra_count, task_querysets=None,
+            excluded_item_ids=frozenset(), total_num_items=None,
+    ):
         """Queue subtasks while enrolling more students into course in the middle of the process."""
 
         task_id = str(uuid4())
@@ -37,7 +40,8 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         )
 
         self._enroll_students_in_course(self.course.id, initial_count)
-        task_querysets = [CourseEnrollment.objects.filter(course_id=self.course.id)]
+        if task_querysets is None:
+            task_querysets = [CourseEnrollment.objects.filter(course_id=self.course.id)]
 
         def initialize_subtask_info(*args):  # pylint: disable=unused-argument
             """Instead of initializing subtask info enroll some more students into course."""
@@ -53,7 +57,8 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_querysets=task_querysets,
                 item_fields=[],
                 items_per_task=items_per_task,
-                total_num_items=initial_count,
+                total_num_items=initial_count if total_num_items is None else total_num_items,
+                excluded_item_ids=excluded_item_ids,
             )
 
     def test_queue_subtasks_for_query1(self):
@@ -79,3 +84,48 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    @patch('lms.djangoapps.instructor_task.subtasks.ITEMS_PER_QUERY', 2)
+    def test_queue_subtasks_for_query_duplicates(self):
+        """Test queue_subtasks_for_query() only passes items in more than one queryset to one subtask."""
+
+        mock_create_subtask_fcn = Mock()
+        task_querysets = [
+            CourseEnrollment.objects.filter(course_id=self.course.id),
+            CourseEnrollment.objects.filter(course_id=self.course.id, user__username__startswith='student'),
+        ]
+        self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 0, task_querysets=task_querysets)
+
+        # Check items are passed to subtasks once, in order of primary key
+        item_lists = [args[0][0] for args in mock_create_subtask_fcn.call_args_list]
+        self.assertEqual([len(item_list) for item_list in item_lists], [3, 3, 1])
+        item_ids = [item['pk'] for item_list in item_lists for item in item_list]
+        self.assertEqual(
+            item_ids,
+            list(CourseEnrollment.objects.filter(course_id=self.course.id).order_by('pk').values_list('pk', flat=True)),
+        )
+
+    def test_queue_subtasks_for_query_excluded(self):
+        """Test queue_subtasks_for_query() counts excluded items as skipped by the subtask they would be in."""
+
+        mock_create_subtask_fcn = Mock()
+        self._enroll_students_in_course(self.course.id, 7)
+        enrollment_ids = list(
+            CourseEnrollment.objects.filter(course_id=self.course.id).order_by('pk').values_list('pk', flat=True)
+        )
+        excluded_item_ids = {enrollment_ids[0], enrollment_ids[1], enrollment_ids[4]}
+        self._queue_subtasks(
+            mock_create_subtask_fcn, 3, 0, 0, excluded_item_ids=excluded_item_ids, total_num_items=len(enrollment_ids),
+        )
+
+        # Check number of items and skipped items for each subtask
+        mock_create_subtask_fcn_args = mock_create_subtask_fcn.call_args_list
+        self.assertEqual(len(mock_create_subtask_fcn_args), 3)
+        self.assertEqual(
+            [len(args[0][0]) for args in mock_create_subtask_fcn_args],
+            [1, 2, 1],
+        )
+        self.assertEqual(
+            [args[0][1].skipped for args in mock_create_subtask_fcn_args],
+            [2, 1, 0],
+        )
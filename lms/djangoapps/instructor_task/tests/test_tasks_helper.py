@@ -8,14 +8,17 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 import tempfile
 import urllib
 from datetime import datetime
+from uuid import uuid4
 
 import ddt
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
@@ -34,6 +37,7 @@ from courseware.tests.factories import InstructorFactory
 from instructor_analytics.basic import UNAVAILABLE
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
+from lms.djangoapps.instructor_task.config.models import GradeReportSetting
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_enrollment_report,
@@ -53,6 +57,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -83,7 +88,7 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.partitions.partitions import Group, UserPartition
 
-from ..models import ReportStore
+from ..models import InstructorTask, ReportStore
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 
@@ -395,7 +400,7 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
 
         RequestCache.clear_request_cache()
 
-        expected_query_count = 36
+        expected_query_count = 37
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with check_mongo_calls(mongo_count):
                 with self.assertNumQueries(expected_query_count):
@@ -424,6 +429,105 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+class TestShardedGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports generated in shards by parallel subtasks
+    are merged into a single report.
+    """
+    def setUp(self):
+        super(TestShardedGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(5)
+        ]
+        GradeReportSetting.objects.create(enabled=True, batch_size=2)
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_key='dummy_task_key',
+            task_id=str(uuid4()),
+        )
+
+    def _generate(self):
+        """
+        Generates the grade report for the course, with its shards
+        run eagerly.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate(None, self.entry.id, self.course.id, {}, 'graded')
+
+    def test_merged_report(self):
+        self._generate()
+
+        self.verify_rows_in_csv(
+            [
+                {'Student ID': unicode(student.id), 'Username': student.username}
+                for student in sorted(self.students, key=lambda student: student.id)
+            ],
+            ignore_other_columns=True,
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+        self.assertEqual(report_store.filenames_in(self.course.id, u'grade_report_shards_{}'.format(self.entry.id)), [])
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['succeeded'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output),
+        )
+
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
+    def test_merged_error_report(self, mock_course_grade):
+        mock_course_grade.side_effect = TypeError('Cannot grade student')
+        self._generate()
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 0, 'failed': 5}, json.loads(entry.task_output),
+        )
+
+    def assert_report_failed(self, message):
+        """
+        Asserts that no grade report was stored and the task failed with
+        the given message, and that the parts of the shards were deleted.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        self.assertEqual(report_store.filenames_in(self.course.id, u'grade_report_shards_{}'.format(self.entry.id)), [])
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['message'], message)
+
+    def test_failed_shard(self):
+        generate_shard = CourseGradeReport._generate_shard  # pylint: disable=protected-access
+
+        def _generate_shard(report, context, user_id_range):
+            """
+            Fails to grade the shard of the third student.
+            """
+            if user_id_range[0] == self.students[2].id:
+                raise ValueError('Cannot grade shard')
+            return generate_shard(report, context, user_id_range)
+
+        with patch.object(CourseGradeReport, '_generate_shard', autospec=True, side_effect=_generate_shard):
+            self._generate()
+
+        self.assert_report_failed(u'1 of the grade report shards failed')
+        self.assertEqual(json.loads(InstructorTask.objects.get(pk=self.entry.id).subtasks)['failed'], 1)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.upload_merged_csv_to_report_store')
+    def test_failed_merge(self, mock_upload):
+        mock_upload.side_effect = IOError('Cannot store report')
+        self._generate()
+
+        self.assert_report_failed(u'Cannot store report')
+
+
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
 
@@ -6,8 +6,11 @@ included early in the INSTALLED_APPS list.
 """
 
 import analytics
+from capa.capa_problem import configure_template_cache
+from capa.safe_exec import configure_local_cache
 from django.apps import AppConfig
 from django.conf import settings
+from static_replace import configure_asset_url_cache
 
 
 class LMSInitializationConfig(AppConfig):
@@ -23,6 +26,9 @@ class LMSInitializationConfig(AppConfig):
         settings have loaded, but before most other djangoapp initializations.
         """
         self._initialize_analytics()
+        self._initialize_safe_exec()
+        self._initialize_capa_problem_templates()
+        self._initialize_static_replace()
 
     def _initialize_analytics(self):
         """
@@ -30,3 +36,22 @@ class LMSInitializationConfig(AppConfig):
         """
         if settings.LMS_SEGMENT_KEY:
             analytics.write_key = settings.LMS_SEGMENT_KEY
+
+    def _initialize_safe_exec(self):
+        """
+        Size the in-process cache of sandboxed code execution results.
+        """
+        configure_local_cache(settings.SAFE_EXEC_LOCAL_CACHE_MAX_ENTRIES)
+
+    def _initialize_capa_problem_templates(self):
+        """
+        Size the in-process cache of parsed problem templates.
+        """
+        configure_template_cache(settings.CAPA_PROBLEM_TEMPLATE_CACHE_MAX_BYTES)
+
+    def _initialize_static_replace(self):
+        """
+        Configure the in-process cache of resolved static asset urls.
+        """
+        config = settings.STATIC_REPLACE_ASSET_URL_CACHE
+        configure_asset_url_cache(config['TIMEOUT'], config['MAX_COURSES'], config['MAX_URLS_PER_COURSE'])
@@ -226,6 +226,14 @@ if 'loc_cache' not in CACHES:
         'LOCATION': 'edx_location_mem_cache',
     }
 
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES', COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES
+)
+CONTENTSERVER_DISK_CACHE_DIR = ENV_TOKENS.get('CONTENTSERVER_DISK_CACHE_DIR', CONTENTSERVER_DISK_CACHE_DIR)
+CONTENTSERVER_DISK_CACHE_MAX_BYTES = ENV_TOKENS.get(
+    'CONTENTSERVER_DISK_CACHE_MAX_BYTES', CONTENTSERVER_DISK_CACHE_MAX_BYTES
+)
+
 # Email overrides
 DEFAULT_FROM_EMAIL = ENV_TOKENS.get('DEFAULT_FROM_EMAIL', DEFAULT_FROM_EMAIL)
 DEFAULT_FEEDBACK_EMAIL = ENV_TOKENS.get('DEFAULT_FEEDBACK_EMAIL', DEFAULT_FEEDBACK_EMAIL)
@@ -254,6 +262,9 @@ PAYMENT_REPORT_GENERATOR_GROUP = ENV_TOKENS.get('PAYMENT_REPORT_GENERATOR_GROUP'
 # Bulk Email overrides
 BULK_EMAIL_DEFAULT_FROM_EMAIL = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_FROM_EMAIL', BULK_EMAIL_DEFAULT_FROM_EMAIL)
 BULK_EMAIL_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_TASK', BULK_EMAIL_EMAILS_PER_TASK)
+BULK_EMAIL_SECONDS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_SECONDS_PER_TASK', BULK_EMAIL_SECONDS_PER_TASK)
+BULK_EMAIL_MIN_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_MIN_EMAILS_PER_TASK', BULK_EMAIL_MIN_EMAILS_PER_TASK)
+BULK_EMAIL_MAX_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_MAX_EMAILS_PER_TASK', BULK_EMAIL_MAX_EMAILS_PER_TASK)
 BULK_EMAIL_DEFAULT_RETRY_DELAY = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_RETRY_DELAY', BULK_EMAIL_DEFAULT_RETRY_DELAY)
 BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX_RETRIES)
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
@@ -357,6 +368,7 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CONNECTIONS.update(ENV_TOKENS.get('COMMENTS_SERVICE_CONNECTIONS', {}))
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get('ZENDESK_URL', ZENDESK_URL)
 ZENDESK_CUSTOM_FIELDS = ENV_TOKENS.get('ZENDESK_CUSTOM_FIELDS', ZENDESK_CUSTOM_FIELDS)
@@ -383,6 +395,13 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_LOCAL_CACHE_MAX_ENTRIES = ENV_TOKENS.get(
+    'SAFE_EXEC_LOCAL_CACHE_MAX_ENTRIES', SAFE_EXEC_LOCAL_CACHE_MAX_ENTRIES
+)
+CAPA_PROBLEM_TEMPLATE_CACHE_MAX_BYTES = ENV_TOKENS.get(
+    'CAPA_PROBLEM_TEMPLATE_CACHE_MAX_BYTES', CAPA_PROBLEM_TEMPLATE_CACHE_MAX_BYTES
+)
+STATIC_REPLACE_ASSET_URL_CACHE.update(ENV_TOKENS.get('STATIC_REPLACE_ASSET_URL_CACHE', {}))
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
@@ -617,6 +636,16 @@ BROKER_USE_SSL = ENV_TOKENS.get('CELERY_BROKER_USE_SSL', False)
 # Block Structures
 BLOCK_STRUCTURES_SETTINGS = ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', BLOCK_STRUCTURES_SETTINGS)
 
+# Course Overviews
+COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT',
+    COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT
+)
+COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES = ENV_TOKENS.get(
+    'COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES',
+    COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES
+)
+
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
 
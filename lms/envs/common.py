@@ -64,6 +64,18 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Connections to the comments service.  Each process keeps up to POOL_SIZE
+# connections alive, and retries requests that fail to connect up to
+# MAX_RETRIES times.  Up to MAX_CONCURRENT_REQUESTS independent requests of
+# the Discussion API are made at once.  A POOL_SIZE of 0 opens a connection
+# for each request, and a MAX_CONCURRENT_REQUESTS of 0 makes them one at a
+# time.
+COMMENTS_SERVICE_CONNECTIONS = {
+    'POOL_SIZE': 0,
+    'MAX_RETRIES': 0,
+    'MAX_CONCURRENT_REQUESTS': 0,
+}
+
 LMS_ROOT_URL = "http://localhost:8000"
 LMS_INTERNAL_ROOT_URL = LMS_ROOT_URL
 LMS_ENROLLMENT_API_PATH = "/api/enrollment/v1/"
@@ -418,6 +430,23 @@ FEATURES = {
 
     # Whether HTML XBlocks/XModules return HTML content with the Course Blocks API student_view_data
     'ENABLE_HTML_XBLOCK_STUDENT_VIEW_DATA': False,
+
+    # Whether the Course Blocks API streams its JSON responses, encoding
+    # one block at a time, rather than rendering them through DRF.
+    'ENABLE_BLOCKS_API_STREAMING': False,
+
+    # Whether courseware.access.has_access caches its decisions for the
+    # rest of the request.
+    'ENABLE_ACCESS_DECISION_CACHE': False,
+
+    # Whether to cache XBlock user state in the Django cache, so that it can be
+    # reused across requests rather than being queried on every page load.
+    'ENABLE_SHARED_USER_STATE_CACHE': False,
+
+    # Whether XBlock user state written while handling a request is saved
+    # with one bulk write per user when the response is returned, rather
+    # than one block at a time as it is written.
+    'ENABLE_USER_STATE_WRITE_BEHIND': False,
 }
 
 # Settings for the course reviews tool template and identification key, set either to None to disable course reviews
@@ -820,6 +849,18 @@ XBLOCK_FIELD_DATA_WRAPPERS = ()
 ############# ModuleStore Configuration ##########
 
 MODULESTORE_BRANCH = 'published-only'
+
+# Maximum number of bytes of pickled split modulestore course structures to
+# keep in an in-process cache, in front of the 'course_structure_cache'.
+# Structures are immutable, so this cache never serves stale data. Set to 0
+# to disable the in-process cache.
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = 0
+
+# Directory in which to cache the data of course assets, which are too large to be cached
+# in the 'course_assets' cache, on the local disk of each node, and the maximum number of
+# bytes to cache there. The disk cache is disabled unless both are set.
+CONTENTSERVER_DISK_CACHE_DIR = None
+CONTENTSERVER_DISK_CACHE_MAX_BYTES = 0
 CONTENTSTORE = None
 DOC_STORE_CONFIG = {
     'host': 'localhost',
@@ -885,6 +926,16 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# Number of sandboxed code execution results to keep in an in-process cache in
+# front of the shared cache, so problems re-rendered with the same seed don't
+# need a round trip to it.  0 disables the in-process cache.
+SAFE_EXEC_LOCAL_CACHE_MAX_ENTRIES = 0
+
+# Total size, in bytes of problem XML, of the parsed problem templates kept in
+# an in-process cache, so each learner loading a problem doesn't parse its XML
+# again.  0 disables the cache.
+CAPA_PROBLEM_TEMPLATE_CACHE_MAX_BYTES = 0
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -932,6 +983,15 @@ STATICFILES_DIRS = [
     PROJECT_ROOT / "static",
 ]
 
+# In-process cache of the urls that static_replace resolves for course
+# assets, by course.  Urls are kept for TIMEOUT seconds, since they change
+# with the content of the assets.  A TIMEOUT of 0 disables the cache.
+STATIC_REPLACE_ASSET_URL_CACHE = {
+    'TIMEOUT': 0,
+    'MAX_COURSES': 100,
+    'MAX_URLS_PER_COURSE': 1000,
+}
+
 FAVICON_PATH = 'images/favicon.ico'
 DEFAULT_COURSE_ABOUT_IMAGE_URL = 'images/pencils.jpg'
 
@@ -1213,6 +1273,8 @@ MIDDLEWARE_CLASSES = [
     'crum.CurrentRequestUserMiddleware',
 
     'request_cache.middleware.RequestCache',
+    # Must come after RequestCache, which clears the writes it saves.
+    'courseware.middleware.UserStateWriteBehindMiddleware',
     'openedx.core.djangoapps.monitoring_utils.middleware.MonitoringCustomMetrics',
 
     'mobile_api.middleware.AppVersionUpgrade',
@@ -1928,6 +1990,16 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # DIRECTORY_PREFIX='/modeltest/',
 )
 
+################################ Course Overviews ###################################
+
+# Number of seconds CourseOverview.get_from_ids keeps overviews in an in-process
+# cache, in addition to invalidating them when their course is published.
+# Set to 0 to disable the in-process cache.
+COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT = 0
+
+# Maximum number of overviews in the in-process cache of each process.
+COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES = 1000
+
 ################################ Bulk Email ###################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -1937,6 +2009,14 @@ BULK_EMAIL_DEFAULT_FROM_EMAIL = 'no-reply@example.com'
 # Parameters for breaking down course enrollment into subtasks.
 BULK_EMAIL_EMAILS_PER_TASK = 100
 
+# If set, subtasks are instead sized to take about this many seconds, at the
+# recently measured rate of sending email, with no fewer than
+# BULK_EMAIL_MIN_EMAILS_PER_TASK and no more than BULK_EMAIL_MAX_EMAILS_PER_TASK
+# emails in each.  Set to 0 to always use BULK_EMAIL_EMAILS_PER_TASK.
+BULK_EMAIL_SECONDS_PER_TASK = 0
+BULK_EMAIL_MIN_EMAILS_PER_TASK = 20
+BULK_EMAIL_MAX_EMAILS_PER_TASK = 1000
+
 # Initial delay used for retrying tasks.  Additional retries use
 # longer delays.  Value is in seconds.
 BULK_EMAIL_DEFAULT_RETRY_DELAY = 30
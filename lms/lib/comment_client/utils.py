@@ -1,16 +1,35 @@
 """" Common utilities for comment client wrapper """
 import logging
+import os
+import sys
+import threading
 from contextlib import contextmanager
+from functools import partial
+from multiprocessing.pool import ThreadPool
 from time import time
 from uuid import uuid4
 
 import requests
-from django.utils.translation import get_language
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.translation import get_language, override
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 import dogstats_wrapper as dog_stats_api
 
 log = logging.getLogger(__name__)
 
+# The connection pool and thread pool of this process, created lazily.
+_pools_lock = threading.Lock()
+_session = None
+_session_key = None
+_thread_pool = None
+_thread_pool_key = None
+
+# Whether the current thread is a worker of the thread pool.
+_worker_state = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -52,6 +71,123 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+def _get_connection_settings():
+    """
+    Returns the COMMENTS_SERVICE_CONNECTIONS setting, with defaults for
+    any missing values.
+    """
+    connection_settings = {'POOL_SIZE': 0, 'MAX_RETRIES': 0, 'MAX_CONCURRENT_REQUESTS': 0}
+    connection_settings.update(getattr(settings, 'COMMENTS_SERVICE_CONNECTIONS', {}))
+    return connection_settings
+
+
+def get_session():
+    """
+    Returns the requests.Session of this process, which keeps up to
+    POOL_SIZE connections to the comments service alive, and retries
+    requests that fail to connect up to MAX_RETRIES times.
+
+    Returns None if POOL_SIZE is 0, in which case each request opens a
+    new connection.
+
+    The session is created again after a fork, so that processes don't
+    share connections, and when the settings change.
+    """
+    global _session, _session_key  # pylint: disable=global-statement
+    connection_settings = _get_connection_settings()
+    pool_size, max_retries = connection_settings['POOL_SIZE'], connection_settings['MAX_RETRIES']
+    if not pool_size:
+        return None
+
+    key = (os.getpid(), pool_size, max_retries)
+    if _session_key != key:
+        with _pools_lock:
+            if _session_key != key:
+                session = requests.Session()
+                # Requests that fail to connect were never sent, so are safe to
+                # retry whatever their method, but requests that fail after
+                # they were sent aren't.
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=pool_size,
+                    max_retries=Retry(total=max_retries, read=False),
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session, _session_key = session, key
+    return _session
+
+
+def _get_thread_pool(size):
+    """
+    Returns the pool of `size` threads of this process that make concurrent
+    requests to the comments service.
+    """
+    global _thread_pool, _thread_pool_key  # pylint: disable=global-statement
+    key = (os.getpid(), size)
+    if _thread_pool_key != key:
+        with _pools_lock:
+            if _thread_pool_key != key:
+                # A pool inherited from the parent process has no threads, and
+                # one of another size is left to finish its work and exit.
+                if _thread_pool is not None and _thread_pool_key[0] == key[0]:
+                    _thread_pool.close()
+                _thread_pool, _thread_pool_key = ThreadPool(size), key
+    return _thread_pool
+
+
+def _call_in_worker(call, language):
+    """
+    Calls `call` in a worker thread with the language of the thread that
+    submitted it, and returns whether it succeeded along with its result or
+    the info of the exception it raised.
+    """
+    _worker_state.active = True
+    try:
+        with override(language):
+            return True, call()
+    except Exception:  # pylint: disable=broad-except
+        return False, sys.exc_info()
+    finally:
+        _worker_state.active = False
+        # Like at the end of a request, as the thread outlives the call.
+        close_old_connections()
+
+
+def perform_concurrently(*calls):
+    """
+    Calls each of `calls`, functions that make independent requests to the
+    comments service, and returns the list of their results, in order.
+
+    Up to MAX_CONCURRENT_REQUESTS of the calls are made at once, from a pool
+    of threads, so a view that needs several requests only waits for the
+    slowest of them.  The calls are made in the current thread, one after
+    the other, if MAX_CONCURRENT_REQUESTS is 0, or if the current thread is
+    itself one of the pool's.
+
+    Besides the language, calls in the pool's threads don't see any state
+    local to the current thread, such as the request cache or the event
+    tracker's context, so they should only make requests.
+
+    If any call raises an exception, the first one raised, in the order of
+    `calls`, is raised once all calls have finished.
+    """
+    max_concurrent_requests = _get_connection_settings()['MAX_CONCURRENT_REQUESTS']
+    if max_concurrent_requests < 2 or len(calls) < 2 or getattr(_worker_state, 'active', False):
+        return [call() for call in calls]
+
+    outcomes = _get_thread_pool(max_concurrent_requests).map(
+        partial(_call_in_worker, language=get_language()), calls, chunksize=1,
+    )
+    results = []
+    for succeeded, result in outcomes:
+        if not succeeded:
+            exc_type, exc_value, exc_traceback = result
+            raise exc_type, exc_value, exc_traceback
+        results.append(result)
+    return results
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
     # To avoid dependency conflict
@@ -83,8 +219,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
+    session = get_session()
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = (session or requests).request(
             method,
             url,
             data=data,
@@ -3,3 +3,7 @@ PROGRAM_CACHE_KEY_TPL = 'program-{uuid}'
 
 # Cache key used to locate an item containing a list of all program UUIDs for a site.
 SITE_PROGRAM_UUIDS_CACHE_KEY_TPL = 'program-uuids-{domain}'
+
+# Cache key used to locate the version of a site's cached programs, which changes
+# each time they are cached again.
+SITE_PROGRAMS_VERSION_CACHE_KEY_TPL = 'program-version-{domain}'
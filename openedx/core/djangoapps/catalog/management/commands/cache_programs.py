@@ -1,5 +1,6 @@
 import logging
 import sys
+from uuid import uuid4
 
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
@@ -8,7 +9,8 @@ from django.core.management import BaseCommand
 
 from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.catalog.utils import create_catalog_api_client
@@ -24,6 +26,9 @@ class Command(BaseCommand):
     service, writing each to its own cache entry with an indefinite expiration.
     It is meant to be run on a scheduled basis and should be the only code
     updating these cache entries.
+
+    Once all programs are cached, each site's programs version is changed, so
+    that processes replace their in-process snapshots of the programs.
     """
     help = "Rebuild the LMS' cache of program data."
 
@@ -69,6 +74,11 @@ class Command(BaseCommand):
         logger.info('Caching details for {successful} programs.'.format(successful=successful))
         cache.set_many(programs, None)
 
+        version = uuid4().hex
+        cache.set_many({
+            SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=site.domain): version for site in Site.objects.all()
+        }, None)
+
         if failure:
             # This will fail a Jenkins job running this command, letting site
             # operators know that there was a problem.
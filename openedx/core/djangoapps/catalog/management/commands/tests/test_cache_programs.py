@@ -6,7 +6,8 @@ from django.core.management import call_command
 
 from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.tests.factories import ProgramFactory
 from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
@@ -115,6 +116,14 @@ class TestCachePrograms(CatalogIntegrationMixin, CacheIsolationTestCase, SiteMix
         for key, program in cached_programs.items():
             self.assertEqual(program, programs[key])
 
+        # The version changes each time the programs are cached.
+        version_key = SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=self.site_domain)
+        version = cache.get(version_key)
+        self.assertIsNotNone(version)
+
+        call_command('cache_programs')
+        self.assertNotEqual(cache.get(version_key), version)
+
     def test_handle_missing_service_user(self):
         """
         Verify that the command raises an exception when run without a service
@@ -1,6 +1,7 @@
 """Tests covering utilities for integrating with the catalog service."""
 # pylint: disable=missing-docstring
 import copy
+import threading
 
 import ddt
 import mock
@@ -9,7 +10,11 @@ from django.core.cache import cache
 from django.test import TestCase, override_settings
 from student.tests.factories import UserFactory
 
-from openedx.core.djangoapps.catalog.cache import PROGRAM_CACHE_KEY_TPL, SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+from openedx.core.djangoapps.catalog.cache import (
+    PROGRAM_CACHE_KEY_TPL,
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
+)
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.catalog.tests.factories import CourseFactory, CourseRunFactory, ProgramFactory, ProgramTypeFactory
 from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
@@ -20,6 +25,7 @@ from openedx.core.djangoapps.catalog.utils import (
     get_currency_data,
     get_program_types,
     get_programs,
+    get_programs_snapshot,
     get_programs_with_type
 )
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory
@@ -160,6 +166,93 @@ class TestGetPrograms(CacheIsolationTestCase):
         self.assertFalse(mock_warning.called)
 
 
+@skip_unless_lms
+@mock.patch(UTILS_MODULE + '.logger.info')
+@mock.patch(UTILS_MODULE + '.logger.warning')
+class TestGetProgramsSnapshot(CacheIsolationTestCase):
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestGetProgramsSnapshot, self).setUp()
+        self.site = SiteFactory()
+        self.programs = ProgramFactory.create_batch(3)
+
+        snapshots_patcher = mock.patch.dict(UTILS_MODULE + '._program_snapshots', clear=True)
+        snapshots_patcher.start()
+        self.addCleanup(snapshots_patcher.stop)
+
+    def cache_programs(self, programs, version):
+        """Cache the programs of the site, as the cache_programs command does."""
+        cache.set_many({PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid']): program for program in programs}, None)
+        cache.set(
+            SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=self.site.domain),
+            [program['uuid'] for program in programs],
+            None
+        )
+        cache.set(SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=self.site.domain), version, None)
+
+    def assert_programs(self, actual, expected):
+        """Verify that the programs are the same, in whatever order."""
+        self.assertEqual(
+            sorted(actual, key=lambda program: program['uuid']),
+            sorted(expected, key=lambda program: program['uuid'])
+        )
+
+    def test_no_version(self, _mock_warning, _mock_info):
+        self.cache_programs(self.programs, None)
+        self.assertIsNone(get_programs_snapshot(self.site))
+        self.assert_programs(get_programs(self.site), self.programs)
+
+    def test_snapshot(self, _mock_warning, _mock_info):
+        self.cache_programs(self.programs, 'v1')
+        self.assert_programs(get_programs(self.site), self.programs)
+
+        # Programs are read from the snapshot until the version changes.
+        cache.delete_many([PROGRAM_CACHE_KEY_TPL.format(uuid=program['uuid']) for program in self.programs])
+        programs = get_programs(self.site)
+        self.assert_programs(programs, self.programs)
+        self.assertEqual(get_programs(self.site, uuid=self.programs[0]['uuid']), self.programs[0])
+
+        # Each call gets its own copy of the programs.
+        programs[0]['title'] = 'Changed'
+        self.assert_programs(get_programs(self.site), self.programs)
+
+        self.cache_programs(self.programs[:2], 'v2')
+        self.assert_programs(get_programs(self.site), self.programs[:2])
+
+    def test_course_run_index(self, _mock_warning, _mock_info):
+        self.cache_programs(self.programs, 'v1')
+        snapshot = get_programs_snapshot(self.site)
+
+        for program in self.programs:
+            for course in program['courses']:
+                for course_run in course['course_runs']:
+                    self.assertIn(program['uuid'], snapshot.course_run_index[course_run['key']])
+
+    def test_missing_programs(self, mock_warning, _mock_info):
+        self.cache_programs(self.programs, 'v1')
+        cache.delete(PROGRAM_CACHE_KEY_TPL.format(uuid=self.programs[2]['uuid']))
+        self.assert_programs(get_programs(self.site), self.programs[:2])
+        self.assertTrue(mock_warning.called)
+
+        # Snapshots missing programs aren't kept, so they are read again.
+        cache.set(PROGRAM_CACHE_KEY_TPL.format(uuid=self.programs[2]['uuid']), self.programs[2], None)
+        self.assert_programs(get_programs(self.site), self.programs)
+
+    def test_single_flight(self, _mock_warning, _mock_info):
+        self.cache_programs(self.programs[:2], 'v1')
+        snapshot = get_programs_snapshot(self.site)
+        self.cache_programs(self.programs, 'v2')
+
+        # While another thread reads the new version, the previous snapshot
+        # is returned rather than reading it again.
+        lock = threading.Lock()
+        with mock.patch.dict(UTILS_MODULE + '._program_snapshot_locks', {self.site.domain: lock}):
+            with lock:
+                self.assertIs(get_programs_snapshot(self.site), snapshot)
+            self.assertEqual(get_programs_snapshot(self.site).version, 'v2')
+
+
 @skip_unless_lms
 @ddt.ddt
 class TestGetProgramsWithType(TestCase):
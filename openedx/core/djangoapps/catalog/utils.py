@@ -1,6 +1,9 @@
 """Helper functions for working with the catalog service."""
 import copy
+import cPickle as pickle
 import logging
+import threading
+from collections import OrderedDict, defaultdict
 
 from django.conf import settings
 from django.core.cache import cache
@@ -9,7 +12,8 @@ from edx_rest_api_client.client import EdxRestApiClient
 
 from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
-    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
+    SITE_PROGRAM_UUIDS_CACHE_KEY_TPL,
+    SITE_PROGRAMS_VERSION_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.lib.edx_api_utils import get_edx_api_data
@@ -17,6 +21,15 @@ from openedx.core.lib.token_utils import JwtBuilder
 
 logger = logging.getLogger(__name__)
 
+MISSING_PROGRAM_DETAILS_MSG_TPL = 'Failed to get details for program {uuid} from the cache.'
+
+# The latest ProgramsSnapshot of each site read by this process, by domain.
+_program_snapshots = {}
+
+# Locks held while a site's snapshot is refreshed, by domain.
+_program_snapshot_locks = defaultdict(threading.Lock)
+_program_snapshot_locks_lock = threading.Lock()
+
 
 def create_catalog_api_client(user, site=None):
     """Returns an API client which can be used to make Catalog API requests."""
@@ -32,10 +45,93 @@ def create_catalog_api_client(user, site=None):
     return EdxRestApiClient(url, jwt=jwt)
 
 
+class ProgramsSnapshot(object):
+    """
+    An immutable, in-process copy of the programs cached for a site, at one
+    version of them.
+
+    Programs are kept pickled, so each caller gets its own copy of them, which
+    it is free to change, without a round trip to the cache.
+    """
+    def __init__(self, version, programs):
+        self.version = version
+        self._programs = OrderedDict(
+            (program['uuid'], pickle.dumps(program, pickle.HIGHEST_PROTOCOL)) for program in programs
+        )
+        self.course_run_index = build_course_run_index(programs)
+
+    def __contains__(self, uuid):
+        return uuid in self._programs
+
+    def get_programs(self):
+        """Returns a copy of every program."""
+        return [pickle.loads(program) for program in self._programs.itervalues()]
+
+    def get_program(self, uuid):
+        """Returns a copy of the program identified by uuid."""
+        return pickle.loads(self._programs[uuid])
+
+
+def build_course_run_index(programs):
+    """
+    Returns the UUIDs of the given programs containing each course run, as
+    a dict of lists keyed by course run key.
+    """
+    index = defaultdict(list)
+    for program in programs:
+        for course in program['courses']:
+            for course_run in course['course_runs']:
+                program_uuids = index[course_run['key']]
+                if program['uuid'] not in program_uuids:
+                    program_uuids.append(program['uuid'])
+    return dict(index)
+
+
+def get_programs_snapshot(site):
+    """
+    Returns the latest ProgramsSnapshot of the site's cached programs, or
+    None if their version isn't cached.
+
+    A snapshot is only read from the cache when the cache_programs command
+    has changed the programs' version.  Only one thread of the process reads
+    it: the others keep using the previous snapshot, if any, until it is read,
+    rather than all reading the same programs at once.
+    """
+    version = cache.get(SITE_PROGRAMS_VERSION_CACHE_KEY_TPL.format(domain=site.domain))
+    if version is None:
+        return None
+
+    snapshot = _program_snapshots.get(site.domain)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _program_snapshot_locks_lock:
+        lock = _program_snapshot_locks[site.domain]
+    if not lock.acquire(snapshot is None):
+        return snapshot
+    try:
+        # Another thread may have read this version while we waited for the lock.
+        snapshot = _program_snapshots.get(site.domain)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        programs, missing_uuids = _get_cached_programs(site)
+        snapshot = ProgramsSnapshot(version, programs)
+        # Programs missing from the cache may only be missing for this read, so
+        # they are read again next time rather than left out of the snapshot.
+        if not missing_uuids:
+            _program_snapshots[site.domain] = snapshot
+        return snapshot
+    finally:
+        lock.release()
+
+
 def get_programs(site, uuid=None):
     """Read programs from the cache.
 
-    The cache is populated by a management command, cache_programs.
+    The cache is populated by a management command, cache_programs.  Programs
+    are read from the in-process snapshot of the site's programs, when its
+    version is cached.
 
     Arguments:
         site (Site): django.contrib.sites.models object
@@ -47,14 +143,30 @@ def get_programs(site, uuid=None):
         list of dict, representing programs.
         dict, if a specific program is requested.
     """
-    missing_details_msg_tpl = 'Failed to get details for program {uuid} from the cache.'
+    snapshot = get_programs_snapshot(site)
 
     if uuid:
+        if snapshot is not None and uuid in snapshot:
+            return snapshot.get_program(uuid)
+
         program = cache.get(PROGRAM_CACHE_KEY_TPL.format(uuid=uuid))
         if not program:
-            logger.warning(missing_details_msg_tpl.format(uuid=uuid))
+            logger.warning(MISSING_PROGRAM_DETAILS_MSG_TPL.format(uuid=uuid))
 
         return program
+
+    if snapshot is not None:
+        return snapshot.get_programs()
+
+    programs, __ = _get_cached_programs(site)
+    return programs
+
+
+def _get_cached_programs(site):
+    """
+    Returns the programs cached for the site, and the UUIDs of those missing
+    from the cache.
+    """
     uuids = cache.get(SITE_PROGRAM_UUIDS_CACHE_KEY_TPL.format(domain=site.domain), [])
     if not uuids:
         logger.warning('Failed to get program UUIDs from the cache.')
@@ -79,11 +191,11 @@ def get_programs(site, uuid=None):
         retried_programs = cache.get_many([PROGRAM_CACHE_KEY_TPL.format(uuid=uuid) for uuid in missing_uuids])
         programs += list(retried_programs.values())
 
-        still_missing_uuids = set(uuids) - set(program['uuid'] for program in programs)
-        for uuid in still_missing_uuids:
-            logger.warning(missing_details_msg_tpl.format(uuid=uuid))
+        missing_uuids = set(uuids) - set(program['uuid'] for program in programs)
+        for uuid in missing_uuids:
+            logger.warning(MISSING_PROGRAM_DETAILS_MSG_TPL.format(uuid=uuid))
 
-    return programs
+    return programs, missing_uuids
 
 
 def get_program_types(name=None):
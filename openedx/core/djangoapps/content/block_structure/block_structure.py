@@ -725,6 +725,46 @@ class BlockStructureBlockData(BlockStructure):
 
         return self.get_transformer_data(transformer, TRANSFORMER_VERSION_KEY, 0)
 
+    def _update_from_partial(self, partial_block_structure, subtree_root_keys):
+        """
+        Mutates this block structure by replacing the subtrees starting at
+        the given keys with those in the given partial block structure,
+        which was collected for only those subtrees and their ancestors.
+
+        The collected data of the ancestors and the non-block-specific
+        transformer data are also replaced, while the relations of the
+        ancestors are retained since the partial structure contains only
+        their relations with the subtrees.
+
+        Arguments:
+            partial_block_structure (BlockStructureBlockData) - The
+                collected partial block structure.
+
+            subtree_root_keys (set(UsageKey)) - The usage keys of the
+                roots of the recollected subtrees.
+        """
+        # Remove the previous descendants of the subtree roots.
+        for subtree_root_key in subtree_root_keys:
+            stale_descendants = [
+                block_key for block_key in self.post_order_traversal(start_node=subtree_root_key)
+                if block_key != subtree_root_key
+            ]
+            for block_key in stale_descendants:
+                self._block_relations.pop(block_key, None)
+                self._block_data_map.pop(block_key, None)
+
+        # Add the recollected blocks, relations and data.
+        for block_key in partial_block_structure:
+            if block_key in subtree_root_keys:
+                self._block_relations[block_key].children = list(partial_block_structure.get_children(block_key))
+            elif block_key not in self:
+                self._block_relations[block_key] = partial_block_structure._block_relations[block_key]
+
+            if block_key in partial_block_structure._block_data_map:
+                self._block_data_map[block_key] = partial_block_structure[block_key]
+
+        self.transformer_data = partial_block_structure.transformer_data
+
     def _add_transformer(self, transformer):
         """
         Adds the given transformer to the block structure by recording
@@ -0,0 +1,409 @@
+"""
+Module for the columnar serialization format of BlockStructure objects.
+
+Unlike the pickled format, which stores the block relations, block data
+and transformer data of a structure as a single compressed pickle, the
+columnar format lays out:
+
+    * the block type and block id of all blocks as a single ordered
+      list in the header, so blocks can be referred to by their integer
+      index,
+    * the parent and child relations as integer-indexed adjacency
+      arrays, and
+    * each collected xBlock field, each transformer's per-block field
+      and each transformer's non-block-specific field as a separately
+      compressed column.
+
+Columns are only decoded when a field stored in them is first accessed,
+so reading a few fields of a large structure does not pay for
+deserializing all of its collected data.  Since the header records the
+offset of each section, the serialized data can be read directly from a
+memory-mapped file.
+
+Columns whose values are all JSON scalars are stored as JSON; all other
+columns fall back to pickling, since transformers may collect arbitrary
+picklable values (for example, UserPartition objects).
+
+Layout:
+    MAGIC (4 bytes)
+    FORMAT_VERSION (1 byte)
+    header length (4 bytes, unsigned little-endian)
+    header (zlib-compressed JSON)
+    sections (int arrays and compressed columns, located via the header)
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+import json
+import struct
+import sys
+import zlib
+from array import array
+from collections import MutableMapping, defaultdict
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+from .exceptions import BlockStructureNotFound
+from .factory import BlockStructureFactory
+
+
+MAGIC = 'BSCF'
+
+# The version of the columnar layout.  Incrementally update this value
+# whenever the layout changes.  Data serialized with any other version
+# is treated as not found, so it is recollected.
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct('<4sBI')
+
+# Typecode of the arrays used for block indices and offsets.
+_INDEX_TYPECODE = 'I'
+
+# Codecs used for encoding columns.
+_JSON_CODEC = 'j'
+_PICKLE_CODEC = 'p'
+
+_JSON_SCALAR_TYPES = (type(None), bool, int, long, float, unicode)
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the columnar format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given block structure into the columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        str - The serialized data.
+    """
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    block_keys = list(block_relations)
+    block_keys.extend(block_key for block_key in block_data_map if block_key not in block_relations)
+    index_of = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    writer = _SectionWriter()
+    header = {
+        'keys': [[block_key.block_type, block_key.block_id] for block_key in block_keys],
+        'num_related': len(block_relations),
+    }
+
+    for relation in ('parents', 'children'):
+        offsets, indices = array(_INDEX_TYPECODE, [0]), array(_INDEX_TYPECODE)
+        for block_key in block_keys[:len(block_relations)]:
+            indices.extend(index_of[related] for related in getattr(block_relations[block_key], relation))
+            offsets.append(len(indices))
+        header[relation] = [writer.add_array(offsets), writer.add_array(indices)]
+
+    data_blocks = array(_INDEX_TYPECODE)
+    block_columns = defaultdict(lambda: ([], []))
+    transformer_blocks = defaultdict(lambda: array(_INDEX_TYPECODE))
+    transformer_block_columns = defaultdict(lambda: defaultdict(lambda: ([], [])))
+
+    for block_key, block_data in block_data_map.iteritems():
+        index = index_of[block_key]
+        data_blocks.append(index)
+        _add_to_columns(block_columns, index, block_data.fields)
+        for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+            transformer_blocks[transformer_name].append(index)
+            _add_to_columns(transformer_block_columns[transformer_name], index, transformer_block_data.fields)
+
+    header['data_blocks'] = writer.add_array(data_blocks)
+    header['block_fields'] = writer.add_columns(block_columns)
+    header['transformer_blocks'] = {
+        transformer_name: writer.add_array(indices)
+        for transformer_name, indices in transformer_blocks.iteritems()
+    }
+    header['transformer_block_fields'] = {
+        transformer_name: writer.add_columns(columns)
+        for transformer_name, columns in transformer_block_columns.iteritems()
+    }
+    header['transformer_data'] = {
+        transformer_name: {
+            field_name: writer.add_column(value)
+            for field_name, value in transformer_data.fields.iteritems()
+        }
+        for transformer_name, transformer_data in block_structure.transformer_data.iteritems()
+    }
+
+    encoded_header = zlib.compress(json.dumps(header, separators=(',', ':')))
+    return ''.join([_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded_header)), encoded_header] + writer.sections)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given columnar data and returns the block structure.
+
+    Only the block keys and relations are decoded eagerly.  Collected
+    fields are decoded, one column at a time, when first accessed.
+
+    Arguments:
+        serialized_data (str or mmap) - Data previously returned by
+            serialize.  Any buffer supporting slicing may be given.
+
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the block structure.
+
+    Raises:
+        BlockStructureNotFound if the data was written with a different
+        format version.
+    """
+    magic, format_version, header_length = _PREAMBLE.unpack(serialized_data[:_PREAMBLE.size])
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise BlockStructureNotFound(root_block_usage_key)
+
+    sections_offset = _PREAMBLE.size + header_length
+    header = json.loads(zlib.decompress(serialized_data[_PREAMBLE.size:sections_offset]))
+    columnar_data = _ColumnarData(serialized_data, sections_offset)
+
+    # All blocks of a structure belong to the course of its root.
+    # Creating their keys from that course key is much faster than
+    # parsing serialized usage keys, and retains the course run of
+    # deprecated keys.
+    make_usage_key = root_block_usage_key.course_key.make_usage_key
+    block_keys = [make_usage_key(block_type, block_id) for block_type, block_id in header['keys']]
+
+    block_relations = {}
+    parents_offsets, parents = [columnar_data.array(section) for section in header['parents']]
+    children_offsets, children = [columnar_data.array(section) for section in header['children']]
+    for index, block_key in enumerate(block_keys[:header['num_related']]):
+        relations = _BlockRelations()
+        relations.parents = [block_keys[i] for i in parents[parents_offsets[index]:parents_offsets[index + 1]]]
+        relations.children = [block_keys[i] for i in children[children_offsets[index]:children_offsets[index + 1]]]
+        block_relations[block_key] = relations
+
+    transformer_blocks = {
+        transformer_name: frozenset(columnar_data.array(section))
+        for transformer_name, section in header['transformer_blocks'].iteritems()
+    }
+    block_data_map = {}
+    for index in columnar_data.array(header['data_blocks']):
+        block_data = BlockData(block_keys[index])
+        block_data.fields = _LazyFields(columnar_data, header['block_fields'], index)
+        for transformer_name, indices in transformer_blocks.iteritems():
+            if index in indices:
+                transformer_block_data = TransformerData()
+                transformer_block_data.fields = _LazyFields(
+                    columnar_data, header['transformer_block_fields'][transformer_name], index,
+                )
+                block_data.transformer_data[transformer_name] = transformer_block_data
+        block_data_map[block_data.location] = block_data
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, columns in header['transformer_data'].iteritems():
+        transformer_data[transformer_name] = TransformerData()
+        transformer_data[transformer_name].fields = _LazyFields(columnar_data, columns)
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        block_data_map,
+    )
+
+
+def _add_to_columns(columns, index, fields):
+    """
+    Appends the given block index and field values to the given
+    map of field name to (block indices, values) columns.
+    """
+    for field_name, value in fields.iteritems():
+        indices, values = columns[field_name]
+        indices.append(index)
+        values.append(value)
+
+
+def _encode_value(value, is_json_compatible):
+    """
+    Returns a (codec, encoded string) tuple for the given column value.
+    """
+    if is_json_compatible:
+        return _JSON_CODEC, zlib.compress(json.dumps(value, separators=(',', ':')))
+    return _PICKLE_CODEC, zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_value(codec, encoded_value):
+    """
+    Returns the column value for the given codec and encoded string.
+    """
+    decoded_value = zlib.decompress(encoded_value)
+    return json.loads(decoded_value) if codec == _JSON_CODEC else pickle.loads(decoded_value)
+
+
+def _is_json_scalar(value):
+    """
+    Returns whether the given value round-trips through JSON unchanged.
+    """
+    if isinstance(value, str):
+        try:
+            value.decode('ascii')
+        except UnicodeDecodeError:
+            return False
+        return True
+    return isinstance(value, _JSON_SCALAR_TYPES)
+
+
+class _SectionWriter(object):
+    """
+    Accumulates the sections of a serialization, returning the
+    [offset, length(, codec)] locator of each added section.
+    """
+    def __init__(self):
+        self.sections = []
+        self._offset = 0
+
+    def add(self, data):
+        """
+        Appends the given string as a section.
+        """
+        locator = [self._offset, len(data)]
+        self.sections.append(data)
+        self._offset += len(data)
+        return locator
+
+    def add_array(self, values):
+        """
+        Appends the given array of block indices as a section.
+        """
+        if sys.byteorder == 'big':
+            values = array(values.typecode, values)
+            values.byteswap()
+        return self.add(values.tostring())
+
+    def add_column(self, value):
+        """
+        Appends the given non-block-specific value as an encoded column.
+        """
+        codec, encoded_value = _encode_value(value, _is_json_scalar(value))
+        return self.add(encoded_value) + [codec]
+
+    def add_columns(self, columns):
+        """
+        Appends each of the given (indices, values) block columns,
+        returning a map of field name to column locator.
+        """
+        locators = {}
+        for field_name, (indices, values) in columns.iteritems():
+            codec, encoded_value = _encode_value(
+                [list(indices), values],
+                all(_is_json_scalar(value) for value in values),
+            )
+            locators[field_name] = self.add(encoded_value) + [codec]
+        return locators
+
+
+class _ColumnarData(object):
+    """
+    Provides access to the sections of serialized columnar data,
+    decoding and caching each column on first access.
+    """
+    def __init__(self, serialized_data, sections_offset):
+        self._serialized_data = serialized_data
+        self._sections_offset = sections_offset
+        self._columns = {}
+
+    def array(self, locator):
+        """
+        Returns the array of block indices at the given locator.
+        """
+        values = array(_INDEX_TYPECODE)
+        values.fromstring(self._read(locator))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def value(self, locator):
+        """
+        Returns the decoded value of the column at the given locator.
+        """
+        column_id = locator[0]
+        try:
+            return self._columns[column_id]
+        except KeyError:
+            value = self._columns[column_id] = _decode_value(locator[2], self._read(locator))
+            return value
+
+    def block_values(self, locator):
+        """
+        Returns a map of block index to value for the block column
+        at the given locator.
+        """
+        column_id = locator[0]
+        try:
+            return self._columns[column_id]
+        except KeyError:
+            indices, values = _decode_value(locator[2], self._read(locator))
+            block_values = self._columns[column_id] = dict(zip(indices, values))
+            return block_values
+
+    def _read(self, locator):
+        """
+        Returns the raw bytes of the section at the given locator.
+        """
+        start = self._sections_offset + locator[0]
+        return self._serialized_data[start:start + locator[1]]
+
+
+class _LazyFields(MutableMapping):
+    """
+    A map of field name to value that reads values from the columns of
+    serialized columnar data on first access.  Used as the fields of
+    deserialized BlockData and TransformerData objects.
+
+    Updates are kept locally.  When pickled or deep-copied, a plain dict
+    of the current values is produced.
+    """
+    def __init__(self, columnar_data, columns, block_index=None):
+        """
+        Arguments:
+            columnar_data (_ColumnarData) - The serialized data.
+
+            columns ({field name: locator}) - The columns of the fields.
+
+            block_index (int) - The index of the block whose fields
+                these are, or None for non-block-specific fields.
+        """
+        self._columnar_data = columnar_data
+        self._columns = columns
+        self._block_index = block_index
+        self._updated = {}
+        self._removed = set()
+
+    def __getitem__(self, field_name):
+        if field_name in self._updated:
+            return self._updated[field_name]
+        if field_name in self._removed:
+            raise KeyError(field_name)
+
+        locator = self._columns[field_name]
+        if self._block_index is None:
+            return self._columnar_data.value(locator)
+        return self._columnar_data.block_values(locator)[self._block_index]
+
+    def __setitem__(self, field_name, value):
+        self._updated[field_name] = value
+
+    def __delitem__(self, field_name):
+        self[field_name]  # pylint: disable=pointless-statement
+        self._updated.pop(field_name, None)
+        self._removed.add(field_name)
+
+    def __iter__(self):
+        for field_name in self._updated:
+            yield field_name
+        for field_name in self._columns:
+            if field_name not in self._updated and field_name in self:
+                yield field_name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
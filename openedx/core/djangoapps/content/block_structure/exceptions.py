@@ -32,6 +32,14 @@ class TransformerDataIncompatible(BlockStructureException):
     pass
 
 
+class IncrementalCollectUnsupported(BlockStructureException):
+    """
+    Exception for when a block structure cannot be updated by
+    recollecting only a part of it.
+    """
+    pass
+
+
 class BlockStructureNotFound(BlockStructureException):
     """
     Exception for when a Block Structure is not found.
@@ -2,6 +2,7 @@
 Module for factory class for BlockStructure objects.
 """
 from .block_structure import BlockStructureModulestoreData, BlockStructureBlockData
+from .exceptions import IncrementalCollectUnsupported
 
 
 class BlockStructureFactory(object):
@@ -32,31 +33,84 @@ class BlockStructureFactory(object):
                 root_block_usage_key is not found in the modulestore.
         """
         block_structure = BlockStructureModulestoreData(root_block_usage_key)
-        blocks_visited = set()
-
-        def build_block_structure(xblock):
-            """
-            Recursively update the block structure with the given xBlock
-            and its descendants.
-            """
-            # Check if the xblock was already visited (can happen in
-            # DAGs).
-            if xblock.location in blocks_visited:
-                return
-
-            # Add the xBlock.
-            blocks_visited.add(xblock.location)
-            block_structure._add_xblock(xblock.location, xblock)  # pylint: disable=protected-access
-
-            # Add relations with its children and recurse.
-            for child in xblock.get_children():
-                block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
-                build_block_structure(child)
-
         root_xblock = modulestore.get_item(root_block_usage_key, depth=None, lazy=False)
-        build_block_structure(root_xblock)
+        cls._add_xblock_subtree(block_structure, root_xblock, blocks_visited=set())
         return block_structure
 
+    @classmethod
+    def create_partial_from_modulestore(cls, block_structure, subtree_root_keys, modulestore):
+        """
+        Creates and returns a block structure from the modulestore
+        containing only the subtrees starting at the given keys, along
+        with the ancestors of their roots.  The ancestors and their
+        relations are taken from the given, previously collected, block
+        structure.  The root of the given block structure is always
+        included.
+
+        Arguments:
+            block_structure (BlockStructureBlockData) - The previously
+                collected block structure that contains the roots of the
+                subtrees.
+
+            subtree_root_keys (set(UsageKey)) - The usage keys of the
+                roots of the subtrees that are to be loaded from the
+                modulestore.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks.
+
+        Returns:
+            BlockStructureModulestoreData - The created partial block
+                structure with the same root as the given block
+                structure.
+
+        Raises:
+            IncrementalCollectUnsupported - If any of the blocks in the
+                partial structure has multiple parents (DAGs), since the
+                collected data of such blocks depends on parents outside
+                of the partial structure.
+        """
+        partial_structure = BlockStructureModulestoreData(block_structure.root_block_usage_key)
+
+        # Add the ancestors, walking up from the roots of the subtrees.
+        # The root is always included, since transformers may collect
+        # structure-wide data from it.
+        blocks_to_visit = list(subtree_root_keys)
+        ancestors = {block_structure.root_block_usage_key}
+        while blocks_to_visit:
+            block_key = blocks_to_visit.pop()
+            for parent_key in block_structure.get_parents(block_key):
+                partial_structure._add_relation(parent_key, block_key)  # pylint: disable=protected-access
+                if parent_key not in ancestors:
+                    ancestors.add(parent_key)
+                    blocks_to_visit.append(parent_key)
+
+        if ancestors & set(subtree_root_keys):
+            raise IncrementalCollectUnsupported('Subtrees to collect are nested.')
+
+        for ancestor_key in ancestors:
+            partial_structure._add_xblock(ancestor_key, modulestore.get_item(ancestor_key))  # pylint: disable=protected-access
+
+        blocks_visited = set(ancestors)
+        for subtree_root_key in subtree_root_keys:
+            subtree_root_xblock = modulestore.get_item(subtree_root_key, depth=None, lazy=False)
+            cls._add_xblock_subtree(partial_structure, subtree_root_xblock, blocks_visited)
+
+        # Check both the previous and the new blocks of the subtrees.
+        blocks_to_check = set(partial_structure)
+        for subtree_root_key in subtree_root_keys:
+            blocks_to_check.update(block_structure.post_order_traversal(start_node=subtree_root_key))
+
+        for block_key in blocks_to_check:
+            previous_parents = block_structure.get_parents(block_key) if block_key in block_structure else []
+            new_parents = partial_structure.get_parents(block_key) if block_key in partial_structure else []
+            if max(len(previous_parents), len(new_parents)) > 1:
+                raise IncrementalCollectUnsupported(
+                    'Block {} has multiple parents.'.format(unicode(block_key))
+                )
+
+        return partial_structure
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -95,3 +149,24 @@ class BlockStructureFactory(object):
         block_structure.transformer_data = transformer_data
         block_structure._block_data_map = block_data_map  # pylint: disable=protected-access
         return block_structure
+
+    @classmethod
+    def _add_xblock_subtree(cls, block_structure, xblock, blocks_visited):
+        """
+        Recursively updates the given block structure with the given
+        xBlock and its descendants, skipping any blocks in the given
+        blocks_visited set.
+        """
+        # Check if the xblock was already visited (can happen in
+        # DAGs).
+        if xblock.location in blocks_visited:
+            return
+
+        # Add the xBlock.
+        blocks_visited.add(xblock.location)
+        block_structure._add_xblock(xblock.location, xblock)  # pylint: disable=protected-access
+
+        # Add relations with its children and recurse.
+        for child in xblock.get_children():
+            block_structure._add_relation(xblock.location, child.location)  # pylint: disable=protected-access
+            cls._add_xblock_subtree(block_structure, child, blocks_visited)
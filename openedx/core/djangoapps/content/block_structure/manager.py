@@ -3,14 +3,23 @@ Top-level module for the Block Structure framework with a class for managing
 BlockStructures.
 """
 from contextlib import contextmanager
+from logging import getLogger
 
 from . import config
-from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
+from .exceptions import (
+    UsageKeyNotInBlockStructure,
+    TransformerDataIncompatible,
+    BlockStructureNotFound,
+    IncrementalCollectUnsupported,
+)
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
 class BlockStructureManager(object):
     """
     Top-level class for managing Block Structures.
@@ -112,7 +121,8 @@ class BlockStructureManager(object):
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                if self._update_collected_incrementally() is None:
+                    self._update_collected()
 
     def _update_collected(self):
         """
@@ -124,10 +134,110 @@ class BlockStructureManager(object):
                 self.root_block_usage_key,
                 self.modulestore,
             )
-            BlockStructureTransformers.collect(block_structure)
+            BlockStructureTransformers.collect(
+                block_structure,
+                collect_course_version=config.waffle().is_enabled(config.INCREMENTAL_COLLECT),
+            )
             self.store.add(block_structure)
             return block_structure
 
+    def _update_collected_incrementally(self):
+        """
+        The store is updated by recollecting only the blocks that changed
+        in the modulestore since the stored block structure was collected,
+        along with their descendants and ancestors.
+
+        Returns the updated block structure, or None if the stored block
+        structure cannot be updated incrementally, in which case a full
+        collect is needed.
+        """
+        if not config.waffle().is_enabled(config.INCREMENTAL_COLLECT):
+            return None
+
+        try:
+            block_structure = BlockStructureFactory.create_from_store(self.root_block_usage_key, self.store)
+        except BlockStructureNotFound:
+            return None
+
+        if not BlockStructureTransformers.supports_incremental_collect(block_structure):
+            logger.info(
+                u'BlockStructure: Transformers do not support incremental collect; %s.',
+                self.root_block_usage_key,
+            )
+            return None
+
+        changed_usage_keys = self._get_changed_usage_keys(block_structure)
+        if changed_usage_keys is None:
+            return None
+
+        subtree_root_keys = self._get_changed_subtree_roots(block_structure, changed_usage_keys)
+        if self.root_block_usage_key in subtree_root_keys:
+            return None
+
+        with self._bulk_operations():
+            try:
+                partial_block_structure = BlockStructureFactory.create_partial_from_modulestore(
+                    block_structure,
+                    subtree_root_keys,
+                    self.modulestore,
+                )
+            except IncrementalCollectUnsupported as exc:
+                logger.info(u'BlockStructure: Cannot collect incrementally; %s, %s', self.root_block_usage_key, exc)
+                return None
+
+            BlockStructureTransformers.collect(partial_block_structure, collect_course_version=True)
+            block_structure._update_from_partial(partial_block_structure, subtree_root_keys)  # pylint: disable=protected-access
+            self.store.add(block_structure)
+
+        logger.info(
+            u'BlockStructure: Collected incrementally; %s, changed blocks: %d, recollected blocks: %d.',
+            self.root_block_usage_key,
+            len(changed_usage_keys),
+            len(partial_block_structure),
+        )
+        return block_structure
+
+    def _get_changed_usage_keys(self, block_structure):
+        """
+        Returns the set of usage keys of blocks that changed in the
+        modulestore since the given block structure was collected, or
+        None if they cannot be determined.
+        """
+        get_changed_usage_keys = getattr(self.modulestore, 'get_changed_usage_keys', None)
+        collected_version = BlockStructureTransformers.get_collected_course_version(block_structure)
+        if not get_changed_usage_keys or not collected_version:
+            return None
+
+        root_block = self.modulestore.get_item(self.root_block_usage_key)
+        changed_usage_keys = get_changed_usage_keys(
+            self.root_block_usage_key.course_key,
+            collected_version,
+            getattr(root_block, 'course_version', None),
+        )
+        return set(changed_usage_keys) if changed_usage_keys is not None else None
+
+    def _get_changed_subtree_roots(self, block_structure, changed_usage_keys):
+        """
+        Returns the set of usage keys of the topmost changed blocks in the
+        given block structure, whose subtrees contain all changed blocks.
+
+        Changed blocks that are not in the block structure are either
+        removed or added blocks.  Their previous and new parents are
+        changed as well, so they are covered by the returned subtrees.
+        """
+        subtree_root_keys = set()
+        changed_subtree_keys = set()
+        for block_key in block_structure.topological_traversal():
+            has_changed_ancestor = any(
+                parent_key in changed_subtree_keys for parent_key in block_structure.get_parents(block_key)
+            )
+            if has_changed_ancestor:
+                changed_subtree_keys.add(block_key)
+            elif block_key in changed_usage_keys:
+                changed_subtree_keys.add(block_key)
+                subtree_root_keys.add(block_key)
+        return subtree_root_keys
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
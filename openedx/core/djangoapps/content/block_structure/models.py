@@ -2,6 +2,8 @@
 Models used by the block structure framework.
 """
 
+import mmap
+import os
 from contextlib import contextmanager
 from datetime import datetime
 from django.conf import settings
@@ -165,17 +167,39 @@ class BlockStructureModel(TimeStampedModel):
     )
     data = CustomizableFileField()
 
-    def get_serialized_data(self):
+    def get_serialized_data(self, memory_map=False):
         """
         Returns the collected data for this instance.
+
+        Arguments:
+            memory_map (bool) - Whether to return a read-only memory map
+                of the file instead of reading it into memory.  Only
+                honored for storages backed by the local filesystem.
         """
         operation = u'Read'
         with _storage_error_handling(self, operation, is_read_operation=True):
-            serialized_data = self.data.read()
+            serialized_data = self._memory_mapped_data() if memory_map else None
+            if serialized_data is None:
+                serialized_data = self.data.read()
 
         self._log(self, operation, serialized_data)
         return serialized_data
 
+    def _memory_mapped_data(self):
+        """
+        Returns a read-only memory map of the file for this instance,
+        or None if the storage does not support local file paths.
+        """
+        try:
+            path = self.data.path
+        except NotImplementedError:
+            return None
+
+        with open(path, 'rb') as data_file:
+            if not os.fstat(data_file.fileno()).st_size:
+                return None
+            return mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
     @classmethod
     def get(cls, data_usage_key):
         """
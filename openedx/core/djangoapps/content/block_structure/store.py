@@ -3,10 +3,11 @@ Module for the Storage of BlockStructure objects.
 """
 # pylint: disable=protected-access
 from logging import getLogger
+from mmap import mmap
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import columnar, config
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -157,6 +158,9 @@ class BlockStructureStore(object):
         to the cache.
         """
         cache_key = self._encode_root_cache_key(bs_model)
+        if isinstance(serialized_data, mmap):
+            # Only the bytes of a memory-mapped file can be cached.
+            serialized_data = serialized_data[:]
         self._cache.set(cache_key, serialized_data, timeout=config.cache_timeout_in_seconds())
         logger.info("BlockStructure: Added to cache; %s, size: %d", bs_model, len(serialized_data))
 
@@ -187,12 +191,16 @@ class BlockStructureStore(object):
         if not _is_storage_backing_enabled():
             raise BlockStructureNotFound(bs_model.data_usage_key)
 
-        return bs_model.get_serialized_data()
+        return bs_model.get_serialized_data(memory_map=_is_columnar_format_enabled())
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, using the
+        columnar format if enabled.
         """
+        if _is_columnar_format_enabled():
+            return columnar.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -203,8 +211,14 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        The format of the data is detected, so data serialized in either
+        format can be read regardless of the current setting.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+        if columnar.is_columnar(serialized_data):
+            return columnar.deserialize(serialized_data, root_block_usage_key)
+
+        # Slicing copies a memory-mapped file into a string; it is a no-op for strings.
+        block_relations, transformer_data, block_data_map = zunpickle(serialized_data[:])
         return BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
@@ -256,3 +270,11 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_columnar_format_enabled():
+    """
+    Returns whether Block Structures are to be serialized in the
+    columnar format.
+    """
+    return config.waffle().is_enabled(config.COLUMNAR_STORAGE_FORMAT)
@@ -13,7 +13,9 @@ from ..block_structure import BlockStructureBlockData
 from ..exceptions import BlockStructureNotFound
 from ..models import BlockStructureModel
 from ..store import BlockStructureStore
-from ..transformer import BlockStructureTransformer, FilteringTransformerMixin
+from ..transformer import (
+    BlockStructureTransformer, BlockVisitor, FilteringTransformerMixin, VisitingTransformerMixin
+)
 from ..transformer_registry import TransformerRegistry
 
 
@@ -203,6 +205,30 @@ class MockFilteringTransformer(FilteringTransformerMixin, BlockStructureTransfor
         return [block_structure.create_universal_filter()]
 
 
+class MockVisitingTransformer(VisitingTransformerMixin):
+    """
+    A mock VisitingTransformerMixin class, which records the blocks its
+    visitor is called on.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+
+    def __init__(self, visited=None, order=BlockVisitor.ANY):
+        self.visited = visited if visited is not None else []
+        self.order = order
+
+    @classmethod
+    def name(cls):
+        # Use the class' name for Mock transformers.
+        return cls.__name__
+
+    def transform_block_visitors(self, usage_info, block_structure):
+        return [BlockVisitor(lambda block_key: self.visited.append((self, block_key)), order=self.order)]
+
+    def __repr__(self):
+        return self.name()
+
+
 def clear_registered_transformers_cache():
     """
     Test helper to clear out any cached values of registered transformers.
@@ -0,0 +1,139 @@
+"""
+Tests for columnar.py
+"""
+# pylint: disable=protected-access
+import pickle
+from copy import deepcopy
+from datetime import datetime
+from mmap import mmap
+from unittest import TestCase
+
+import ddt
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator
+
+from .. import columnar
+from ..exceptions import BlockStructureNotFound
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestColumnarFormat(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format of block structures.
+    """
+    def setUp(self):
+        super(TestColumnarFormat, self).setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.block_structure._add_transformer(MockTransformer)
+        self.block_structure.set_transformer_data(MockTransformer, 'structure_wide', {'a': [1, 2]})
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_data = self.block_structure._get_or_create_block(block_key)
+            block_data.display_name = u'Block {}'.format(block_id)
+            if block_id % 2:
+                block_data.start = datetime(2017, 1, block_id + 1)
+            self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'index', block_id)
+
+    def _round_trip(self):
+        """
+        Serializes and deserializes the test block structure.
+        """
+        serialized_data = columnar.serialize(self.block_structure)
+        self.assertTrue(columnar.is_columnar(serialized_data))
+        return columnar.deserialize(serialized_data, self.block_structure.root_block_usage_key)
+
+    def _assert_collected_data(self, block_structure):
+        """
+        Verifies the collected data of the given block structure matches
+        that of the test block structure.
+        """
+        self.assert_block_structure(block_structure, self.children_map)
+        self.assertEquals(
+            block_structure.get_transformer_data(MockTransformer, 'structure_wide'),
+            {'a': [1, 2]},
+        )
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            self.assertEquals(block_structure.get_xblock_field(block_key, 'display_name'), u'Block {}'.format(block_id))
+            self.assertEquals(
+                block_structure.get_xblock_field(block_key, 'start'),
+                datetime(2017, 1, block_id + 1) if block_id % 2 else None,
+            )
+            self.assertEquals(
+                block_structure.get_transformer_block_field(block_key, MockTransformer, 'index'),
+                block_id,
+            )
+
+    def test_round_trip(self):
+        block_structure = self._round_trip()
+        self._assert_collected_data(block_structure)
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            self.assertEquals(
+                block_structure.get_children(block_key),
+                self.block_structure.get_children(block_key),
+            )
+            self.assertEquals(
+                block_structure.get_parents(block_key),
+                self.block_structure.get_parents(block_key),
+            )
+
+    def test_deprecated_keys(self):
+        self.course_key = CourseLocator('org', 'course', 'run', deprecated=True)
+        self.block_structure = self.create_block_structure(self.children_map)
+        block_structure = self._round_trip()
+        self.assert_block_structure(block_structure, self.children_map)
+        self.assertEquals(block_structure.root_block_usage_key.course_key.run, 'run')
+
+    def test_update_and_remove(self):
+        block_structure = self._round_trip()
+        block_key = self.block_key_factory(1)
+        block_structure.set_transformer_block_field(block_key, MockTransformer, 'index', 'updated')
+        block_structure.set_transformer_block_field(block_key, MockTransformer, 'new', 'added')
+        block_structure.remove_transformer_block_field(block_key, MockTransformer, 'index')
+        block_structure.remove_transformer_block_field(block_key, MockTransformer, 'missing')
+
+        transformer_block_data = block_structure.get_transformer_block_data(block_key, MockTransformer)
+        self.assertEquals(dict(transformer_block_data.fields), {'new': 'added'})
+        self.assertIsNone(block_structure.get_transformer_block_field(block_key, MockTransformer, 'index'))
+
+    def test_copy_and_pickle(self):
+        block_structure = self._round_trip()
+        self._assert_collected_data(block_structure.copy())
+        self._assert_collected_data(pickle.loads(pickle.dumps(block_structure, pickle.HIGHEST_PROTOCOL)))
+        self.assertIsInstance(deepcopy(block_structure[self.block_key_factory(0)]).fields, dict)
+
+    def test_reserialize(self):
+        self.block_structure = self._round_trip()
+        self._assert_collected_data(self._round_trip())
+
+    def test_memory_mapped(self):
+        serialized_data = columnar.serialize(self.block_structure)
+        memory_mapped_data = mmap(-1, len(serialized_data))
+        memory_mapped_data.write(serialized_data)
+        block_structure = columnar.deserialize(memory_mapped_data, self.block_structure.root_block_usage_key)
+        self._assert_collected_data(block_structure)
+
+    def test_lazy_columns(self):
+        block_structure = self._round_trip()
+        block_structure.get_xblock_field(self.block_key_factory(0), 'display_name')
+        columnar_data = block_structure[self.block_key_factory(0)].fields._columnar_data
+        self.assertEquals(len(columnar_data._columns), 1)
+
+    @ddt.data('XXXX', None)
+    def test_incompatible_data(self, magic):
+        serialized_data = columnar.serialize(self.block_structure)
+        if magic:
+            serialized_data = magic + serialized_data[len(magic):]
+        else:
+            serialized_data = serialized_data[:4] + chr(columnar.FORMAT_VERSION + 1) + serialized_data[5:]
+        with self.assertRaises(BlockStructureNotFound):
+            columnar.deserialize(serialized_data, self.block_structure.root_block_usage_key)
+
+    def test_block_usage_locator_keys(self):
+        block_structure = self._round_trip()
+        for block_key in block_structure:
+            self.assertIsInstance(block_key, BlockUsageLocator)
@@ -6,7 +6,7 @@ from nose.plugins.attrib import attr
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from ..store import BlockStructureStore
-from ..exceptions import BlockStructureNotFound
+from ..exceptions import BlockStructureNotFound, IncrementalCollectUnsupported
 from ..factory import BlockStructureFactory
 from .helpers import (
     MockCache, MockModulestoreFactory, ChildrenMapTestMixin
@@ -65,3 +65,26 @@ class TestBlockStructureFactory(TestCase, ChildrenMapTestMixin):
             block_structure._block_data_map,  # pylint: disable=protected-access
         )
         self.assert_block_structure(new_structure, self.children_map)
+
+    def test_partial_from_modulestore(self):
+        block_structure = self.create_block_structure(self.children_map)
+        partial_structure = BlockStructureFactory.create_partial_from_modulestore(
+            block_structure, subtree_root_keys={1}, modulestore=self.modulestore,
+        )
+        self.assert_block_structure(partial_structure, [[1], [3, 4], [], [], []], missing_blocks=[2])
+
+    def test_partial_from_modulestore_dag(self):
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.modulestore = MockModulestoreFactory.create(self.children_map, self.block_key_factory)
+        block_structure = self.create_block_structure(self.children_map)
+        with self.assertRaises(IncrementalCollectUnsupported):
+            BlockStructureFactory.create_partial_from_modulestore(
+                block_structure, subtree_root_keys={2}, modulestore=self.modulestore,
+            )
+
+    def test_partial_from_modulestore_nested(self):
+        block_structure = self.create_block_structure(self.children_map)
+        with self.assertRaises(IncrementalCollectUnsupported):
+            BlockStructureFactory.create_partial_from_modulestore(
+                block_structure, subtree_root_keys={1, 3}, modulestore=self.modulestore,
+            )
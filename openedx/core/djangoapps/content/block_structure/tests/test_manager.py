@@ -3,15 +3,17 @@ Tests for manager.py
 """
 import ddt
 from django.test import TestCase
+from mock import Mock, patch
 from nose.plugins.attrib import attr
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import INCREMENTAL_COLLECT, RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
 from ..exceptions import UsageKeyNotInBlockStructure, BlockStructureNotFound
+from ..factory import BlockStructureFactory
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
 from .helpers import (
-    MockModulestoreFactory, MockCache, MockTransformer,
+    MockModulestoreFactory, MockCache, MockTransformer, MockXBlock,
     ChildrenMapTestMixin, UsageKeyFactoryMixin,
     mock_registered_transformers,
 )
@@ -219,3 +221,70 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    def _update_modulestore_for_incremental_collect(self):
+        """
+        Adds a new child to block 1 in the mock modulestore and returns
+        the children map of the updated course.
+        """
+        new_block_key = self.block_key_factory(5)
+        self.modulestore.blocks[new_block_key] = MockXBlock(new_block_key, modulestore=self.modulestore)
+        self.modulestore.blocks[self.block_key_factory(1)].children.append(new_block_key)
+        self.modulestore.blocks[self.block_key_factory(0)].field_map['course_version'] = 'version2'
+        self.modulestore.get_changed_usage_keys = Mock(return_value=[self.block_key_factory(1), new_block_key])
+        return [[1, 2], [3, 4, 5], [], [], [], []]
+
+    @ddt.data(True, False)
+    def test_update_collected_incrementally(self, with_storage_backing):
+        self.modulestore.blocks[self.block_key_factory(0)].field_map['course_version'] = 'version1'
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(INCREMENTAL_COLLECT, active=True):
+                with patch.object(TestTransformer1, 'SUPPORTS_INCREMENTAL_COLLECT', True):
+                    with mock_registered_transformers(self.registered_transformers):
+                        self.bs_manager.update_collected_if_needed()
+                        self.children_map = self._update_modulestore_for_incremental_collect()
+
+                        self.modulestore.get_items_call_count = 0
+                        self.bs_manager.update_collected_if_needed()
+                        self.modulestore.get_changed_usage_keys.assert_called_once_with(
+                            self.block_key_factory(0).course_key, 'version1', 'version2',
+                        )
+                        # Only the root (once to find the changed blocks and once
+                        # as an ancestor), block 1 and its 3 children are loaded
+                        # from the modulestore, in addition to the root loaded to
+                        # check whether the stored data is up-to-date.
+                        self.assertEquals(
+                            self.modulestore.get_items_call_count,
+                            7 if with_storage_backing else 6,
+                        )
+                        self.assertEquals(TestTransformer1.collect_call_count, 2)
+                        self.collect_and_verify(expect_modulestore_called=False, expect_cache_updated=False)
+
+                        block_structure = self.bs_manager.get_collected()
+                        self.assertEquals(
+                            BlockStructureTransformers.get_collected_course_version(block_structure),
+                            'version2',
+                        )
+                        self.assertIsNone(block_structure.get_xblock_field(self.block_key_factory(0), 'course_version'))
+
+    @ddt.data(
+        ('INCREMENTAL_COLLECT disabled', False, True, [1]),
+        ('transformer unsupported', True, False, [1]),
+        ('root changed', True, True, [0]),
+    )
+    @ddt.unpack
+    def test_update_collected_incrementally_unsupported(
+            self, _description, incremental_collect_enabled, transformer_supported, changed_blocks,
+    ):
+        with waffle().override(INCREMENTAL_COLLECT, active=incremental_collect_enabled):
+            with patch.object(TestTransformer1, 'SUPPORTS_INCREMENTAL_COLLECT', transformer_supported):
+                with mock_registered_transformers(self.registered_transformers):
+                    self.bs_manager.update_collected_if_needed()
+                    self.modulestore.get_changed_usage_keys = Mock(
+                        return_value=[self.block_key_factory(block) for block in changed_blocks],
+                    )
+                    with patch.object(BlockStructureFactory, 'create_partial_from_modulestore') as mock_create_partial:
+                        self.bs_manager.update_collected_if_needed()
+                    self.assertFalse(mock_create_partial.called)
+                    self.assertEquals(TestTransformer1.collect_call_count, 2)
+                    self.collect_and_verify(expect_modulestore_called=False, expect_cache_updated=False)
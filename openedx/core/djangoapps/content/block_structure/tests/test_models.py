@@ -104,6 +104,13 @@ class BlockStructureModelTestCase(TestCase):
         # old files not pruned
         self._assert_file_count_equal(2)
 
+    def test_memory_mapped_read(self):
+        serialized_data = 'memory mapped data'
+        BlockStructureModel.update_or_create(serialized_data, **self.params)
+        found_bsm = BlockStructureModel.get(self.usage_key)
+        memory_mapped_data = found_bsm.get_serialized_data(memory_map=True)
+        self.assertEqual(memory_mapped_data[:], serialized_data)
+
     @patch('openedx.core.djangoapps.content.block_structure.config.num_versions_to_keep', Mock(return_value=1))
     def test_prune_files(self):
         with waffle().override(PRUNE_OLD_VERSIONS, active=True):
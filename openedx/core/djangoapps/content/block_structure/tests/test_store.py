@@ -2,11 +2,12 @@
 Tests for block_structure/cache.py
 """
 import ddt
+from itertools import product
 from nose.plugins.attrib import attr
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_STORAGE_FORMAT, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -51,13 +52,29 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
-    @ddt.data(True, False)
-    def test_add_and_get(self, with_storage_backing):
+    @ddt.data(*product((True, False), (True, False)))
+    @ddt.unpack
+    def test_add_and_get(self, with_storage_backing, with_columnar_format):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
-            self.store.add(self.block_structure)
-            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            with waffle().override(COLUMNAR_STORAGE_FORMAT, active=with_columnar_format):
+                self.store.add(self.block_structure)
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
+            self.assertEquals(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                '{} val'.format(MockTransformer.name()),
+            )
+
+    @ddt.data(True, False)
+    def test_format_change(self, with_columnar_format):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=True):
+            with waffle().override(COLUMNAR_STORAGE_FORMAT, active=with_columnar_format):
+                self.store.add(self.block_structure)
+            self.mock_cache.map.clear()
+            with waffle().override(COLUMNAR_STORAGE_FORMAT, active=not with_columnar_format):
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
 
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
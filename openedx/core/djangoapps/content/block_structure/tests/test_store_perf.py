@@ -0,0 +1,173 @@
+"""
+Performance test comparing the pickled and columnar serialization
+formats of BlockStructureStore.
+"""
+# pylint: disable=protected-access
+import gc
+import os
+import unittest
+from datetime import datetime
+from timeit import default_timer
+
+from opaque_keys.edx.locator import CourseLocator, BlockUsageLocator
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import columnar
+from ..block_structure import BlockStructureBlockData
+from ..store import BlockStructureStore
+from .helpers import MockTransformer
+
+# Number of blocks in each generated course.
+COURSE_SIZES = (500, 5000, 20000)
+
+# Number of children of each non-leaf block in a generated course.
+BRANCHING_FACTOR = 8
+
+# Number of times each deserialization is timed.
+NUM_RUNS = 5
+
+
+def generate_block_structure(num_blocks):
+    """
+    Returns a collected block structure for a generated course with the
+    given number of blocks, with xBlock fields and transformer data
+    resembling those of real courses.
+    """
+    course_key = CourseLocator('org', 'perf', 'run{}'.format(num_blocks))
+
+    def block_key(index):
+        """
+        Returns the usage key of the block at the given index.
+        """
+        return BlockUsageLocator(course_key, 'course' if index == 0 else 'vertical', 'block{}'.format(index))
+
+    block_structure = BlockStructureBlockData(block_key(0))
+    block_structure._add_transformer(MockTransformer)
+    for index in range(num_blocks):
+        if index:
+            block_structure._add_relation(block_key((index - 1) // BRANCHING_FACTOR), block_key(index))
+        block_data = block_structure._get_or_create_block(block_key(index))
+        block_data.display_name = u'Block number {}'.format(index)
+        block_data.category = u'vertical'
+        block_data.graded = bool(index % 3)
+        block_data.start = datetime(2017, 1, 1 + index % 28)
+        block_data.format = u'Homework' if index % 5 else None
+        block_structure.set_transformer_block_field(block_key(index), MockTransformer, 'merged_visible_to_staff_only', False)
+        block_structure.set_transformer_block_field(block_key(index), MockTransformer, 'merged_group_access', {50: [1, 2]})
+    return block_structure
+
+
+def resident_memory():
+    """
+    Returns the resident memory of the current process in bytes.
+    """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure_in_child(func):
+    """
+    Calls the given function in a forked process so allocations of
+    previous measurements don't affect it, returning the growth in
+    resident memory while the function's result is alive.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_fd)
+        gc.collect()
+        before = resident_memory()
+        result = func()  # pylint: disable=unused-variable
+        os.write(write_fd, str(resident_memory() - before))
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+    memory_growth = int(os.read(read_fd, 64))
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return memory_growth
+
+
+def time_calls(func):
+    """
+    Returns the best time, in seconds, of NUM_RUNS calls to the given function.
+    """
+    timings = []
+    for _ in range(NUM_RUNS):
+        start = default_timer()
+        func()
+        timings.append(default_timer() - start)
+    return min(timings)
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+class BlockStructureStoreFormatPerf(unittest.TestCase):
+    """
+    Compares deserialization time and resident memory of the pickled
+    and columnar formats on generated courses of increasing size.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def test_deserialize(self):
+        store = BlockStructureStore(cache=None)
+        print
+        print '{:>8} {:>10} {:>10} {:>12} {:>12} {:>12}'.format(
+            'blocks', 'format', 'size (KB)', 'full (ms)', 'field (ms)', 'memory (KB)',
+        )
+        for num_blocks in COURSE_SIZES:
+            block_structure = generate_block_structure(num_blocks)
+            root_key = block_structure.root_block_usage_key
+            last_block_key = max(block_structure, key=lambda key: int(key.block_id[len('block'):]))
+
+            for format_name, serialized_data in (
+                    ('pickle', zpickle((
+                        block_structure._block_relations,
+                        block_structure.transformer_data,
+                        block_structure._block_data_map,
+                    ))),
+                    ('columnar', columnar.serialize(block_structure)),
+            ):
+                def deserialize(serialized_data=serialized_data):
+                    """
+                    Deserializes the structure without accessing its fields.
+                    """
+                    return store._deserialize(serialized_data, root_key)
+
+                def read_all_fields(serialized_data=serialized_data):
+                    """
+                    Deserializes the structure and reads every collected field.
+                    """
+                    deserialized = deserialize(serialized_data)
+                    for block_data in deserialized.itervalues():
+                        dict(block_data.fields)
+                        for transformer_block_data in block_data.transformer_data.itervalues():
+                            dict(transformer_block_data.fields)
+                    return deserialized
+
+                def read_one_field(serialized_data=serialized_data):
+                    """
+                    Deserializes the structure and reads a single field
+                    of a single block.
+                    """
+                    deserialized = deserialize(serialized_data)
+                    deserialized.get_xblock_field(last_block_key, 'display_name')
+                    return deserialized
+
+                print '{:>8} {:>10} {:>10.1f} {:>12.1f} {:>12.1f} {:>12.1f}'.format(
+                    num_blocks,
+                    format_name,
+                    len(serialized_data) / 1024.0,
+                    time_calls(read_all_fields) * 1000,
+                    time_calls(read_one_field) * 1000,
+                    measure_in_child(read_one_field) / 1024.0,
+                )
+
+                self.assertEquals(
+                    read_one_field().get_xblock_field(last_block_key, 'display_name'),
+                    block_structure.get_xblock_field(last_block_key, 'display_name'),
+                )
@@ -7,9 +7,14 @@ from unittest import TestCase
 
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerException, TransformerDataIncompatible
+from ..transformer import BlockVisitor
 from ..transformers import BlockStructureTransformers
 from .helpers import (
-    ChildrenMapTestMixin, MockTransformer, MockFilteringTransformer, mock_registered_transformers
+    ChildrenMapTestMixin,
+    MockTransformer,
+    MockFilteringTransformer,
+    MockVisitingTransformer,
+    mock_registered_transformers,
 )
 
 
@@ -82,3 +87,152 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             self.assertTrue(self.transformers.verify_versions(block_structure))
+
+    def test_collect_course_version(self):
+        block_structure = self.create_block_structure(
+            self.SIMPLE_CHILDREN_MAP,
+            BlockStructureModulestoreData
+        )
+        root_key = block_structure.root_block_usage_key
+        block_structure._add_xblock(root_key, MagicMock(course_version='version1'))  # pylint: disable=protected-access
+
+        with mock_registered_transformers(self.registered_transformers):
+            self.transformers.collect(block_structure)
+            self.assertIsNone(self.transformers.get_collected_course_version(block_structure))
+
+            self.transformers.collect(block_structure, collect_course_version=True)
+            self.assertEquals(self.transformers.get_collected_course_version(block_structure), 'version1')
+
+        # The version is collected once for the structure, not as a field of each block.
+        self.assertIsNone(block_structure.get_xblock_field(root_key, 'course_version'))
+
+    def test_supports_incremental_collect(self):
+        block_structure = self.create_block_structure(
+            self.SIMPLE_CHILDREN_MAP,
+            BlockStructureModulestoreData
+        )
+
+        with mock_registered_transformers(self.registered_transformers):
+            self.transformers.collect(block_structure)
+            self.assertFalse(self.transformers.supports_incremental_collect(block_structure))
+
+            with patch.object(MockTransformer, 'SUPPORTS_INCREMENTAL_COLLECT', True):
+                with patch.object(MockFilteringTransformer, 'SUPPORTS_INCREMENTAL_COLLECT', True):
+                    self.assertTrue(self.transformers.supports_incremental_collect(block_structure))
+
+                    # Data collected with a previous version of a transformer
+                    # must be fully recollected.
+                    with patch.object(MockTransformer, 'WRITE_VERSION', MockTransformer.WRITE_VERSION + 1):
+                        self.assertFalse(self.transformers.supports_incremental_collect(block_structure))
+
+    def test_transform_timings(self):
+        self.add_mock_transformer()
+        self.transformers.transform(block_structure=MagicMock())
+        self.assertEquals(
+            self.transformers.timings.keys(),
+            ['MockFilteringTransformer', 'filters', 'MockTransformer', 'prune_unreachable'],
+        )
+
+    def test_transform_visitors_share_traversal(self):
+        visited = []
+        visiting_transformers = [
+            MockVisitingTransformer(visited, order=BlockVisitor.ANY),
+            MockVisitingTransformer(visited, order=BlockVisitor.TOPOLOGICAL),
+        ]
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+
+        with mock_registered_transformers(visiting_transformers):
+            self.transformers += visiting_transformers
+        with patch.object(
+            block_structure, 'topological_traversal', wraps=block_structure.topological_traversal
+        ) as mock_traversal:
+            self.transformers.transform(block_structure)
+            self.assertEquals(mock_traversal.call_count, 1)
+
+        # Both visitors are called on each block before the next block.
+        self.assertEquals(
+            visited,
+            [
+                (transformer, block_key)
+                for block_key in block_structure.topological_traversal()
+                for transformer in visiting_transformers
+            ],
+        )
+        self.assertIn(
+            'MockVisitingTransformer',
+            self.transformers.timings,
+        )
+
+    def test_transform_visitors_separated_by_transformer(self):
+        visited = []
+        visiting_transformers = [MockVisitingTransformer(visited), MockVisitingTransformer(visited)]
+        mock_transformer = MockTransformer()
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+
+        with mock_registered_transformers(visiting_transformers + [mock_transformer]):
+            self.transformers += [visiting_transformers[0], mock_transformer, visiting_transformers[1]]
+        with patch.object(mock_transformer, 'transform') as mock_transform:
+            mock_transform.side_effect = lambda *args: self.assertEquals(
+                [transformer for transformer, _ in visited],
+                [visiting_transformers[0]] * len(self.SIMPLE_CHILDREN_MAP),
+            )
+            self.transformers.transform(block_structure)
+            self.assertTrue(mock_transform.called)
+
+        self.assertEquals(len(visited), 2 * len(self.SIMPLE_CHILDREN_MAP))
+
+
+@attr(shard=2)
+class TestBlockVisitor(ChildrenMapTestMixin, TestCase):
+    """
+    Test class for planning and running BlockVisitor traversals.
+    """
+    def visitor(self, order, finish=False):
+        """
+        Returns a BlockVisitor with the given order, that does nothing.
+        """
+        return BlockVisitor(lambda block_key: None, order=order, finish=MagicMock() if finish else None)
+
+    def test_plan_compatible_orders(self):
+        visitors = [
+            self.visitor(BlockVisitor.ANY),
+            self.visitor(BlockVisitor.POST_ORDER),
+            self.visitor(BlockVisitor.ANY),
+            self.visitor(BlockVisitor.POST_ORDER),
+        ]
+        self.assertEquals(BlockVisitor.plan_traversals(visitors), [visitors])
+
+    def test_plan_incompatible_orders(self):
+        visitors = [
+            self.visitor(BlockVisitor.ANY),
+            self.visitor(BlockVisitor.POST_ORDER),
+            self.visitor(BlockVisitor.ANY),
+            self.visitor(BlockVisitor.TOPOLOGICAL),
+            self.visitor(BlockVisitor.TOPOLOGICAL),
+        ]
+        self.assertEquals(BlockVisitor.plan_traversals(visitors), [visitors[:3], visitors[3:]])
+
+    def test_plan_finish(self):
+        visitors = [
+            self.visitor(BlockVisitor.TOPOLOGICAL, finish=True),
+            self.visitor(BlockVisitor.TOPOLOGICAL),
+        ]
+        self.assertEquals(BlockVisitor.plan_traversals(visitors), [visitors[:1], visitors[1:]])
+
+    def test_plan_empty(self):
+        self.assertEquals(BlockVisitor.plan_traversals([]), [])
+
+    def test_traverse_post_order(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        visited = []
+        visitors = [
+            BlockVisitor(visited.append),
+            BlockVisitor(visited.append, order=BlockVisitor.POST_ORDER, finish=MagicMock()),
+        ]
+        BlockVisitor.traverse(block_structure, visitors)
+
+        self.assertEquals(
+            visited,
+            [block_key for block_key in block_structure.post_order_traversal() for _ in visitors],
+        )
+        self.assertTrue(visitors[1].finish.called)
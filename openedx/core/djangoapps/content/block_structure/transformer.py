@@ -55,6 +55,19 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collected data can be updated by calling
+    # its collect method on a partial block structure, consisting of only
+    # the changed blocks, their descendants and their ancestors.
+    #
+    # This holds when the data that the transformer collects for a block
+    # (and for the structure as a whole) depends only on the block itself
+    # and its ancestors - for example, values that are percolated down the
+    # hierarchy.  Transformers that aggregate data from a block's
+    # descendants (for example, counts of descendant blocks) must leave
+    # this as False, in which case the entire structure is recollected
+    # whenever the course changes.
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -207,3 +220,134 @@ class FilteringTransformerMixin(BlockStructureTransformer):
                 transformer, that is to be transformed in place.
         """
         raise NotImplementedError
+
+
+class BlockVisitor(object):
+    """
+    A function to be called on each block of a block structure during a
+    traversal, in a given order.
+
+    Visitors of several transformers that need the same order are called
+    during a single traversal of the block structure, each in turn on
+    each block.
+    """
+    # Parents are visited before their children.
+    TOPOLOGICAL = 'topological'
+
+    # Children are visited before their parents.
+    POST_ORDER = 'post_order'
+
+    # Blocks may be visited in any order.
+    ANY = 'any'
+
+    def __init__(self, visit, order=ANY, finish=None):
+        """
+        Arguments:
+            visit ((usage_key)->None) - Function called on each block.
+                It must not add or remove blocks.
+
+            order (str) - The order in which blocks must be visited.
+
+            finish (()->None) - Optional function called after all
+                blocks have been visited.  It may add or remove blocks,
+                so the traversal it's part of ends with it.
+        """
+        self.visit = visit
+        self.order = order
+        self.finish = finish
+
+    @classmethod
+    def plan_traversals(cls, visitors):
+        """
+        Returns the given visitors, split into lists of visitors that can
+        be called in a single traversal, to be run in the returned order.
+
+        Consecutive visitors share a traversal when their orders are
+        compatible, and the traversal doesn't end with an earlier
+        visitor's finish function.
+        """
+        traversals = []
+        current, current_order = None, None
+        for visitor in visitors:
+            if current is None or (
+                    visitor.order != cls.ANY and current_order != cls.ANY and visitor.order != current_order
+            ):
+                current, current_order = [], cls.ANY
+                traversals.append(current)
+            current.append(visitor)
+            if visitor.order != cls.ANY:
+                current_order = visitor.order
+            if visitor.finish:
+                current = None
+        return traversals
+
+    @classmethod
+    def traverse(cls, block_structure, visitors):
+        """
+        Calls the given visitors on each block of the block structure, in
+        a single traversal, then calls their finish functions.
+        """
+        if any(visitor.order == cls.POST_ORDER for visitor in visitors):
+            traversal = block_structure.post_order_traversal()
+        else:
+            traversal = block_structure.topological_traversal()
+
+        visit_functions = [visitor.visit for visitor in visitors]
+        for block_key in traversal:
+            for visit in visit_functions:
+                visit(block_key)
+
+        for visitor in visitors:
+            if visitor.finish:
+                visitor.finish()
+
+
+class VisitingTransformerMixin(BlockStructureTransformer):
+    """
+    Transformers may optionally choose to implement this mixin if their
+    transform logic can be broken apart into functions called on each
+    block in turn, during a traversal of the block structure.
+
+    For performance reasons, developers should try to implement this mixin
+    whenever possible - consecutive transformers that implement
+    VisitingTransformerMixin share traversals of the block structure,
+    rather than each traversing it in full.
+    """
+
+    def transform(self, usage_info, block_structure):
+        """
+        By defining this method, VisitingTransformers can be run individually
+        if desired. In normal operations, the visitors returned from multiple
+        transform_block_visitors calls will share tree traversals.
+        """
+        for visitors in BlockVisitor.plan_traversals(self.transform_block_visitors(usage_info, block_structure)):
+            BlockVisitor.traverse(block_structure, visitors)
+
+    @abstractmethod
+    def transform_block_visitors(self, usage_info, block_structure):
+        """
+        This is an alternative to the standard transform method.
+
+        Returns a list of BlockVisitors, which are called in order on each
+        block of the given block_structure to transform it.
+
+        Unlike filters, visitors are run in the order in which their
+        transformers were listed, after the results of the visitors of
+        preceding transformers are available for each block.  A visitor
+        may read the data that earlier visitors set for the block it's
+        visiting, and for the blocks its order guarantees were visited
+        before it.
+
+        Arguments:
+            usage_info (any negotiated type) - A usage-specific object
+                that is passed to the block_structure and forwarded to all
+                requested Transformers in order to apply a
+                usage-specific transform. For example, an instance of
+                usage_info would contain a user object for which the
+                transform should be applied.
+
+            block_structure (BlockStructureBlockData) - A mutable
+                block structure, with already collected data for the
+                transformer, that is to be transformed in place.
+        """
+        raise NotImplementedError
@@ -2,10 +2,15 @@
 Module for a collection of BlockStructureTransformers.
 """
 import functools
+from collections import OrderedDict
+from contextlib import contextmanager
 from logging import getLogger
+from timeit import default_timer
+
+from openedx.core.djangoapps import monitoring_utils
 
 from .exceptions import TransformerException, TransformerDataIncompatible
-from .transformer import FilteringTransformerMixin
+from .transformer import BlockVisitor, FilteringTransformerMixin, VisitingTransformerMixin
 from .transformer_registry import TransformerRegistry
 
 
@@ -23,6 +28,13 @@ class BlockStructureTransformers(object):
     Clients are expected to access the list of transformers through the
     class' interface rather than directly.
     """
+    # Name under which non-block-specific data collected for the block
+    # structure framework itself, rather than for a transformer, is stored.
+    COLLECTED_DATA_NAME = u'block_structure'
+
+    # Key of the course version of the root block in that data.
+    COURSE_VERSION_KEY = u'course_version'
+
     def __init__(self, transformers=None, usage_info=None):
         """
         Arguments:
@@ -42,6 +54,10 @@ class BlockStructureTransformers(object):
         """
         self.usage_info = usage_info
         self._transformers = {'supports_filter': [], 'no_filter': []}
+
+        # Seconds spent in each step of the last transform, keyed by
+        # the names of the transformers run in the step.
+        self.timings = OrderedDict()
         if transformers:
             self.__iadd__(transformers)
 
@@ -71,10 +87,20 @@ class BlockStructureTransformers(object):
         return self
 
     @classmethod
-    def collect(cls, block_structure):
+    def collect(cls, block_structure, collect_course_version=False):
         """
         Collects data for each registered transformer.
+
+        If collect_course_version is True, the course version of the root
+        block is also collected, so that the blocks that changed since the
+        data was collected can be found to collect incrementally.
         """
+        if collect_course_version:
+            root_xblock = block_structure.get_xblock(block_structure.root_block_usage_key)
+            block_structure.set_transformer_data(
+                cls.COLLECTED_DATA_NAME, cls.COURSE_VERSION_KEY, getattr(root_xblock, 'course_version', None),
+            )
+
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
@@ -82,6 +108,30 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def get_collected_course_version(cls, block_structure):
+        """
+        Returns the course version of the root block when the data in the
+        given block structure was collected, or None if it wasn't recorded.
+        """
+        return block_structure.get_transformer_data(cls.COLLECTED_DATA_NAME, cls.COURSE_VERSION_KEY)
+
+    @classmethod
+    def supports_incremental_collect(cls, block_structure):
+        """
+        Returns whether the collected data in the given block structure
+        can be updated by collecting only a part of the structure.
+
+        This requires that all registered transformers support
+        incremental collects and that the data was collected with their
+        current WRITE_VERSION.
+        """
+        return all(
+            transformer.SUPPORTS_INCREMENTAL_COLLECT and
+            block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION  # pylint: disable=protected-access
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -110,13 +160,17 @@ class BlockStructureTransformers(object):
         The given block structure is transformed by each transformer in the
         collection. Tranformers with filters are combined and run first in a
         single course tree traversal, then remaining transformers are run in
-        the order that they were added.
+        the order that they were added.  The visitors of consecutive
+        VisitingTransformers share as few traversals as their orders allow.
         """
+        self.timings = OrderedDict()
+
         self._transform_with_filters(block_structure)
         self._transform_without_filters(block_structure)
 
         # Prune the block structure to remove any unreachable blocks.
-        block_structure._prune_unreachable()  # pylint: disable=protected-access
+        with self._timed(u'prune_unreachable'):
+            block_structure._prune_unreachable()  # pylint: disable=protected-access
 
     def _transform_with_filters(self, block_structure):
         """
@@ -128,14 +182,16 @@ class BlockStructureTransformers(object):
 
         filters = []
         for transformer in self._transformers['supports_filter']:
-            filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
+            with self._timed(transformer.name()):
+                filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
 
         combined_filters = functools.reduce(
             self._filter_chain,
             filters,
             block_structure.create_universal_filter()
         )
-        block_structure.filter_topological_traversal(combined_filters)
+        with self._timed(u'filters'):
+            block_structure.filter_topological_traversal(combined_filters)
 
     def _filter_chain(self, accumulated, additional):
         """
@@ -147,7 +203,56 @@ class BlockStructureTransformers(object):
     def _transform_without_filters(self, block_structure):
         """
         Transforms the given block_structure using the transform
-        method from the given transformers.
+        method from the given transformers, or the block visitors of
+        consecutive VisitingTransformers.
         """
+        visiting_transformers = []
         for transformer in self._transformers['no_filter']:
-            transformer.transform(self.usage_info, block_structure)
+            if isinstance(transformer, VisitingTransformerMixin):
+                visiting_transformers.append(transformer)
+                continue
+
+            self._transform_with_visitors(block_structure, visiting_transformers)
+            visiting_transformers = []
+            with self._timed(transformer.name()):
+                transformer.transform(self.usage_info, block_structure)
+
+        self._transform_with_visitors(block_structure, visiting_transformers)
+
+    def _transform_with_visitors(self, block_structure, transformers):
+        """
+        Transforms the given block_structure using the block visitors
+        from the given VisitingTransformers, sharing traversals between
+        them.
+        """
+        if not transformers:
+            return
+
+        # Visitors are tagged with the name of the transformer they came
+        # from, to report the time spent in each traversal.
+        visitors = []
+        for transformer in transformers:
+            with self._timed(transformer.name()):
+                for visitor in transformer.transform_block_visitors(self.usage_info, block_structure):
+                    visitors.append((transformer.name(), visitor))
+
+        visitors_by_id = {id(visitor): name for name, visitor in visitors}
+        for traversal in BlockVisitor.plan_traversals([visitor for _, visitor in visitors]):
+            names = OrderedDict((visitors_by_id[id(visitor)], None) for visitor in traversal)
+            with self._timed(u'+'.join(names)):
+                BlockVisitor.traverse(block_structure, traversal)
+
+    @contextmanager
+    def _timed(self, step):
+        """
+        Context manager that adds the time spent in its block to the
+        timing of the given step of the transform, and reports it as a
+        custom metric.
+        """
+        start = default_timer()
+        try:
+            yield
+        finally:
+            elapsed = default_timer() - start
+            self.timings[step] = self.timings.get(step, 0) + elapsed
+            monitoring_utils.accumulate(u'block_structure.transform.{}'.format(step), elapsed)
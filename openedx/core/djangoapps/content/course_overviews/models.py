@@ -3,9 +3,14 @@ Declaration of CourseOverview model
 """
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from urlparse import urlparse, urlunparse
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -28,6 +33,108 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageK
 log = logging.getLogger(__name__)
 
 
+class CourseOverviewProcessCache(object):
+    """
+    In-process cache of CourseOverviews, used by CourseOverview.get_from_ids.
+
+    Each process caches its own copies of overviews, so publishing a course
+    can't remove them from the caches of other processes.  Instead, each
+    course has a version in the django cache, which is changed by invalidate()
+    when the course is published.  Overviews are cached along with the
+    version of their course when they were read from the database, and are
+    only returned while that version is current.
+
+    Entries are also dropped after settings.COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT
+    seconds, in case the version of a course was evicted from the django cache,
+    and the oldest entries are dropped once there are more than
+    settings.COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES.  The cache is disabled
+    if the timeout is 0.
+    """
+    VERSION_CACHE_KEY_PREFIX = 'course_overviews.version.'
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        Returns whether overviews should be cached.
+        """
+        return bool(getattr(settings, 'COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT', 0))
+
+    @classmethod
+    def _version_cache_key(cls, course_id):
+        """
+        Returns the key of the version of the course in the django cache.
+        """
+        return cls.VERSION_CACHE_KEY_PREFIX + unicode(course_id)
+
+    @classmethod
+    def get_versions(cls, course_ids):
+        """
+        Returns a dict mapping course_ids to the current versions of their
+        courses, for the courses that have one.
+
+        This should be called before the overviews are read from the database,
+        so that they are never cached with a version newer than their data.
+        """
+        course_ids_by_key = {cls._version_cache_key(course_id): course_id for course_id in course_ids}
+        return {
+            course_ids_by_key[key]: version
+            for key, version in cache.get_many(course_ids_by_key.keys()).iteritems()
+        }
+
+    @classmethod
+    def invalidate(cls, course_id):
+        """
+        Changes the version of the course, so that its overview is read from
+        the database again by all processes.
+        """
+        cache.set(cls._version_cache_key(course_id), uuid4().hex, None)
+
+    def get_many(self, course_ids, versions):
+        """
+        Returns a dict mapping course_ids to the cached overviews of their
+        courses, for the courses whose overview was cached with the version in
+        `versions`.
+        """
+        now = time.time()
+        overviews = {}
+        with self._lock:
+            for course_id in course_ids:
+                entry = self._entries.get(course_id)
+                if entry is None:
+                    continue
+                overview, version, expiry = entry
+                if expiry <= now or version != versions.get(course_id):
+                    del self._entries[course_id]
+                else:
+                    overviews[course_id] = overview
+        return overviews
+
+    def set_many(self, overviews, versions):
+        """
+        Caches the overviews, along with the versions of their courses in
+        `versions`.
+        """
+        expiry = time.time() + settings.COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT
+        max_entries = getattr(settings, 'COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES', 1000)
+        with self._lock:
+            for overview in overviews:
+                self._entries.pop(overview.id, None)
+                self._entries[overview.id] = (overview, versions.get(overview.id), expiry)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all overviews from the cache of this process.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
 class CourseOverview(TimeStampedModel):
     """
     Model for storing and caching basic information about a course.
@@ -49,6 +156,9 @@ class CourseOverview(TimeStampedModel):
     # Cache entry versioning.
     version = IntegerField()
 
+    # In-process cache of the overviews returned by get_from_ids.
+    process_cache = CourseOverviewProcessCache()
+
     # Course identification
     id = CourseKeyField(db_index=True, primary_key=True, max_length=255)
     _location = UsageKeyField(max_length=255)
@@ -301,6 +411,63 @@ class CourseOverview(TimeStampedModel):
 
         return course_overview or cls.load_from_module_store(course_id)
 
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews.
+
+        Like get_from_id, but for many courses at once.  The overviews are read
+        from the database along with their tabs and image sets in a constant
+        number of queries, and only the overviews that are missing or outdated
+        are loaded from the module store.  Courses that are not found or fail to
+        load from the module store are left out.
+
+        If settings.COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT is set, overviews are
+        also cached in-process until their course is published again (see
+        CourseOverviewProcessCache).  Cached overviews are shared, so callers
+        must not modify them.
+        """
+        course_ids = set(course_ids)
+        process_cache_enabled = cls.process_cache.enabled
+        if process_cache_enabled:
+            versions = cls.process_cache.get_versions(course_ids)
+            course_overviews = cls.process_cache.get_many(course_ids, versions)
+        else:
+            course_overviews = {}
+
+        loaded_overviews = []
+        missing_course_ids = course_ids.difference(course_overviews)
+        if missing_course_ids:
+            outdated_course_ids = []
+            for course_overview in cls.objects.select_related('image_set').prefetch_related('tabs').filter(
+                    id__in=missing_course_ids
+            ):
+                if course_overview.version < cls.VERSION:
+                    outdated_course_ids.append(course_overview.id)
+                    continue
+                # Regenerate the thumbnail images if they're missing, as in get_from_id.
+                if not hasattr(course_overview, 'image_set'):
+                    CourseOverviewImageSet.create(course_overview)
+                loaded_overviews.append(course_overview)
+
+            # Throw away old versions of CourseOverview, as they might contain stale data.
+            if outdated_course_ids:
+                cls.objects.filter(id__in=outdated_course_ids).delete()
+
+            missing_course_ids.difference_update(course_overview.id for course_overview in loaded_overviews)
+            for course_id in missing_course_ids:
+                try:
+                    loaded_overviews.append(cls.load_from_module_store(course_id))
+                except cls.DoesNotExist:
+                    log.info('Course overview for %s not generated: course not found.', unicode(course_id))
+                except IOError:
+                    log.exception('Course overview for %s not generated.', unicode(course_id))
+
+        if process_cache_enabled:
+            cls.process_cache.set_many(loaded_overviews, versions)
+        course_overviews.update((course_overview.id, course_overview) for course_overview in loaded_overviews)
+        return course_overviews
+
     @classmethod
     def get_from_ids_if_exists(cls, course_ids):
         """
@@ -20,6 +20,7 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     """
     previous_course_overview = CourseOverview.get_from_ids_if_exists([course_key]).get(course_key)
     updated_course_overview = CourseOverview.load_from_module_store(course_key)
+    CourseOverview.process_cache.invalidate(course_key)
     _check_for_course_changes(previous_course_overview, updated_course_overview)
 
 
@@ -30,6 +31,7 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     invalidates the corresponding CourseOverview cache entry if one exists.
     """
     CourseOverview.objects.filter(id=course_key).delete()
+    CourseOverview.process_cache.invalidate(course_key)
     # import CourseAboutSearchIndexer inline due to cyclic import
     from cms.djangoapps.contentstore.courseware_index import CourseAboutSearchIndexer
     # Delete course entry from Course About Search_index
@@ -9,11 +9,14 @@ import math
 import mock
 from nose.plugins.attrib import attr
 import pytz
+import time
 
 from django.conf import settings
+from django.db import connection
 from django.db.utils import IntegrityError
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
+from opaque_keys.edx.locator import CourseLocator
 from PIL import Image
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
@@ -34,7 +37,7 @@ from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls_range
+from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
 from ..models import CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
 
@@ -529,6 +532,85 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase):
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    def test_get_from_ids(self):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        course_with_old_overview = CourseFactory.create(emit_signals=True)
+        old_overview = CourseOverview.get_from_id(course_with_old_overview.id)
+        old_overview.version = CourseOverview.VERSION - 1
+        old_overview.save()
+        courses = [course_with_overview, course_without_overview, course_with_old_overview]
+        course_ids = [course.id for course in courses]
+
+        # Missing and outdated CourseOverviews are generated, and courses
+        # that don't exist are left out.
+        course_ids_to_overviews = CourseOverview.get_from_ids(
+            course_ids + [CourseLocator('org', 'missing', 'run')]
+        )
+        self.assertEqual(set(course_ids_to_overviews), set(course_ids))
+        for course in courses:
+            course_overview = course_ids_to_overviews[course.id]
+            self.assertEqual(course_overview.version, CourseOverview.VERSION)
+            self.assertEqual(course_overview.display_name, course.display_name)
+
+        # Now that all of them exist, the CourseOverviews and their tabs are
+        # read in the same number of queries however many courses there are.
+        def get_overviews_with_tabs(course_ids):
+            """
+            Returns the number of queries taken by getting the overviews of
+            the courses and their tabs.
+            """
+            with CaptureQueriesContext(connection) as queries:
+                with check_mongo_calls(0):
+                    for course_overview in CourseOverview.get_from_ids(course_ids).itervalues():
+                        self.assertTrue(course_overview.tabs.all())
+            return len(queries)
+
+        self.assertEqual(get_overviews_with_tabs(course_ids[:1]), get_overviews_with_tabs(course_ids))
+
+    @override_settings(COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT=60)
+    def test_get_from_ids_process_cache(self):
+        CourseOverview.process_cache.clear()
+        self.addCleanup(CourseOverview.process_cache.clear)
+        course = CourseFactory.create(emit_signals=True)
+        course_overview = CourseOverview.get_from_ids([course.id])[course.id]
+
+        # The overview is cached in-process...
+        with self.assertNumQueries(0):
+            self.assertIs(CourseOverview.get_from_ids([course.id])[course.id], course_overview)
+
+        # ...until its course's version changes...
+        CourseOverview.process_cache.invalidate(course.id)
+        course_overview = CourseOverview.get_from_ids([course.id])[course.id]
+        with self.assertNumQueries(0):
+            self.assertIs(CourseOverview.get_from_ids([course.id])[course.id], course_overview)
+
+        # ...or it expires.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.time.time',
+            return_value=time.time() + 61,
+        ):
+            self.assertIsNot(CourseOverview.get_from_ids([course.id])[course.id], course_overview)
+
+    @override_settings(COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT=60, COURSE_OVERVIEWS_PROCESS_CACHE_MAX_ENTRIES=2)
+    def test_get_from_ids_process_cache_max_entries(self):
+        CourseOverview.process_cache.clear()
+        self.addCleanup(CourseOverview.process_cache.clear)
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        course_ids_to_overviews = CourseOverview.get_from_ids(course_ids[:2])
+        CourseOverview.get_from_ids(course_ids[2:])
+
+        # The oldest overview was evicted to make room for the last one.
+        with self.assertNumQueries(0):
+            self.assertIs(
+                CourseOverview.get_from_ids(course_ids[1:2])[course_ids[1]],
+                course_ids_to_overviews[course_ids[1]],
+            )
+        self.assertIsNot(
+            CourseOverview.get_from_ids(course_ids[:1])[course_ids[0]],
+            course_ids_to_overviews[course_ids[0]],
+        )
+
 
 @attr(shard=3)
 @ddt.ddt
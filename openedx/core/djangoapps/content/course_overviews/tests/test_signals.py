@@ -1,5 +1,6 @@
 import datetime
 import ddt
+from django.test.utils import override_settings
 from mock import patch
 from nose.plugins.attrib import attr
 
@@ -69,6 +70,27 @@ class CourseOverviewSignalsTestCase(ModuleStoreTestCase):
                 self.store.delete_course(course.id, ModuleStoreEnum.UserID.test)
                 CourseOverview.get_from_id(course.id)
 
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    @override_settings(COURSE_OVERVIEWS_PROCESS_CACHE_TIMEOUT=60)
+    def test_process_cache_invalidation(self, modulestore_type):
+        """
+        Tests that when a course is published or deleted, the corresponding
+        course_overview is removed from the in-process cache.
+        """
+        CourseOverview.process_cache.clear()
+        self.addCleanup(CourseOverview.process_cache.clear)
+        with self.store.default_store(modulestore_type):
+            course = CourseFactory.create(mobile_available=True, default_store=modulestore_type, emit_signals=True)
+            self.assertTrue(CourseOverview.get_from_ids([course.id])[course.id].mobile_available)
+
+            course.mobile_available = False
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+                self.store.update_item(course, ModuleStoreEnum.UserID.test)
+            self.assertFalse(CourseOverview.get_from_ids([course.id])[course.id].mobile_available)
+
+            self.store.delete_course(course.id, ModuleStoreEnum.UserID.test)
+            self.assertEqual(CourseOverview.get_from_ids([course.id]), {})
+
     def assert_changed_signal_sent(self, field_name, initial_value, changed_value, mock_signal):
         course = CourseFactory.create(emit_signals=True, **{field_name: initial_value})
 
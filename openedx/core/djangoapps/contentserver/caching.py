@@ -1,11 +1,21 @@
 """
 Helper functions for caching course assets.
 """
+import errno
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
+
+log = logging.getLogger(__name__)
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -14,6 +24,9 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# Prefix of the cache keys of the metadata of assets, whose content is too large to be cached.
+METADATA_KEY_PREFIX = 'metadata:'
+
 
 def set_cached_content(content):
     """
@@ -29,6 +42,29 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(unicode(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+def set_cached_metadata(content):
+    """
+    Stores the metadata of the given piece of content in the cache, without its data.
+    """
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+    CONTENT_CACHE.set(
+        METADATA_KEY_PREFIX + unicode(content.location).encode("utf-8"), metadata, version=STATIC_CONTENT_VERSION
+    )
+
+
+def get_cached_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location if cached, as
+    a StaticContent whose data is None.
+    """
+    return CONTENT_CACHE.get(METADATA_KEY_PREFIX + unicode(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+
+
 def del_cached_content(location):
     """
     Delete content for the given location, as well versions of the content without a run.
@@ -47,4 +83,183 @@ def del_cached_content(location):
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.delete_many(
+        locations + [METADATA_KEY_PREFIX + loc for loc in locations], version=STATIC_CONTENT_VERSION
+    )
+
+
+# DiskContentCache of each configured directory and size, which keep track of the size
+# of their entries across requests.
+_DISK_CONTENT_CACHES = {}
+
+
+def get_disk_content_cache():
+    """
+    Returns the DiskContentCache configured by the CONTENTSERVER_DISK_CACHE_DIR and
+    CONTENTSERVER_DISK_CACHE_MAX_BYTES settings, or None if it isn't configured.
+    """
+    directory = getattr(settings, 'CONTENTSERVER_DISK_CACHE_DIR', None)
+    max_bytes = getattr(settings, 'CONTENTSERVER_DISK_CACHE_MAX_BYTES', 0)
+    if not directory or not max_bytes:
+        return None
+    disk_cache = _DISK_CONTENT_CACHES.get((directory, max_bytes))
+    if disk_cache is None:
+        disk_cache = _DISK_CONTENT_CACHES.setdefault((directory, max_bytes), DiskContentCache(directory, max_bytes))
+    return disk_cache
+
+
+class DiskContentCache(object):
+    """
+    A cache of the data of assets in a local directory, shared by all of the processes
+    on a node, which holds at most about `max_bytes` of data.
+
+    Entries are keyed by both the location and the content digest of assets, so an asset
+    which is replaced is never served from a stale entry. Entries are written as assets
+    are streamed to the client, and only become visible once complete.
+
+    Each process counts the size of the entries it adds on top of the size it last found
+    in the directory, and only lists the directory, removing the least recently used
+    entries, when that count exceeds `max_bytes`. Entries added by other processes since
+    are therefore only accounted for at their own next eviction.
+    """
+    TEMP_FILE_PREFIX = '.tmp-'
+
+    # Evictions remove entries until the cache holds at most this fraction of `max_bytes`,
+    # so that a full cache isn't listed each time an entry is added.
+    EVICTION_RATIO = 0.9
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Number of bytes in the cache, as last counted by this process plus the entries
+        # it added since, or None until counted.
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, location, content_digest):
+        """
+        Returns the path of the cached data of the given version of an asset.
+        """
+        location_hash = hashlib.sha1(unicode(location).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, '{}-{}'.format(location_hash, content_digest))
+
+    def get(self, location, content_digest):
+        """
+        Returns the cached data of the given version of an asset as an open file, or None.
+        """
+        path = self._path(location, content_digest)
+        try:
+            asset_file = open(path, 'rb')
+        except IOError:
+            return None
+
+        try:
+            # Record the access for the purpose of evicting least recently used entries.
+            os.utime(path, None)
+        except OSError:
+            # The entry was evicted by another process, but we still hold it open.
+            pass
+        return asset_file
+
+    def stream_and_set(self, content):
+        """
+        Yields the data of the given StaticContentStream, and caches it once all of it
+        has been read. Nothing is cached if the data isn't read to its end.
+        """
+        if not content.content_digest or content.length is None or content.length > self.max_bytes:
+            for chunk in content.stream_data():
+                yield chunk
+            return
+
+        temp_file = None
+        try:
+            try:
+                os.makedirs(self.directory)
+            except OSError as exception:
+                if exception.errno != errno.EEXIST:
+                    raise
+            temp_fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=self.TEMP_FILE_PREFIX)
+            temp_file = os.fdopen(temp_fd, 'wb')
+        except (IOError, OSError):
+            log.exception(u"Could not cache content of %s on disk", unicode(content.location))
+
+        complete = False
+        try:
+            for chunk in content.stream_data():
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                    except (IOError, OSError):
+                        log.exception(u"Could not cache content of %s on disk", unicode(content.location))
+                        self._discard(temp_file, temp_path)
+                        temp_file = None
+                yield chunk
+            complete = True
+        finally:
+            if temp_file is not None:
+                if complete:
+                    self._commit(temp_file, temp_path, self._path(content.location, content.content_digest))
+                else:
+                    self._discard(temp_file, temp_path)
+
+    def _commit(self, temp_file, temp_path, path):
+        """
+        Makes the data written to the given temporary file the cache entry at `path`.
+        """
+        try:
+            temp_file.close()
+            size = os.path.getsize(temp_path)
+            # Make the entry visible to other processes only once it's complete.
+            os.rename(temp_path, path)
+        except (IOError, OSError):
+            log.exception(u"Could not cache content at %s on disk", path)
+            self._discard(temp_file, temp_path)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            if self._size is None or self._size > self.max_bytes:
+                self._size = self.evict()
+
+    @staticmethod
+    def _discard(temp_file, temp_path):
+        """
+        Closes and removes the given temporary file.
+        """
+        temp_file.close()
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """
+        Removes the least recently used entries if the cache holds more than `max_bytes`,
+        and returns the number of bytes left in the cache.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.TEMP_FILE_PREFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size <= self.max_bytes:
+            return size
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes * self.EVICTION_RATIO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Already evicted by another process.
+                pass
+            size -= entry_size
+        return size
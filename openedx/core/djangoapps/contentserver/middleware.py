@@ -4,23 +4,27 @@ Middleware to serve assets.
 
 import logging
 import datetime
+from uuid import uuid4
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    FileResponse, HttpResponse, StreamingHttpResponse, HttpResponseNotModified, HttpResponseForbidden,
     HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+from django.utils.http import parse_etags, quote_etag
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    get_cached_content, get_cached_metadata, get_disk_content_cache, set_cached_content, set_cached_metadata
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -31,6 +35,19 @@ from .models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# Assets smaller than this many bytes are cached along with their data. We cap this at 1MB
+# because it's the default for memcached and also we don't want to do too much buffering
+# in memory when we're serving an actual request.
+MAX_CACHED_CONTENT_LENGTH = 1048576
+
+# Maximum number of ranges, once overlapping and adjacent ones are merged, of a request
+# which is answered with a multipart/byteranges response. The full content is sent in
+# response to requests for more ranges.
+MAX_BYTE_RANGES = 20
+
+# Number of bytes read at a time from assets cached on local disk.
+DISK_READ_CHUNK_SIZE = 64 * 1024
+
 
 class StaticContentServer(object):
     """
@@ -108,11 +125,18 @@ class StaticContentServer(object):
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            if self.is_not_modified(request, content):
+                return HttpResponseNotModified()
+
+            # Small assets are cached along with their data. Load the data of larger
+            # ones, preferably from the local disk cache.
+            asset_file = None
+            disk_cache = get_disk_content_cache()
+            if content.data is None:
+                content, asset_file = self.load_asset_data(loc, content, disk_cache)
+
+            if newrelic:
+                newrelic.agent.add_custom_parameter('contentserver.disk_cached', asset_file is not None)
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
@@ -122,10 +146,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -138,37 +158,58 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                        )
                     else:
-                        first, last = ranges[0]
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        if not ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            if asset_file is not None:
+                                asset_file.close()
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        ranges = merge_ranges(ranges)
+                        if len(ranges) > MAX_BYTE_RANGES:
+                            log.warning(
+                                u"Too many ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                        elif len(ranges) == 1:
+                            first, last = ranges[0]
+                            # Players commonly request the whole of media assets as "bytes=0-", which
+                            # can fill the disk cache like a request without a Range.
+                            if asset_file is None and (first, last) == (0, content.length - 1):
+                                range_data = stream_data(content, disk_cache)
+                            else:
+                                range_data = stream_ranges(content, ranges, asset_file)
+                            response = StreamingHttpResponse(range_data)
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
+                            response['Content-Type'] = content.content_type
+                        else:
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a
+                            # multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            response = multipart_byteranges_response(content, ranges, asset_file)
+
+                        if response is not None:
                             response.status_code = 206  # Partial Content
 
                             if newrelic:
                                 newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if asset_file is not None:
+                    # This lets the WSGI server send the file with sendfile, where available.
+                    response = FileResponse(asset_file)
+                elif content.data is None:
+                    response = StreamingHttpResponse(stream_data(content, disk_cache))
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
+                response['Content-Type'] = content.content_type
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
@@ -176,7 +217,6 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -212,12 +252,34 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        if content.content_digest:
+            response['ETag'] = quote_etag(content.content_digest)
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
         # caches a version of the response without CORS headers, in turn breaking XHR requests.
         force_header_for_response(response, 'Vary', 'Origin')
 
+    @staticmethod
+    def is_not_modified(request, content):
+        """
+        Determines whether the given conditional request can be answered with 304 Not Modified.
+
+        An If-None-Match header, which is matched against the content digest of the asset,
+        takes precedence over an If-Modified-Since header.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            if not content.content_digest:
+                return False
+            return if_none_match.strip() == '*' or content.content_digest in parse_etags(if_none_match)
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since is not None:
+            return if_modified_since == content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+
+        return False
+
     @staticmethod
     def is_cdn_request(request):
         """
@@ -269,10 +331,16 @@ class StaticContentServer(object):
         """
         Loads an asset based on its location, either retrieving it from a cache
         or loading it directly from the contentstore.
+
+        Assets which are too large to be cached are returned either as a
+        StaticContentStream or, if their metadata is cached, as a StaticContent
+        without data. See `load_asset_data`.
         """
 
         # See if we can load this item from cache.
         content = get_cached_content(location)
+        if content is None:
+            content = get_cached_metadata(location)
         if content is None:
             # Not in cache, so just try and load it from the asset manager.
             try:
@@ -280,15 +348,137 @@ class StaticContentServer(object):
             except (ItemNotFoundError, NotFoundError):
                 raise
 
-            # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            # Now that we fetched it, let's go ahead and try to cache it.
+            if content.length is not None and content.length < MAX_CACHED_CONTENT_LENGTH:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
+            else:
+                # Cache the metadata of larger assets, so that requests which don't need
+                # their data, such as conditional requests, don't read the contentstore.
+                set_cached_metadata(content)
 
         return content
 
+    def load_asset_data(self, location, content, disk_cache=None):
+        """
+        Returns the given asset with its data loaded, and an open file holding its data
+        if it is cached in `disk_cache`, or None otherwise.
+
+        Arguments:
+            location: The location of the asset.
+            content: A StaticContentStream, or a StaticContent without data.
+            disk_cache: The DiskContentCache, if configured.
+        """
+        if disk_cache is not None and content.content_digest:
+            asset_file = disk_cache.get(content.location, content.content_digest)
+            if asset_file is not None:
+                return content, asset_file
+
+        if not isinstance(content, StaticContentStream):
+            content = AssetManager.find(location, as_stream=True)
+
+        return content, None
+
+
+def stream_data(content, disk_cache=None):
+    """
+    Returns an iterator over the data of `content`, which is cached in `disk_cache`, if
+    given, as it is streamed.
+    """
+    if disk_cache is not None and isinstance(content, StaticContentStream):
+        return disk_cache.stream_and_set(content)
+    return content.stream_data()
+
+
+def stream_ranges(content, ranges, asset_file=None):
+    """
+    Yields the data of each of the (first, last) byte `ranges` of `content`, read from
+    `asset_file` if the asset is cached on local disk, in turn. `asset_file` is closed
+    once the ranges are streamed.
+    """
+    try:
+        for first, last in ranges:
+            for chunk in stream_range(content, first, last, asset_file):
+                yield chunk
+    finally:
+        if asset_file is not None:
+            asset_file.close()
+
+
+def stream_range(content, first, last, asset_file=None):
+    """
+    Yields the data of the given byte range of `content`, read from `asset_file` if
+    the asset is cached on local disk.
+    """
+    if asset_file is not None:
+        asset_file.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = asset_file.read(min(remaining, DISK_READ_CHUNK_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    elif content.data is not None:
+        yield content.data[first:last + 1]
+    else:
+        for chunk in content.stream_data_in_range(first, last):
+            yield chunk
+
+
+def merge_ranges(ranges):
+    """
+    Returns the given (first, last) byte ranges in order, with overlapping and adjacent
+    ranges merged.
+    """
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def multipart_byteranges_response(content, ranges, asset_file=None):
+    """
+    Returns a streaming multipart/byteranges response, with a part for each of the
+    (first, last) byte `ranges` of `content`, read from `asset_file` if the asset is
+    cached on local disk. `asset_file` is closed once the body is streamed.
+
+    See spec for details: https://tools.ietf.org/html/rfc7233#appendix-A
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        u'--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length,
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing = '--{boundary}--\r\n'.format(boundary=boundary)
+
+    def stream_body():
+        """
+        Yields the parts of the multipart body.
+        """
+        try:
+            for headers, (first, last) in zip(part_headers, ranges):
+                yield headers
+                for chunk in stream_range(content, first, last, asset_file):
+                    yield chunk
+                yield '\r\n'
+            yield closing
+        finally:
+            if asset_file is not None:
+                asset_file.close()
+
+    content_length = len(closing) + sum(
+        len(headers) + (last - first + 1) + len('\r\n') for headers, (first, last) in zip(part_headers, ranges)
+    )
+    response = StreamingHttpResponse(stream_body(), content_type='multipart/byteranges; boundary={}'.format(boundary))
+    response['Content-Length'] = str(content_length)
+    return response
+
 
 def parse_range_header(header_value, content_length):
     """
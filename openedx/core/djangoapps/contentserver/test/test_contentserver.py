@@ -6,14 +6,18 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import unittest
+from tempfile import mkdtemp
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
-from mock import patch
+from mock import Mock, patch
 
 from xmodule.contentstore.django import contentstore
 from xmodule.contentstore.content import StaticContent, VERSIONED_ASSETS_PREFIX
@@ -27,7 +31,8 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
-from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from ..caching import DiskContentCache
+from ..middleware import merge_ranges, parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
 
@@ -242,17 +247,63 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with each of the ranges.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
+        data = self.client.get(self.url_unlocked).content
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertNotIn('Content-Range', resp)
+        body = ''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+        parts = body.split('--{}'.format(boundary))
+        self.assertEqual(parts[0], '')
+        self.assertEqual(parts[-1], '--\r\n')
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:-1], expected_ranges):
+            headers, body = part.split('\r\n\r\n', 1)
+            self.assertIn('Content-Range: bytes {}-{}/{}'.format(first, last, self.length_unlocked), headers)
+            self.assertEqual(body, data[first:last + 1] + '\r\n')
+
+    def test_range_request_overlapping_ranges(self):
+        """
+        Test that overlapping and adjacent ranges in request are merged.
+        """
+        data = self.client.get(self.url_unlocked).content
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-19, 0-14, 20-29, 0-9')
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-29/{length}'.format(length=self.length_unlocked))
+        self.assertEqual(''.join(resp.streaming_content), data[0:30])
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.MAX_BYTE_RANGES', 2)
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that a request for more ranges than are served as a multipart message outputs the full content.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-0, 2-2, 4-4')
+
         self.assertEqual(resp.status_code, 200)
         self.assertNotIn('Content-Range', resp)
         self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
 
+    def test_range_request_partially_satisfiable_ranges(self):
+        """
+        Test that unsatisfiable ranges among multiple ranges in request are left out.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, {first}-'.format(
+            first=self.length_unlocked))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-9/{length}'.format(length=self.length_unlocked))
+        self.assertEqual(resp['Content-Length'], '10')
+
     @ddt.data(
         'bytes 0-',
         'bits=0-',
@@ -285,6 +336,72 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_etag_conditional_request(self):
+        """
+        Test that a request whose If-None-Match header matches the ETag of the asset outputs 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_modified_since_conditional_request(self):
+        """
+        Test that a request whose If-Modified-Since header matches the Last-Modified of the asset
+        outputs 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        self.assertEqual(resp.status_code, 304)
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.MAX_CACHED_CONTENT_LENGTH', 0)
+    def test_metadata_cache(self):
+        """
+        Test that conditional requests for assets too large to be cached with their data
+        don't read the contentstore once the metadata of the asset is cached.
+        """
+        with patch('openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE', LocMemCache(uuid4().hex, {})):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+
+            with patch.object(AssetManager, 'find') as mock_find:
+                resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=resp['ETag'])
+                self.assertEqual(resp.status_code, 304)
+                self.assertFalse(mock_find.called)
+
+    @patch('openedx.core.djangoapps.contentserver.middleware.MAX_CACHED_CONTENT_LENGTH', 0)
+    def test_disk_cache(self):
+        """
+        Test that assets too large to be cached with their data are served from the disk cache.
+        """
+        data = self.client.get(self.url_unlocked).content
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        with override_settings(CONTENTSERVER_DISK_CACHE_DIR=cache_dir, CONTENTSERVER_DISK_CACHE_MAX_BYTES=10 ** 6):
+            with patch('openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE', LocMemCache(uuid4().hex, {})):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(''.join(resp.streaming_content), data)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+                with patch.object(AssetManager, 'find') as mock_find:
+                    resp = self.client.get(self.url_unlocked)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+                    self.assertEqual(''.join(resp.streaming_content), data)
+
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9, 20-29')
+                    self.assertEqual(resp.status_code, 206)
+                    body = ''.join(resp.streaming_content)
+                    self.assertIn(data[0:10], body)
+                    self.assertIn(data[20:30], body)
+
+                    self.assertFalse(mock_find.called)
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -447,3 +564,93 @@ class ParseRangeHeaderTestCase(unittest.TestCase):
         self.assertRaisesRegexp(
             exception_class, exception_message_regex, parse_range_header, header_value, self.content_length
         )
+
+
+@ddt.ddt
+class MergeRangesTestCase(unittest.TestCase):
+    """
+    Tests for the merge_ranges function.
+    """
+    @ddt.data(
+        ([(0, 9)], [(0, 9)]),
+        ([(20, 29), (0, 9)], [(0, 9), (20, 29)]),
+        ([(0, 9), (10, 19)], [(0, 19)]),
+        ([(0, 9), (5, 14), (0, 9), (2, 3)], [(0, 14)]),
+        ([(0, 99)] * 1000, [(0, 99)]),
+    )
+    @ddt.unpack
+    def test_merge_ranges(self, ranges, expected_ranges):
+        self.assertEqual(merge_ranges(ranges), expected_ranges)
+
+
+class DiskContentCacheTestCase(unittest.TestCase):
+    """
+    Tests for the DiskContentCache.
+    """
+    def setUp(self):
+        super(DiskContentCacheTestCase, self).setUp()
+        self.cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache = DiskContentCache(os.path.join(self.cache_dir, 'assets'), 25)
+
+    def mock_content(self, name, data, content_digest=FAKE_MD5_HASH):
+        """
+        Returns a mock StaticContentStream with the given data.
+        """
+        content = Mock(location=name, content_digest=content_digest, length=len(data))
+        content.stream_data.return_value = iter([data])
+        return content
+
+    def set_content(self, name, data, content_digest=FAKE_MD5_HASH):
+        """
+        Streams the given data through the cache, and returns what was streamed.
+        """
+        return ''.join(self.cache.stream_and_set(self.mock_content(name, data, content_digest)))
+
+    def test_set_and_get(self):
+        self.assertIsNone(self.cache.get('a', FAKE_MD5_HASH))
+        self.assertEqual(self.set_content('a', 'x' * 10), 'x' * 10)
+        with self.cache.get('a', FAKE_MD5_HASH) as asset_file:
+            self.assertEqual(asset_file.read(), 'x' * 10)
+
+        # Other versions of the asset aren't cached.
+        self.assertIsNone(self.cache.get('a', '0' * 32))
+
+    def test_too_large(self):
+        self.assertEqual(self.set_content('a', 'x' * 26), 'x' * 26)
+        self.assertEqual(self.set_content('b', 'x' * 10, content_digest=None), 'x' * 10)
+        self.assertFalse(os.path.exists(self.cache.directory))
+
+    def test_partially_streamed(self):
+        content = self.mock_content('a', 'x' * 10)
+        content.stream_data.return_value = iter(['x' * 5, 'x' * 5])
+        stream = self.cache.stream_and_set(content)
+        self.assertEqual(next(stream), 'x' * 5)
+        stream.close()
+
+        self.assertIsNone(self.cache.get('a', FAKE_MD5_HASH))
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def test_evicts_least_recently_used(self):
+        for index, name in enumerate(['a', 'b', 'c']):
+            self.set_content(name, 'x' * 10)
+            # Make sure that the access times of the entries differ.
+            path = self.cache._path(name, FAKE_MD5_HASH)  # pylint: disable=protected-access
+            os.utime(path, (index, index))
+
+        self.assertEqual(len(os.listdir(self.cache.directory)), 2)
+        self.assertIsNone(self.cache.get('a', FAKE_MD5_HASH))
+        self.cache.get('b', FAKE_MD5_HASH).close()
+        self.cache.get('c', FAKE_MD5_HASH).close()
+
+    def test_lists_directory_when_full(self):
+        with patch('os.listdir', wraps=os.listdir) as mock_listdir:
+            # The size of the cache is counted when the first entry is added.
+            self.set_content('a', 'x' * 10)
+            self.assertEqual(mock_listdir.call_count, 1)
+
+            self.set_content('b', 'x' * 10)
+            self.assertEqual(mock_listdir.call_count, 1)
+
+            self.set_content('c', 'x' * 10)
+            self.assertEqual(mock_listdir.call_count, 2)
@@ -0,0 +1,93 @@
+"""
+Performance test of serving large course assets with StaticContentServer, with
+and without the local disk cache.
+"""
+import copy
+import shutil
+import unittest
+from tempfile import mkdtemp
+from timeit import default_timer
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.test.client import Client
+from django.test.utils import override_settings
+from mock import patch
+
+from xmodule.assetstore.assetmgr import AssetManager
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+TEST_DATA_CONTENTSTORE = copy.deepcopy(settings.CONTENTSTORE)
+TEST_DATA_CONTENTSTORE['DOC_STORE_CONFIG']['db'] = 'test_xcontent_%s' % uuid4().hex
+
+# Number of requests to make in each scenario.
+NUM_REQUESTS = 200
+
+
+# Performance tests are excluded from regular unittest CI runs;
+# remove the skip decorator to run them.
+@unittest.skip
+@override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
+@patch('openedx.core.djangoapps.contentserver.middleware.MAX_CACHED_CONTENT_LENGTH', 0)
+class StaticContentServerPerf(SharedModuleStoreTestCase):
+    """
+    Compares the throughput and the number of contentstore reads per request of
+    serving assets which are too large to be cached along with their data.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpClass(cls):
+        super(StaticContentServerPerf, cls).setUpClass()
+        course_key = modulestore().make_course_key('edX', 'toy', '2012_Fall')
+        import_course_from_xml(
+            modulestore(), 1, settings.COMMON_TEST_DATA_ROOT, ['toy'], static_content_store=contentstore(),
+        )
+        cls.url = unicode(course_key.make_asset_key('asset', 'another_static.txt'))
+
+    def _measure(self, **headers):
+        """
+        Returns the number of requests per second, and the number of contentstore reads
+        per request, of requesting the asset NUM_REQUESTS times.
+        """
+        client = Client()
+        with patch.object(AssetManager, 'find', wraps=AssetManager.find) as mock_find:
+            start = default_timer()
+            for _ in range(NUM_REQUESTS):
+                response = client.get(self.url, **headers)
+                if response.streaming:
+                    ''.join(response.streaming_content)
+                else:
+                    response.content  # pylint: disable=pointless-statement
+            elapsed = default_timer() - start
+        return NUM_REQUESTS / elapsed, mock_find.call_count / float(NUM_REQUESTS)
+
+    def test_serve_asset(self):
+        print
+        print '{:>12} {:>14} {:>14} {:>14}'.format('disk cache', 'request', 'requests/s', 'reads/request')
+        for disk_cached in (False, True):
+            cache_dir = mkdtemp()
+            with override_settings(
+                CONTENTSERVER_DISK_CACHE_DIR=cache_dir if disk_cached else None,
+                CONTENTSERVER_DISK_CACHE_MAX_BYTES=10 ** 8,
+            ), patch('openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE', LocMemCache(uuid4().hex, {})):
+                # The disk cache is filled as the first response is streamed.
+                response = Client().get(self.url)
+                ''.join(response.streaming_content)
+                etag = response['ETag']
+                for request, headers in (
+                        ('full', {}),
+                        ('ranges', {'HTTP_RANGE': 'bytes=0-9, 20-29'}),
+                        ('conditional', {'HTTP_IF_NONE_MATCH': etag}),
+                ):
+                    requests_per_second, reads_per_request = self._measure(**headers)
+                    print '{:>12} {:>14} {:>14.1f} {:>14.2f}'.format(
+                        'yes' if disk_cached else 'no', request, requests_per_second, reads_per_request
+                    )
+            shutil.rmtree(cache_dir)
@@ -27,6 +27,7 @@ from openedx.core.djangoapps.catalog.tests.factories import (
     SeatFactory,
     generate_course_run_key
 )
+from openedx.core.djangoapps.catalog.utils import ProgramsSnapshot
 from openedx.core.djangoapps.programs.tests.factories import ProgressFactory
 from openedx.core.djangoapps.programs.utils import (
     DEFAULT_ENROLLMENT_START_DATE,
@@ -301,6 +302,26 @@ class TestProgramProgressMeter(TestCase):
         )
         self.assertEqual(meter.completed_programs, [])
 
+    @mock.patch(UTILS_MODULE + '.get_programs_snapshot')
+    def test_programs_snapshot(self, mock_get_programs_snapshot, mock_get_programs):
+        """
+        Verify that programs and their index by course run are read from the
+        programs snapshot when there is one.
+        """
+        course_run_key = generate_course_run_key()
+        data = [
+            ProgramFactory(courses=[CourseFactory(course_runs=[CourseRunFactory(key=course_run_key)])]),
+            ProgramFactory(),
+        ]
+        mock_get_programs_snapshot.return_value = ProgramsSnapshot('version', data)
+
+        self._create_enrollments(course_run_key)
+        meter = ProgramProgressMeter(self.site, self.user)
+
+        self._attach_detail_url(data)
+        self.assertEqual(meter.engaged_programs, data[:1])
+        self.assertFalse(mock_get_programs.called)
+
     def test_shared_enrollment_engagement(self, mock_get_programs):
         """
         Verify that correct programs are returned when the user is enrolled in a
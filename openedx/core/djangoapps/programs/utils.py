@@ -23,7 +23,7 @@ from lms.djangoapps.certificates import api as certificate_api
 from lms.djangoapps.commerce.utils import EcommerceService
 from lms.djangoapps.courseware.access import has_access
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
-from openedx.core.djangoapps.catalog.utils import get_programs
+from openedx.core.djangoapps.catalog.utils import build_course_run_index, get_programs, get_programs_snapshot
 from openedx.core.djangoapps.commerce.utils import ecommerce_api_client
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.credentials.utils import get_credentials
@@ -92,7 +92,14 @@ class ProgramProgressMeter(object):
 
         self.course_grade_factory = CourseGradeFactory()
 
-        if uuid:
+        # The UUIDs of the programs containing each course run, when they are
+        # indexed by the snapshot the programs are read from.
+        self.course_run_index = None
+        snapshot = None if uuid else get_programs_snapshot(self.site)
+        if snapshot is not None:
+            self.programs = attach_program_detail_url(snapshot.get_programs())
+            self.course_run_index = snapshot.course_run_index
+        elif uuid:
             self.programs = [get_programs(self.site, uuid=uuid)]
         else:
             self.programs = attach_program_detail_url(get_programs(self.site))
@@ -109,14 +116,16 @@ class ProgramProgressMeter(object):
         """
         inverted_programs = defaultdict(list)
 
-        for program in self.programs:
-            for course in program['courses']:
-                for course_run in course['course_runs']:
-                    course_run_id = course_run['key']
-                    if course_run_id in self.course_run_ids:
-                        program_list = inverted_programs[course_run_id]
-                        if program not in program_list:
-                            program_list.append(program)
+        course_run_index = self.course_run_index
+        if course_run_index is None:
+            course_run_index = build_course_run_index(self.programs)
+        programs_by_uuid = {program['uuid']: program for program in self.programs}
+
+        for course_run_id in set(self.course_run_ids):
+            for program_uuid in course_run_index.get(course_run_id, []):
+                program = programs_by_uuid.get(program_uuid)
+                if program is not None:
+                    inverted_programs[course_run_id].append(program)
 
         # Sort programs by title for consistent presentation.
         for program_list in inverted_programs.itervalues():
@@ -337,7 +337,7 @@ class CourseWaffleFlag(WaffleFlag):
             """
             # Import is placed here to avoid model import at project startup.
             from .models import WaffleFlagCourseOverrideModel
-            cache_key = u'{}.{}'.format(namespaced_flag_name, unicode(course_key))
+            cache_key = self._course_override_cache_key(namespaced_flag_name, course_key)
             force_override = self.waffle_namespace._cached_flags.get(cache_key)
 
             if force_override is None:
@@ -352,6 +352,38 @@ class CourseWaffleFlag(WaffleFlag):
 
         return course_override_callback
 
+    @staticmethod
+    def _course_override_cache_key(namespaced_flag_name, course_key):
+        """
+        Returns the request cache key of the flag's override for the course.
+        """
+        return u'{}.{}'.format(namespaced_flag_name, unicode(course_key))
+
+    def prefetch_course_overrides(self, course_keys):
+        """
+        Loads the overrides of this flag for all the given courses with a
+        single query, and caches them for the rest of the request.
+
+        Use this before checking the flag for many courses.
+
+        Arguments:
+            course_keys (list of CourseKey): The courses to load overrides for.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from .models import WaffleFlagCourseOverrideModel
+        namespaced_flag_name = self.waffle_namespace._namespaced_name(self.flag_name)  # pylint: disable=protected-access
+        cached_flags = self.waffle_namespace._cached_flags  # pylint: disable=protected-access
+        uncached_course_keys = [
+            course_key for course_key in course_keys
+            if self._course_override_cache_key(namespaced_flag_name, course_key) not in cached_flags
+        ]
+        if not uncached_course_keys:
+            return
+
+        override_values = WaffleFlagCourseOverrideModel.override_values(namespaced_flag_name, uncached_course_keys)
+        for course_key, override_value in override_values.iteritems():
+            cached_flags[self._course_override_cache_key(namespaced_flag_name, course_key)] = override_value
+
     def is_enabled(self, course_key=None):
         """
         Returns whether or not the flag is enabled.
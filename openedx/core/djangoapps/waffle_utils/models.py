@@ -50,6 +50,32 @@ class WaffleFlagCourseOverrideModel(ConfigurationModel):
             return effective.override_choice
         return cls.ALL_CHOICES.unset
 
+    @classmethod
+    def override_values(cls, waffle_flag, course_ids):
+        """
+        Returns a dictionary mapping each of the given course ids to whether
+        the waffle flag was overridden (on or off) for the course, or is unset,
+        as override_value does, using a single query.
+
+        Arguments:
+            waffle_flag (String): The name of the flag.
+            course_ids (list of CourseKey): The course ids for which the flag
+                may have been overridden.
+
+        """
+        effective_overrides = {}
+        for override in cls.objects.filter(waffle_flag=waffle_flag, course_id__in=course_ids).order_by('-change_date'):
+            effective_overrides.setdefault(override.course_id, override)
+
+        override_values = {}
+        for course_id in course_ids:
+            effective = effective_overrides.get(course_id)
+            if effective and effective.enabled:
+                override_values[course_id] = effective.override_choice
+            else:
+                override_values[course_id] = cls.ALL_CHOICES.unset
+        return override_values
+
     class Meta(object):
         app_label = "waffle_utils"
         verbose_name = 'Waffle flag course override'
@@ -67,6 +67,26 @@ class TestCourseWaffleFlag(TestCase):
             # course which should get the default value of False.
             self.assertEqual(self.TEST_COURSE_FLAG.is_enabled(self.TEST_COURSE_2_KEY), False)
 
+    def test_prefetch_course_overrides(self):
+        """
+        Tests that prefetched course overrides are used for the rest of the
+        request.
+        """
+        WaffleFlagCourseOverrideModel.objects.create(
+            waffle_flag=self.NAMESPACED_FLAG_NAME,
+            override_choice=WaffleFlagCourseOverrideModel.ALL_CHOICES.on,
+            enabled=True,
+            course_id=self.TEST_COURSE_KEY
+        )
+        with self.assertNumQueries(1):
+            self.TEST_COURSE_FLAG.prefetch_course_overrides([self.TEST_COURSE_KEY, self.TEST_COURSE_2_KEY])
+
+        with override_flag(self.NAMESPACED_FLAG_NAME, active=False):
+            with patch.object(WaffleFlagCourseOverrideModel, 'override_value') as mock_override_value:
+                self.assertTrue(self.TEST_COURSE_FLAG.is_enabled(self.TEST_COURSE_KEY))
+                self.assertFalse(self.TEST_COURSE_FLAG.is_enabled(self.TEST_COURSE_2_KEY))
+        self.assertFalse(mock_override_value.called)
+
     @ddt.data(
         {'flag_undefined_default': None, 'result': False},
         {'flag_undefined_default': False, 'result': False},
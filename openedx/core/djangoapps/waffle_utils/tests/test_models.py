@@ -42,10 +42,27 @@ class WaffleFlagCourseOverrideTests(TestCase):
         )
         self.assertEqual(override_value, self.OVERRIDE_CHOICES.off)
 
-    def set_waffle_course_override(self, override_choice, is_enabled=True):
+    def test_override_values(self):
+        other_course_key = CourseKey.from_string("edX/DemoX/Other_Course")
+        unset_course_key = CourseKey.from_string("edX/DemoX/Unset_Course")
+        self.set_waffle_course_override(self.OVERRIDE_CHOICES.on)
+        self.set_waffle_course_override(self.OVERRIDE_CHOICES.off)
+        self.set_waffle_course_override(self.OVERRIDE_CHOICES.on, is_enabled=False, course_id=other_course_key)
+
+        with self.assertNumQueries(1):
+            override_values = WaffleFlagCourseOverrideModel.override_values(
+                self.WAFFLE_TEST_NAME, [self.TEST_COURSE_KEY, other_course_key, unset_course_key]
+            )
+        self.assertEqual(override_values, {
+            self.TEST_COURSE_KEY: self.OVERRIDE_CHOICES.off,
+            other_course_key: self.OVERRIDE_CHOICES.unset,
+            unset_course_key: self.OVERRIDE_CHOICES.unset,
+        })
+
+    def set_waffle_course_override(self, override_choice, is_enabled=True, course_id=TEST_COURSE_KEY):
         WaffleFlagCourseOverrideModel.objects.create(
             waffle_flag=self.WAFFLE_TEST_NAME,
             override_choice=override_choice,
             enabled=is_enabled,
-            course_id=self.TEST_COURSE_KEY
+            course_id=course_id
         )